@@ -1,130 +1,125 @@
 import requests
 import time
 from functools import lru_cache
+from rate_governor import RateLimitExceeded, get_discogs_governor, parse_retry_after
+from tracing import span
+from relevance import RelevanceScorer
+from logging_config import get_logger, SAMPLED
+
+log = get_logger(__name__)
 
 # iTunes API implementation
-_itunes_session = None
 
 def itunes_filter_result(search_artist, search_track, result_title, result_artist, result_album):
     """
     Moderate filtering for iTunes - one search term must match (less strict than Beatport)
     """
-    from scrape_search import normalize_for_matching
-    
-    # Normalize search terms
-    s_artist = normalize_for_matching(search_artist) if search_artist else ""
-    s_track = normalize_for_matching(search_track) if search_track else ""
-    
-    # Normalize result fields
-    r_title = normalize_for_matching(result_title) if result_title else ""
-    r_artist = normalize_for_matching(result_artist) if result_artist else ""
-    r_album = normalize_for_matching(result_album) if result_album else ""
-    
-    # Check if at least one search term is found in the result
-    if s_artist and (s_artist in r_title or s_artist in r_artist or s_artist in r_album):
-        return True
-    if s_track and (s_track in r_title or s_track in r_artist or s_track in r_album):
-        return True
-    
-    return False
+    return RelevanceScorer(search_artist, search_track).term_filter(result_title, result_artist, result_album)
 
 def get_itunes_session():
-    """Get or create global iTunes session optimized for Streamlit"""
-    global _itunes_session
-    if _itunes_session is None:
-        _itunes_session = requests.Session()
-        # Optimized adapter settings for Streamlit context
-        adapter = requests.adapters.HTTPAdapter(
-            pool_connections=2,      # Reduced for Streamlit
-            pool_maxsize=4,          # Smaller pool
-            max_retries=0,           # No retries in ThreadPool context
-            pool_block=False         # Don't block on pool exhaustion
-        )
-        _itunes_session.mount('https://', adapter)
-        _itunes_session.headers.update({
-            'User-Agent': 'GemFinder/1.0',
-            'Accept': 'application/json',
-            'Connection': 'close'    # Force connection close for Streamlit
-        })
-    return _itunes_session
+    """Get the shared keep-alive iTunes session (pooled connections, retries with backoff)"""
+    from http_client import get_http_session
+    return get_http_session("itunes", headers={
+        'User-Agent': 'GemFinder/1.0',
+        'Accept': 'application/json',
+    })
+
+def get_discogs_session():
+    """Get the shared keep-alive Discogs API session"""
+    from http_client import HttpClientConfig, get_http_session
+    config = HttpClientConfig.from_env()
+    # 429 is paced by the rate governor - blind transport retries would only burn more quota
+    config.status_forcelist = tuple(code for code in config.status_forcelist if code != 429)
+    return get_http_session("discogs", headers={
+        'User-Agent': 'GemFinderApp/1.0',
+        'Accept': 'application/json',
+    }, config=config)
+
+def discogs_api_get(url, max_wait=None, **kwargs):
+    """
+    GET against api.discogs.com through the process-wide rate governor
+    Raises RateLimitExceeded (with retry_after) instead of silently failing when the quota is used up
+    max_wait overrides how long this call may queue for a slot (0 = only if one is free right now)
+    """
+    governor = get_discogs_governor()
+    with span("rate_wait", provider="Discogs"):
+        governor.acquire(max_wait)
+    with span("request", provider="Discogs") as attrs:
+        response = get_discogs_session().get(url, **kwargs)
+        attrs["status_code"] = response.status_code
+    governor.update_from_headers(response.headers)
+    if response.status_code == 429:
+        wait = governor.on_rate_limited(parse_retry_after(response.headers))
+        log.warning("⏳ Discogs rate limit exceeded - retry in %.0fs", wait)
+        raise RateLimitExceeded("Discogs", wait)
+    return response
 
 def get_itunes_release_info(artist, track):
     """iTunes API search with optimized implementation for Streamlit"""
-    import socket
     import time
     
     try:
-        print(f"🎵 iTunes API search: '{artist}' - '{track}'")
+        log.debug("🎵 iTunes API search: %r - %r", artist, track)
         t0 = time.time()
         
         query = f"{artist} {track}"
         url = "https://itunes.apple.com/search"
-        params = {"term": query, "entity": "song", "limit": 3, "country": "DE"}  # Get 3 results for filtering
+        params = {"term": query, "entity": "song", "limit": 10, "country": "DE"}  # Get 10 results for filtering and ranking
         
-        print(f"⏱️ Setup time: {time.time()-t0:.3f}s")
+        # IPv4 preference and DNS caching live in the shared transport (http_client)
+        session = get_itunes_session()
         
-        # Force IPv4 to avoid IPv6 timeout delays
-        original_getaddrinfo = socket.getaddrinfo
-        def getaddrinfo_ipv4_only(host, port, family=0, type=0, proto=0, flags=0):
-            return original_getaddrinfo(host, port, socket.AF_INET, type, proto, flags)
-        socket.getaddrinfo = getaddrinfo_ipv4_only
-        
-        try:
-            session = get_itunes_session()
-            t1 = time.time()
-            print(f"⏱️ Session get time: {t1-t0:.3f}s")
-            
-            # Retry logic for Streamlit context
-            for attempt in range(2):  # 2 attempts max
-                try:
-                    t_request = time.time()
-                    print(f"🔧 Attempt {attempt + 1}: Starting iTunes request")
-                    
-                    # Shorter connect timeout, longer read timeout for API responses
+        # Connect errors and 429/5xx are retried by the shared transport - only a stalled read is retried here
+        for attempt in range(2):  # 2 attempts max
+            try:
+                t_request = time.time()
+                log.debug("🔧 Attempt %d: Starting iTunes request", attempt + 1)
+                
+                # Shorter connect timeout, longer read timeout for API responses
+                with span("request", provider="iTunes", attempt=attempt + 1):
                     response = session.get(url, params=params, timeout=(2, 8))
-                    
-                    t2 = time.time()
-                    print(f"⏱️ HTTP request time: {t2-t_request:.3f}s")
-                    break
-                except (requests.exceptions.ConnectTimeout, requests.exceptions.ReadTimeout) as e:
-                    attempt_time = time.time() - t_request
-                    print(f"❌ Attempt {attempt + 1} failed after {attempt_time:.3f}s: {e}")
-                    if attempt == 1:  # Last attempt
-                        raise e
-                    time.sleep(0.1)  # Brief pause before retry
-        finally:
-            # Restore original getaddrinfo
-            socket.getaddrinfo = original_getaddrinfo
+                break
+            except requests.exceptions.ReadTimeout as e:
+                attempt_time = time.time() - t_request
+                log.warning("❌ Attempt %d failed after %.3fs: %s", attempt + 1, attempt_time, e)
+                if attempt == 1:  # Last attempt
+                    raise e
+                time.sleep(0.1)  # Brief pause before retry
         
         elapsed = time.time() - t0
-        print(f"✅ iTunes API total time: {elapsed:.3f}s, Status: {response.status_code}")
+        log.info("✅ iTunes API total time: %.3fs, Status: %s", elapsed, response.status_code)
         
         if response.status_code == 200:
-            data = response.json()
-            results = data.get("results", [])
+            with span("parse", provider="iTunes"):
+                results = response.json().get("results", [])
             if results:
-                print(f"🎯 iTunes found {len(results)} results, filtering...")
+                log.debug("🎯 iTunes found %d results, filtering...", len(results))
                 
-                # Filter results to find the most relevant one
+                # Filter results to find the most relevant one (query normalized once for all rows)
+                scorer = RelevanceScorer(artist, track)
                 filtered_candidates = []
-                for i, r in enumerate(results):
-                    track_name = r.get("trackName", "")
-                    artist_name = r.get("artistName", "")
-                    album_name = r.get("collectionName", "")
+                with span("filter_score", provider="iTunes", candidates=len(results)):
+                    for i, r in enumerate(results):
+                        track_name = r.get("trackName", "")
+                        artist_name = r.get("artistName", "")
+                        album_name = r.get("collectionName", "")
                     
-                    print(f"  Result {i+1}: '{track_name}' by '{artist_name}'")
+                        log.debug("  Result %d: %r by %r", i + 1, track_name, artist_name, extra=SAMPLED)
                     
-                    # Apply iTunes filter (moderate strictness)
-                    if itunes_filter_result(artist, track, track_name, artist_name, album_name):
-                        print(f"    ✅ Passed filter")
-                        filtered_candidates.append(r)
-                    else:
-                        print(f"    ❌ Filtered out - not relevant")
+                        # Apply iTunes filter (moderate strictness)
+                        if scorer.term_filter(track_name, artist_name, album_name):
+                            log.debug("    ✅ Passed filter", extra=SAMPLED)
+                            filtered_candidates.append(r)
+                        else:
+                            log.debug("    ❌ Filtered out - not relevant", extra=SAMPLED)
+                
+                    # Rank the passing rows; without any scored match iTunes' own order decides
+                    best = scorer.best([(c.get("trackName", ""), c.get("artistName", ""), c.get("collectionName", ""))
+                                        for c in filtered_candidates])
                 
                 if filtered_candidates:
-                    # Take the first filtered result (iTunes usually orders by relevance)
-                    r = filtered_candidates[0]
-                    print(f"🎯 iTunes selected: {r.get('trackName', 'No Title')}")
+                    r = filtered_candidates[best or 0]
+                    log.debug("🎯 iTunes selected: %s", r.get('trackName', 'No Title'))
                     return {
                         "platform": "iTunes",
                         "title": r.get("trackName", ""),
@@ -137,11 +132,11 @@ def get_itunes_release_info(artist, track):
                         "preview": r.get("previewUrl", "")
                     }
                 else:
-                    print("📭 iTunes: All results filtered out - no relevant matches")
+                    log.info("📭 iTunes: All results filtered out - no relevant matches")
             else:
-                print("📭 iTunes: No results in response")
+                log.info("📭 iTunes: No results in response")
         else:
-            print(f"❌ iTunes API error: Status {response.status_code}")
+            log.warning("❌ iTunes API error: Status %s", response.status_code)
         
         return {
             "platform": "iTunes", 
@@ -157,7 +152,7 @@ def get_itunes_release_info(artist, track):
         
     except Exception as e:
         elapsed = time.time() - t0 if 't0' in locals() else 0
-        print(f"❌ iTunes API error after {elapsed:.3f}s: {e}")
+        log.error("❌ iTunes API error after %.3fs: %s", elapsed, e)
         return {
             "platform": "iTunes", 
             "title": "❌ iTunes Suche nicht verfügbar", 
@@ -186,8 +181,7 @@ def search_discogs_releases(artist=None, track=None, album=None, catno=None):
     DISCOGS_USER_TOKEN = os.environ.get("DISCOGS_USER_TOKEN")
     
     if not DISCOGS_USER_TOKEN:
-        print("❌ Discogs API error: Authentication required")
-        print("   The Discogs database search API now requires a user token")
+        log.error("❌ Discogs API error: Authentication required - the database search API now requires a user token")
         return []
     
     # Build search query - Discogs API works better with simple terms
@@ -207,12 +201,31 @@ def search_discogs_releases(artist=None, track=None, album=None, catno=None):
     # Simple space-separated query works better than field-specific syntax
     query = " ".join(query_parts)
     
+    headers = {
+        "Authorization": f"Discogs token={DISCOGS_USER_TOKEN}",
+        "User-Agent": "GemFinderApp/1.0"
+    }
+    
     try:
-        url = "https://api.discogs.com/database/search"
-        headers = {
-            "Authorization": f"Discogs token={DISCOGS_USER_TOKEN}",
-            "User-Agent": "GemFinderApp/1.0"
-        }
+        if catno:
+            # Fast path: the dedicated catno filter matches the catalog number field exactly -
+            # one short page of the right releases instead of a free-text search across all fields
+            # Only whitespace is collapsed: Discogs matches the catno as printed ("WARP CD 92"), the
+            # fully normalized key ("WARPCD92") is a different token and would miss exact releases
+            params = {"catno": " ".join(catno.split()), "per_page": 15, "page": 1}
+            if artist:
+                params["artist"] = artist
+            log.debug("Searching Discogs API by catno: %r", params["catno"])
+            releases = discogs_database_search(headers, params, artist)
+            if releases:
+                # Mark the answer of the catno filter - only these are complete per catno (and artist)
+                # and may serve later catno searches from the release index
+                for release in releases:
+                    release["catno_query"] = {"catno": params["catno"], "artist": artist or ""}
+                return releases
+            # None (request failed) or no hit - the free-text search may still find it
+            log.debug("No Discogs release for catno %r - falling back to free-text search", catno)
+        
         params = {
             "q": query,
             # Remove type filter to get all results like browser
@@ -220,99 +233,110 @@ def search_discogs_releases(artist=None, track=None, album=None, catno=None):
             "page": 1
         }
         
-        print(f"Searching Discogs API for: '{query}'")
-        
-        # Apply same IPv4 optimization as iTunes
-        import socket
-        original_getaddrinfo = socket.getaddrinfo
-        def getaddrinfo_ipv4_only(host, port, family=0, type=0, proto=0, flags=0):
-            return original_getaddrinfo(host, port, socket.AF_INET, type, proto, flags)
-        socket.getaddrinfo = getaddrinfo_ipv4_only
-        
-        try:
-            # Use optimized session with same settings as iTunes
-            session = requests.Session()
-            session.headers.update({
-                'Connection': 'close'  # Force connection close for Streamlit
-            })
+        log.debug("Searching Discogs API for: %r", query)
+        return discogs_database_search(headers, params, artist) or []
             
-            # Optimized timeouts: 2s connect, 8s read (same as iTunes)
-            response = session.get(url, headers=headers, params=params, timeout=(2, 8))
-        finally:
-            # Restore original getaddrinfo
-            socket.getaddrinfo = original_getaddrinfo
-        
-        print(f"Discogs API Response: {response.status_code}")
-        print(f"Response URL: {response.url}")
+    except RateLimitExceeded:
+        # Caller decides how to tell the user - not an empty result
+        raise
+    except Exception as e:
+        log.error("Discogs API error: %s", e)
+    
+    # Return empty list if API fails
+    return []
+
+def discogs_database_search(headers, params, artist=None):
+    """One /database/search request -> formatted releases ([] = no results, None = API error)"""
+    url = "https://api.discogs.com/database/search"
+    
+    # Shared keep-alive session, paced by the Discogs rate governor
+    # Optimized timeouts: 2s connect, 8s read (same as iTunes)
+    response = discogs_api_get(url, headers=headers, params=params, timeout=(2, 8))
+    
+    log.debug("Discogs API Response: %s (%s)", response.status_code, response.url)
+    
+    if response.status_code == 200:
+        with span("parse", provider="Discogs"):
+            results = response.json().get("results", [])
         
-        if response.status_code == 200:
-            data = response.json()
-            results = data.get("results", [])
+        # Convert API response to expected format
+        formatted_results = []
+        for i, result in enumerate(results[:10]):  # Always show first 10 results
             
-            # Convert API response to expected format
-            formatted_results = []
-            for i, result in enumerate(results[:10]):  # Always show first 10 results
-                
-                # Accept both releases and masters (like browser does)
-                resource_url = result.get("resource_url", "")
-                result_type = result.get("type", "")
-                
-                # Only skip artists and labels, keep releases and masters
-                if result_type in ["artist", "label"]:
-                    print(f"Skipping {result_type} result: {result.get('title', 'no title')}")
-                    continue
-                
-                # Extract artist from title if available
-                title = result.get("title", "")
-                if " - " in title:
-                    artist_from_title = title.split(" - ")[0]
-                    release_title = title.split(" - ", 1)[1] if len(title.split(" - ", 1)) > 1 else title
-                else:
-                    artist_from_title = artist or "Unknown Artist"
-                    release_title = title
-                
-                # Better cover image handling
-                cover_image = result.get("cover_image") or result.get("thumb") or ""
-                
-                formatted_results.append({
-                    "id": str(result.get("id", "")),
-                    "cover": cover_image,
-                    "thumb": result.get("thumb", cover_image),
-                    "title": release_title,
-                    "artist": artist_from_title,
-                    "tracklist": [],  # Would need separate API call for full tracklist
-                    "label": result.get("label", []),
-                    "year": result.get("year", ""),
-                    "format": result.get("format", []),
-                    "catno": result.get("catno", ""),
-                    "uri": result.get("uri", ""),
-                    "type": result.get("type", ""),  # Add type for debugging
-                    "community": result.get("community", {})  # Extract community data if availabl
-                })
+            # Accept both releases and masters (like browser does)
+            resource_url = result.get("resource_url", "")
+            result_type = result.get("type", "")
             
-            # Formatted results ready
+            # Only skip artists and labels, keep releases and masters
+            if result_type in ["artist", "label"]:
+                log.debug("Skipping %s result: %s", result_type, result.get('title', 'no title'), extra=SAMPLED)
+                continue
             
-            return formatted_results
-        else:
-            print(f"Discogs API error: {response.status_code}")
-            if response.status_code == 401:
-                print("Discogs API authentication error - API may be restricted")
-            elif response.status_code == 429:
-                print("Rate limit exceeded - wait and try again")
-            try:
-                error_data = response.json()
-                print(f"Error details: {error_data}")
-            except:
-                print(f"Response text: {response.text}")
+            # Extract artist from title if available
+            title = result.get("title", "")
+            if " - " in title:
+                artist_from_title = title.split(" - ")[0]
+                release_title = title.split(" - ", 1)[1] if len(title.split(" - ", 1)) > 1 else title
+            else:
+                artist_from_title = artist or "Unknown Artist"
+                release_title = title
             
-    except Exception as e:
-        print(f"Discogs API error: {e}")
+            # Better cover image handling
+            cover_image = result.get("cover_image") or result.get("thumb") or ""
+            
+            formatted_results.append({
+                "id": str(result.get("id", "")),
+                "cover": cover_image,
+                "thumb": result.get("thumb", cover_image),
+                "title": release_title,
+                "artist": artist_from_title,
+                "tracklist": [],  # Would need separate API call for full tracklist
+                "label": result.get("label", []),
+                "year": result.get("year", ""),
+                "format": result.get("format", []),
+                "catno": result.get("catno", ""),
+                "uri": result.get("uri", ""),
+                "type": result.get("type", ""),  # Add type for debugging
+                "community": result.get("community", {})  # Extract community data if availabl
+            })
+        
+        # Formatted results ready
+        
+        return formatted_results
     
-    # Return empty list if API fails
-    return []
+    log.warning("Discogs API error: %s", response.status_code)
+    if response.status_code == 401:
+        log.warning("Discogs API authentication error - API may be restricted")
+    try:
+        error_data = response.json()
+        log.debug("Error details: %s", error_data)
+    except:
+        log.debug("Response text: %s", response.text)
+    return None
 
 def get_discogs_release_details(release_id):
-    """Real Discogs API implementation for release details"""
+    """Real Discogs API implementation for release details (fallback dict if they cannot be loaded)"""
+    try:
+        details = fetch_discogs_release_details(release_id)
+    except RateLimitExceeded as e:
+        log.warning("Release details for %s skipped: %s", release_id, e)
+        details = None
+    if details is not None:
+        return details
+    
+    # Fallback
+    return {
+        "id": release_id,
+        "title": f"Release {release_id}",
+        "tracklist": [],
+        "label": ["Unknown"],
+        "year": "",
+        "format": ["Unknown"],
+        "cover": ""
+    }
+
+def fetch_discogs_release_details(release_id, max_wait=None):
+    """Release details from the Discogs API, or None if they could not be loaded (RateLimitExceeded is raised)"""
     import os
     import requests
     from dotenv import load_dotenv
@@ -326,16 +350,8 @@ def get_discogs_release_details(release_id):
     DISCOGS_USER_TOKEN = os.environ.get("DISCOGS_USER_TOKEN")
     
     if not DISCOGS_USER_TOKEN:
-        print("❌ Discogs API error: Authentication required")
-        return {
-            "id": release_id,
-            "title": f"Release {release_id}",
-            "tracklist": [],
-            "label": ["Unknown"],
-            "year": "",
-            "format": ["Unknown"],
-            "cover": ""
-        }
+        log.error("❌ Discogs API error: Authentication required")
+        return None
     
     try:
         url = f"https://api.discogs.com/releases/{release_id}"
@@ -344,8 +360,8 @@ def get_discogs_release_details(release_id):
             "User-Agent": "GemFinderApp/1.0"
         }
         
-        print(f"Getting Discogs release details for ID: {release_id}")
-        response = requests.get(url, headers=headers, timeout=10)
+        log.debug("Getting Discogs release details for ID: %s", release_id)
+        response = discogs_api_get(url, max_wait=max_wait, headers=headers, timeout=(2, 8))
         
         if response.status_code == 200:
             data = response.json()
@@ -370,21 +386,14 @@ def get_discogs_release_details(release_id):
                 "community": data.get("community", {})  # Add community data
             }
         else:
-            print(f"Discogs API error: {response.status_code}")
+            log.warning("Discogs API error: %s", response.status_code)
             
+    except RateLimitExceeded:
+        raise
     except Exception as e:
-        print(f"Discogs API error: {e}")
+        log.error("Discogs API error: %s", e)
     
-    # Fallback
-    return {
-        "id": release_id,
-        "title": f"Release {release_id}",
-        "tracklist": [],
-        "label": ["Unknown"],
-        "year": "",
-        "format": ["Unknown"],
-        "cover": ""
-    }
+    return None
 
 def get_discogs_offers(release_id, currency="EUR", country="DE"):
     """
@@ -396,7 +405,7 @@ def get_discogs_offers(release_id, currency="EUR", country="DE"):
     
     Returns empty list to maintain compatibility.
     """
-    print("⚠️ Discogs Marketplace API is not available - use web scraping instead")
+    log.warning("⚠️ Discogs Marketplace API is not available - use web scraping instead")
     return []
 
 ##################################################################Dummy Ende
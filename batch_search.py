@@ -0,0 +1,466 @@
+"""
+Batch / crate-digging mode: search a whole list of tracks (CSV or JSONL) on all platforms
+Results are streamed to JSONL or CSV as rows finish; re-running the same command resumes an interrupted batch
+
+    python batch_search.py crate.csv -o results.jsonl
+    python batch_search.py inventory.jsonl -o results.csv --platforms Discogs,Revibed
+"""
+import os
+import csv
+import sys
+import json
+import time
+import argparse
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set
+
+from providers import (
+    SearchCriteria, SearchProvider, SearchManager, DiscogsProvider, RevibedProvider,
+    ItunesProvider, BeatportProvider, BandcampProvider, TraxsourceProvider, error_result
+)
+from search_cache import ERROR_MARKERS
+
+
+def _default_limits() -> Dict[str, int]:
+    return {
+        # Plain API calls are cheap
+        "iTunes": 4,
+        # Shop pages may fall back to a pooled Chrome - keep in line with the driver pool size
+        "Beatport": 2,
+        "Bandcamp": 2,
+        "Traxsource": 2,
+        # Discogs is additionally paced by the rate governor
+        "Discogs": 2,
+        "Revibed": 2,
+    }
+
+
+@dataclass
+class BatchConfig:
+    """Configuration for batch runs (defaults can be overridden via environment)"""
+    # Maximum concurrent searches per platform
+    limits: Dict[str, int] = field(default_factory=_default_limits)
+
+    # How often a rate-limited Discogs search is retried after waiting retry_after
+    rate_limit_retries: int = 3
+
+    # Re-run rows whose stored record contains provider errors when resuming
+    retry_errors: bool = False
+
+    # Rows searched at the same time - an interrupt only loses these
+    window: int = 4
+
+    # Deadline per provider search, including the wait for its platform limit and rate-limit retries
+    provider_timeout: float = 120.0
+
+    @classmethod
+    def from_env(cls) -> "BatchConfig":
+        config = cls()
+        for platform in list(config.limits):
+            # e.g. GEMFINDER_BATCH_LIMIT_BEATPORT=1
+            env_limit = os.environ.get(f"GEMFINDER_BATCH_LIMIT_{platform.upper()}")
+            if env_limit is not None:
+                config.limits[platform] = max(1, int(env_limit))
+        config.rate_limit_retries = int(os.environ.get("GEMFINDER_BATCH_RATE_LIMIT_RETRIES", config.rate_limit_retries))
+        config.window = max(1, int(os.environ.get("GEMFINDER_BATCH_WINDOW", config.window)))
+        config.provider_timeout = float(os.environ.get("GEMFINDER_BATCH_PROVIDER_TIMEOUT", config.provider_timeout))
+        return config
+
+
+def default_providers() -> List[SearchProvider]:
+    return [ItunesProvider(), BeatportProvider(), BandcampProvider(), TraxsourceProvider(),
+            DiscogsProvider(), RevibedProvider()]
+
+
+# —————————————————————————————
+# Input
+# —————————————————————————————
+# Accepted column names per criteria field (crate exports use all kinds of headers)
+FIELD_ALIASES = {
+    "artist": ("artist", "interpret"),
+    "title": ("title", "track", "name"),
+    "album": ("album", "release"),
+    "catalog": ("catalog", "catno", "catalog_number", "cat"),
+}
+
+
+def normalize_row(raw: Dict, index: int) -> Dict:
+    """Map an input row to {row_id, artist, title, album, catalog}; row_id defaults to the 1-based row number"""
+    lowered = {str(k).strip().lower(): v for k, v in raw.items() if k is not None}
+    row = {"row_id": str(lowered.get("id") or lowered.get("row_id") or index)}
+    for target, aliases in FIELD_ALIASES.items():
+        value = next((lowered[a] for a in aliases if lowered.get(a)), "")
+        row[target] = str(value).strip()
+    return row
+
+
+def read_batch_input(path: str) -> Iterator[Dict]:
+    """Yield normalized rows from a CSV (with header) or JSONL file"""
+    if path.lower().endswith((".jsonl", ".ndjson")):
+        with open(path, encoding="utf-8") as f:
+            index = 0
+            for line in f:
+                if not line.strip():
+                    continue
+                index += 1
+                yield normalize_row(json.loads(line), index)
+    else:
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            for index, raw in enumerate(csv.DictReader(f), start=1):
+                yield normalize_row(raw, index)
+
+
+# —————————————————————————————
+# Output
+# —————————————————————————————
+def output_format(path: str, fmt: Optional[str] = None) -> str:
+    if fmt:
+        return fmt.lower()
+    return "csv" if path.lower().endswith(".csv") else "jsonl"
+
+
+def summarize_result(result: Dict) -> Dict[str, str]:
+    """Flat title/price/url of one provider result (first release for Discogs)"""
+    if "releases" in result:
+        first = result["releases"][0] if result.get("releases") else {}
+        uri = first.get("uri", "")
+        return {
+            "title": first.get("title") or result.get("message") or "Kein Treffer",
+            "price": "",
+            "url": f"https://www.discogs.com{uri}" if uri.startswith("/") else uri,
+        }
+    return {
+        "title": result.get("title", ""),
+        "price": result.get("price", ""),
+        "url": result.get("url") or result.get("release_url", ""),
+    }
+
+
+def result_error(result: Dict) -> str:
+    """Error text of a provider result ('' for hits and 'Kein Treffer')"""
+    if result.get("error"):
+        return str(result["error"])
+    if result.get("rate_limited"):
+        return result.get("message", "rate limited")
+    title = str(result.get("title", ""))
+    if any(marker in title.lower() for marker in ERROR_MARKERS):
+        return title
+    return ""
+
+
+def record_has_errors(record: Dict) -> bool:
+    return any(result_error(r) for r in record.get("results", {}).values())
+
+
+class BatchWriter:
+    """Appends one record per finished row; flushes after every row so an interruption loses nothing"""
+
+    def __init__(self, path: str, fmt: str, platforms: List[str]):
+        self.path = path
+        self.fmt = fmt
+        self.platforms = platforms
+        self.columns = ["row_id", "artist", "title", "album", "catalog", "elapsed"]
+        for platform in platforms:
+            self.columns += [f"{platform}_title", f"{platform}_price", f"{platform}_url", f"{platform}_error"]
+        self._file = None
+        self._csv = None
+
+    def check_resumable(self):
+        """
+        Appending to a CSV needs the same columns - DictWriter would silently drop new platform
+        columns and leave missing ones empty. JSONL records carry their own platforms.
+        """
+        if self.fmt != "csv" or not os.path.exists(self.path) or os.path.getsize(self.path) == 0:
+            return
+        with open(self.path, newline="", encoding="utf-8") as f:
+            header = next(csv.reader(f), [])
+        if header != self.columns:
+            raise ValueError(f"{self.path} was written for other platforms - resume with the same "
+                             f"--platforms or start over with --no-resume")
+
+    def open(self):
+        self.check_resumable()
+        exists = os.path.exists(self.path) and os.path.getsize(self.path) > 0
+        if exists and self.fmt == "jsonl":
+            # An interrupted run may have left a half-written last line
+            with open(self.path, "rb") as f:
+                f.seek(-1, os.SEEK_END)
+                needs_newline = f.read(1) != b"\n"
+        else:
+            needs_newline = False
+        self._file = open(self.path, "a", newline="", encoding="utf-8")
+        if needs_newline:
+            self._file.write("\n")
+        if self.fmt == "csv":
+            self._csv = csv.DictWriter(self._file, fieldnames=self.columns, extrasaction="ignore")
+            if not exists:
+                self._csv.writeheader()
+        return self
+
+    def write(self, record: Dict):
+        if self.fmt == "csv":
+            flat = {key: record["input"].get(key, "") for key in ("row_id", "artist", "title", "album", "catalog")}
+            flat["elapsed"] = f"{record['elapsed']:.2f}"
+            for platform, result in record["results"].items():
+                for key, value in summarize_result(result).items():
+                    flat[f"{platform}_{key}"] = value
+                flat[f"{platform}_error"] = result_error(result)
+            self._csv.writerow(flat)
+        else:
+            self._file.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+        self._file.flush()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self.open()
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_output_records(path: str, fmt: str) -> Iterator[Dict]:
+    """Records of an existing output file: {row_id, has_errors, raw} (raw = CSV row dict or JSONL line)"""
+    if not os.path.exists(path):
+        return
+    with open(path, newline="", encoding="utf-8") as f:
+        if fmt == "csv":
+            for row in csv.DictReader(f):
+                if row.get("row_id"):
+                    has_errors = any(v for k, v in row.items() if k and k.endswith("_error"))
+                    yield {"row_id": row["row_id"], "has_errors": has_errors, "raw": row}
+        else:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue  # truncated line of an interrupted run - the row is searched again
+                yield {"row_id": record.get("row_id"), "has_errors": record_has_errors(record), "raw": line}
+
+
+def load_completed_ids(path: str, fmt: str, retry_errors: bool = False) -> Set[str]:
+    """Row ids already present in an existing output file (resume support)"""
+    completed = set()
+    for record in read_output_records(path, fmt):
+        if retry_errors and record["has_errors"]:
+            completed.discard(record["row_id"])
+            continue
+        completed.add(record["row_id"])
+    return completed
+
+
+def drop_records(path: str, fmt: str, keep_ids: Set[str]) -> int:
+    """
+    Rewrite the output file without records of rows outside keep_ids - rows searched again
+    replace their old record instead of being appended a second time; returns the dropped count
+    """
+    records = list(read_output_records(path, fmt))
+    kept = [r for r in records if r["row_id"] in keep_ids]
+    if len(kept) == len(records):
+        return 0
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", newline="", encoding="utf-8") as f:
+        if fmt == "csv":
+            with open(path, newline="", encoding="utf-8") as source:
+                fieldnames = next(csv.reader(source))
+            writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction="ignore")
+            writer.writeheader()
+            writer.writerows(r["raw"] for r in kept)
+        else:
+            for record in kept:
+                f.write(record["raw"] if record["raw"].endswith("\n") else record["raw"] + "\n")
+    os.replace(tmp_path, path)
+    return len(records) - len(kept)
+
+
+# —————————————————————————————
+# Runner
+# —————————————————————————————
+@dataclass
+class BatchSummary:
+    total: int = 0
+    skipped: int = 0
+    completed: int = 0
+    errors: int = 0
+    elapsed: float = 0.0
+
+
+class LimitedProvider(SearchProvider):
+    """Provider seen by the SearchManager of a batch run - searches go through BatchRunner.search_one"""
+
+    def __init__(self, runner: "BatchRunner", provider: SearchProvider):
+        self.name = provider.name
+        self.runner = runner
+        self.provider = provider
+
+    def can_search(self, c: SearchCriteria) -> bool:
+        return self.provider.can_search(c)
+
+    def search(self, c: SearchCriteria) -> dict:
+        return self.runner.search_one(self.provider, c)
+
+
+class BatchRunner:
+    """
+    Searches a window of rows at a time through a SearchManager (per-provider deadlines),
+    each platform bounded by its own semaphore
+    """
+
+    def __init__(self, providers: Optional[List[SearchProvider]] = None, config: Optional[BatchConfig] = None,
+                 sleep: Callable[[float], None] = time.sleep):
+        self.providers = providers or default_providers()
+        self.config = config or BatchConfig.from_env()
+        self._sleep = sleep
+        self._semaphores = {
+            p.name: threading.BoundedSemaphore(self.config.limits.get(p.name, 2)) for p in self.providers
+        }
+
+    def search_one(self, provider: SearchProvider, criteria: SearchCriteria) -> Dict:
+        """One provider search inside its platform limit; rate-limited searches wait and retry within it"""
+        with self._semaphores[provider.name]:
+            for attempt in range(self.config.rate_limit_retries + 1):
+                try:
+                    result = provider.search(criteria)
+                except Exception as e:
+                    return error_result(provider.name, e)
+                if not result.get("rate_limited") or attempt == self.config.rate_limit_retries:
+                    return result
+                # Batch runs can afford to wait for the quota instead of reporting "try later"
+                self._sleep(result.get("retry_after") or 1.0)
+        return result
+
+    def search_row(self, manager: SearchManager, row: Dict) -> Dict:
+        """Results of all eligible providers for one row, keyed by platform"""
+        criteria = SearchCriteria(title=row["title"], artist=row["artist"],
+                                  album=row["album"], catalog=row["catalog"])
+        return {result["platform"]: result for result in manager.stream_sync(criteria)}
+
+    def run(self, rows: Iterable[Dict], writer: BatchWriter, completed_ids: Optional[Set[str]] = None,
+            on_record: Optional[Callable[[Dict], None]] = None) -> BatchSummary:
+        completed_ids = completed_ids or set()
+        summary = BatchSummary()
+        start_time = time.time()
+
+        window = max(1, self.config.window)
+        # One thread per search of the window - searches waiting for their platform limit never starve others
+        search_executor = ThreadPoolExecutor(max_workers=window * max(1, len(self.providers)),
+                                             thread_name_prefix="batch-search")
+        row_executor = ThreadPoolExecutor(max_workers=window, thread_name_prefix="batch-row")
+        manager = SearchManager([LimitedProvider(self, p) for p in self.providers],
+                                provider_timeout=self.config.provider_timeout,
+                                overall_timeout=self.config.provider_timeout,
+                                executor=search_executor)
+        # Keyed by future, not row_id - input files may repeat an id
+        in_flight: Dict = {}
+        try:
+            for row in rows:
+                summary.total += 1
+                if row["row_id"] in completed_ids:
+                    summary.skipped += 1
+                    continue
+                while len(in_flight) >= window:
+                    self._drain(in_flight, writer, summary, on_record)
+                in_flight[row_executor.submit(self.search_row, manager, row)] = (row, time.time())
+            while in_flight:
+                self._drain(in_flight, writer, summary, on_record)
+        finally:
+            # Ctrl-C or an error: rows not started yet are dropped, unfinished ones are searched again on resume
+            row_executor.shutdown(wait=False, cancel_futures=True)
+            search_executor.shutdown(wait=False, cancel_futures=True)
+
+        summary.elapsed = time.time() - start_time
+        return summary
+
+    def _drain(self, in_flight: Dict, writer: BatchWriter, summary: BatchSummary, on_record):
+        """Wait for the next finished rows and write them"""
+        done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+        for future in [f for f in in_flight if f in done]:
+            row, started = in_flight.pop(future)
+            self._finish(row, future.result(), started, writer, summary, on_record)
+
+    def _finish(self, row: Dict, row_results: Dict, started: float, writer: BatchWriter,
+                summary: BatchSummary, on_record):
+        # Keep provider order stable in the output regardless of completion order
+        order = [p.name for p in self.providers]
+        results = {name: row_results[name] for name in order if name in row_results}
+        record = {
+            "row_id": row["row_id"],
+            "input": row,
+            "results": results,
+            "elapsed": time.time() - started,
+        }
+        writer.write(record)
+        summary.completed += 1
+        if record_has_errors(record):
+            summary.errors += 1
+        if on_record:
+            on_record(record)
+
+
+def run_batch(input_path: str, output_path: str, fmt: Optional[str] = None,
+              platforms: Optional[List[str]] = None, resume: bool = True,
+              config: Optional[BatchConfig] = None,
+              on_record: Optional[Callable[[Dict], None]] = None) -> BatchSummary:
+    """
+    Importable entry point: search every row of input_path and stream records to output_path
+    With resume=True rows already present in output_path are skipped (and new records appended)
+    """
+    config = config or BatchConfig.from_env()
+    fmt = output_format(output_path, fmt)
+    providers = default_providers()
+    if platforms:
+        wanted = {p.lower() for p in platforms}
+        providers = [p for p in providers if p.name.lower() in wanted]
+
+    if not resume and os.path.exists(output_path):
+        os.remove(output_path)
+    writer = BatchWriter(output_path, fmt, [p.name for p in providers])
+    # Refuse before touching the file (drop_records below rewrites it)
+    writer.check_resumable()
+    completed_ids = load_completed_ids(output_path, fmt, config.retry_errors) if resume else set()
+    if resume and config.retry_errors:
+        # Rows searched again replace their error record
+        drop_records(output_path, fmt, completed_ids)
+
+    runner = BatchRunner(providers, config)
+    with writer:
+        return runner.run(read_batch_input(input_path), writer, completed_ids, on_record)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="GemFinder batch search (CSV/JSONL crate lists)")
+    parser.add_argument("input", help="CSV with header or JSONL with artist/title/album/catno fields")
+    parser.add_argument("-o", "--output", required=True, help="Result file (.jsonl or .csv)")
+    parser.add_argument("--format", choices=["jsonl", "csv"], help="Output format (default: from file extension)")
+    parser.add_argument("--platforms", help="Comma-separated platforms, e.g. Beatport,Discogs")
+    parser.add_argument("--no-resume", action="store_true", help="Start over instead of skipping finished rows")
+    parser.add_argument("--retry-errors", action="store_true", help="Search rows with provider errors again")
+    args = parser.parse_args(argv)
+
+    config = BatchConfig.from_env()
+    config.retry_errors = args.retry_errors
+    platforms = [p.strip() for p in args.platforms.split(",")] if args.platforms else None
+
+    def progress(record):
+        found = sum(1 for r in record["results"].values()
+                    if not result_error(r) and summarize_result(r)["title"] not in ("", "Kein Treffer"))
+        print(f"✅ Row {record['row_id']}: {found}/{len(record['results'])} platforms with hits ({record['elapsed']:.1f}s)")
+
+    try:
+        summary = run_batch(args.input, args.output, args.format, platforms,
+                            resume=not args.no_resume, config=config, on_record=progress)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 2
+    print(f"🏁 Batch finished: {summary.completed} searched, {summary.skipped} skipped (already done), "
+          f"{summary.errors} with errors in {summary.elapsed:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,138 @@
+"""
+Local stand-in for the shop and API hosts: serves recorded fixtures over real HTTP
+A replay adapter on the shared http_client sessions rewrites https://<host>/... to http://127.0.0.1:<port>/<host>/...
+"""
+import os
+import threading
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+from http_client import HttpClientConfig, HttpStats, PooledHTTPAdapter
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+FIXTURE_DIR = os.path.join(BENCH_DIR, "fixtures")
+
+# Host -> (fixture file, content type); captured pages live in the repo root, API answers and
+# pages with listings in fixtures/
+FIXTURES: Dict[str, Tuple[str, str]] = {
+    "www.beatport.com": (os.path.join(REPO_DIR, "beatport_tracks_source.html"), "text/html; charset=utf-8"),
+    "www.traxsource.com": (os.path.join(REPO_DIR, "traxsource_house_page.html"), "text/html; charset=utf-8"),
+    # Recorded marketplace page with its server-rendered list filled - the empty capture only covered "no hits"
+    "revibed.com": (os.path.join(FIXTURE_DIR, "revibed_marketplace.html"), "text/html; charset=utf-8"),
+    "bandcamp.com": (os.path.join(FIXTURE_DIR, "bandcamp_track.html"), "text/html; charset=utf-8"),
+    "itunes.apple.com": (os.path.join(FIXTURE_DIR, "itunes_search.json"), "application/json"),
+    "api.discogs.com": (os.path.join(FIXTURE_DIR, "discogs_search.json"), "application/json"),
+}
+
+
+def fixture_for_host(host: str) -> Optional[Tuple[str, str]]:
+    if host in FIXTURES:
+        return FIXTURES[host]
+    if host.endswith(".bandcamp.com"):
+        # Artist subdomains (e.g. daftpunk.bandcamp.com) all serve the item page fixture
+        return FIXTURES["bandcamp.com"]
+    return None
+
+
+def read_fixture(host: str) -> bytes:
+    path, _ = fixture_for_host(host)
+    with open(path, "rb") as f:
+        return f.read()
+
+
+class ReplayHandler(BaseHTTPRequestHandler):
+    """Answers /<host>/<path> with the recorded fixture of that host"""
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out as separate writes - without TCP_NODELAY small answers hit the 40ms delayed-ACK stall
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        host = self.path.lstrip("/").split("/", 1)[0].split("?", 1)[0]
+        fixture = fixture_for_host(host)
+        if fixture is None:
+            self.send_error(404, f"No fixture for {host}")
+            return
+        body = self.server.bodies.setdefault(host, read_fixture(host))
+        self.send_response(200)
+        self.send_header("Content-Type", fixture[1])
+        # No X-Discogs-Ratelimit headers: the governor would pace the benchmark to the real 60/min quota
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        with self.server.lock:
+            self.server.request_count += 1
+
+    def log_message(self, *args):
+        pass
+
+
+class ReplayServer:
+    """Threaded keep-alive HTTP server on an ephemeral localhost port"""
+
+    def __init__(self):
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), ReplayHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.bodies = {}
+        self.httpd.lock = threading.Lock()
+        self.httpd.request_count = 0
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.httpd.server_port}"
+
+    @property
+    def request_count(self) -> int:
+        return self.httpd.request_count
+
+    def start(self) -> "ReplayServer":
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="replay-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+class ReplayAdapter(PooledHTTPAdapter):
+    """Pooled adapter that sends every https request to the replay server instead of the real host"""
+
+    def __init__(self, base_url: str, config: Optional[HttpClientConfig] = None, stats: Optional[HttpStats] = None):
+        super().__init__(config or HttpClientConfig.from_env(), stats or HttpStats())
+        self.base_url = base_url
+
+    def send(self, request, **kwargs):
+        parts = urlsplit(request.url)
+        query = f"?{parts.query}" if parts.query else ""
+        request.url = f"{self.base_url}/{parts.hostname}{parts.path}{query}"
+        return super().send(request, **kwargs)
+
+
+def provider_sessions():
+    """Every shared session a provider uses (created through their own getters so headers stay intact)"""
+    from api_search import get_discogs_session, get_itunes_session
+    from scrape_search import get_scrape_session
+    return [get_scrape_session(), get_itunes_session(), get_discogs_session()]
+
+
+@contextmanager
+def replay_provider_traffic(server: ReplayServer):
+    """Route the shared provider sessions through the replay server for the duration of the block"""
+    saved = [(session, session.adapters["https://"]) for session in provider_sessions()]
+    for session, _ in saved:
+        session.mount("https://", ReplayAdapter(server.base_url))
+    try:
+        yield server
+    finally:
+        for session, adapter in saved:
+            session.mount("https://", adapter)
@@ -0,0 +1,295 @@
+"""
+Offline benchmark suite - replays recorded pages/API answers through a local stand-in server
+
+    python -m benchmarks.run                    # measure and compare against benchmarks/baseline.json
+    python -m benchmarks.run --update-baseline  # store the current numbers as new baseline
+    python -m benchmarks.run --runs 50 --tolerance 0.2 --json results.json
+
+Measures per-provider parse latency, per-provider and end-to-end orchestration latency over HTTP,
+tracemalloc peak memory, concurrent search throughput and text normalization/ranking on large
+candidate lists. Exit code 1 flags a regression.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+# Runnable as `python benchmarks/run.py` as well as `python -m benchmarks.run`
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.replay_server import BENCH_DIR, ReplayServer, read_fixture, replay_provider_traffic
+
+BASELINE_PATH = os.path.join(BENCH_DIR, "baseline.json")
+
+# Differences below these floors are noise, not regressions
+ABSOLUTE_FLOORS = {"_ms": 1.0, "_kb": 64.0, "_per_s": 0.5}
+
+# Only medians, memory and throughput gate a run - p95/mean are reported but too noisy on shared machines
+GATED_METRICS = ("p50_ms", "_kb", "_per_s")
+
+# Candidate strings of the normalization benchmark
+NORMALIZE_CANDIDATES = 10000
+
+
+def prepare_environment():
+    """Benchmarks must measure the real code path: no result cache, a dummy token, no quota pacing"""
+    os.environ["GEMFINDER_CACHE_DISABLED"] = "1"
+    # Replayed answers must not end up in the user's release index
+    os.environ["GEMFINDER_INDEX_DISABLED"] = "1"
+    os.environ.setdefault("DISCOGS_USER_TOKEN", "benchmark-token")
+    os.environ["GEMFINDER_DISCOGS_RATE_LIMIT"] = "1000000"
+    # Per-search INFO lines would flood the report (and cost time) - only problems are logged
+    os.environ.setdefault("GEMFINDER_LOG_LEVEL", "WARNING")
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """Latency summary in milliseconds"""
+    ordered = sorted(samples)
+    p95_index = min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))
+    return {
+        "p50_ms": round(statistics.median(ordered) * 1000, 3),
+        "p95_ms": round(ordered[p95_index] * 1000, 3),
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 3),
+    }
+
+
+def time_calls(fn: Callable[[], object], runs: int, warmup: int = 2) -> List[float]:
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def peak_memory_kb(fn: Callable[[], object]) -> float:
+    """tracemalloc peak of one call (measured separately - tracing slows the timed runs down)"""
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return round(peak / 1024, 1)
+
+
+# —————————————————————————————
+# Suites
+# —————————————————————————————
+def parse_cases() -> Dict[str, Callable[[], object]]:
+    """Pure parsing of the recorded pages, no network"""
+    from scrape_search import (
+        parse_beatport_next_data, select_beatport_result, parse_traxsource_rows,
+        parse_revibed_marketplace, parse_bandcamp_price
+    )
+    from api_search import itunes_filter_result
+
+    pages = {host: read_fixture(host).decode("utf-8") for host in
+             ("www.beatport.com", "www.traxsource.com", "revibed.com", "bandcamp.com", "itunes.apple.com", "api.discogs.com")}
+
+    def beatport():
+        tracks = parse_beatport_next_data(pages["www.beatport.com"])
+        return select_beatport_result(tracks, "Daft Punk", "One More Time", "", 0.0)
+
+    def itunes():
+        results = json.loads(pages["itunes.apple.com"])["results"]
+        return [r for r in results if itunes_filter_result("Daft Punk", "One More Time", r.get("trackName", ""),
+                                                           r.get("artistName", ""), r.get("collectionName", ""))]
+
+    return {
+        "beatport": beatport,
+        "traxsource": lambda: parse_traxsource_rows(pages["www.traxsource.com"]),
+        "revibed": lambda: parse_revibed_marketplace(pages["revibed.com"]),
+        "bandcamp": lambda: parse_bandcamp_price(pages["bandcamp.com"]),
+        "itunes": itunes,
+        "discogs": lambda: json.loads(pages["api.discogs.com"]),
+    }
+
+
+def scoring_cases(size: int = NORMALIZE_CANDIDATES) -> Dict[str, Callable[[], object]]:
+    """Text normalization and relevance ranking on large candidate lists (no network)"""
+    from scrape_search import parse_beatport_next_data
+    from relevance import RelevanceScorer
+    from text_normalize import clear_cache, normalize_many
+
+    tracks = parse_beatport_next_data(read_fixture("www.beatport.com").decode("utf-8"))
+    # Distinct strings (numbered, some accented) - the cold case must not be served by the memo cache
+    texts = [f"{t['title']} {t['artist']} Café Ólafur #{i}" if i % 3 == 0 else f"{t['title']} {t['artist']} #{i}"
+             for i, t in ((i, tracks[i % len(tracks)]) for i in range(size))]
+    candidates = [(t["title"], t["artist"], t["album"]) for t in tracks[:50]]
+    scorer = RelevanceScorer("Daft Punk", "One More Time")
+
+    def normalize_cold():
+        clear_cache()
+        return normalize_many(texts)
+
+    return {
+        "normalize_cold": normalize_cold,
+        "normalize_warm": lambda: normalize_many(texts),
+        "rank_50": lambda: scorer.rank(candidates),
+    }
+
+
+def provider_cases():
+    """One provider search over HTTP against the replay server"""
+    from providers import (
+        SearchCriteria, ItunesProvider, BeatportProvider, TraxsourceProvider, DiscogsProvider, RevibedProvider
+    )
+    from scrape_search import fetch_bandcamp_price
+
+    criteria = SearchCriteria(title="One More Time", artist="Daft Punk")
+    cases = {provider.name.lower(): (lambda p=provider: p.search(criteria)) for provider in
+             (ItunesProvider(), BeatportProvider(), TraxsourceProvider(), DiscogsProvider(), RevibedProvider())}
+    # The Bandcamp search page needs a browser - only its (HTTP) item price lookup is replayable
+    cases["bandcamp_price"] = lambda: fetch_bandcamp_price("https://daftpunk.bandcamp.com/track/one-more-time")
+    return cases
+
+
+def replayable_providers():
+    from providers import ItunesProvider, BeatportProvider, TraxsourceProvider, DiscogsProvider, RevibedProvider
+    return [ItunesProvider(), BeatportProvider(), TraxsourceProvider(), DiscogsProvider(), RevibedProvider()]
+
+
+def run_suite(runs: int = 20, concurrency: int = 4) -> Dict:
+    from providers import SearchCriteria, SearchManager
+
+    results = {"parse": {}, "scoring": {}, "provider": {}, "orchestration": {}, "throughput": {}, "memory": {}}
+
+    for name, fn in parse_cases().items():
+        results["parse"][name] = summarize(time_calls(fn, runs))
+        results["memory"][f"parse_{name}_peak_kb"] = peak_memory_kb(fn)
+
+    scoring = scoring_cases()
+    for name, fn in scoring.items():
+        results["scoring"][name] = summarize(time_calls(fn, runs))
+    # Cold normalization throughput: distinct candidate strings per second
+    cold_s = results["scoring"]["normalize_cold"]["p50_ms"] / 1000
+    results["throughput"]["normalized_strings_per_s"] = round(NORMALIZE_CANDIDATES / cold_s, 2) if cold_s else 0.0
+
+    with ReplayServer() as server, replay_provider_traffic(server):
+        for name, fn in provider_cases().items():
+            results["provider"][name] = summarize(time_calls(fn, runs))
+
+        manager = SearchManager(replayable_providers())
+        criteria = SearchCriteria(title="One More Time", artist="Daft Punk")
+        search = lambda: list(manager.stream_sync(criteria))
+        results["orchestration"]["all_providers"] = summarize(time_calls(search, runs))
+        results["memory"]["orchestration_peak_kb"] = peak_memory_kb(search)
+
+        # Distinct catalog values keep single-flight from merging the concurrent searches
+        counter = iter(range(10 ** 9))
+        def distinct_search():
+            return manager.run_all(SearchCriteria(title="One More Time", artist="Daft Punk",
+                                                  catalog=f"BENCH-{next(counter)}"))
+        total = runs * concurrency
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            list(executor.map(lambda _: distinct_search(), range(total)))
+        elapsed = time.perf_counter() - start
+        results["throughput"]["searches_per_s"] = round(total / elapsed, 2)
+        results["throughput"]["concurrency"] = concurrency
+        results["throughput"]["http_requests"] = server.request_count
+
+    return results
+
+
+# —————————————————————————————
+# Baseline comparison
+# —————————————————————————————
+def flatten(results: Dict, prefix: str = "") -> Dict[str, float]:
+    flat = {}
+    for key, value in results.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{name}."))
+        elif isinstance(value, (int, float)) and name.endswith(GATED_METRICS):
+            flat[name] = float(value)
+    return flat
+
+
+def compare_to_baseline(current: Dict, baseline: Dict, tolerance: float = 0.3) -> List[Dict]:
+    """
+    Regressions of current vs. baseline: median latencies/memory above baseline*(1+tolerance),
+    throughput below baseline*(1-tolerance); differences under the absolute noise floors are ignored
+    """
+    regressions = []
+    current_flat, baseline_flat = flatten(current), flatten(baseline)
+    for name, old in baseline_flat.items():
+        new = current_flat.get(name)
+        if new is None:
+            continue
+        suffix = next(s for s in ABSOLUTE_FLOORS if name.endswith(s))
+        if abs(new - old) < ABSOLUTE_FLOORS[suffix]:
+            continue
+        higher_is_better = suffix == "_per_s"
+        regressed = new < old * (1 - tolerance) if higher_is_better else new > old * (1 + tolerance)
+        if regressed:
+            regressions.append({"metric": name, "baseline": old, "current": new,
+                                "change": round((new - old) / old * 100, 1) if old else None})
+    return regressions
+
+
+def print_report(results: Dict, regressions: List[Dict]):
+    print("\n📊 GemFinder offline benchmarks")
+    for section in ("parse", "scoring", "provider", "orchestration"):
+        for name, stats in results.get(section, {}).items():
+            print(f"  {section:<13} {name:<15} p50 {stats['p50_ms']:>9.3f} ms   p95 {stats['p95_ms']:>9.3f} ms")
+    throughput = results["throughput"]
+    print(f"  throughput    {throughput['searches_per_s']:.2f} searches/s at concurrency {throughput['concurrency']}")
+    if "normalized_strings_per_s" in throughput:
+        print(f"  throughput    {throughput['normalized_strings_per_s']:.0f} normalized strings/s (cold cache)")
+    for name, value in results["memory"].items():
+        print(f"  memory        {name:<32} {value:>9.1f} KB")
+    if regressions:
+        print(f"\n❌ {len(regressions)} regression(s):")
+        for r in regressions:
+            print(f"  {r['metric']}: {r['baseline']} -> {r['current']} ({r['change']:+}%)")
+    else:
+        print("\n✅ No regressions against baseline")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="GemFinder offline benchmark suite")
+    parser.add_argument("--runs", type=int, default=20, help="Timed runs per case")
+    parser.add_argument("--concurrency", type=int, default=4, help="Parallel searches for the throughput run")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="Baseline JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.3, help="Allowed relative slowdown (0.3 = 30%%)")
+    parser.add_argument("--update-baseline", action="store_true", help="Write the results as new baseline")
+    parser.add_argument("--json", help="Also write the raw results to this file")
+    args = parser.parse_args(argv)
+    prepare_environment()
+
+    # Provider progress goes through logging (WARNING and up, see prepare_environment)
+    results = run_suite(args.runs, args.concurrency)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    if args.update_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+            f.write("\n")
+        print_report(results, [])
+        print(f"💾 Baseline written to {args.baseline}")
+        return 0
+
+    regressions = []
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare_to_baseline(results, json.load(f), args.tolerance)
+    else:
+        print(f"⚠️ No baseline at {args.baseline} - run with --update-baseline first")
+    print_report(results, regressions)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,7 +6,6 @@ Designed to handle anti-bot measures, scaling, and future challenges
 import time
 import random
 import json
-import logging
 from typing import List, Dict, Optional, Union
 from dataclasses import dataclass, asdict
 from urllib.parse import urljoin, quote
@@ -20,6 +19,8 @@ from selenium.common.exceptions import TimeoutException, NoSuchElementException
 import threading
 from functools import wraps
 import hashlib
+from driver_pool import get_driver_pool, is_driver_alive
+from logging_config import get_logger
 
 
 # Configuration class for easy maintenance
@@ -61,14 +62,60 @@ class ScraperConfig:
     max_concurrent_sessions: int = 3
 
 
+class SharedTTLCache:
+    """Thread-safe TTL cache that several scraper instances (and threads) can share"""
+    
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, key: str, ttl: float) -> Optional[Dict]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                data, timestamp = entry
+                if time.time() - timestamp < ttl:
+                    self.hits += 1
+                    return data
+                del self._entries[key]
+            self.misses += 1
+            return None
+    
+    def set(self, key: str, data: Dict):
+        with self._lock:
+            self._entries[key] = (data, time.time())
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+    
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+
+# Marketplace results shared by all scrapers from get_discogs_scraper()
+_marketplace_cache = SharedTTLCache()
+
+
+def covers_max_offers(cached_result: Dict, max_offers: int) -> bool:
+    """Whether a cached marketplace result holds enough offers ('max_offers': None = all offers were read)"""
+    if 'max_offers' not in cached_result:
+        return False
+    limit = cached_result['max_offers']
+    return limit is None or limit >= max_offers
+
+
 class DiscogsScraper:
     """Production-ready Discogs marketplace scraper"""
     
-    def __init__(self, config: Optional[ScraperConfig] = None):
+    def __init__(self, config: Optional[ScraperConfig] = None, cache: Optional[SharedTTLCache] = None):
         self.config = config or ScraperConfig()
         self.session_lock = threading.Lock()
         self.active_sessions = 0
-        self.cache = {}
+        self.cache = cache if cache is not None else SharedTTLCache()
         self.setup_logging()
         
         # User agent rotation for anti-bot measures
@@ -114,23 +161,20 @@ class DiscogsScraper:
     
     def setup_logging(self):
         """Setup logging for debugging and monitoring"""
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler('discogs_scraper.log'),
-                logging.StreamHandler()
-            ]
-        )
-        self.logger = logging.getLogger(__name__)
+        # Levels, format and an optional log file come from logging_config (GEMFINDER_LOG_*)
+        self.logger = get_logger(__name__)
+    
+    def wait_rate_limit(self):
+        """Random delay between requests to Discogs"""
+        if self.config.use_random_delays:
+            delay = random.uniform(self.config.min_delay, self.config.max_delay)
+            time.sleep(delay)
     
     def rate_limit_decorator(func):
         """Decorator to apply rate limiting"""
         @wraps(func)
         def wrapper(self, *args, **kwargs):
-            if self.config.use_random_delays:
-                delay = random.uniform(self.config.min_delay, self.config.max_delay)
-                time.sleep(delay)
+            self.wait_rate_limit()
             return func(self, *args, **kwargs)
         return wrapper
     
@@ -144,19 +188,15 @@ class DiscogsScraper:
         if not self.config.enable_cache:
             return None
             
-        if cache_key in self.cache:
-            data, timestamp = self.cache[cache_key]
-            if time.time() - timestamp < self.config.cache_ttl:
-                self.logger.info(f"Cache hit for key: {cache_key[:8]}...")
-                return data
-            else:
-                del self.cache[cache_key]
-        return None
+        data = self.cache.get(cache_key, self.config.cache_ttl)
+        if data is not None:
+            self.logger.debug("Cache hit for key: %s...", cache_key[:8])
+        return data
     
     def set_cache(self, cache_key: str, data: Dict):
         """Store data in cache"""
         if self.config.enable_cache:
-            self.cache[cache_key] = (data, time.time())
+            self.cache.set(cache_key, data)
     
     def create_driver(self) -> webdriver.Chrome:
         """Create a Chrome WebDriver with anti-bot measures"""
@@ -201,7 +241,7 @@ class DiscogsScraper:
             
             return driver
         except Exception as e:
-            self.logger.error(f"Failed to create driver: {e}")
+            self.logger.error("Failed to create driver: %s", e)
             raise
     
     def find_element_with_fallback(self, driver, selectors: List[str], parent=None) -> Optional:
@@ -250,7 +290,6 @@ class DiscogsScraper:
             document.dispatchEvent(event);
         """)
     
-    @rate_limit_decorator
     def scrape_marketplace_offers(self, release_id: str, max_offers: Optional[int] = None) -> Dict:
         """
         Scrape marketplace offers for a Discogs release
@@ -263,12 +302,16 @@ class DiscogsScraper:
             Dictionary with offers and metadata
         """
         max_offers = max_offers or self.config.max_offers_per_release
-        cache_key = self.get_cache_key(release_id=release_id, max_offers=max_offers)
+        # Offers (and shipping) depend on the buyer country; one entry serves any smaller max_offers
+        cache_key = self.get_cache_key(release_id=str(release_id), country=self.config.user_country)
         
-        # Check cache first
+        # Check cache first - before the rate-limit delay, a hit must return instantly
         cached_result = self.get_from_cache(cache_key)
-        if cached_result:
-            return cached_result
+        if cached_result and covers_max_offers(cached_result, max_offers):
+            offers = cached_result['offers'][:max_offers]
+            return {**cached_result, 'offers': offers, 'total_offers': len(offers), 'cached': True}
+        
+        self.wait_rate_limit()
         
         # Check concurrent session limit
         with self.session_lock:
@@ -277,13 +320,15 @@ class DiscogsScraper:
                 time.sleep(random.uniform(5, 10))
             self.active_sessions += 1
         
-        driver = None
+        pooled = None
         try:
-            driver = self.create_driver()
+            # Borrow a warm browser from the shared pool instead of starting Chrome per release
+            pooled = get_driver_pool("discogs_marketplace", factory=self.create_driver).acquire()
+            driver = pooled.driver
             # Include user country for localized shipping calculations
             marketplace_url = f"https://www.discogs.com/sell/list?release_id={release_id}&ev=rb&country={self.config.user_country}"
             
-            self.logger.info(f"Scraping offers for release {release_id}")
+            self.logger.info("Scraping offers for release %s", release_id)
             driver.get(marketplace_url)
             
             # Wait for page to load and simulate human behavior
@@ -299,13 +344,15 @@ class DiscogsScraper:
             )
             
             if not offer_elements:
-                self.logger.warning(f"No offers found for release {release_id}")
+                self.logger.warning("No offers found for release %s", release_id)
                 result = {
                     'release_id': release_id,
                     'offers': [],
                     'total_offers': 0,
                     'scraped_at': time.time(),
-                    'status': 'no_offers_found'
+                    'status': 'no_offers_found',
+                    # No offers at all - valid for any requested number (None = unlimited)
+                    'max_offers': None
                 }
                 self.set_cache(cache_key, result)
                 return result
@@ -317,7 +364,7 @@ class DiscogsScraper:
                     if offer_data:
                         offers.append(offer_data)
                 except Exception as e:
-                    self.logger.warning(f"Failed to extract offer {i}: {e}")
+                    self.logger.warning("Failed to extract offer %s: %s", i, e)
                     continue
             
             result = {
@@ -325,16 +372,18 @@ class DiscogsScraper:
                 'offers': offers,
                 'total_offers': len(offers),
                 'scraped_at': time.time(),
-                'status': 'success'
+                'status': 'success',
+                # All offers were read if fewer than requested were listed (None = unlimited)
+                'max_offers': max_offers if len(offer_elements) > max_offers else None
             }
             
             self.set_cache(cache_key, result)
-            self.logger.info(f"Successfully scraped {len(offers)} offers for release {release_id}")
+            self.logger.info("Successfully scraped %s offers for release %s", len(offers), release_id)
             
             return result
             
         except TimeoutException:
-            self.logger.error(f"Timeout scraping release {release_id}")
+            self.logger.error("Timeout scraping release %s", release_id)
             return {
                 'release_id': release_id,
                 'offers': [],
@@ -343,7 +392,7 @@ class DiscogsScraper:
                 'status': 'timeout_error'
             }
         except Exception as e:
-            self.logger.error(f"Error scraping release {release_id}: {e}")
+            self.logger.error("Error scraping release %s: %s", release_id, e)
             return {
                 'release_id': release_id,
                 'offers': [],
@@ -353,8 +402,8 @@ class DiscogsScraper:
                 'error': str(e)
             }
         finally:
-            if driver:
-                driver.quit()
+            if pooled:
+                get_driver_pool("discogs_marketplace").release(pooled, healthy=is_driver_alive(pooled.driver))
             with self.session_lock:
                 self.active_sessions -= 1
     
@@ -403,7 +452,7 @@ class DiscogsScraper:
                     offer_id = buy_button.get_attribute('data-offer-id') or buy_button.get_attribute('data-item-id')
                     if offer_id:
                         offer_url = f"https://www.discogs.com/sell/item/{offer_id}"
-                        self.logger.info(f"Found offer URL via button data-offer-id: {offer_url}")
+                        self.logger.debug("Found offer URL via button data-offer-id: %s", offer_url)
                 except NoSuchElementException:
                     pass
                 
@@ -414,7 +463,7 @@ class DiscogsScraper:
                         offer_url = marketplace_link.get_attribute('href')
                         if offer_url and not offer_url.startswith('http'):
                             offer_url = f"https://www.discogs.com{offer_url}"
-                        self.logger.info(f"Found offer URL via marketplace link: {offer_url}")
+                        self.logger.debug("Found offer URL via marketplace link: %s", offer_url)
                     except NoSuchElementException:
                         pass
                 
@@ -425,7 +474,7 @@ class DiscogsScraper:
                         action = form.get_attribute('action')
                         if action:
                             offer_url = action if action.startswith('http') else f"https://www.discogs.com{action}"
-                            self.logger.info(f"Found offer URL via form action: {offer_url}")
+                            self.logger.debug("Found offer URL via form action: %s", offer_url)
                     except NoSuchElementException:
                         pass
                         
@@ -438,13 +487,13 @@ class DiscogsScraper:
                             offer_id = offer_element.get_attribute(attr)
                             if offer_id and offer_id.isdigit():
                                 offer_url = f"https://www.discogs.com/sell/item/{offer_id}"
-                                self.logger.info(f"Found offer URL via {attr}: {offer_url}")
+                                self.logger.debug("Found offer URL via %s: %s", attr, offer_url)
                                 break
                     except:
                         pass
                         
             except Exception as e:
-                self.logger.warning(f"Error extracting offer URL: {e}")
+                self.logger.warning("Error extracting offer URL: %s", e)
                 offer_url = ''
             
             offer['offer_url'] = offer_url
@@ -455,7 +504,7 @@ class DiscogsScraper:
             return offer
             
         except Exception as e:
-            self.logger.warning(f"Failed to extract offer data: {e}")
+            self.logger.warning("Failed to extract offer data: %s", e)
             return None
     
     def bulk_scrape_offers(self, release_ids: List[str], max_offers_per_release: int = 10) -> Dict[str, Dict]:
@@ -472,7 +521,7 @@ class DiscogsScraper:
         results = {}
         
         for i, release_id in enumerate(release_ids):
-            self.logger.info(f"Processing release {i+1}/{len(release_ids)}: {release_id}")
+            self.logger.info("Processing release %s/%s: %s", i+1, len(release_ids), release_id)
             
             try:
                 result = self.scrape_marketplace_offers(release_id, max_offers_per_release)
@@ -481,11 +530,11 @@ class DiscogsScraper:
                 # Add longer delay between releases to be respectful
                 if i < len(release_ids) - 1:
                     delay = random.uniform(self.config.max_delay, self.config.max_delay * 2)
-                    self.logger.info(f"Waiting {delay:.1f}s before next release...")
+                    self.logger.info("Waiting %.1fs before next release...", delay)
                     time.sleep(delay)
                     
             except Exception as e:
-                self.logger.error(f"Failed to process release {release_id}: {e}")
+                self.logger.error("Failed to process release %s: %s", release_id, e)
                 results[release_id] = {
                     'release_id': release_id,
                     'offers': [],
@@ -539,7 +588,7 @@ class DiscogsScraper:
             }
             
         except Exception as e:
-            self.logger.error(f"Error in search_and_scrape: {e}")
+            self.logger.error("Error in search_and_scrape: %s", e)
             return {
                 'search_results': [],
                 'marketplace_data': {},
@@ -594,6 +643,28 @@ def create_discogs_scraper(headless: bool = True, enable_cache: bool = True,
     return DiscogsScraper(config)
 
 
+_scrapers: Dict[str, DiscogsScraper] = {}
+_scrapers_lock = threading.Lock()
+
+
+def get_discogs_scraper(user_country: Optional[str] = None) -> DiscogsScraper:
+    """
+    Long-lived scraper per buyer country (process-wide registry)
+    
+    All registry scrapers share one marketplace cache, so a release opened by one
+    user is answered from memory for everybody else within cache_ttl.
+    """
+    country = (user_country or ScraperConfig.user_country).upper()
+    with _scrapers_lock:
+        scraper = _scrapers.get(country)
+        if scraper is None:
+            config = ScraperConfig(headless=True, enable_cache=True, use_proxies=False,
+                                   proxy_list=[], user_country=country)
+            scraper = DiscogsScraper(config, cache=_marketplace_cache)
+            _scrapers[country] = scraper
+        return scraper
+
+
 # Integration function for the existing codebase
 def scrape_discogs_offers_integrated(release_id: str, max_offers: int = 10) -> List[Dict]:
     """
@@ -611,7 +682,7 @@ if __name__ == "__main__":
     
     # Test scraping offers for a release
     result = scraper.scrape_marketplace_offers("12345", max_offers=5)
-    print(json.dumps(result, indent=2))
+    scraper.logger.info("Marketplace result: %s", result)
     
     # Test combined search and scrape
     combined_result = scraper.search_and_scrape(
@@ -619,4 +690,4 @@ if __name__ == "__main__":
         track="vintage track", 
         max_offers=5
     )
-    print(json.dumps(combined_result, indent=2))
\ No newline at end of file
+    scraper.logger.info("Combined result: %s", combined_result)
\ No newline at end of file
@@ -0,0 +1,364 @@
+"""
+Shared pool of warm Chrome drivers for all Selenium scrapers
+Scrapers borrow a running browser instead of launching (and quitting) Chrome per search
+"""
+import os
+import threading
+import time
+import atexit
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+from tracing import span
+
+
+@dataclass
+class DriverPoolConfig:
+    """Configuration for a driver pool (defaults can be overridden via environment)"""
+    # Maximum number of browsers (idle + borrowed) per pool
+    max_size: int = 4
+
+    # Recycle a browser after this many borrows to keep memory usage flat
+    max_uses: int = 50
+
+    # Quit browsers that were not borrowed for this many seconds
+    idle_timeout: float = 300.0
+
+    # How long a caller waits for a free browser before giving up
+    acquire_timeout: float = 30.0
+
+    @classmethod
+    def from_env(cls) -> "DriverPoolConfig":
+        config = cls()
+        config.max_size = int(os.environ.get("GEMFINDER_DRIVER_POOL_SIZE", config.max_size))
+        config.max_uses = int(os.environ.get("GEMFINDER_DRIVER_MAX_USES", config.max_uses))
+        config.idle_timeout = float(os.environ.get("GEMFINDER_DRIVER_IDLE_TIMEOUT", config.idle_timeout))
+        config.acquire_timeout = float(os.environ.get("GEMFINDER_DRIVER_ACQUIRE_TIMEOUT", config.acquire_timeout))
+        return config
+
+
+class DriverPoolTimeout(Exception):
+    """Raised when no browser becomes available within acquire_timeout"""
+
+
+@dataclass
+class PooledDriver:
+    """A browser owned by the pool plus its bookkeeping"""
+    driver: object
+    created_at: float = field(default_factory=time.time)
+    last_used: float = field(default_factory=time.time)
+    uses: int = 0
+    timeouts: object = None
+
+
+def is_driver_alive(driver) -> bool:
+    """Cheap health check - a crashed browser or chromedriver fails this round-trip"""
+    try:
+        driver.current_window_handle
+        return True
+    except Exception:
+        return False
+
+
+def _quit_driver(driver):
+    try:
+        driver.quit()
+    except Exception:
+        pass
+
+
+def _quit_drivers(pooled_drivers: List[PooledDriver]):
+    for pooled in pooled_drivers:
+        _quit_driver(pooled.driver)
+
+
+class DriverPool:
+    """Thread-safe pool of warm WebDriver instances created by a factory"""
+
+    def __init__(self, factory: Callable[[], object], config: Optional[DriverPoolConfig] = None, name: str = "default"):
+        self.factory = factory
+        self.config = config or DriverPoolConfig.from_env()
+        self.name = name
+        self._idle: List[PooledDriver] = []
+        self._total = 0
+        self._closed = False
+        self._cond = threading.Condition(threading.Lock())
+        self._reaper = None
+        self.stats_counters = {"created": 0, "reused": 0, "recycled": 0, "crashed": 0, "expired": 0}
+
+    # —————————————————————————————
+    # Borrow / return
+    # —————————————————————————————
+    def acquire(self, timeout: Optional[float] = None) -> PooledDriver:
+        """Take a healthy idle browser or start a new one if the pool has room"""
+        timeout = self.config.acquire_timeout if timeout is None else timeout
+        deadline = time.time() + timeout
+
+        while True:
+            candidate = None
+            expired = []
+            with self._cond:
+                if self._closed:
+                    raise RuntimeError(f"Driver pool '{self.name}' is closed")
+                expired = self._pop_expired_locked()
+
+                if self._idle:
+                    # LIFO: the most recently used browser has the warmest caches
+                    candidate = self._idle.pop()
+                elif self._total < self.config.max_size:
+                    # Reserve the slot before the (slow) browser start outside the lock
+                    self._total += 1
+                else:
+                    remaining = deadline - time.time()
+                    if remaining <= 0:
+                        raise DriverPoolTimeout(
+                            f"No browser available in pool '{self.name}' after {timeout:.1f}s"
+                        )
+                    self._cond.wait(remaining)
+                    continue
+            # Quitting Chrome can take seconds - never while other threads wait for the lock
+            _quit_drivers(expired)
+
+            if candidate is not None:
+                if is_driver_alive(candidate.driver):
+                    candidate.last_used = time.time()
+                    with self._cond:
+                        self.stats_counters["reused"] += 1
+                    return candidate
+                # Browser died while idle - drop it and try again
+                self._discard(candidate, reason="crashed")
+                continue
+
+            try:
+                driver = self.factory()
+            except Exception:
+                with self._cond:
+                    self._total -= 1
+                    self._cond.notify()
+                raise
+
+            pooled = PooledDriver(driver=driver)
+            try:
+                pooled.timeouts = driver.timeouts
+            except Exception:
+                pooled.timeouts = None
+            with self._cond:
+                self.stats_counters["created"] += 1
+            self._ensure_reaper()
+            return pooled
+
+    def release(self, pooled: PooledDriver, healthy: bool = True):
+        """Return a browser; broken or worn-out browsers are quit instead of re-pooled"""
+        pooled.uses += 1
+        pooled.last_used = time.time()
+
+        if not healthy:
+            self._discard(pooled, reason="crashed")
+            return
+        if pooled.uses >= self.config.max_uses:
+            self._discard(pooled, reason="recycled")
+            return
+        if not self._reset(pooled):
+            self._discard(pooled, reason="crashed")
+            return
+
+        with self._cond:
+            closed = self._closed
+            if closed:
+                self._total -= 1
+            else:
+                self._idle.append(pooled)
+                self._cond.notify()
+        if closed:
+            _quit_driver(pooled.driver)
+
+    @contextmanager
+    def borrow(self, timeout: Optional[float] = None):
+        """Context manager yielding a warm driver - always returned to the pool"""
+        with span("driver_acquire", pool=self.name):
+            pooled = self.acquire(timeout)
+        try:
+            yield pooled.driver
+        except BaseException:
+            # Scraper errors (timeouts, missing elements) are normal - only drop dead browsers
+            self.release(pooled, healthy=is_driver_alive(pooled.driver))
+            raise
+        else:
+            self.release(pooled)
+
+    # —————————————————————————————
+    # Maintenance
+    # —————————————————————————————
+    def _reset(self, pooled: PooledDriver) -> bool:
+        """Bring a browser back into a neutral state for the next borrower"""
+        driver = pooled.driver
+        try:
+            handles = driver.window_handles
+            if len(handles) > 1:
+                # Close tabs a scraper left open (e.g. price-check tabs)
+                for handle in handles[1:]:
+                    driver.switch_to.window(handle)
+                    driver.close()
+                driver.switch_to.window(handles[0])
+            if pooled.timeouts is not None:
+                # Scrapers tweak page-load/implicit timeouts - restore the profile defaults
+                driver.timeouts = pooled.timeouts
+            return True
+        except Exception:
+            return False
+
+    def _discard(self, pooled: PooledDriver, reason: str):
+        _quit_driver(pooled.driver)
+        with self._cond:
+            self._total -= 1
+            self.stats_counters[reason] = self.stats_counters.get(reason, 0) + 1
+            self._cond.notify()
+
+    def _pop_expired_locked(self) -> List[PooledDriver]:
+        """Take idle browsers past idle_timeout out of the pool (caller holds the lock, then quits them)"""
+        now = time.time()
+        keep, expired = [], []
+        for pooled in self._idle:
+            if now - pooled.last_used > self.config.idle_timeout:
+                expired.append(pooled)
+                self._total -= 1
+                self.stats_counters["expired"] += 1
+            else:
+                keep.append(pooled)
+        self._idle = keep
+        if expired:
+            self._cond.notify_all()
+        return expired
+
+    def reap_idle(self):
+        with self._cond:
+            expired = self._pop_expired_locked()
+        _quit_drivers(expired)
+
+    def _ensure_reaper(self):
+        """Start a background thread so idle browsers are quit even without traffic"""
+        interval = max(1.0, self.config.idle_timeout / 2)
+
+        def _run():
+            while True:
+                time.sleep(interval)
+                with self._cond:
+                    if self._closed:
+                        return
+                    expired = self._pop_expired_locked()
+                _quit_drivers(expired)
+
+        with self._cond:
+            if self._reaper is not None:
+                return
+            self._reaper = threading.Thread(target=_run, name=f"driver-pool-reaper-{self.name}", daemon=True)
+            self._reaper.start()
+
+    def close(self):
+        """Quit all idle browsers; borrowed ones are quit when returned"""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._total -= len(idle)
+            self._cond.notify_all()
+        _quit_drivers(idle)
+
+    def get_stats(self) -> Dict:
+        with self._cond:
+            return {
+                "name": self.name,
+                "idle": len(self._idle),
+                "in_use": self._total - len(self._idle),
+                "max_size": self.config.max_size,
+                **self.stats_counters,
+            }
+
+
+# —————————————————————————————
+# Chrome profiles used by the scrapers
+# —————————————————————————————
+def create_chrome_driver(profile: str = "standard"):
+    """
+    Create a headless Chrome for one of the scraper profiles:
+      standard    - JS/CSS enabled (Beatport, Traxsource)
+      lightweight - DOM-ready loading, images blocked (Bandcamp, Revibed)
+    """
+    from selenium import webdriver
+
+    options = webdriver.ChromeOptions()
+    options.add_argument('--headless=new')
+    options.add_argument('--no-sandbox')
+    options.add_argument('--disable-dev-shm-usage')
+    options.add_argument('--disable-gpu')
+
+    if profile == "lightweight":
+        # Performance optimizations for faster loading
+        options.add_argument('--disable-features=VizDisplayCompositor')
+        options.add_argument('--disable-background-timer-throttling')
+        options.add_argument('--disable-renderer-backgrounding')
+        options.add_argument('--disable-backgrounding-occluded-windows')
+        options.add_argument('--disable-ipc-flooding-protection')
+        options.add_argument('--dns-prefetch-disable')
+        options.add_argument('--disable-default-apps')
+
+        # DOM-ready strategy - stop at DOM complete, not all resources
+        options.add_argument('--page-load-strategy=eager')
+
+        # Block images (we only need URLs from HTML)
+        options.add_argument('--blink-settings=imagesEnabled=false')
+        options.add_argument('--disable-extensions')
+        options.add_experimental_option("prefs", {
+            "profile.managed_default_content_settings.images": 2,  # Block images
+            "profile.default_content_setting_values.notifications": 2,  # Block notifications
+            "profile.default_content_settings.popups": 0  # Block popups
+        })
+
+    driver = webdriver.Chrome(options=options)
+
+    if profile == "lightweight":
+        driver.implicitly_wait(2)
+        driver.set_page_load_timeout(5)
+
+    return driver
+
+
+_pools: Dict[str, DriverPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_driver_pool(name: str = "standard", factory: Optional[Callable[[], object]] = None,
+                    config: Optional[DriverPoolConfig] = None) -> DriverPool:
+    """Process-wide pool registry - one pool per browser profile"""
+    with _pools_lock:
+        pool = _pools.get(name)
+        if pool is None:
+            pool = DriverPool(factory or (lambda: create_chrome_driver(name)), config, name=name)
+            _pools[name] = pool
+        return pool
+
+
+@contextmanager
+def borrow_driver(name: str = "standard", factory: Optional[Callable[[], object]] = None,
+                  timeout: Optional[float] = None):
+    """Shortcut: `with borrow_driver("lightweight") as driver: ...`"""
+    with get_driver_pool(name, factory).borrow(timeout) as driver:
+        yield driver
+
+
+def get_all_pool_stats() -> List[Dict]:
+    with _pools_lock:
+        pools = list(_pools.values())
+    return [pool.get_stats() for pool in pools]
+
+
+def shutdown_driver_pools():
+    """Quit every pooled browser (called automatically at interpreter exit)"""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
+
+
+atexit.register(shutdown_driver_pools)
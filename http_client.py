@@ -0,0 +1,326 @@
+"""
+Shared HTTP client layer for all API and plain-HTTP scraping calls
+One pooled keep-alive session per service, retries with backoff and connection-reuse metrics
+Name resolution goes through a process-wide TTL DNS cache that prefers IPv4 - no global socket patching
+"""
+import os
+import sys
+import time
+import socket
+import threading
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import ConnectTimeoutError, NameResolutionError, NewConnectionError
+from urllib3.util.retry import Retry
+
+
+@dataclass
+class HttpClientConfig:
+    """Configuration for the shared HTTP sessions (defaults can be overridden via environment)"""
+    # Number of per-host connection pools kept per session
+    pool_connections: int = 10
+
+    # Keep-alive connections per host - matches the parallel search workers
+    pool_maxsize: int = 8
+
+    # Retries for connection errors and 429/5xx answers
+    retries: int = 2
+
+    # Exponential backoff between retries: backoff_factor * 2^(retry-1) seconds
+    backoff_factor: float = 0.3
+
+    # Never sleep longer than this for a single retry (also caps Retry-After)
+    max_backoff: float = 4.0
+
+    status_forcelist: Tuple[int, ...] = (429, 500, 502, 503, 504)
+
+    # Address family for new connections: "ipv4" avoids slow IPv6 attempts, "any" uses the system order
+    ip_family: str = "ipv4"
+
+    # How long resolved addresses are reused
+    dns_ttl: float = 300.0
+
+    @classmethod
+    def from_env(cls) -> "HttpClientConfig":
+        config = cls()
+        workers = int(os.environ.get("GEMFINDER_SEARCH_WORKERS", config.pool_maxsize))
+        config.pool_maxsize = int(os.environ.get("GEMFINDER_HTTP_POOL_SIZE", workers))
+        config.retries = int(os.environ.get("GEMFINDER_HTTP_RETRIES", config.retries))
+        config.backoff_factor = float(os.environ.get("GEMFINDER_HTTP_BACKOFF", config.backoff_factor))
+        config.max_backoff = float(os.environ.get("GEMFINDER_HTTP_MAX_BACKOFF", config.max_backoff))
+        config.ip_family = os.environ.get("GEMFINDER_HTTP_IP_FAMILY", config.ip_family).lower()
+        config.dns_ttl = float(os.environ.get("GEMFINDER_DNS_TTL", config.dns_ttl))
+        return config
+
+
+@dataclass
+class HttpStats:
+    """Thread-safe counters of one session - requests vs. newly opened connections"""
+    requests: int = 0
+    new_connections: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def count(self, counter: str):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            reused = max(0, self.requests - self.new_connections)
+            return {
+                "requests": self.requests,
+                "new_connections": self.new_connections,
+                "reused_connections": reused,
+                "reuse_rate": reused / self.requests if self.requests else 0.0,
+            }
+
+
+# —————————————————————————————
+# Name resolution
+# —————————————————————————————
+class DnsCache:
+    """
+    Thread-safe TTL cache of getaddrinfo results
+    With prefer_ipv4 only A records are asked for; IPv6-only hosts fall back to all families
+    """
+
+    def __init__(self, ttl: float = 300.0, prefer_ipv4: bool = True,
+                 resolver: Optional[Callable] = None):
+        self.ttl = ttl
+        self.prefer_ipv4 = prefer_ipv4
+        self.resolver = resolver or socket.getaddrinfo
+        self._entries: Dict[Tuple[str, int], Tuple[float, List]] = {}
+        self._lock = threading.Lock()
+        self.stats_counters = {"hits": 0, "misses": 0}
+
+    def resolve(self, host: str, port: int) -> List:
+        key = (host, port)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self.stats_counters["hits"] += 1
+                return entry[1]
+            self.stats_counters["misses"] += 1
+
+        # Lookup outside the lock - a slow resolver must not block other hosts
+        addresses = None
+        if self.prefer_ipv4:
+            try:
+                addresses = self.resolver(host, port, socket.AF_INET, socket.SOCK_STREAM)
+            except socket.gaierror:
+                addresses = None
+        if not addresses:
+            addresses = self.resolver(host, port, socket.AF_UNSPEC, socket.SOCK_STREAM)
+
+        with self._lock:
+            self._entries[key] = (time.time() + self.ttl, addresses)
+        return addresses
+
+    def invalidate(self, host: str, port: int):
+        with self._lock:
+            self._entries.pop((host, port), None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def create_connection(self, address: Tuple[str, int], timeout=None, source_address=None,
+                          socket_options=None) -> socket.socket:
+        """Like urllib3's create_connection, but with cached addresses in preferred-family order"""
+        host, port = address
+        if host.startswith("["):
+            host = host.strip("[]")
+        err = None
+        for af, socktype, proto, _, sockaddr in self.resolve(host, port):
+            sock = None
+            try:
+                sock = socket.socket(af, socktype, proto)
+                for option in socket_options or ():
+                    sock.setsockopt(*option)
+                if timeout is not None:
+                    sock.settimeout(timeout)
+                if source_address:
+                    sock.bind(source_address)
+                sock.connect(sockaddr)
+                return sock
+            except OSError as e:
+                err = e
+                if sock is not None:
+                    sock.close()
+        # Every cached address failed - the host may have moved, resolve again next time
+        self.invalidate(host, port)
+        if err is not None:
+            raise err
+        raise OSError("getaddrinfo returns an empty list")
+
+
+_dns_cache: Optional[DnsCache] = None
+_dns_cache_lock = threading.Lock()
+
+
+def get_dns_cache(config: Optional[HttpClientConfig] = None) -> DnsCache:
+    """Process-wide resolver cache shared by all sessions"""
+    global _dns_cache
+    with _dns_cache_lock:
+        if _dns_cache is None:
+            config = config or HttpClientConfig.from_env()
+            _dns_cache = DnsCache(ttl=config.dns_ttl, prefer_ipv4=config.ip_family == "ipv4")
+        return _dns_cache
+
+
+class _CachedDnsConnectionMixin:
+    """Opens sockets through the DnsCache instead of a fresh getaddrinfo per connection"""
+    dns_cache: DnsCache = None
+
+    def _new_conn(self):
+        try:
+            sock = self.dns_cache.create_connection(
+                (self._dns_host, self.port),
+                self.timeout if isinstance(self.timeout, (int, float)) else None,
+                source_address=self.source_address,
+                socket_options=self.socket_options,
+            )
+        except socket.gaierror as e:
+            raise NameResolutionError(self.host, self, e) from e
+        except socket.timeout as e:
+            raise ConnectTimeoutError(
+                self, f"Connection to {self.host} timed out. (connect timeout={self.timeout})"
+            ) from e
+        except OSError as e:
+            raise NewConnectionError(self, f"Failed to establish a new connection: {e}") from e
+
+        sys.audit("http.client.connect", self, self.host, self.port)
+        return sock
+
+
+class CappedRetry(Retry):
+    """urllib3 Retry that never waits longer than max_backoff, even if the server asks for it"""
+
+    def __init__(self, *args, max_retry_after: float = 4.0, **kwargs):
+        self.max_retry_after = max_retry_after
+        super().__init__(*args, **kwargs)
+
+    def new(self, **kwargs):
+        retry = super().new(**kwargs)
+        retry.max_retry_after = self.max_retry_after
+        return retry
+
+    def get_retry_after(self, response):
+        retry_after = super().get_retry_after(response)
+        if retry_after is None:
+            return None
+        return min(retry_after, self.max_retry_after)
+
+
+class _CountingPoolMixin:
+    """Counts every HTTP exchange and every freshly opened connection of a pool"""
+    stats: HttpStats = None
+
+    def _new_conn(self):
+        self.stats.count("new_connections")
+        return super()._new_conn()
+
+    def _make_request(self, *args, **kwargs):
+        self.stats.count("requests")
+        return super()._make_request(*args, **kwargs)
+
+
+class PooledHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter with shared retry policy and connection-reuse metrics"""
+
+    def __init__(self, config: HttpClientConfig, stats: HttpStats, dns_cache: Optional[DnsCache] = None):
+        self.config = config
+        self.stats = stats
+        self.dns_cache = dns_cache or get_dns_cache(config)
+        retry = CappedRetry(
+            total=config.retries,
+            connect=config.retries,
+            read=0,                      # A slow answer is not retried - the caller's deadline decides
+            status=config.retries,
+            backoff_factor=config.backoff_factor,
+            backoff_max=config.max_backoff,
+            status_forcelist=config.status_forcelist,
+            allowed_methods=frozenset({"GET", "HEAD"}),
+            respect_retry_after_header=True,
+            raise_on_status=False,       # Callers check status_code themselves
+            max_retry_after=config.max_backoff,
+        )
+        super().__init__(
+            pool_connections=config.pool_connections,
+            pool_maxsize=config.pool_maxsize,
+            max_retries=retry,
+            pool_block=False,
+        )
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        bound = {"dns_cache": self.dns_cache}
+        http_conn = type("CachedDnsHTTPConnection", (_CachedDnsConnectionMixin, HTTPConnection), bound)
+        https_conn = type("CachedDnsHTTPSConnection", (_CachedDnsConnectionMixin, HTTPSConnection), bound)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": type("CountingHTTPConnectionPool", (_CountingPoolMixin, HTTPConnectionPool),
+                         {"stats": self.stats, "ConnectionCls": http_conn}),
+            "https": type("CountingHTTPSConnectionPool", (_CountingPoolMixin, HTTPSConnectionPool),
+                          {"stats": self.stats, "ConnectionCls": https_conn}),
+        }
+
+
+# —————————————————————————————
+# Session registry
+# —————————————————————————————
+_sessions: Dict[str, requests.Session] = {}
+_stats: Dict[str, HttpStats] = {}
+_sessions_lock = threading.Lock()
+
+
+def create_http_session(config: Optional[HttpClientConfig] = None, headers: Optional[Dict] = None,
+                        stats: Optional[HttpStats] = None, dns_cache: Optional[DnsCache] = None) -> requests.Session:
+    """New keep-alive session with the pooled adapter mounted for http and https"""
+    config = config or HttpClientConfig.from_env()
+    stats = stats or HttpStats()
+    session = requests.Session()
+    adapter = PooledHTTPAdapter(config, stats, dns_cache)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    if headers:
+        session.headers.update(headers)
+    return session
+
+
+def get_http_session(name: str = "default", headers: Optional[Dict] = None,
+                     config: Optional[HttpClientConfig] = None) -> requests.Session:
+    """
+    Process-wide session per service (e.g. "itunes", "discogs", "scrape")
+    headers and config are only applied when the session is created
+    """
+    with _sessions_lock:
+        session = _sessions.get(name)
+        if session is None:
+            stats = HttpStats()
+            session = create_http_session(config=config, headers=headers, stats=stats)
+            _sessions[name] = session
+            _stats[name] = stats
+        return session
+
+
+def get_http_stats() -> Dict[str, Dict]:
+    """Connection-reuse metrics of every shared session"""
+    with _sessions_lock:
+        stats = dict(_stats)
+    return {name: counters.snapshot() for name, counters in stats.items()}
+
+
+def close_http_sessions():
+    """Close all pooled connections (next get_http_session call starts fresh)"""
+    with _sessions_lock:
+        sessions = list(_sessions.values())
+        _sessions.clear()
+        _stats.clear()
+    for session in sessions:
+        session.close()
@@ -0,0 +1,154 @@
+"""
+Unified logging for the GemFinder modules
+Per-module levels, lazy %-formatting, sampling of high-volume debug lines and an optional JSON formatter
+
+    from logging_config import get_logger, SAMPLED
+    log = get_logger(__name__)
+    log.debug("Shipping span: %r", text, extra=SAMPLED)   # formatted only if DEBUG is enabled (and sampled in)
+
+    GEMFINDER_LOG_LEVEL=INFO                                      # default level
+    GEMFINDER_LOG_LEVELS=selenium_scraper=DEBUG,api_search=WARNING
+    GEMFINDER_LOG_FORMAT=json                                     # one JSON object per line
+    GEMFINDER_LOG_SAMPLE_RATE=0.1                                 # keep every 10th sampled line per call site
+    GEMFINDER_LOG_FILE=gemfinder.log                              # additionally log to a file
+"""
+import os
+import sys
+import json
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+# All app loggers live below this name - Streamlit's and third-party loggers stay untouched
+ROOT_LOGGER = "gemfinder"
+
+# Pass as extra= on high-volume lines (per row/span/offer) - only every Nth one per call site is emitted
+SAMPLED = {"sampled": True}
+
+TEXT_FORMAT = "%(asctime)s %(levelname)-7s %(name)s: %(message)s"
+
+
+@dataclass
+class LoggingConfig:
+    """Logging configuration (defaults can be overridden via environment)"""
+    level: str = "INFO"
+
+    # Module name -> level, e.g. {"selenium_scraper": "DEBUG"}
+    module_levels: Dict[str, str] = field(default_factory=dict)
+
+    json_format: bool = False
+
+    # Share of sampled records that are emitted (1.0 = all, 0 = none)
+    sample_rate: float = 0.1
+
+    log_file: str = ""
+
+    @classmethod
+    def from_env(cls) -> "LoggingConfig":
+        config = cls()
+        config.level = os.environ.get("GEMFINDER_LOG_LEVEL", config.level).upper()
+        config.module_levels = parse_module_levels(os.environ.get("GEMFINDER_LOG_LEVELS", ""))
+        config.json_format = os.environ.get("GEMFINDER_LOG_FORMAT", "").lower() == "json"
+        config.sample_rate = float(os.environ.get("GEMFINDER_LOG_SAMPLE_RATE", config.sample_rate))
+        config.log_file = os.environ.get("GEMFINDER_LOG_FILE", config.log_file)
+        return config
+
+
+def parse_module_levels(spec: str) -> Dict[str, str]:
+    """'scrape_search=DEBUG, api_search=warning' -> {"scrape_search": "DEBUG", "api_search": "WARNING"}"""
+    levels = {}
+    for part in spec.split(","):
+        name, sep, level = part.partition("=")
+        if sep and name.strip() and level.strip():
+            levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+class SamplingFilter(logging.Filter):
+    """Lets every Nth record flagged with extra=SAMPLED through (counted per call site); others always pass"""
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.every = max(1, round(1 / rate)) if rate > 0 else 0
+        self._lock = threading.Lock()
+        self._counts: Dict[tuple, int] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not getattr(record, "sampled", False):
+            return True
+        if self.every == 0:
+            return False
+        key = (record.name, record.lineno)
+        with self._lock:
+            count = self._counts.get(key, 0)
+            self._counts[key] = count + 1
+        return count % self.every == 0
+
+
+# Attributes every LogRecord has - anything else came in via extra= and goes into the JSON payload
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "sampled"}
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: ts, level, logger, message plus extra= fields and the traceback"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": round(record.created, 3),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS:
+                payload[key] = value
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+_configured: Optional[LoggingConfig] = None
+_configure_lock = threading.Lock()
+
+
+def configure_logging(config: Optional[LoggingConfig] = None, force: bool = False) -> LoggingConfig:
+    """Install handlers and levels on the app logger tree (once per process unless force=True)"""
+    global _configured
+    with _configure_lock:
+        if _configured is not None and not force:
+            return _configured
+        config = config or LoggingConfig.from_env()
+
+        root = logging.getLogger(ROOT_LOGGER)
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+            handler.close()
+        # Reset levels of a previous configuration before applying the new per-module ones
+        if _configured is not None:
+            for name in _configured.module_levels:
+                logging.getLogger(f"{ROOT_LOGGER}.{name}").setLevel(logging.NOTSET)
+
+        formatter = JsonFormatter() if config.json_format else logging.Formatter(TEXT_FORMAT)
+        handlers = [logging.StreamHandler(sys.stderr)]
+        if config.log_file:
+            handlers.append(logging.FileHandler(config.log_file, encoding="utf-8"))
+        for handler in handlers:
+            handler.setFormatter(formatter)
+            handler.addFilter(SamplingFilter(config.sample_rate))
+            root.addHandler(handler)
+
+        root.setLevel(config.level)
+        root.propagate = False
+        for name, level in config.module_levels.items():
+            logging.getLogger(f"{ROOT_LOGGER}.{name}").setLevel(level)
+
+        _configured = config
+        return config
+
+
+def get_logger(name: str) -> logging.Logger:
+    """Logger for a module (pass __name__) - configures logging from the environment on first use"""
+    if _configured is None:
+        configure_logging()
+    return logging.getLogger(f"{ROOT_LOGGER}.{name}")
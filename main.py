@@ -8,23 +8,26 @@ import datetime
 import pandas as pd
 from st_keyup import st_keyup
 import os
-from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # --- Deine Modul-Imports ---
 from providers import (
-    SearchManager,
+    SearchManager, SpeculativeSearch,
     DiscogsProvider, RevibedProvider,
     ItunesProvider, BeatportProvider, BandcampProvider, TraxsourceProvider
 )
 from state_manager import AppState
+from logging_config import get_logger
+from tracing import span
 from ui_helpers import (
-    show_live_results,
+    show_live_results, show_previously_found,
     show_revibed_fragment, show_discogs_block
 )
 from utils import get_platform_info, is_fuzzy_match
 
 from state_manager import AppState
 
+log = get_logger(__name__)
+
 discogs_provider = DiscogsProvider()
 revibed_provider = RevibedProvider()
 
@@ -104,7 +107,7 @@ st.image(os.path.join(os.path.dirname(__file__), "record_mole_copy.png"), width=
 st.title("GEM DETECTOR")
 # Create containers with unique keys to force recreation on mode switches
 container_key = f"containers_{st.session_state.get('container_generation', 0)}"
-print(f"🔄 DEBUG: Creating containers with key: {container_key}")
+log.debug("Creating containers with key: %s", container_key)
 
 live_placeholder    = st.empty()
 digital_placeholder = st.empty()
@@ -228,13 +231,41 @@ def check_button_state():
     st.session_state.can_search = can_search_digital or can_search_secondary
     return can_search_digital or can_search_secondary
 
-def search_platform_thread_safe(provider, criteria):                                                                        
-    """Thread-safe search ohne UI-Updates"""                    
-    try: 
-        result = provider.search(criteria)       
-        return {"status": "success", "result": result, "provider": provider.name}                                                                                                                      
-    except Exception as e:                    
-        return {"status": "error", "error": str(e), "provider": provider.name}                                                                                                                                                                                                      
+def run_secondary_search(criteria, on_result=None):
+    """
+    Discogs + Revibed gleichzeitig über den Orchestrator (übernimmt spekulativ vorab
+    gestartete Suchen). on_result(platform, result) wird aufgerufen, sobald ein Provider fertig ist.
+    """
+    manager = SearchManager(secondary_providers)
+    with span("physical", provider="orchestrator"):
+        for result in manager.stream_sync(criteria, speculative=st.session_state.get("speculative_search")):
+            platform = result.get("platform")
+            if platform == "Discogs":
+                st.session_state.results_discogs = result.get("releases", [])  # Extract releases list from dict
+            elif platform == "Revibed":
+                st.session_state.results_revibed = [result]
+            if on_result:
+                on_result(platform, result)
+    st.session_state.secondary_search_done = True
+
+def secondary_result_renderer(container, show_empty_discogs=False):
+    """Callback für run_secondary_search: rendert jedes Ergebnis sofort - Discogs bleibt über Revibed"""
+    with container:
+        discogs_area = st.container()
+        revibed_area = st.container()
+
+    def render(platform, result):
+        if platform == "Discogs" and result.get("rate_limited"):
+            with discogs_area:
+                st.warning(f"⏳ {result.get('message')}")
+        elif platform == "Discogs" and (st.session_state.results_discogs or show_empty_discogs):
+            with discogs_area:
+                show_discogs_block(st.session_state.results_discogs, st.session_state.track_for_search)
+        elif platform == "Revibed" and st.session_state.results_revibed:
+            with revibed_area:
+                show_revibed_fragment(st.session_state.results_revibed)
+
+    return render
 
 # --- Input Interface Based on Selected Mode ---
 reset_suffix = f"_{st.session_state.get('reset_counter', 0)}"
@@ -465,6 +496,9 @@ if not st.session_state.get("suche_gestartet", False) and not app_state.is_cache
 else:
     search_info_placeholder.empty()
 
+# Candidates from earlier searches - instant, while the live search below still runs
+show_previously_found(criteria)
+
 # Search button - use placeholder that can be cleared later
 search_button_placeholder = st.empty()
 st.session_state.search_button_placeholder = search_button_placeholder
@@ -516,45 +550,33 @@ if search_clicked or track_search_clicked:
 
         # Stage 1: Search digital platforms if criteria met
         if can_search_digital:
-            print("🔍 DEBUG: Starting OPTIMIZED digital search path")
+            log.debug("Starting optimized digital search path")
             st.session_state.show_digital = True  
             st.session_state.discogs_revibed_mode = False
             
+            # Optional: Discogs/Revibed spekulativ parallel zur digitalen Stufe starten,
+            # damit der Wechsel zu den physischen Ergebnissen ohne Wartezeit erfolgt
+            if st.session_state.get("speculative_physical", False) and can_search_secondary:
+                st.session_state.speculative_search = SpeculativeSearch(secondary_providers, criteria)
+            
             # Digital platforms parallel search (iTunes will be re-added later)
-            print(f"🔍 DEBUG: Starting digital platforms in parallel")
+            log.debug("Starting digital platforms in parallel")
             
             # Show progress bar immediately when search starts
-            print(f"🔍 DEBUG: SHOWING LIVE RESULTS in live_container (initial progress) - secondary_active={st.session_state.get('secondary_search_active', False)}")
+            log.debug("Showing live results in live_container (initial progress) - secondary_active=%s",
+                      st.session_state.get('secondary_search_active', False))
             with live_container:
                 show_live_results()
             
-            with ThreadPoolExecutor(max_workers=4) as executor:
-                futures = {executor.submit(search_platform_thread_safe, p, criteria): p 
-                          for p in digital_providers if p.can_search(criteria)}
-                
-                # Live Updates während Threads laufen
-                for future in as_completed(futures):
-                    thread_result = future.result()
-                    
-                    if thread_result["status"] == "success":
-                        entry = thread_result["result"]
-                    else:
-                        entry = {
-                            "platform": thread_result["provider"],
-                            "title": "Fehler",
-                            "artist": "",
-                            "album": "",
-                            "label": "",
-                            "price": "",
-                            "cover_url": "",
-                            "url": "",
-                            "error": thread_result["error"]
-                        }
-                    
-                    # SOFORT anzeigen sobald Thread fertig
+            # Alle digitalen Provider gleichzeitig - Ergebnisse in Fertigstellungs-Reihenfolge
+            digital_manager = SearchManager(digital_providers)
+            with span("digital", provider="orchestrator"):
+                for entry in digital_manager.stream_sync(criteria):
+                    # SOFORT anzeigen sobald ein Provider fertig ist
                     st.session_state.live_results.append(entry)
                     st.session_state.results_digital.append(entry)
-                    print(f"🔍 DEBUG: SHOWING LIVE RESULTS in live_container (digital search loop) - secondary_active={st.session_state.get('secondary_search_active', False)}")
+                    log.debug("Showing live results in live_container (digital search loop) - secondary_active=%s",
+                              st.session_state.get('secondary_search_active', False))
                     with live_container:
                         show_live_results()
 
@@ -576,7 +598,8 @@ if search_clicked or track_search_clicked:
                     st.session_state.live_progress_container.empty()
                 
                 # Final call to show_live_results to display results
-                print(f"🔍 DEBUG: SHOWING LIVE RESULTS in live_container (final digital) - secondary_active={st.session_state.get('secondary_search_active', False)}")
+                log.debug("Showing live results in live_container (final digital) - secondary_active=%s",
+                          st.session_state.get('secondary_search_active', False))
                 with live_container:
                     show_live_results()
             elif can_search_secondary:
@@ -585,46 +608,16 @@ if search_clicked or track_search_clicked:
                 st.session_state.discogs_revibed_mode = True
                 st.session_state.show_digital = False
                 
-                # Search secondary platforms
-                for p in secondary_providers:
-                    if p.can_search(criteria):
-                        result = p.search(criteria)
-                        if p.name == "Discogs":
-                            st.session_state.results_discogs = result.get("releases", [])  # Extract releases list from dict
-                        elif p.name == "Revibed":
-                            st.session_state.results_revibed = [result]
-                
-                st.session_state.secondary_search_done = True
-                # Show results separately for better user experience
-                with digital_container:
-                    if st.session_state.results_discogs:
-                        print(f"🌟 DEBUG MAIN: Calling show_discogs_block from line 597 (first search area)")
-                        show_discogs_block(st.session_state.results_discogs, st.session_state.track_for_search)
-                    if st.session_state.results_revibed:
-                        show_revibed_fragment(st.session_state.results_revibed)
+                # Search secondary platforms in parallel - show each result as soon as it is ready
+                run_secondary_search(criteria, secondary_result_renderer(digital_container))
 
         # If only secondary platforms can search
         elif can_search_secondary:
             st.session_state.discogs_revibed_mode = True
             st.session_state.show_digital = False
             
-            # Search secondary platforms
-            for p in secondary_providers:
-                if p.can_search(criteria):
-                    result = p.search(criteria)
-                    if p.name == "Discogs":
-                        st.session_state.results_discogs = result.get("releases", [])  # Extract releases list from dict
-                    elif p.name == "Revibed":
-                        st.session_state.results_revibed = [result]
-            
-            st.session_state.secondary_search_done = True
-            # Show results separately for better user experience
-            with digital_container:
-                if st.session_state.results_discogs:
-                    print(f"🌟 DEBUG MAIN: Calling show_discogs_block from line 619 (second search area)")
-                    show_discogs_block(st.session_state.results_discogs, st.session_state.track_for_search)
-                if st.session_state.results_revibed:
-                    show_revibed_fragment(st.session_state.results_revibed)
+            # Search secondary platforms in parallel - show each result as soon as it is ready
+            run_secondary_search(criteria, secondary_result_renderer(digital_container))
 
 # Reset when search criteria changed (cache invalid but search was started)
 elif st.session_state.suche_gestartet and not app_state.is_cache_valid():
@@ -645,7 +638,7 @@ elif st.session_state.suche_gestartet and not app_state.is_cache_valid():
 
 # Handle switch to cached secondary results - FORCE COMPLETE RESET
 if st.session_state.get("switch_to_cached_secondary", False):
-    print("🔄 DEBUG: Switching to cached secondary results")
+    log.debug("Switching to cached secondary results")
     st.session_state.switch_to_cached_secondary = False  # Reset flag
     
     # Increment container generation to force complete recreation
@@ -664,7 +657,7 @@ if st.session_state.get("switch_to_cached_secondary", False):
 # Debug output removed to reduce noise
 
 if st.session_state.get("trigger_secondary_search", False) and can_search_secondary:
-    print("🔄 DEBUG: Mode switch triggered - starting secondary search")
+    log.debug("Mode switch triggered - starting secondary search")
     st.session_state.trigger_secondary_search = False  # Reset flag
     
     # Clear containers to remove verblasste results and header (keep progress container for secondary search)
@@ -679,7 +672,7 @@ if st.session_state.get("trigger_secondary_search", False) and can_search_second
     if "live_results_header_container" in st.session_state:
         st.session_state.live_results_header_container.empty()
     
-    print("🔄 DEBUG: All result containers cleared including header, progress container kept for secondary search")
+    log.debug("All result containers cleared including header, progress container kept for secondary search")
     
     # Switch to secondary mode
     st.session_state.discogs_revibed_mode = True
@@ -694,63 +687,31 @@ if st.session_state.get("trigger_secondary_search", False) and can_search_second
     
     # Ensure Discogs comes first for better user experience (~0.3s vs ~2s)
     searchable_secondary.sort(key=lambda p: 0 if p.name == "Discogs" else 1)
+    finished_secondary = []
     
-    with st.session_state.live_progress_container.container():
-        progress_text = ", ".join([f"{p.name} ⏳" for p in searchable_secondary])
-        st.info(f"🔍 Searching: {progress_text}")
-        st.progress(0)
-    
-    # Search secondary platforms sequentially (Discogs first, then Revibed)
-    for i, p in enumerate(searchable_secondary):
-        print(f"🔍 DEBUG: Searching {p.name}...")
-        
-        # Update progress during search
+    def show_secondary_progress():
         with st.session_state.live_progress_container.container():
-            progress_parts = []
-            for j, provider in enumerate(searchable_secondary):
-                if j < i:
-                    progress_parts.append(f"{provider.name} ✅")
-                elif j == i:
-                    progress_parts.append(f"{provider.name} ⏳")
-                else:
-                    progress_parts.append(f"{provider.name} ⏳")
-            
-            progress_text = ", ".join(progress_parts)
+            progress_text = ", ".join(
+                f"{p.name} {'✅' if p.name in finished_secondary else '⏳'}" for p in searchable_secondary
+            )
             st.info(f"🔍 Searching: {progress_text}")
-            st.progress((i + 0.5) / len(searchable_secondary))
-        
-        # Perform search
-        result = p.search(criteria)
-        if p.name == "Discogs":
-            st.session_state.results_discogs = result.get("releases", [])
-            print("🔍 DEBUG: Discogs loaded - showing Discogs results while Revibed continues...")
-            # Show Discogs results immediately
-            with digital_container:
-                show_discogs_block(st.session_state.results_discogs, st.session_state.track_for_search)
-        elif p.name == "Revibed":
-            st.session_state.results_revibed = [result]
-            print("🔍 DEBUG: Revibed loaded - adding Revibed results...")
-            # Add Revibed results to the display
-            with digital_container:
-                show_revibed_fragment(st.session_state.results_revibed)
+            st.progress(len(finished_secondary) / len(searchable_secondary))
     
-        # Update progress after completion
-        with st.session_state.live_progress_container.container():
-            progress_parts = []
-            for j, provider in enumerate(searchable_secondary):
-                if j <= i:
-                    progress_parts.append(f"{provider.name} ✅")
-                else:
-                    progress_parts.append(f"{provider.name} ⏳")
-            
-            progress_text = ", ".join(progress_parts)
-            st.info(f"🔍 Searching: {progress_text}")
-            st.progress((i + 1) / len(searchable_secondary))
+    show_secondary_progress()
+    render_secondary = secondary_result_renderer(digital_container, show_empty_discogs=True)
+    
+    def on_secondary_result(platform, result):
+        log.debug("%s loaded - showing results while the other platform continues", platform)
+        finished_secondary.append(platform)
+        render_secondary(platform, result)
+        show_secondary_progress()
+    
+    # Search secondary platforms in parallel (Discogs and Revibed at the same time)
+    run_secondary_search(criteria, on_secondary_result)
     
     # Clear progress bar after completion
     st.session_state.live_progress_container.empty()
     
-    st.session_state.secondary_search_done = True
     st.session_state.secondary_search_active = False  # Reset flag - secondary search complete
     # Results are already displayed individually as they complete
 
@@ -759,18 +720,19 @@ elif st.session_state.suche_gestartet and app_state.is_cache_valid():
     # Don't show digital results if we're in secondary mode
     if st.session_state.show_digital and st.session_state.digital_search_done and not st.session_state.get("discogs_revibed_mode", False):
         # Show cached digital results via live container
-        print("🔍 DEBUG: SHOWING cached digital results in live_container")
+        log.debug("Showing cached digital results in live_container")
         with live_container:
             show_live_results()
     else:
-        print(f"🔍 DEBUG: NOT showing cached digital - show_digital={st.session_state.get('show_digital')}, discogs_mode={st.session_state.get('discogs_revibed_mode')}")
+        log.debug("Not showing cached digital - show_digital=%s, discogs_mode=%s",
+                  st.session_state.get('show_digital'), st.session_state.get('discogs_revibed_mode'))
     
     if st.session_state.discogs_revibed_mode and st.session_state.secondary_search_done:
-        print(f"🌟 DEBUG MAIN: Entering cached secondary results block (line 764)")
+        log.debug("Entering cached secondary results block")
         # Show cached secondary results - now completely separated
         with digital_container:
             # Enhanced Discogs block (normal rendering)
-            print(f"🌟 DEBUG MAIN: Calling show_discogs_block from line 766 (cached results)")
+            log.debug("Calling show_discogs_block (cached results)")
             show_discogs_block(
                 st.session_state.results_discogs, 
                 st.session_state.track_for_search
@@ -786,16 +748,16 @@ if (st.session_state.get("digital_search_done", False) and
     
     if not st.session_state.get("secondary_search_done", False):
         # First time - show search button
-        print("🔄 DEBUG: Adding search button for Discogs/Revibed")
+        log.debug("Adding search button for Discogs/Revibed")
         if st.button("🔄 Search on Discogs and Revibed", key="final_switch", type="primary"):
-            print("🔄 DEBUG: Search button clicked!")
+            log.debug("Search button clicked")
             st.session_state.trigger_secondary_search = True
             st.rerun()
     else:
         # Secondary search already done - show switch button for cached results
-        print("🔄 DEBUG: Adding switch button for cached Discogs/Revibed results")
+        log.debug("Adding switch button for cached Discogs/Revibed results")
         if st.button("🔄 Switch to Discogs and Revibed", key="switch_cached", type="secondary"):
-            print("🔄 DEBUG: Switch to cached results clicked!")
+            log.debug("Switch to cached results clicked")
             # Set flag to trigger clean switch
             st.session_state.switch_to_cached_secondary = True
             st.rerun()
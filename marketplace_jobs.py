@@ -0,0 +1,239 @@
+"""
+Background jobs for Discogs marketplace enrichment
+Offers of a release are scraped and shipping-checked in a bounded worker pool instead of the
+Streamlit script run; the UI gets a job handle, renders partial offers as they arrive and
+completed jobs are reused by all sessions asking for the same release and country
+"""
+import os
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+from driver_pool import DriverPoolConfig
+from logging_config import get_logger
+from refresh_bus import VersionBus, get_refresh_bus
+from tracing import span
+
+log = get_logger(__name__)
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+
+
+@dataclass
+class MarketplaceJobConfig:
+    """Configuration for the marketplace job pool (defaults can be overridden via environment)"""
+    # Jobs running at the same time - each one uses up to shipping_workers pooled browsers
+    workers: int = 2
+
+    # Offers scraped per release and browsers used for the shipping check of one job.
+    # workers * shipping_workers must fit the "discogs_offers" driver pool (max_size 4) - a check
+    # that waits too long for a browser falls back to the offer without shipping data
+    max_offers: int = 8
+    shipping_workers: int = 2
+
+    # Completed jobs are reused for this long; failed jobs are kept (and their error shown) for
+    # failure_ttl unless the user asks for a retry - a re-rendering UI must not rescrape on every run
+    result_ttl: float = 900.0
+    failure_ttl: float = 60.0
+
+    # Upper bound of remembered jobs (oldest finished ones are dropped first)
+    max_jobs: int = 200
+
+    @classmethod
+    def from_env(cls) -> "MarketplaceJobConfig":
+        config = cls()
+        config.workers = int(os.environ.get("GEMFINDER_MARKETPLACE_WORKERS", config.workers))
+        config.max_offers = int(os.environ.get("GEMFINDER_MARKETPLACE_MAX_OFFERS", config.max_offers))
+        config.shipping_workers = int(os.environ.get("GEMFINDER_MARKETPLACE_SHIPPING_WORKERS", config.shipping_workers))
+        config.result_ttl = float(os.environ.get("GEMFINDER_MARKETPLACE_RESULT_TTL", config.result_ttl))
+        pool_share = max(1, DriverPoolConfig.from_env().max_size // max(1, config.workers))
+        if config.shipping_workers > pool_share:
+            log.info("Marketplace shipping workers capped at %d (driver pool size / job workers)", pool_share)
+            config.shipping_workers = pool_share
+        config.failure_ttl = float(os.environ.get("GEMFINDER_MARKETPLACE_FAILURE_TTL", config.failure_ttl))
+        return config
+
+
+def offers_topic(release_id, country: str) -> str:
+    """Refresh-bus topic a job publishes partial and final offers on"""
+    return f"offers:{release_id}:{(country or '').upper()}"
+
+
+class MarketplaceJob:
+    """Handle of one enrichment job - thread-safe snapshot accessors for the UI"""
+
+    def __init__(self, release_id: str, country: str):
+        self.release_id = str(release_id)
+        self.country = (country or "").upper()
+        self.topic = offers_topic(self.release_id, self.country)
+        self.status = QUEUED
+        self.error = ""
+        self.raw_count = 0
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        self._offers: List[Dict] = []
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+
+    @property
+    def key(self) -> Tuple[str, str]:
+        return self.release_id, self.country
+
+    @property
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    def offers(self) -> List[Dict]:
+        """Offers accepted so far (partial while the job runs)"""
+        with self._lock:
+            return list(self._offers)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        return self._done.wait(timeout)
+
+    def start(self):
+        with self._lock:
+            self.status = RUNNING
+
+    def add_offer(self, offer: Dict):
+        with self._lock:
+            self._offers.append(offer)
+
+    def finish(self, offers: List[Dict], status: str = DONE, error: str = ""):
+        with self._lock:
+            self._offers = list(offers)
+            self.status = status
+            self.error = error
+            self.finished_at = time.time()
+        self._done.set()
+
+    def is_fresh(self, ttl: float, now: Optional[float] = None, failure_ttl: float = 0.0) -> bool:
+        """Reusable: still running, finished successfully within ttl or failed within failure_ttl"""
+        if not self.done:
+            return True
+        now = time.time() if now is None else now
+        return now - self.finished_at < (ttl if self.status == DONE else failure_ttl)
+
+
+class MarketplaceJobQueue:
+    """Bounded worker pool plus a registry of jobs by (release_id, country)"""
+
+    def __init__(self, config: Optional[MarketplaceJobConfig] = None, bus: Optional[VersionBus] = None,
+                 scrape: Optional[Callable] = None, enrich: Optional[Callable] = None):
+        self.config = config or MarketplaceJobConfig.from_env()
+        self.bus = bus or get_refresh_bus()
+        self._scrape = scrape
+        self._enrich = enrich
+        self._executor = ThreadPoolExecutor(max_workers=max(1, self.config.workers),
+                                            thread_name_prefix="marketplace-job")
+        self._lock = threading.Lock()
+        self._jobs: Dict[Tuple[str, str], MarketplaceJob] = {}
+        self.stats_counters = {"submitted": 0, "reused": 0, "failed": 0}
+
+    def submit(self, release_id, country: str, retry: bool = False) -> MarketplaceJob:
+        """
+        Job for the release/country - a running or recently finished one is shared. A recently
+        failed job is returned as is (so the UI can show its error) unless retry is set.
+        """
+        key = (str(release_id), (country or "").upper())
+        with self._lock:
+            job = self._jobs.get(key)
+            if job is not None and self._is_fresh(job) and not (retry and job.status == FAILED):
+                self.stats_counters["reused"] += 1
+                return job
+            job = MarketplaceJob(*key)
+            self._jobs[key] = job
+            self.stats_counters["submitted"] += 1
+            self._prune_locked()
+        # Pending from submit on, so watching fragments start polling before a worker is free
+        self.bus.begin(job.topic)
+        future = self._executor.submit(self._run, job)
+        future.add_done_callback(lambda f: self._on_cancelled(job) if f.cancelled() else None)
+        return job
+
+    def _on_cancelled(self, job: MarketplaceJob):
+        """Queued job dropped by shutdown - _run never ends its topic, so watchers would poll forever"""
+        job.finish(job.offers(), status=FAILED, error="Marketplace job was cancelled")
+        self.bus.end(job.topic)
+
+    def get(self, release_id, country: str) -> Optional[MarketplaceJob]:
+        with self._lock:
+            return self._jobs.get((str(release_id), (country or "").upper()))
+
+    def _run(self, job: MarketplaceJob):
+        job.start()
+
+        def on_offer(offer):
+            job.add_offer(offer)
+            self.bus.publish(job.topic)
+
+        try:
+            with span("marketplace", provider="orchestrator", release_id=job.release_id):
+                with span("offers_scrape", provider="Discogs Marketplace"):
+                    # Scraper errors must fail the job - an empty list would be reused as "no offers"
+                    raw = self._scrape_fn()(job.release_id, max_offers=self.config.max_offers,
+                                            user_country=job.country, raise_errors=True)
+                job.raw_count = len(raw)
+                log.info("Scraper returned %d offers for release %s", len(raw), job.release_id)
+                offers = []
+                if raw:
+                    with span("shipping_filter", provider="Discogs Marketplace", offers=len(raw)):
+                        offers = self._enrich_fn()(raw, job.country, max_workers=self.config.shipping_workers,
+                                                   on_offer=on_offer)
+                    log.info("Shipping check kept %d available offers for release %s", len(offers), job.release_id)
+            job.finish(offers)
+        except Exception as e:
+            log.error("❌ Marketplace job for release %s failed: %s", job.release_id, e)
+            with self._lock:
+                self.stats_counters["failed"] += 1
+            job.finish(job.offers(), status=FAILED, error=str(e))
+        finally:
+            self.bus.end(job.topic)
+
+    def _scrape_fn(self) -> Callable:
+        if self._scrape is None:
+            from scrape_search import scrape_discogs_marketplace_offers
+            self._scrape = scrape_discogs_marketplace_offers
+        return self._scrape
+
+    def _enrich_fn(self) -> Callable:
+        if self._enrich is None:
+            from selenium_scraper import selenium_filter_offers_parallel
+            self._enrich = selenium_filter_offers_parallel
+        return self._enrich
+
+    def _is_fresh(self, job: MarketplaceJob, now: Optional[float] = None) -> bool:
+        return job.is_fresh(self.config.result_ttl, now, failure_ttl=self.config.failure_ttl)
+
+    def _prune_locked(self):
+        """Drop expired jobs, then the oldest finished ones above max_jobs (caller holds the lock)"""
+        now = time.time()
+        for key, job in list(self._jobs.items()):
+            if not self._is_fresh(job, now):
+                del self._jobs[key]
+        finished = sorted((job for job in self._jobs.values() if job.done), key=lambda j: j.finished_at)
+        while len(self._jobs) > self.config.max_jobs and finished:
+            self._jobs.pop(finished.pop(0).key, None)
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            running = sum(1 for job in self._jobs.values() if not job.done)
+            return {"jobs": len(self._jobs), "running": running, **self.stats_counters}
+
+    def shutdown(self, wait: bool = False):
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+
+_queue: Optional[MarketplaceJobQueue] = None
+_queue_lock = threading.Lock()
+
+
+def get_marketplace_jobs() -> MarketplaceJobQueue:
+    """Process-wide job queue shared by all Streamlit sessions"""
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            _queue = MarketplaceJobQueue()
+        return _queue
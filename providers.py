@@ -1,7 +1,19 @@
 # providers.py
+import os
+import asyncio
+import threading
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Iterator, Optional
 from scrape_search import search_bandcamp, search_beatport, search_traxsource, search_revibed
 from api_search import search_discogs_releases, get_discogs_release_details, get_itunes_release_info
+from search_cache import cached_search, criteria_key
+from release_index import get_release_index
+from rate_governor import RateLimitExceeded
+from tracing import span
+from logging_config import get_logger
+
+log = get_logger(__name__)
 
 class SearchCriteria:
     def __init__(self, title: str = "", artist: str = "", album: str = "", catalog: str = ""):
@@ -46,11 +58,38 @@ class DiscogsProvider(SearchProvider):
             c.catalog
         )
 
+    @cached_search
     def search(self, c: SearchCriteria) -> dict:
         """Return releases in consistent dict format like other providers"""
-        print(f"DiscogsProvider: Searching for artist='{c.artist}', title='{c.title}', album='{c.album}'")
-        releases = search_discogs_releases(c.artist, c.title, c.album)
-        print(f"DiscogsProvider: Returning {len(releases)} releases")
+        log.debug("DiscogsProvider: Searching for artist=%r, title=%r, album=%r, catalog=%r",
+                  c.artist, c.title, c.album, c.catalog)
+        if c.catalog and not c.title:
+            # Exact-match fast path: releases found earlier under this catalog number, no API call
+            # (a track title cannot be checked against the stored releases - ask the API then)
+            known = get_release_index().releases_for_catno(c.catalog, c.artist, c.album)
+            if known:
+                log.debug("DiscogsProvider: %d releases for catno %r from the release index", len(known), c.catalog)
+                return {
+                    "platform": self.name,
+                    "releases": known,
+                    "count": len(known),
+                    "has_results": True,
+                    "from_index": True
+                }
+        try:
+            releases = search_discogs_releases(c.artist, c.title, c.album, c.catalog)
+        except RateLimitExceeded as e:
+            # Quota used up - tell the user when to retry instead of showing "no releases"
+            return {
+                "platform": self.name,
+                "releases": [],
+                "count": 0,
+                "has_results": False,
+                "rate_limited": True,
+                "retry_after": e.retry_after,
+                "message": f"Discogs-Limit erreicht – bitte in {e.retry_after:.0f}s erneut versuchen"
+            }
+        log.debug("DiscogsProvider: Returning %d releases", len(releases))
         
         # Return in consistent format with other providers
         return {
@@ -72,6 +111,7 @@ class RevibedProvider(SearchProvider):
         # 2. Artist
         return bool(c.album or c.artist)
 
+    @cached_search
     def search(self, c: SearchCriteria) -> dict:
         # search_revibed nimmt (artist, album)-Parameter
         artist = "" if c.album else c.artist
@@ -104,6 +144,7 @@ class ItunesProvider(SearchProvider):
             (c.title and c.album) or
             (c.artist and c.album)
         )
+    @cached_search
     def search(self, c: SearchCriteria) -> dict:
         result = get_itunes_release_info(c.artist, c.title)
         result["platform"] = self.name
@@ -121,6 +162,7 @@ class BeatportProvider(SearchProvider):
             (c.title and c.album) or
             (c.artist and c.album)
         )
+    @cached_search
     def search(self, c: SearchCriteria) -> dict:
         hits = search_beatport(c.artist, c.title, c.album)
         entry = hits[0] if hits else {"platform":self.name,"title":"Kein Treffer"}
@@ -139,6 +181,7 @@ class BandcampProvider(SearchProvider):
             (c.title and c.album) or
             (c.artist and c.album)
         )
+    @cached_search
     def search(self, c: SearchCriteria) -> dict:
         hits = search_bandcamp(c.artist, c.title)
         entry = hits[0] if hits else {"platform":self.name,"title":"Kein Treffer"}
@@ -157,6 +200,7 @@ class TraxsourceProvider(SearchProvider):
             (c.title and c.album) or
             (c.artist and c.album)
         )
+    @cached_search
     def search(self, c: SearchCriteria) -> dict:
         hits = search_traxsource(c.artist, c.title)
         entry = hits[0] if hits else {"platform":self.name,"title":"Kein Treffer"}
@@ -166,13 +210,195 @@ class TraxsourceProvider(SearchProvider):
 # —————————————————————————————
 # Manager, der alle passenden Provider parallel startet
 # —————————————————————————————
+# Per-Provider-Deadline (Selenium-Fallbacks brauchen bis ~15s) und Gesamt-Deadline einer Suche
+DEFAULT_PROVIDER_TIMEOUT = float(os.environ.get("GEMFINDER_PROVIDER_TIMEOUT", 25.0))
+DEFAULT_OVERALL_TIMEOUT = float(os.environ.get("GEMFINDER_SEARCH_TIMEOUT", 40.0))
+
+_search_executor = None
+_search_executor_lock = threading.Lock()
+
+def get_search_executor() -> ThreadPoolExecutor:
+    """Shared worker threads for the blocking provider searches (outlive a single event loop)"""
+    global _search_executor
+    with _search_executor_lock:
+        if _search_executor is None:
+            _search_executor = ThreadPoolExecutor(
+                max_workers=int(os.environ.get("GEMFINDER_SEARCH_WORKERS", 8)),
+                thread_name_prefix="provider-search"
+            )
+        return _search_executor
+
+def error_result(platform: str, error, status: str = "error") -> dict:
+    """Ergebnis-Dict für einen fehlgeschlagenen oder abgelaufenen Provider"""
+    return {
+        "platform": platform,
+        "title": "Fehler",
+        "artist": "",
+        "album": "",
+        "label": "",
+        "price": "",
+        "cover_url": "",
+        "url": "",
+        "error": str(error),
+        "status": status,
+    }
+
+def traced_search(provider: SearchProvider, criteria: SearchCriteria) -> dict:
+    """Provider-Suche als "search"-Span - Gesamtzeit des Providers inkl. Cache-Lookup"""
+    with span("search", provider=provider.name):
+        return provider.search(criteria)
+
 class SearchManager:
-    def __init__(self, providers: list[SearchProvider]):
+    def __init__(self, providers: list[SearchProvider],
+                 provider_timeout: float = DEFAULT_PROVIDER_TIMEOUT,
+                 overall_timeout: float = DEFAULT_OVERALL_TIMEOUT,
+                 executor: Optional[ThreadPoolExecutor] = None):
         self.providers = providers
+        self.provider_timeout = provider_timeout
+        self.overall_timeout = overall_timeout
+        # Eigener Thread-Pool (z.B. Batch-Modus), sonst die geteilten Such-Worker
+        self.executor = executor
+
+    def eligible(self, criteria: SearchCriteria) -> list[SearchProvider]:
+        return [p for p in self.providers if p.can_search(criteria)]
+
+    async def stream(self, criteria: SearchCriteria,
+                     provider_timeout: Optional[float] = None,
+                     overall_timeout: Optional[float] = None,
+                     speculative: Optional["SpeculativeSearch"] = None) -> AsyncIterator[dict]:
+        """
+        Startet alle passenden Provider gleichzeitig und liefert die Ergebnisse in
+        Fertigstellungs-Reihenfolge. Provider über ihrer Deadline (oder der Gesamt-Deadline)
+        liefern ein Fehler-Dict mit status="timeout"; ihr Thread läuft im Hintergrund aus
+        und füllt noch den Such-Cache. Mit speculative werden vorab gestartete Suchen übernommen.
+        """
+        provider_timeout = self.provider_timeout if provider_timeout is None else provider_timeout
+        overall_timeout = self.overall_timeout if overall_timeout is None else overall_timeout
+        loop = asyncio.get_running_loop()
+        executor = self.executor or get_search_executor()
+        providers = self.eligible(criteria)
+
+        tasks = {}
+        for p in providers:
+            background = speculative.future(p, criteria) if speculative is not None else None
+            if background is not None:
+                # Await the running search directly - blocking a worker on it could starve the queue it waits in
+                future = self._adopt(background, p, criteria)
+            else:
+                future = loop.run_in_executor(executor, traced_search, p, criteria)
+            tasks[asyncio.ensure_future(asyncio.wait_for(future, provider_timeout))] = p
+
+        deadline = loop.time() + overall_timeout
+        pending = set(tasks)
+        try:
+            while pending:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                done, pending = await asyncio.wait(pending, timeout=remaining,
+                                                   return_when=asyncio.FIRST_COMPLETED)
+                # Gleichzeitig fertige Provider in Listen-Reihenfolge ausgeben
+                for task in sorted(done, key=lambda t: providers.index(tasks[t])):
+                    p = tasks[task]
+                    try:
+                        result = task.result()
+                    except asyncio.TimeoutError:
+                        result = error_result(p.name, f"Timeout nach {provider_timeout:.0f}s", status="timeout")
+                    except Exception as e:
+                        result = error_result(p.name, e)
+                    yield result
+
+            # Gesamt-Deadline erreicht - Nachzügler abbrechen
+            for task in sorted(pending, key=lambda t: providers.index(tasks[t])):
+                task.cancel()
+                yield error_result(tasks[task].name, f"Timeout nach {overall_timeout:.0f}s", status="timeout")
+            pending = set()
+        finally:
+            # Auch bei vorzeitigem Abbruch durch den Aufrufer (break/aclose)
+            for task in pending:
+                task.cancel()
+
+    async def _adopt(self, background, provider: SearchProvider, criteria: SearchCriteria) -> dict:
+        """Ergebnis einer spekulativen Suche übernehmen - bei Fehler oder Verwerfen normal suchen"""
+        try:
+            # shield: eine abgelaufene Deadline verwirft die Hintergrundsuche nicht, sie füllt weiter den Cache
+            return await asyncio.shield(asyncio.wrap_future(background))
+        except asyncio.CancelledError:
+            if not background.cancelled():
+                raise
+            log.debug("Speculative %s search was discarded - searching again", provider.name)
+        except Exception as e:
+            log.warning("⚠️ Speculative %s search failed (%s) - searching again", provider.name, e)
+        return await asyncio.get_running_loop().run_in_executor(self.executor or get_search_executor(),
+                                                                traced_search, provider, criteria)
+
+    def stream_sync(self, criteria: SearchCriteria, **kwargs) -> Iterator[dict]:
+        """Synchroner Iterator über stream() - für Streamlit-Skripte und Batch-Tools"""
+        loop = asyncio.new_event_loop()
+        results = self.stream(criteria, **kwargs)
+        try:
+            while True:
+                try:
+                    yield loop.run_until_complete(results.__anext__())
+                except StopAsyncIteration:
+                    break
+        finally:
+            loop.run_until_complete(results.aclose())
+            loop.close()
 
     def run_all(self, criteria: SearchCriteria) -> list[dict]:
-        results = []
-        for p in self.providers:
-            if p.can_search(criteria):
-                results.append(p.search(criteria))
-        return results
+        """Alle passenden Provider parallel - Ergebnisse in Provider-Reihenfolge"""
+        order = [p.name for p in self.eligible(criteria)]
+        results = list(self.stream_sync(criteria))
+        return sorted(results, key=lambda r: order.index(r["platform"]) if r.get("platform") in order else len(order))
+
+
+# —————————————————————————————
+# Spekulative Suche: physische Provider schon während der digitalen Stufe starten
+# —————————————————————————————
+# Default für den optionalen Modus (pro Session überschreibbar)
+SPECULATIVE_PHYSICAL_DEFAULT = os.environ.get("GEMFINDER_SPECULATIVE_PHYSICAL", "").lower() in ("1", "true", "yes")
+
+class SpeculativeSearch:
+    """
+    Provider-Suchen, die vorab im Hintergrund laufen. Wird das Ergebnis später gebraucht,
+    wird die laufende (oder fertige) Suche übernommen statt sie neu zu starten.
+    Ergebnisse landen zusätzlich über @cached_search im Such-Cache.
+    """
+
+    def __init__(self, providers: list[SearchProvider], criteria: SearchCriteria):
+        self.key = criteria_key(criteria)
+        executor = get_search_executor()
+        self.futures = {
+            p.name: executor.submit(traced_search, p, criteria)
+            for p in providers if p.can_search(criteria)
+        }
+
+    def matches(self, criteria: SearchCriteria) -> bool:
+        return criteria_key(criteria) == self.key
+
+    def is_done(self, provider: SearchProvider) -> bool:
+        future = self.futures.get(provider.name)
+        return future is not None and future.done()
+
+    def future(self, provider: SearchProvider, criteria: SearchCriteria):
+        """Vorab gestartete (nicht verworfene) Suche für diese Kriterien - sonst None"""
+        future = self.futures.get(provider.name) if self.matches(criteria) else None
+        return None if future is None or future.cancelled() else future
+
+    def result(self, provider: SearchProvider, criteria: SearchCriteria,
+               timeout: float = DEFAULT_PROVIDER_TIMEOUT) -> dict:
+        """Vorab gestartetes Ergebnis übernehmen - sonst (oder bei Fehler) normal suchen"""
+        future = self.future(provider, criteria)
+        if future is None:
+            return provider.search(criteria)
+        try:
+            return future.result(timeout=timeout)
+        except Exception as e:
+            log.warning("⚠️ Speculative %s search failed (%s) - searching again", provider.name, e)
+            return provider.search(criteria)
+
+    def cancel(self):
+        """Noch nicht gestartete Suchen verwerfen (laufende füllen weiter den Cache)"""
+        for future in self.futures.values():
+            future.cancel()
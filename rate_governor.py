@@ -0,0 +1,162 @@
+"""
+Process-wide rate-limit governor for the Discogs API
+Token bucket paced by the X-Discogs-Ratelimit* response headers; callers are served first come, first served
+"""
+import os
+import time
+import threading
+from dataclasses import dataclass
+from typing import Mapping, Optional
+
+from logging_config import get_logger
+
+log = get_logger(__name__)
+
+
+@dataclass
+class RateGovernorConfig:
+    """Configuration for an API governor (defaults can be overridden via environment)"""
+    # Requests allowed per window - Discogs allows 60/min for authenticated clients
+    limit: int = 60
+
+    # Length of the rate-limit window in seconds
+    window: float = 60.0
+
+    # Callers that would have to queue longer than this get RateLimitExceeded instead
+    max_wait: float = 8.0
+
+    # Pause after a 429 without Retry-After header
+    cooldown: float = 10.0
+
+    @classmethod
+    def from_env(cls, prefix: str = "GEMFINDER_DISCOGS") -> "RateGovernorConfig":
+        config = cls()
+        config.limit = int(os.environ.get(f"{prefix}_RATE_LIMIT", config.limit))
+        config.window = float(os.environ.get(f"{prefix}_RATE_WINDOW", config.window))
+        config.max_wait = float(os.environ.get(f"{prefix}_MAX_WAIT", config.max_wait))
+        config.cooldown = float(os.environ.get(f"{prefix}_COOLDOWN", config.cooldown))
+        return config
+
+
+class RateLimitExceeded(Exception):
+    """Raised instead of an empty result when the API quota does not allow a request in time"""
+
+    def __init__(self, service: str, retry_after: float):
+        self.service = service
+        self.retry_after = max(0.0, retry_after)
+        super().__init__(f"{service} rate limit reached - retry in {self.retry_after:.0f}s")
+
+
+class RateGovernor:
+    """
+    Thread-safe token bucket. Tokens may go negative: every caller reserves the next free
+    slot under the lock, so waiting callers are released in arrival order (FIFO).
+    """
+
+    def __init__(self, name: str, config: Optional[RateGovernorConfig] = None, clock=time.monotonic, sleep=time.sleep):
+        self.name = name
+        self.config = config or RateGovernorConfig.from_env()
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._tokens = float(self.config.limit)
+        self._updated = clock()
+        self.server_remaining: Optional[int] = None
+        self.stats_counters = {"granted": 0, "waited": 0, "rejected": 0, "throttled": 0}
+
+    @property
+    def _interval(self) -> float:
+        """Seconds until one token is refilled"""
+        return self.config.window / max(1, self.config.limit)
+
+    def _refill_locked(self):
+        now = self._clock()
+        elapsed = now - self._updated
+        self._updated = now
+        self._tokens = min(float(self.config.limit), self._tokens + elapsed / self._interval)
+
+    # —————————————————————————————
+    # Pacing
+    # —————————————————————————————
+    def expected_wait(self) -> float:
+        """Seconds a caller arriving now would have to queue"""
+        with self._lock:
+            self._refill_locked()
+            return max(0.0, (1 - self._tokens) * self._interval)
+
+    def acquire(self, max_wait: Optional[float] = None) -> float:
+        """
+        Reserve one request slot and sleep until it is due
+        Raises RateLimitExceeded (with the expected wait) if the slot is further away than max_wait
+        """
+        max_wait = self.config.max_wait if max_wait is None else max_wait
+        with self._lock:
+            self._refill_locked()
+            wait = max(0.0, (1 - self._tokens) * self._interval)
+            if wait > max_wait:
+                self.stats_counters["rejected"] += 1
+                raise RateLimitExceeded(self.name, wait)
+            self._tokens -= 1
+            self.stats_counters["granted"] += 1
+            if wait > 0:
+                self.stats_counters["waited"] += 1
+
+        if wait > 0:
+            log.info("⏳ %s: waiting %.1fs for rate limit slot", self.name, wait)
+            self._sleep(wait)
+        return wait
+
+    def update_from_headers(self, headers: Mapping[str, str]):
+        """Sync with the server's view - e.g. other processes using the same token"""
+        limit = headers.get("X-Discogs-Ratelimit")
+        remaining = headers.get("X-Discogs-Ratelimit-Remaining")
+        with self._lock:
+            self._refill_locked()
+            if limit is not None and str(limit).isdigit() and int(limit) > 0:
+                self.config.limit = int(limit)
+            if remaining is not None and str(remaining).isdigit():
+                self.server_remaining = int(remaining)
+                # Never trust the local bucket more than the server; queued reservations stay negative
+                self._tokens = min(self._tokens, float(self.server_remaining))
+
+    def on_rate_limited(self, retry_after: Optional[float] = None) -> float:
+        """Server answered 429 - block the bucket for retry_after (or the cooldown) and return that wait"""
+        pause = self.config.cooldown if retry_after is None else retry_after
+        with self._lock:
+            self._refill_locked()
+            self._tokens = min(self._tokens, 1 - pause / self._interval)
+            self.stats_counters["throttled"] += 1
+        return pause
+
+    def get_stats(self):
+        with self._lock:
+            self._refill_locked()
+            return {
+                "name": self.name,
+                "tokens": round(self._tokens, 2),
+                "limit": self.config.limit,
+                "server_remaining": self.server_remaining,
+                **self.stats_counters,
+            }
+
+
+def parse_retry_after(headers: Mapping[str, str]) -> Optional[float]:
+    value = headers.get("Retry-After")
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+_governors = {}
+_governors_lock = threading.Lock()
+
+
+def get_discogs_governor() -> RateGovernor:
+    """Process-wide governor shared by every Discogs API call (one quota per token)"""
+    with _governors_lock:
+        governor = _governors.get("Discogs")
+        if governor is None:
+            governor = RateGovernor("Discogs", RateGovernorConfig.from_env("GEMFINDER_DISCOGS"))
+            _governors["Discogs"] = governor
+        return governor
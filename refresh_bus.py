@@ -0,0 +1,135 @@
+"""
+Change notifications for event-driven UI refresh
+Background jobs publish a new version of their topic when they have new data; Streamlit fragments
+only rerun while a job on one of their topics is pending, polling fast at first and backing off
+while nothing new arrives
+"""
+import os
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional, Tuple
+
+
+@dataclass
+class RefreshConfig:
+    """Polling tiers for pending jobs (defaults can be overridden via environment)"""
+    # Seconds between fragment reruns - the next tier is used after ticks_per_tier ticks without new data
+    tiers: Tuple[float, ...] = (0.25, 0.5, 1.0, 2.0)
+
+    ticks_per_tier: int = 4
+
+    @classmethod
+    def from_env(cls) -> "RefreshConfig":
+        config = cls()
+        tiers = os.environ.get("GEMFINDER_REFRESH_TIERS")
+        if tiers:
+            config.tiers = tuple(float(t) for t in tiers.split(",") if t.strip())
+        config.ticks_per_tier = int(os.environ.get("GEMFINDER_REFRESH_TICKS_PER_TIER", config.ticks_per_tier))
+        return config
+
+
+class VersionBus:
+    """Thread-safe version counters and pending-job counts per topic"""
+
+    def __init__(self):
+        self._cond = threading.Condition(threading.Lock())
+        self._versions: Dict[str, int] = {}
+        self._pending: Dict[str, int] = {}
+
+    def publish(self, topic: str) -> int:
+        """Signal new data for topic; returns the new version"""
+        with self._cond:
+            version = self._versions.get(topic, 0) + 1
+            self._versions[topic] = version
+            self._cond.notify_all()
+            return version
+
+    def version(self, topic: str) -> int:
+        with self._cond:
+            return self._versions.get(topic, 0)
+
+    def versions(self, topics: Iterable[str]) -> Tuple[int, ...]:
+        with self._cond:
+            return tuple(self._versions.get(topic, 0) for topic in topics)
+
+    def begin(self, topic: str):
+        with self._cond:
+            self._pending[topic] = self._pending.get(topic, 0) + 1
+
+    def end(self, topic: str):
+        """Mark one job on topic as finished - also publishes, so watchers pick up the final state"""
+        with self._cond:
+            remaining = self._pending.get(topic, 0) - 1
+            if remaining > 0:
+                self._pending[topic] = remaining
+            else:
+                self._pending.pop(topic, None)
+        self.publish(topic)
+
+    @contextmanager
+    def job(self, topic: str):
+        """`with bus.job(topic): ...` - pending while the block runs, published when it ends"""
+        self.begin(topic)
+        try:
+            yield self
+        finally:
+            self.end(topic)
+
+    def pending(self, topic: str) -> int:
+        with self._cond:
+            return self._pending.get(topic, 0)
+
+    def any_pending(self, topics: Iterable[str]) -> bool:
+        with self._cond:
+            return any(self._pending.get(topic, 0) > 0 for topic in topics)
+
+    def wait_for_change(self, topics: Iterable[str], seen: Tuple[int, ...], timeout: float) -> bool:
+        """Block until one of the topics moves past the seen versions (True) or timeout (False)"""
+        topics = tuple(topics)
+        with self._cond:
+            return self._cond.wait_for(
+                lambda: tuple(self._versions.get(topic, 0) for topic in topics) != tuple(seen), timeout
+            )
+
+
+class AdaptivePoller:
+    """
+    Polling interval of one fragment: None while nothing is pending, otherwise the fastest tier
+    right after new data and slower tiers the longer the watched topics stay unchanged
+    """
+
+    def __init__(self, config: Optional[RefreshConfig] = None):
+        self.config = config or RefreshConfig.from_env()
+        self.topics: Tuple[str, ...] = ()
+        self.versions: Optional[Tuple[int, ...]] = None
+        self.idle_ticks = 0
+
+    def retarget(self, topics: Iterable[str], versions: Tuple[int, ...]):
+        """Watch other topics (e.g. another release was selected) - starts again at the fastest tier"""
+        topics = tuple(topics)
+        if topics != self.topics:
+            self.topics = topics
+            self.versions = versions
+            self.idle_ticks = 0
+
+    def observe(self, versions: Tuple[int, ...]) -> bool:
+        """Record one timer tick; returns True if new data was published since the last one"""
+        changed = versions != self.versions
+        self.versions = versions
+        self.idle_ticks = 0 if changed else self.idle_ticks + 1
+        return changed
+
+    def interval(self, pending: bool) -> Optional[float]:
+        if not pending or not self.config.tiers:
+            return None
+        tier = min(len(self.config.tiers) - 1, self.idle_ticks // max(1, self.config.ticks_per_tier))
+        return self.config.tiers[tier]
+
+
+_bus = VersionBus()
+
+
+def get_refresh_bus() -> VersionBus:
+    """Process-wide bus shared by background jobs and all Streamlit sessions (topics carry the scope)"""
+    return _bus
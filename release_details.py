@@ -0,0 +1,197 @@
+"""
+Shared cache and background prefetch for Discogs release details
+After a search the top-N releases are fetched concurrently - only with free rate-limit slots, so
+interactive calls never queue behind prefetches - and switching releases in the list reads from memory
+"""
+import os
+import time
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, Optional
+
+from logging_config import get_logger
+from rate_governor import RateGovernor, RateLimitExceeded, get_discogs_governor
+from singleflight import SingleFlight
+from tracing import span
+
+log = get_logger(__name__)
+
+# Result of a prefetch flight that found no free rate-limit slot
+_SKIPPED = object()
+
+
+@dataclass
+class ReleaseDetailsConfig:
+    """Configuration for release-detail prefetching (defaults can be overridden via environment)"""
+    # Releases of a result list that are prefetched (the UI shows up to 10)
+    top_n: int = 5
+
+    # Concurrent detail requests of the prefetcher
+    workers: int = 3
+
+    # Details change rarely (tracklist) or slowly (have/want counts)
+    ttl: float = 6 * 3600
+
+    # Upper bound of cached releases - least recently used ones are evicted first
+    max_entries: int = 500
+
+    # Rate-limit tokens left for interactive requests - prefetches are skipped below this
+    reserve: int = 10
+
+    @classmethod
+    def from_env(cls) -> "ReleaseDetailsConfig":
+        config = cls()
+        config.top_n = int(os.environ.get("GEMFINDER_DETAILS_PREFETCH", config.top_n))
+        config.workers = int(os.environ.get("GEMFINDER_DETAILS_WORKERS", config.workers))
+        config.ttl = float(os.environ.get("GEMFINDER_DETAILS_TTL", config.ttl))
+        config.reserve = int(os.environ.get("GEMFINDER_DETAILS_RESERVE", config.reserve))
+        return config
+
+
+def release_key(release: Dict) -> str:
+    """release_id of a search result (id field or the last part of the uri)"""
+    return str(release.get("id") or release.get("uri", "").split("/")[-1] or "")
+
+
+class ReleaseDetailsCache:
+    """Thread-safe TTL/LRU cache by release_id plus a bounded prefetch pool"""
+
+    def __init__(self, config: Optional[ReleaseDetailsConfig] = None, fetch: Optional[Callable] = None,
+                 governor: Optional[RateGovernor] = None, clock=time.monotonic):
+        self.config = config or ReleaseDetailsConfig.from_env()
+        self._fetch = fetch
+        self._governor = governor
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._flight = SingleFlight()
+        self._executor = ThreadPoolExecutor(max_workers=max(1, self.config.workers),
+                                            thread_name_prefix="release-details")
+        self.stats_counters = {"hits": 0, "misses": 0, "prefetched": 0, "skipped": 0}
+
+    # —————————————————————————————
+    # Cache
+    # —————————————————————————————
+    def get(self, release_id) -> Optional[Dict]:
+        """Cached details or None - never hits the API"""
+        key = str(release_id)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= self._clock():
+                self._entries.pop(key, None)
+                self.stats_counters["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats_counters["hits"] += 1
+            return entry[1]
+
+    def put(self, release_id, details: Dict):
+        with self._lock:
+            key = str(release_id)
+            self._entries[key] = (self._clock() + self.config.ttl, details)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.config.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_or_fetch(self, release_id) -> Optional[Dict]:
+        """Details of the selected release - joins a running prefetch instead of requesting twice"""
+        details = self.get(release_id)
+        if details is not None:
+            return details
+        try:
+            details = self._load(str(release_id), max_wait=None)
+            if details is _SKIPPED:
+                # Joined a prefetch that gave up without a free slot - the user may queue for one
+                details = self._load(str(release_id), max_wait=None)
+            return None if details is _SKIPPED else details
+        except RateLimitExceeded as e:
+            log.warning("Release details for %s skipped: %s", release_id, e)
+            return None
+
+    def _load(self, key: str, max_wait: Optional[float]):
+        """Details, None or _SKIPPED - callers joining the flight share the result of its max_wait"""
+        def fetch_and_store():
+            # Another caller may have stored it while this one waited for the flight
+            cached = self.get(key)
+            if cached is not None:
+                return cached
+            try:
+                details = self._fetch_fn()(key, max_wait=max_wait)
+            except RateLimitExceeded:
+                if max_wait != 0:
+                    raise
+                # Not an error for an interactive caller that joined this flight - it retries with its own max_wait
+                return _SKIPPED
+            if details is not None:
+                self.put(key, details)
+            return details
+
+        return self._flight.do(key, fetch_and_store)
+
+    # —————————————————————————————
+    # Prefetch
+    # —————————————————————————————
+    def prefetch(self, releases: Iterable[Dict]) -> int:
+        """Queue detail fetches for the top-N releases that are not cached yet; returns how many were queued"""
+        queued = 0
+        for release in list(releases)[:self.config.top_n]:
+            key = release_key(release)
+            if key and self.get(key) is None:
+                self._executor.submit(self._prefetch_one, key)
+                queued += 1
+        return queued
+
+    def _prefetch_one(self, key: str):
+        if self.get(key) is not None:
+            return
+        if self._governor_fn().get_stats()["tokens"] < self.config.reserve + 1:
+            with self._lock:
+                self.stats_counters["skipped"] += 1
+            return
+        try:
+            with span("details_prefetch", provider="Discogs", release_id=key):
+                # max_wait=0: take a slot only if one is free right now, never queue ahead of the user
+                details = self._load(key, max_wait=0)
+        except Exception as e:
+            log.warning("Prefetch of release %s failed: %s", key, e)
+            return
+        if details is _SKIPPED:
+            with self._lock:
+                self.stats_counters["skipped"] += 1
+        elif details is not None:
+            with self._lock:
+                self.stats_counters["prefetched"] += 1
+
+    def _fetch_fn(self) -> Callable:
+        if self._fetch is None:
+            from api_search import fetch_discogs_release_details
+            self._fetch = fetch_discogs_release_details
+        return self._fetch
+
+    def _governor_fn(self) -> RateGovernor:
+        if self._governor is None:
+            self._governor = get_discogs_governor()
+        return self._governor
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {"entries": len(self._entries), **self.stats_counters}
+
+    def shutdown(self, wait: bool = False):
+        """wait=True lets queued prefetches finish, otherwise they are dropped"""
+        self._executor.shutdown(wait=wait, cancel_futures=not wait)
+
+
+_cache: Optional[ReleaseDetailsCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_release_details_cache() -> ReleaseDetailsCache:
+    """Process-wide details cache shared by all Streamlit sessions"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ReleaseDetailsCache()
+        return _cache
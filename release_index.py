@@ -0,0 +1,356 @@
+"""
+Local fuzzy index of every release and track the providers have returned
+Fed by cached_search with each fresh provider answer, persisted in SQLite next to the search cache
+and searched in memory with rapidfuzz - typed input shows "previously found" candidates in
+milliseconds while the live search is still running
+Discogs releases are also kept per normalized catalog number, so a repeated catno lookup is
+answered without touching the API
+"""
+import os
+import json
+import time
+import sqlite3
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from rapidfuzz import fuzz, process
+from logging_config import get_logger
+from text_normalize import normalize_catno, normalize_key_text
+
+log = get_logger(__name__)
+
+# Placeholder titles of "no hit" answers - never indexed
+NO_HIT_TITLES = ("kein treffer", "no results", "not found", "")
+
+@dataclass
+class ReleaseIndexConfig:
+    """Configuration for the release index (defaults can be overridden via environment)"""
+    # SQLite file - shared by every process/session on this machine
+    path: str = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".gemfinder_cache", "release_index.sqlite")
+
+    # Upper bound of indexed entries - least recently seen ones are dropped first
+    max_entries: int = 20000
+
+    # rapidfuzz WRatio (0-100) a candidate needs to be shown
+    min_score: float = 80.0
+
+    # Candidates returned per lookup
+    limit: int = 5
+
+    # Shorter input matches almost everything - no lookup below this many characters
+    min_query_length: int = 3
+
+    # How long a catno -> Discogs release mapping answers searches without the API
+    catno_ttl: float = 7 * 24 * 3600
+
+    enabled: bool = True
+
+    @classmethod
+    def from_env(cls) -> "ReleaseIndexConfig":
+        config = cls()
+        config.path = os.environ.get("GEMFINDER_INDEX_PATH", config.path)
+        config.max_entries = int(os.environ.get("GEMFINDER_INDEX_MAX_ENTRIES", config.max_entries))
+        config.min_score = float(os.environ.get("GEMFINDER_INDEX_MIN_SCORE", config.min_score))
+        config.limit = int(os.environ.get("GEMFINDER_INDEX_LIMIT", config.limit))
+        config.catno_ttl = float(os.environ.get("GEMFINDER_INDEX_CATNO_TTL", config.catno_ttl))
+        config.enabled = os.environ.get("GEMFINDER_INDEX_DISABLED", "").lower() not in ("1", "true", "yes")
+        return config
+
+
+catno_key = normalize_catno
+
+
+def _catno_query(release: Dict) -> bool:
+    """Release came from a dedicated catno= query (api_search marks those)"""
+    return isinstance(release.get("catno_query"), dict)
+
+
+def _first(value) -> str:
+    """Discogs returns label lists - the index stores the first one"""
+    if isinstance(value, (list, tuple)):
+        return str(value[0]) if value else ""
+    return str(value or "")
+
+
+def entries_from_result(platform: str, result: Any) -> List[Dict]:
+    """Index entries of one provider answer (Discogs release list or a single shop hit)"""
+    if not isinstance(result, dict):
+        return []
+    rows = result.get("releases") if "releases" in result else [result]
+    entries = []
+    for row in rows or []:
+        if not isinstance(row, dict):
+            continue
+        title = str(row.get("title") or "").strip()
+        if title.lower() in NO_HIT_TITLES:
+            continue
+        url = row.get("url") or row.get("uri") or ""
+        if url.startswith("/"):
+            url = f"https://www.discogs.com{url}"
+        entries.append({
+            "platform": row.get("platform") or platform,
+            "artist": str(row.get("artist") or "").strip(),
+            "title": title,
+            "album": str(row.get("album") or "").strip(),
+            "label": _first(row.get("label")),
+            "catno": str(row.get("catno") or row.get("catalog_number") or "").strip(),
+            "year": str(row.get("year") or ""),
+            "url": url,
+            "cover_url": row.get("cover_url") or row.get("cover") or row.get("thumb") or "",
+        })
+    return entries
+
+
+def entry_key(entry: Dict) -> str:
+    if entry["url"]:
+        return f"{entry['platform']}|{entry['url']}"
+    return "|".join([entry["platform"], normalize_key_text(entry["artist"]), normalize_key_text(entry["title"]),
+                     catno_key(entry["catno"])])
+
+
+def entry_text(entry: Dict) -> str:
+    """Normalized text the fuzzy lookup runs against"""
+    return normalize_key_text(f"{entry['artist']} {entry['title']} {entry['album']}")
+
+
+class ReleaseIndex:
+    """Thread-safe in-memory fuzzy index, loaded from and written through to SQLite"""
+
+    def __init__(self, config: Optional[ReleaseIndexConfig] = None):
+        self.config = config or ReleaseIndexConfig.from_env()
+        self._lock = threading.Lock()
+        self._conn = None
+        self._loaded = False
+        self._entries: Dict[str, Dict] = {}
+        # Parallel lists for rapidfuzz - rebuilt after changes, on the next lookup
+        self._keys: List[str] = []
+        self._texts: List[str] = []
+        self._catnos: List[str] = []
+        self._dirty = True
+        # Normalized catno -> {release id: (Discogs release dict, seen_at)}
+        self._catno_releases: Dict[str, Dict[str, tuple]] = {}
+        self.stats_counters = {"added": 0, "lookups": 0, "evictions": 0, "catno_hits": 0, "catno_misses": 0}
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            if self.config.path != ":memory:":
+                os.makedirs(os.path.dirname(os.path.abspath(self.config.path)), exist_ok=True)
+            conn = sqlite3.connect(self.config.path, timeout=5.0, check_same_thread=False)
+            if self.config.path != ":memory:":
+                conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS releases (
+                    key      TEXT PRIMARY KEY,
+                    value    TEXT NOT NULL,
+                    seen_at  REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_releases_seen_at ON releases(seen_at)")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS catnos (
+                    catno       TEXT NOT NULL,
+                    release_id  TEXT NOT NULL,
+                    value       TEXT NOT NULL,
+                    seen_at     REAL NOT NULL,
+                    PRIMARY KEY (catno, release_id)
+                )
+            """)
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def _load_locked(self):
+        if self._loaded:
+            return
+        self._loaded = True
+        try:
+            conn = self._connection()
+            rows = conn.execute("SELECT key, value, seen_at FROM releases").fetchall()
+            catno_rows = conn.execute("SELECT catno, release_id, value, seen_at FROM catnos WHERE seen_at > ?",
+                                      (time.time() - self.config.catno_ttl,)).fetchall()
+        except sqlite3.Error as e:
+            # A broken index must never break the app - it starts empty
+            log.warning("⚠️ Release index read error: %s", e)
+            return
+        for key, value, seen_at in rows:
+            try:
+                entry = json.loads(value)
+            except ValueError:
+                continue
+            entry["seen_at"] = seen_at
+            self._entries[key] = entry
+        for catno, release_id, value, seen_at in catno_rows:
+            try:
+                self._catno_releases.setdefault(catno, {})[release_id] = (json.loads(value), seen_at)
+            except ValueError:
+                continue
+        self._dirty = True
+        log.debug("Release index loaded: %d entries", len(self._entries))
+
+    # —————————————————————————————
+    # Feed
+    # —————————————————————————————
+    def add_result(self, platform: str, result: Any) -> int:
+        """Index a provider answer; returns the number of entries added or refreshed"""
+        if not self.config.enabled:
+            return 0
+        entries = entries_from_result(platform, result)
+        if not entries:
+            return 0
+        now = time.time()
+        with self._lock:
+            self._load_locked()
+            rows = []
+            for entry in entries:
+                key = entry_key(entry)
+                self._entries[key] = {**entry, "seen_at": now}
+                rows.append((key, json.dumps(entry, ensure_ascii=False), now))
+            self.stats_counters["added"] += len(rows)
+            self._dirty = True
+            catno_rows = self._add_catnos_locked(platform, result, now)
+            try:
+                conn = self._connection()
+                conn.executemany("INSERT OR REPLACE INTO releases (key, value, seen_at) VALUES (?, ?, ?)", rows)
+                if catno_rows:
+                    conn.executemany("INSERT OR REPLACE INTO catnos (catno, release_id, value, seen_at) "
+                                     "VALUES (?, ?, ?, ?)", catno_rows)
+                    conn.execute("DELETE FROM catnos WHERE seen_at <= ?", (now - self.config.catno_ttl,))
+                    self._prune_catnos_locked(now - self.config.catno_ttl)
+                self._evict_locked(conn)
+                conn.commit()
+            except sqlite3.Error as e:
+                log.warning("⚠️ Release index write error: %s", e)
+        return len(entries)
+
+    def _add_catnos_locked(self, platform: str, result: Any, now: float) -> List[tuple]:
+        """
+        Map the queried catno to the releases of a fresh catno= answer; returns the SQLite rows
+        Free-text hits are skipped - they may show only one of several releases with their catno
+        """
+        if platform != "Discogs" or not isinstance(result, dict) or result.get("from_index"):
+            # Answers served from this index must not extend their own lifetime
+            return []
+        rows = []
+        for release in result.get("releases") or []:
+            if not isinstance(release, dict) or not release.get("id") or not _catno_query(release):
+                continue
+            catno = catno_key(release["catno_query"].get("catno"))
+            if not catno:
+                continue
+            release_id = str(release["id"])
+            self._catno_releases.setdefault(catno, {})[release_id] = (dict(release), now)
+            rows.append((catno, release_id, json.dumps(release, ensure_ascii=False), now))
+        return rows
+
+    def _prune_catnos_locked(self, cutoff: float):
+        """Drop expired catno mappings from memory (the SQLite rows are deleted alongside)"""
+        for catno in list(self._catno_releases):
+            releases = self._catno_releases[catno]
+            for release_id in [rid for rid, (_, seen_at) in releases.items() if seen_at <= cutoff]:
+                del releases[release_id]
+            if not releases:
+                del self._catno_releases[catno]
+
+    def _evict_locked(self, conn: sqlite3.Connection):
+        overflow = len(self._entries) - self.config.max_entries
+        if overflow <= 0:
+            return
+        oldest = sorted(self._entries, key=lambda k: self._entries[k]["seen_at"])[:overflow]
+        for key in oldest:
+            del self._entries[key]
+        conn.executemany("DELETE FROM releases WHERE key = ?", [(key,) for key in oldest])
+        self.stats_counters["evictions"] += overflow
+
+    # —————————————————————————————
+    # Lookup
+    # —————————————————————————————
+    def _rebuild_locked(self):
+        if not self._dirty:
+            return
+        self._keys = list(self._entries)
+        self._texts = [entry_text(self._entries[key]) for key in self._keys]
+        self._catnos = [catno_key(self._entries[key].get("catno")) for key in self._keys]
+        self._dirty = False
+
+    def search(self, artist: str = "", title: str = "", album: str = "", catalog: str = "",
+               limit: Optional[int] = None) -> List[Dict]:
+        """Previously seen entries matching the input, best first (each with a 0-100 "score")"""
+        if not self.config.enabled:
+            return []
+        limit = limit or self.config.limit
+        query = normalize_key_text(f"{artist} {title} {album}")
+        catno = catno_key(catalog)
+        with self._lock:
+            self._load_locked()
+            self._rebuild_locked()
+            self.stats_counters["lookups"] += 1
+            keys, texts, catnos = self._keys, self._texts, self._catnos
+
+            scores: Dict[int, float] = {}
+            if len(catno) >= self.config.min_query_length:
+                # Catalog numbers are exact identifiers - prefix matches while typing, full match ranks first
+                for i, candidate in enumerate(catnos):
+                    if candidate and candidate.startswith(catno):
+                        scores[i] = 100.0 if candidate == catno else 95.0
+            if len(query) >= self.config.min_query_length and texts:
+                for _, score, i in process.extract(query, texts, scorer=fuzz.WRatio, processor=None,
+                                                   limit=limit * 4, score_cutoff=self.config.min_score):
+                    scores[i] = max(scores.get(i, 0.0), score)
+
+            ranked = sorted(scores, key=lambda i: (-scores[i], -self._entries[keys[i]]["seen_at"]))[:limit]
+            return [{**self._entries[keys[i]], "score": round(scores[i], 1)} for i in ranked]
+
+    def releases_for_catno(self, catno: str, artist: str = "", album: str = "") -> List[Dict]:
+        """
+        Discogs releases an earlier catno= query returned for this catalog number (newest first,
+        expired ones skipped). Answers of a query narrowed to another artist are not used; with an
+        artist or album only releases matching them - catnos are not unique across labels
+        """
+        key = catno_key(catno)
+        if not self.config.enabled or len(key) < self.config.min_query_length:
+            return []
+        artist_norm = normalize_key_text(artist)
+        album_norm = normalize_key_text(album)
+        cutoff = time.time() - self.config.catno_ttl
+        with self._lock:
+            self._load_locked()
+            found = [(release, seen_at) for release, seen_at in self._catno_releases.get(key, {}).values()
+                     if seen_at > cutoff and _catno_query(release)
+                     and normalize_key_text(release["catno_query"].get("artist")) in ("", artist_norm)]
+            if artist_norm:
+                found = [(release, seen_at) for release, seen_at in found
+                         if fuzz.token_set_ratio(artist_norm, normalize_key_text(release.get("artist")))
+                         >= self.config.min_score]
+            if album_norm:
+                found = [(release, seen_at) for release, seen_at in found
+                         if fuzz.token_set_ratio(album_norm, normalize_key_text(release.get("title")))
+                         >= self.config.min_score]
+            self.stats_counters["catno_hits" if found else "catno_misses"] += 1
+        found.sort(key=lambda item: -item[1])
+        return [dict(release) for release, _ in found]
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            self._load_locked()
+            return {"entries": len(self._entries), "catnos": len(self._catno_releases),
+                    "max_entries": self.config.max_entries, **self.stats_counters}
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+_release_index: Optional[ReleaseIndex] = None
+_release_index_lock = threading.Lock()
+
+
+def get_release_index() -> ReleaseIndex:
+    """Process-wide index instance (one SQLite connection per process)"""
+    global _release_index
+    with _release_index_lock:
+        if _release_index is None:
+            _release_index = ReleaseIndex()
+        return _release_index
@@ -0,0 +1,149 @@
+"""
+Batch relevance scoring for digital search results
+The query is normalized once per search; candidates are scored together and ranked by how many
+search terms they contain, then by rapidfuzz similarity of artist/title (one batch call per field),
+then by the calculate_relevance_score points
+"""
+import os
+from typing import List, Optional, Sequence, Tuple
+
+from rapidfuzz import fuzz, process
+from text_normalize import normalize_for_matching, normalize_many
+
+# Result rows per platform that are scored (the shops list their best matches first)
+MAX_CANDIDATES = int(os.environ.get("GEMFINDER_RELEVANCE_CANDIDATES", 50))
+
+# (title, artist_found, additional_text) of one result row
+Candidate = Tuple[str, str, str]
+
+
+class RelevanceScorer:
+    """Scores many result rows against one search (artist, track, optional album)"""
+
+    def __init__(self, artist: str, track: str, album: str = ""):
+        self.artist = artist or ""
+        self.track = track or ""
+        self.album = album or ""
+        self.artist_norm = normalize_for_matching(self.artist)
+        self.track_norm = normalize_for_matching(self.track)
+
+        # Beatport word filter works on lowercased (not accent-folded) words
+        self.artist_words = self.artist.lower().split()
+        self.track_words = self.track.lower().split()
+        self.album_words = self.album.lower().split()
+
+    # —————————————————————————————
+    # Points (calculate_relevance_score)
+    # —————————————————————————————
+    def score(self, title, artist_found, additional_text="") -> int:
+        """Relevance points of one row - 0 means not relevant"""
+        return self._tier_and_score(title, artist_found, additional_text)[1]
+
+    def _tier_and_score(self, title, artist_found, additional_text) -> Tuple[int, int]:
+        """(search terms found in the row: 0-2, relevance points)"""
+        content_norm = normalize_for_matching(f"{title} {artist_found} {additional_text}")
+
+        # Check matches in content
+        artist_in_content = self.artist_norm in content_norm if self.artist_norm else False
+        track_in_content = self.track_norm in content_norm if self.track_norm else False
+
+        # Scoring system
+        if artist_in_content and track_in_content:
+            tier, score = 2, 10  # Both terms found = highest priority
+        elif artist_in_content or track_in_content:
+            tier, score = 1, 5   # One term found = medium priority
+        else:
+            return 0, 0          # No match = skip
+
+        # Bonus points for matches in title (more important than artist field)
+        title_norm = normalize_for_matching(title)
+        if self.artist_norm in title_norm:
+            score += 3
+        if self.track_norm in title_norm:
+            score += 3
+
+        # Bonus for exact word matches (not just substrings)
+        words_in_content = content_norm.split()
+        if self.artist_norm in words_in_content:
+            score += 2
+        if self.track_norm in words_in_content:
+            score += 2
+
+        return tier, score
+
+    def score_many(self, candidates: Sequence[Candidate]) -> List[int]:
+        return [self.score(*candidate) for candidate in candidates]
+
+    # —————————————————————————————
+    # Ranking
+    # —————————————————————————————
+    def similarity_many(self, candidates: Sequence[Candidate]) -> List[float]:
+        """
+        Mean rapidfuzz token-set similarity (0-100) of artist vs. artist field and track vs. title,
+        one batch call per field - a cover with "Daft Punk" in its title stays behind the original
+        """
+        fields = [(self.artist_norm, 1), (self.track_norm, 0)]
+        totals = [0.0] * len(candidates)
+        used = 0
+        for query, column in fields:
+            if not query or not candidates:
+                continue
+            used += 1
+            choices = normalize_many(candidate[column] for candidate in candidates)
+            for _, similarity, index in process.extract(query, choices, scorer=fuzz.token_set_ratio,
+                                                        processor=None, limit=None):
+                totals[index] += similarity
+        return [total / used for total in totals] if used else totals
+
+    def rank(self, candidates: Sequence[Candidate]) -> List[Tuple[int, int]]:
+        """(index, score) of all relevant rows, best first: terms found, field similarity, points, list order"""
+        tiers_scores = [self._tier_and_score(*candidate) for candidate in candidates]
+        relevant = [i for i, (_, score) in enumerate(tiers_scores) if score > 0]
+        if not relevant:
+            return []
+        similarities = self.similarity_many([candidates[i] for i in relevant])
+        order = sorted(range(len(relevant)), key=lambda k: (-tiers_scores[relevant[k]][0], -similarities[k],
+                                                            -tiers_scores[relevant[k]][1], relevant[k]))
+        return [(relevant[k], tiers_scores[relevant[k]][1]) for k in order]
+
+    def best(self, candidates: Sequence[Candidate]) -> Optional[int]:
+        """Index of the best relevant row, or None"""
+        ranked = self.rank(candidates)
+        return ranked[0][0] if ranked else None
+
+    # —————————————————————————————
+    # Platform filters
+    # —————————————————————————————
+    def word_filter(self, result_title, result_artist, result_album) -> bool:
+        """Beatport: at least one word of EACH given search term must occur in the result"""
+        result_content = f"{result_title} {result_artist} {result_album}".lower()
+
+        artist_found = any(word in result_content for word in self.artist_words) if self.artist_words else True
+        track_found = any(word in result_content for word in self.track_words) if self.track_words else True
+        album_found = any(word in result_content for word in self.album_words) if self.album_words else True
+
+        # Logic based on what search terms we have - BOTH terms must have matches
+        if self.artist and self.track:
+            return artist_found and track_found
+        elif self.artist and self.album:
+            return artist_found and album_found
+        elif self.track and self.album:
+            return track_found and album_found
+        elif self.artist:
+            return artist_found
+        elif self.track:
+            return track_found
+        elif self.album:
+            return album_found
+        return False
+
+    def term_filter(self, result_title, result_artist, result_album) -> bool:
+        """iTunes: the artist or the track must occur in one of the result fields"""
+        r_title = normalize_for_matching(result_title)
+        r_artist = normalize_for_matching(result_artist)
+        r_album = normalize_for_matching(result_album)
+        if self.artist_norm and (self.artist_norm in r_title or self.artist_norm in r_artist or self.artist_norm in r_album):
+            return True
+        if self.track_norm and (self.track_norm in r_title or self.track_norm in r_artist or self.track_norm in r_album):
+            return True
+        return False
@@ -132,93 +132,63 @@
 # scrape_search.py - DUMMY VERSION FOR FAST TESTING
 import time
 from typing import List, Dict
-import unicodedata
+import re
+import json
+from urllib.parse import quote, quote_plus
+from driver_pool import borrow_driver
+from tracing import span
+from logging_config import get_logger
+from singleflight import get_singleflight
+from relevance import MAX_CANDIDATES, RelevanceScorer
+from text_normalize import normalize_for_matching
+
+log = get_logger(__name__)
+
+# Browser-like headers for the browser-less fast paths (shared keep-alive session, see http_client)
+SCRAPE_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+                  '(KHTML, like Gecko) Chrome/124.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.9,de;q=0.8',
+}
+
+# Display symbols for shop prices that come as amount + ISO code
+CURRENCY_SYMBOLS = {'EUR': '€', 'USD': '$', 'GBP': '£'}
+
+def get_scrape_session():
+    """Get the shared keep-alive session for plain-HTTP scraping of the shop pages"""
+    from http_client import get_http_session
+    return get_http_session("scrape", headers=SCRAPE_HEADERS)
+
+def fetch_page_html(url, timeout=(3, 6)):
+    """Fetch a page via plain HTTP - returns None on any network/HTTP error"""
+    try:
+        response = get_scrape_session().get(url, timeout=timeout)
+        if response.status_code != 200:
+            log.info("⚠️ HTTP %s for %s", response.status_code, url)
+            return None
+        return response.text
+    except Exception as e:
+        log.warning("⚠️ HTTP fetch failed for %s: %s", url, e)
+        return None
 
-def normalize_for_matching(text):
-    """Normalize text for flexible matching - handles accents and case"""
-    if not text:
-        return ""
-    # Remove accents: NFD splits characters, then filter out combining marks
-    text = unicodedata.normalize('NFD', text)
-    text = ''.join(c for c in text if unicodedata.category(c) != 'Mn')
-    return text.lower().strip()
+def _xpath_class(name):
+    """XPath predicate matching one CSS class token (like the CSS selector .name)"""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
 
 def beatport_strict_filter(search_artist, search_track, search_album, result_title, result_artist, result_album):
     """
     Word-based filtering for Beatport - at least one word from EACH search term must be found
     Prevents false matches like "PICASSO Extended Mix" for "Drum Starts - Picasso"
     """
-    # Split search terms into words
-    artist_words = search_artist.lower().split() if search_artist else []
-    track_words = search_track.lower().split() if search_track else []
-    album_words = search_album.lower().split() if search_album else []
-    
-    # Combined result content (normalized)
-    result_content = f"{result_title} {result_artist} {result_album}".lower()
-    
-    # Check if at least one word from each search term is found
-    artist_found = any(word in result_content for word in artist_words) if artist_words else True
-    track_found = any(word in result_content for word in track_words) if track_words else True
-    album_found = any(word in result_content for word in album_words) if album_words else True
-    
-    # Logic based on what search terms we have - BOTH terms must have matches
-    if search_artist and search_track:
-        return artist_found and track_found
-    elif search_artist and search_album:
-        return artist_found and album_found
-    elif search_track and search_album:
-        return track_found and album_found
-    elif search_artist:
-        return artist_found
-    elif search_track:
-        return track_found
-    elif search_album:
-        return album_found
-    else:
-        return False
+    return RelevanceScorer(search_artist, search_track, search_album).word_filter(result_title, result_artist, result_album)
 
 def calculate_relevance_score(artist, track, title, artist_found, additional_text=""):
     """
     Calculate relevance score for search results
-    Higher score = more relevant result
+    Higher score = more relevant result (single row - lists are scored with RelevanceScorer)
     """
-    # Normalize all inputs
-    artist_norm = normalize_for_matching(artist)
-    track_norm = normalize_for_matching(track)
-    
-    # Create searchable content from all available fields
-    combined_content = f"{title} {artist_found} {additional_text}"
-    content_norm = normalize_for_matching(combined_content)
-    
-    score = 0
-    
-    # Check matches in content
-    artist_found_in_content = artist_norm in content_norm if artist_norm else False
-    track_found_in_content = track_norm in content_norm if track_norm else False
-    
-    # Scoring system
-    if artist_found_in_content and track_found_in_content:
-        score += 10  # Both terms found = highest priority
-    elif artist_found_in_content or track_found_in_content:
-        score += 5   # One term found = medium priority
-    else:
-        return 0     # No match = skip
-    
-    # Bonus points for matches in title (more important than artist field)
-    title_norm = normalize_for_matching(title)
-    if artist_norm in title_norm:
-        score += 3
-    if track_norm in title_norm:
-        score += 3
-        
-    # Bonus for exact word matches (not just substrings)
-    words_in_content = content_norm.split()
-    if artist_norm in words_in_content:
-        score += 2
-    if track_norm in words_in_content:
-        score += 2
-    
-    return score
+    return RelevanceScorer(artist, track).score(title, artist_found, additional_text)
 
 def flexible_search_match(artist, track, title, artist_found, additional_text=""):
     """
@@ -229,15 +199,115 @@ def flexible_search_match(artist, track, title, artist_found, additional_text=""
 # import time
 # from concurrent.futures import ThreadPoolExecutor, as_completed
 
-# --- BEATPORT DUMMY ---
+# --- BEATPORT ---
+BEATPORT_BASE_URL = "https://www.beatport.com"
+
+_NEXT_DATA_RE = re.compile(
+    r'<script[^>]*id="__NEXT_DATA__"[^>]*>(.*?)</script>', re.DOTALL
+)
+
+def extract_next_data(html):
+    """Return the state a Next.js page embeds in <script id="__NEXT_DATA__">, or None"""
+    if not html:
+        return None
+    match = _NEXT_DATA_RE.search(html)
+    if not match:
+        return None
+    try:
+        return json.loads(match.group(1))
+    except ValueError as e:
+        log.warning("Error decoding __NEXT_DATA__: %s", e)
+        return None
+
+def _slugify(text):
+    """URL slug like Beatport uses it (lowercase words joined by '-')"""
+    text = normalize_for_matching(text)
+    return re.sub(r'[^a-z0-9]+', '-', text).strip('-')
+
+def _beatport_track_lists(next_data):
+    """Yield the track lists of the dehydrated react-query state (search-tracks and search-all)"""
+    page_props = (next_data.get('props') or {}).get('pageProps') or {}
+    queries = (page_props.get('dehydratedState') or {}).get('queries') or []
+    for query in queries:
+        data = (query.get('state') or {}).get('data')
+        if not isinstance(data, dict):
+            continue
+        if isinstance(data.get('data'), list):
+            yield data['data']                      # /search/tracks
+        elif isinstance(data.get('tracks'), dict):
+            yield data['tracks'].get('data') or []  # /search (all types)
+
+def map_beatport_track(item):
+    """Map one Beatport track JSON object to the platform result fields"""
+    track_name = (item.get('track_name') or '').strip()
+    mix_name = (item.get('mix_name') or '').strip()
+    release = item.get('release') or {}
+
+    artist_names = [a.get('artist_name', '').strip() for a in item.get('artists') or []]
+    artists = ', '.join(name for name in artist_names if name)
+
+    cover_url = release.get('release_image_uri') or ''
+    if release.get('release_image_dynamic_uri'):
+        # Thumbnail size instead of the 1400x1400 original
+        cover_url = release['release_image_dynamic_uri'].replace('{w}', '250').replace('{h}', '250')
+
+    track_id = item.get('track_id')
+    return {
+        'title': f'{track_name} ({mix_name})' if mix_name else track_name,
+        'artist': artists or 'Unknown Artist',
+        'album': release.get('release_name') or track_name,
+        'label': (item.get('label') or {}).get('label_name') or 'Unknown Label',
+        'price': (item.get('price') or {}).get('display') or '',
+        'cover_url': cover_url,
+        'url': f'{BEATPORT_BASE_URL}/track/{_slugify(track_name) or "track"}/{track_id}' if track_id else '',
+        'catalog_number': item.get('catalog_number') or '',
+    }
+
+def parse_beatport_next_data(html):
+    """
+    Parse a Beatport search page via its embedded __NEXT_DATA__ JSON.
+    Returns None if the page carries no embedded state, otherwise the mapped tracks ([] = no results).
+    """
+    next_data = extract_next_data(html)
+    if next_data is None:
+        return None
+
+    tracks = []
+    for track_list in _beatport_track_lists(next_data):
+        for item in track_list:
+            if isinstance(item, dict) and item.get('track_name'):
+                tracks.append(map_beatport_track(item))
+    return tracks
+
+def select_beatport_result(tracks, artist, track, album, elapsed_time):
+    """Apply the Beatport word filter to the top tracks and return the best ranked one in platform format"""
+    scorer = RelevanceScorer(artist, track, album)
+    passed = [item for item in tracks[:MAX_CANDIDATES]
+              if scorer.word_filter(item['title'], item['artist'], item['album'])]
+    if passed:
+        # Best relevance score wins; without any scored match Beatport's own order decides
+        best = scorer.best([(item['title'], item['artist'], item['album']) for item in passed])
+        best_result = {'platform': 'Beatport', **passed[best or 0], 'search_time': elapsed_time}
+        best_result.pop('catalog_number', None)
+        log.info("✅ Beatport result: %.3fs -> %s", elapsed_time, best_result['title'])
+        return [best_result]
+
+    log.info("❌ Beatport no results: %.3fs", elapsed_time)
+    return [{
+        'platform': 'Beatport',
+        'title': 'Kein Treffer',
+        'artist': '',
+        'album': '',
+        'label': '',
+        'price': '',
+        'cover_url': '',
+        'url': '',
+        'search_time': elapsed_time
+    }]
+
 def search_beatport(artist, track, album=""):
-    """Beatport scraper with test dummy and fallback error handling"""
+    """Beatport search via embedded JSON: plain-HTTP fast path, Selenium fallback, test dummy and error handling"""
     try:
-        # Real Beatport scraper implementation
-        from selenium import webdriver
-        from selenium.webdriver.common.by import By
-        from selenium.webdriver.support.ui import WebDriverWait
-        from selenium.webdriver.support import expected_conditions as EC
         import time
         
         # Build search query based on available parameters
@@ -249,152 +319,45 @@ def search_beatport(artist, track, album=""):
         if album:
             search_terms.append(album)
         
-        search_query = "%20".join(search_terms)
-        print(f"🎧 Beatport search: '{' + '.join(search_terms)}'")
+        log.debug("🎧 Beatport search: %r", ' + '.join(search_terms))
         start_time = time.time()
         
-        url = f"https://www.beatport.com/search/tracks?q={search_query}"
-        
-        options = webdriver.ChromeOptions()
-        options.add_argument('--headless=new')
-        options.add_argument('--no-sandbox')
-        options.add_argument('--disable-dev-shm-usage')
-        options.add_argument('--disable-gpu')
-        # Keep JavaScript/CSS enabled for Beatport compatibility
-        
-        driver = webdriver.Chrome(options=options)
-        driver.get(url)
-        
-        wait = WebDriverWait(driver, 5)  # Fast timeout for speed
-        
-        # Cookies akzeptieren (falls vorhanden)
-        try:
-            wait.until(EC.element_to_be_clickable(
-                (By.XPATH, "//button[contains(text(),'Accept') or contains(text(),'I Accept')]")
-            )).click()
-        except:
-            pass
-        
-        # Check if there are any results first, instead of waiting for elements that might not exist
-        try:
-            wait.until(EC.presence_of_element_located(
-                (By.CSS_SELECTOR, 'div[data-testid="tracks-list-item"]')
-            ))
-            rows = driver.find_elements(By.CSS_SELECTOR, 'div[data-testid="tracks-list-item"]')
-        except:
-            # No track rows found - check if this is "no results" or a real error
-            page_source = driver.page_source.lower()
-            if "no results" in page_source or "keine ergebnisse" in page_source or len(page_source) > 1000:
-                # Page loaded successfully but no results found
-                print(f"📭 Beatport no results: No tracks found for search")
-                driver.quit()
-                elapsed_time = time.time() - start_time
-                return [{
-                    'platform': 'Beatport',
-                    'title': 'Kein Treffer',
-                    'artist': '',
-                    'album': '',
-                    'label': '',
-                    'price': '',
-                    'cover_url': '',
-                    'url': '',
-                    'search_time': elapsed_time
-                }]
-            else:
-                # Real error - page didn't load properly
-                raise Exception("Page did not load properly")
+        url = f"{BEATPORT_BASE_URL}/search/tracks?q={quote(' '.join(search_terms))}"
         
-        if not rows:
-            print("Beatport: No results found with any selector")
-            return [{'platform': 'Beatport', 'title': 'No results found', 'artist': '', 'album': '', 'label': '', 'price': '', 'cover_url': '', 'url': '', 'search_time': 2.0}]
+        # Fast path: one GET, the track list is embedded as JSON in the server-rendered page
+        with span("page_load", provider="Beatport", transport="http"):
+            html = fetch_page_html(url)
+        with span("parse", provider="Beatport"):
+            tracks = parse_beatport_next_data(html)
+        if tracks is not None:
+            with span("filter_score", provider="Beatport", candidates=len(tracks)):
+                return select_beatport_result(tracks, artist, track, album, time.time() - start_time)
         
-        results = []
-        candidates = []  # Collect top 3 candidates for relevance scoring
+        # Fallback: request blocked (e.g. bot challenge) - let a pooled browser load the page
+        log.warning("⚠️ Beatport HTTP fetch returned no embedded data - falling back to Selenium")
+        from selenium import webdriver
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
         
-        # Process top 3 results for relevance scoring
-        for row in rows[:3]:
+        # Borrow a warm browser from the shared pool - JS/CSS stay enabled for Beatport
+        with borrow_driver("standard") as driver:
+            with span("page_load", provider="Beatport", transport="selenium"):
+                driver.get(url)
             try:
-                # Extract title from track name - new Beatport structure
-                title_elem = row.find_element(By.CSS_SELECTOR, 'span.Lists-shared-style__ItemName-sc-cd3f7e11-7')
-                title = title_elem.text.strip()
-                
-                # Extract artists - new structure
-                artist_elems = row.find_elements(By.CSS_SELECTOR, 'div.ArtistNames-sc-72fc6023-0 a')
-                artists = ', '.join([elem.text.strip() for elem in artist_elems]) if artist_elems else 'Unknown Artist'
-                
-                # Extract label - look for label link in the meta section
-                try:
-                    label_elem = row.find_element(By.CSS_SELECTOR, 'div.Lists-shared-style__MetaRow-sc-cd3f7e11-4 a[href*="/label/"]')
-                    label = label_elem.text.strip()
-                except:
-                    label = 'Unknown Label'
-                
-                # Extract album/release from artwork link title
-                try:
-                    album_elem = row.find_element(By.CSS_SELECTOR, 'a.artwork')
-                    album = album_elem.get_attribute('title').strip()
-                except:
-                    album = title
-                
-                # Extract cover image
-                try:
-                    cover_elem = row.find_element(By.CSS_SELECTOR, 'div.Lists-shared-style__Artwork-sc-cd3f7e11-0 img')
-                    cover_url = cover_elem.get_attribute('src')
-                except:
-                    cover_url = ''
-                
-                # Extract price from cart button
-                try:
-                    price_elem = row.find_element(By.CSS_SELECTOR, 'button.add-to-cart .price')
-                    price = price_elem.text.strip()
-                except:
-                    price = ""  # No fallback price - leave empty if not found
-                
-                # Use Beatport-specific filtering (less strict than before)
-                is_relevant = beatport_strict_filter(artist, track, album, title, artists, album)
-                
-                if is_relevant:  # Only include matches that pass Beatport filter
-                    candidate = {
-                        'platform': 'Beatport',
-                        'title': title,
-                        'artist': artists,
-                        'album': album,
-                        'label': label,
-                        'price': price,
-                        'cover_url': cover_url,
-                        'url': f'https://www.beatport.com/track/{title.lower().replace(" ", "-")}',
-                        'search_time': 2.0,
-                        'relevance_score': 8  # Fixed score for valid matches
-                    }
-                    candidates.append(candidate)
-            except Exception as e:
-                print(f"Error processing Beatport row: {e}")
-                continue
+                with span("wait_for_selector", provider="Beatport"):
+                    WebDriverWait(driver, 5).until(EC.presence_of_element_located(
+                        (By.CSS_SELECTOR, 'script#__NEXT_DATA__')
+                    ))
+            except:
+                raise Exception("Page did not load properly")
+            with span("parse", provider="Beatport"):
+                tracks = parse_beatport_next_data(driver.page_source)
         
-        driver.quit()
-        elapsed_time = time.time() - start_time
-        
-        # Select best result based on relevance score
-        if candidates:
-            best_result = max(candidates, key=lambda x: x['relevance_score'])
-            # Remove score from final result (internal use only)
-            best_result.pop('relevance_score', None)
-            best_result['search_time'] = elapsed_time
-            print(f"✅ Beatport result: {elapsed_time:.3f}s -> {best_result['title']}")
-            return [best_result]
-        else:
-            print(f"❌ Beatport no results: {elapsed_time:.3f}s")
-            return [{
-                'platform': 'Beatport',
-                'title': 'Kein Treffer',
-                'artist': '',
-                'album': '',
-                'label': '',
-                'price': '',
-                'cover_url': '',
-                'url': '',
-                'search_time': elapsed_time
-            }]
+        if tracks is None:
+            raise Exception("Beatport page contains no embedded track data")
+        with span("filter_score", provider="Beatport", candidates=len(tracks)):
+            return select_beatport_result(tracks, artist, track, album, time.time() - start_time)
         
     except ImportError:
         # Test dummy for development (can be commented out to test error handling)
@@ -428,7 +391,7 @@ def search_beatport(artist, track, album=""):
     
     except Exception as e:
         elapsed_time = time.time() - locals().get('start_time', time.time())
-        print(f"❌ Beatport scraper error: {e} (after {elapsed_time:.3f}s)")
+        log.error("❌ Beatport scraper error: %s (after %.3fs)", e, elapsed_time)
         return [{
             'platform': 'Beatport',
             'title': '❌ Beatport Suche nicht verfügbar',
@@ -441,13 +404,173 @@ def search_beatport(artist, track, album=""):
             'search_time': elapsed_time
         }]
 
-# --- BANDCAMP DUMMY ---
+# --- BANDCAMP ---
+def format_bandcamp_price(amount, currency, is_track, nyp=False):
+    """Format a Bandcamp price like '€1.00 (Track)', '$7.00 (Album only)' or 'nyp (Track)'"""
+    context = "(Track)" if is_track else "(Album only)"
+    if nyp:
+        return f"nyp {context}"
+    if amount is None:
+        return ""
+    symbol = CURRENCY_SYMBOLS.get(currency)
+    value = f"{symbol}{amount:.2f}" if symbol else f"{amount:.2f} {currency or ''}".strip()
+    return f"{value} {context}" if is_track is not None else value
+
+def price_from_buy_text(buy_text):
+    """Derive the price label from the text of the '.buyItem' purchase section"""
+    buy_text = buy_text.lower()
+    
+    # Check what type of purchase is available
+    is_track_available = False
+    is_album_only = False
+    
+    # Detect track vs album availability
+    if 'buy digital track' in buy_text or 'digital track' in buy_text:
+        is_track_available = True
+    elif 'buy digital album' in buy_text or 'digital album' in buy_text:
+        is_album_only = True
+    
+    # Check for "name your price" patterns
+    nyp_phrases = ['name your price', 'nenne deinen preis', 'pay what you want']
+    has_nyp = any(phrase in buy_text for phrase in nyp_phrases)
+    
+    if has_nyp and not any(currency in buy_text for currency in ['£', '$', '€']):
+        return "nyp (Track)" if is_track_available else "nyp (Album only)"
+    
+    # Look for price patterns
+    price_patterns = [
+        r'(£\d+(?:\.\d{2})?)',
+        r'(\$\d+(?:\.\d{2})?)', 
+        r'(€\d+(?:\.\d{2})?)',
+    ]
+    
+    extracted_price = ""
+    for pattern in price_patterns:
+        matches = re.findall(pattern, buy_text)
+        if matches:
+            extracted_price = matches[0]  # Take first price found
+            break
+    
+    # Add context to price
+    if extracted_price:
+        if is_track_available:
+            return f"{extracted_price} (Track)"
+        elif is_album_only:
+            return f"{extracted_price} (Album only)"
+        return extracted_price  # Fallback without context
+    elif has_nyp:
+        return "nyp (Track)" if is_track_available else "nyp (Album only)"
+    return ""
+
+def _first_offer(offers):
+    """(amount, currency) of the first JSON-LD offer with a price"""
+    if isinstance(offers, dict):
+        offers = [offers]
+    for offer in offers or []:
+        if not isinstance(offer, dict) or offer.get('price') is None:
+            continue
+        try:
+            return float(offer['price']), offer.get('priceCurrency', '')
+        except (TypeError, ValueError):
+            continue
+    return None
+
+def _digital_album_offer(album):
+    """Offer of the digital release of a JSON-LD MusicAlbum (physical formats are skipped)"""
+    releases = album.get('albumRelease') or []
+    if isinstance(releases, dict):
+        releases = [releases]
+    for release in releases:
+        if not isinstance(release, dict):
+            continue
+        if 'DigitalFormat' in str(release.get('musicReleaseFormat', 'DigitalFormat')):
+            offer = _first_offer(release.get('offers'))
+            if offer:
+                return offer
+    return _first_offer(album.get('offers'))
+
+def parse_bandcamp_price(html):
+    """
+    Read price, currency, track-vs-album and name-your-price from a Bandcamp item page.
+    Uses the embedded data-tralbum / JSON-LD data, the server-rendered '.buyItem' text as fallback.
+    Returns '' if the page carries no purchase information.
+    """
+    import lxml.html
+
+    if not html:
+        return ""
+    try:
+        doc = lxml.html.fromstring(html)
+    except Exception as e:
+        log.warning("Error parsing Bandcamp item page: %s", e)
+        return ""
+
+    tralbum = {}
+    for raw in doc.xpath('//*[@data-tralbum]/@data-tralbum'):
+        try:
+            tralbum = json.loads(raw)
+            break
+        except ValueError:
+            continue
+
+    ld_item = {}
+    for raw in doc.xpath('//script[@type="application/ld+json"]/text()'):
+        try:
+            data = json.loads(raw)
+        except ValueError:
+            continue
+        if isinstance(data, dict) and data.get('@type') in ('MusicRecording', 'MusicAlbum'):
+            ld_item = data
+            break
+
+    item_type = tralbum.get('item_type') or {'MusicRecording': 'track', 'MusicAlbum': 'album'}.get(ld_item.get('@type'))
+    minimum_price = (tralbum.get('current') or {}).get('minimum_price')
+    try:
+        minimum_price = float(minimum_price) if minimum_price is not None else None
+    except (TypeError, ValueError):
+        # Malformed minimum price - treated as missing, like a broken JSON-LD offer
+        minimum_price = None
+    nyp_item = minimum_price == 0
+
+    # The server-rendered purchase section - shows the currency symbol as the shop displays it
+    buy_items = doc.xpath(f"//*[{_xpath_class('buyItem')}]")
+    buy_text_price = price_from_buy_text(' '.join(buy_items[0].text_content().split())) if buy_items else ""
+
+    offer, is_track = None, None
+    if item_type == 'track':
+        # Track sold on its own, otherwise only the album containing it can be bought
+        trackinfo = (tralbum.get('trackinfo') or [{}])[0] or {}
+        offer = _first_offer(ld_item.get('offers'))
+        if offer is None and minimum_price is not None and trackinfo.get('is_downloadable', True) is not False:
+            offer = (minimum_price, '')
+        is_track = offer is not None
+        if offer is None:
+            offer = _digital_album_offer(ld_item.get('inAlbum') or {})
+            nyp_item = False  # minimum_price belongs to the track, not the album
+    elif item_type == 'album':
+        offer = _digital_album_offer(ld_item)
+        if offer is None and minimum_price is not None:
+            offer = (minimum_price, '')
+        is_track = False
+
+    if offer is None or (not offer[1] and buy_text_price):
+        # No embedded price (or no currency) - use the purchase section text
+        return buy_text_price
+    amount, currency = offer
+    return format_bandcamp_price(amount, currency, is_track, nyp=nyp_item or amount == 0)
+
+def fetch_bandcamp_price(item_url):
+    """Fetch a Bandcamp item page over the shared HTTP session - None if the page could not be loaded"""
+    html = fetch_page_html(item_url, timeout=(2, 4))
+    if html is None:
+        return None
+    return parse_bandcamp_price(html)
+
 def extract_bandcamp_price(driver, item_url):
-    """Extract price from individual Bandcamp track page with Track vs Album distinction"""
+    """Extract price from individual Bandcamp track page with Track vs Album distinction (browser fallback)"""
     from selenium.webdriver.common.by import By
     from selenium.webdriver.support.ui import WebDriverWait
     from selenium.webdriver.support import expected_conditions as EC
-    import re
     try:
         # Save current window handle
         main_window = driver.current_window_handle
@@ -466,54 +589,9 @@ def extract_bandcamp_price(driver, item_url):
         try:
             # Wait for buy section to load
             buy_item = wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, '.buyItem')))
-            buy_text = buy_item.text.lower()
-            
-            # Check what type of purchase is available
-            is_track_available = False
-            is_album_only = False
-            
-            # Detect track vs album availability
-            if 'buy digital track' in buy_text or 'digital track' in buy_text:
-                is_track_available = True
-            elif 'buy digital album' in buy_text or 'digital album' in buy_text:
-                is_album_only = True
-            
-            # Check for "name your price" patterns
-            nyp_phrases = ['name your price', 'nenne deinen preis', 'pay what you want']
-            has_nyp = any(phrase in buy_text for phrase in nyp_phrases)
-            
-            if has_nyp and not any(currency in buy_text for currency in ['£', '$', '€']):
-                price = "nyp (Track)" if is_track_available else "nyp (Album only)"
-            else:
-                # Look for price patterns
-                price_patterns = [
-                    r'(£\d+(?:\.\d{2})?)',
-                    r'(\$\d+(?:\.\d{2})?)', 
-                    r'(€\d+(?:\.\d{2})?)',
-                ]
-                
-                extracted_price = ""
-                for pattern in price_patterns:
-                    matches = re.findall(pattern, buy_text)
-                    if matches:
-                        extracted_price = matches[0]  # Take first price found
-                        break
-                
-                # Add context to price
-                if extracted_price:
-                    if is_track_available:
-                        price = f"{extracted_price} (Track)"
-                    elif is_album_only:
-                        price = f"{extracted_price} (Album only)"
-                    else:
-                        price = extracted_price  # Fallback without context
-                elif has_nyp:
-                    price = "nyp (Track)" if is_track_available else "nyp (Album only)"
-                else:
-                    price = ""
-                    
+            price = price_from_buy_text(buy_item.text)
         except Exception as e:
-            print(f"Timeout or error on Bandcamp track page: {e}")
+            log.debug("Timeout or error on Bandcamp track page: %s", e)
             price = ""
         
         # Close the tab and switch back
@@ -523,7 +601,7 @@ def extract_bandcamp_price(driver, item_url):
         return price
         
     except Exception as e:
-        print(f"❌ Error extracting Bandcamp price: {e}")
+        log.warning("❌ Error extracting Bandcamp price: %s", e)
         # Make sure we're back to main window
         try:
             if len(driver.window_handles) > 1:
@@ -543,148 +621,111 @@ def search_bandcamp(artist, track):
         from selenium.webdriver.support import expected_conditions as EC
         import time
         
-        print(f"🎼 Bandcamp search: '{artist}' - '{track}'")
+        log.debug("🎼 Bandcamp search: %r - %r", artist, track)
         start_time = time.time()
         
         url = f"https://bandcamp.com/search?q={artist}%20{track}"
         
-        options = webdriver.ChromeOptions()
-        options.add_argument('--headless=new')
-        options.add_argument('--no-sandbox')
-        options.add_argument('--disable-dev-shm-usage')
-        options.add_argument('--disable-gpu')
-        
-        # Performance optimizations for faster loading
-        options.add_argument('--disable-features=VizDisplayCompositor')
-        options.add_argument('--disable-background-timer-throttling')
-        options.add_argument('--disable-renderer-backgrounding')
-        options.add_argument('--disable-backgrounding-occluded-windows')
-        options.add_argument('--disable-ipc-flooding-protection')
-        options.add_argument('--dns-prefetch-disable')
-        options.add_argument('--disable-default-apps')
-        
-        # 1) DOM-ready strategy - stop at DOM complete, not all resources
-        options.add_argument('--page-load-strategy=eager')
-        
-        # 2) Block images and CSS for faster loading (we only need URLs from HTML)
-        options.add_argument('--blink-settings=imagesEnabled=false')
-        options.add_argument('--disable-extensions')
-        
-        # 3) JavaScript optimizations - block unnecessary resources
-        options.add_experimental_option("prefs", {
-            "profile.managed_default_content_settings.images": 2,  # Block images
-            "profile.default_content_setting_values.notifications": 2,  # Block notifications
-            "profile.default_content_settings.popups": 0  # Block popups
-        })
-        
-        driver = webdriver.Chrome(options=options)
-        
-        # 4) Reduce implicit wait time (applies to all find_element calls)
-        driver.implicitly_wait(2)  # Down from default 15s
-        
-        # Set shorter page load timeout
-        driver.set_page_load_timeout(5)  # Down from unlimited
-        driver.get(url)
+        # Borrow a warm browser (images blocked, DOM-ready loading) from the shared pool
+        with borrow_driver("lightweight") as driver:
+            with span("page_load", provider="Bandcamp", transport="selenium"):
+                driver.get(url)
         
-        # Reduced explicit wait time
-        wait = WebDriverWait(driver, 5)  # Down from 15s
+            # Reduced explicit wait time
+            wait = WebDriverWait(driver, 5)  # Down from 15s
         
-        # Check if there are any results first, instead of waiting for elements that might not exist
-        try:
-            search_results = wait.until(
-                EC.presence_of_all_elements_located((By.CSS_SELECTOR, 'li.searchresult'))
-            )
-        except:
-            # No search results found - check if this is "no results" or a real error
-            page_source = driver.page_source.lower()
-            if "no results" in page_source or "keine ergebnisse" in page_source or len(page_source) > 1000:
-                # Page loaded successfully but no results found
-                print(f"📭 Bandcamp no results: No search results found")
-                driver.quit()
-                elapsed_time = time.time() - start_time
-                return [{
-                    'platform': 'Bandcamp',
-                    'title': 'Kein Treffer',
-                    'artist': '',
-                    'album': '',
-                    'label': '',
-                    'price': '',
-                    'cover_url': '',
-                    'url': '',
-                    'search_time': elapsed_time
-                }]
-            else:
-                # Real error - page didn't load properly
-                raise Exception("Page did not load properly")
-        
-        results = []
-        candidates = []  # Collect top 3 candidates for relevance scoring
-        
-        for result in search_results[:3]:  # Process top 3 for relevance scoring
+            # Check if there are any results first, instead of waiting for elements that might not exist
             try:
-                title = result.find_element(By.CSS_SELECTOR, '.heading a').text.strip()
-                
-                try:
-                    artist_name = result.find_element(By.CSS_SELECTOR, '.subhead').text.replace('by ', '').strip()
-                except:
-                    artist_name = 'N/A'
-                
-                try:
-                    album_elem = result.find_element(By.CSS_SELECTOR, '.itemtype').text.strip()
-                except:
-                    album_elem = 'album'
+                with span("wait_for_selector", provider="Bandcamp"):
+                    search_results = wait.until(
+                        EC.presence_of_all_elements_located((By.CSS_SELECTOR, 'li.searchresult'))
+                    )
+            except:
+                # No search results found - check if this is "no results" or a real error
+                page_source = driver.page_source.lower()
+                if "no results" in page_source or "keine ergebnisse" in page_source or len(page_source) > 1000:
+                    # Page loaded successfully but no results found
+                    log.info("📭 Bandcamp no results: No search results found")
+                    elapsed_time = time.time() - start_time
+                    return [{
+                        'platform': 'Bandcamp',
+                        'title': 'Kein Treffer',
+                        'artist': '',
+                        'album': '',
+                        'label': '',
+                        'price': '',
+                        'cover_url': '',
+                        'url': '',
+                        'search_time': elapsed_time
+                    }]
+                else:
+                    # Real error - page didn't load properly
+                    raise Exception("Page did not load properly")
+        
+            candidates = []  # Parsed rows, scored together below
+            # Every DOM lookup is a WebDriver round trip - only the top 3 rows are parsed
+            with span("parse_score", provider="Bandcamp", candidates=len(search_results[:3])):
+                for result in search_results[:3]:
+                    try:
+                        title = result.find_element(By.CSS_SELECTOR, '.heading a').text.strip()
                 
-                cover_url = result.find_element(By.CSS_SELECTOR, '.art img').get_attribute('src')
-                item_url = result.find_element(By.CSS_SELECTOR, '.itemurl a').get_attribute('href')
+                        try:
+                            artist_name = result.find_element(By.CSS_SELECTOR, '.subhead').text.replace('by ', '').strip()
+                        except:
+                            artist_name = 'N/A'
                 
-                # Extract label from URL
-                try:
-                    label = item_url.split(".bandcamp.com")[0].replace("https://", "") if ".bandcamp.com" in item_url else "Independent"
-                except:
-                    label = "Independent"
+                        try:
+                            album_elem = result.find_element(By.CSS_SELECTOR, '.itemtype').text.strip()
+                        except:
+                            album_elem = 'album'
                 
-                # Extract real price from individual track page (only for relevant results)
-                # Pre-calculate relevance to avoid unnecessary price extraction
-                temp_score = calculate_relevance_score(artist, track, title, artist_name)
-                if temp_score > 0:
-                    price = extract_bandcamp_price(driver, item_url)
-                else:
-                    price = ""  # Skip price extraction for irrelevant results
+                        cover_url = result.find_element(By.CSS_SELECTOR, '.art img').get_attribute('src')
+                        item_url = result.find_element(By.CSS_SELECTOR, '.itemurl a').get_attribute('href')
                 
-                # Calculate relevance score for this result
-                score = calculate_relevance_score(artist, track, title, artist_name)
+                        # Extract label from URL
+                        try:
+                            label = item_url.split(".bandcamp.com")[0].replace("https://", "") if ".bandcamp.com" in item_url else "Independent"
+                        except:
+                            label = "Independent"
                 
-                if score > 0:  # Only include relevant matches
-                    candidate = {
-                        'platform': 'Bandcamp',
-                        'title': title,
-                        'artist': artist_name,
-                        'album': album_elem,
-                        'label': label,
-                        'price': price,
-                        'cover_url': cover_url,
-                        'url': item_url,
-                        'search_time': 1.5,
-                        'relevance_score': score
-                    }
-                    candidates.append(candidate)
-            except Exception as e:
-                print(f"Error processing Bandcamp result: {e}")
-                continue
-        
-        driver.quit()
-        elapsed_time = time.time() - start_time
-        
-        # Select best result based on relevance score
-        if candidates:
-            best_result = max(candidates, key=lambda x: x['relevance_score'])
-            # Remove score from final result (internal use only)
-            best_result.pop('relevance_score', None)
+                        candidates.append({
+                            'platform': 'Bandcamp',
+                            'title': title,
+                            'artist': artist_name,
+                            'album': album_elem,
+                            'label': label,
+                            'price': '',
+                            'cover_url': cover_url,
+                            'url': item_url,
+                            'search_time': time.time() - start_time
+                        })
+                    except Exception as e:
+                        log.debug("Error processing Bandcamp result: %s", e)
+                        continue
+        
+                # Select best result based on relevance score (price is fetched for the winner only)
+                best = RelevanceScorer(artist, track).best([(c['title'], c['artist'], '') for c in candidates])
+        
+        if best is not None:
+            best_result = candidates[best]
+            
+            # Price from the item page over plain HTTP - no extra browser tab
+            with span("price_lookup", provider="Bandcamp", transport="http"):
+                price = fetch_bandcamp_price(best_result['url'])
+            if price is None:
+                # Item page blocked/unreachable over HTTP - check it in a pooled browser
+                with borrow_driver("lightweight") as driver, \
+                        span("price_lookup", provider="Bandcamp", transport="selenium"):
+                    price = extract_bandcamp_price(driver, best_result['url'])
+            best_result['price'] = price
+            
+            elapsed_time = time.time() - start_time
             best_result['search_time'] = elapsed_time
-            print(f"✅ Bandcamp result: {elapsed_time:.3f}s -> {best_result['title']}")
+            log.info("✅ Bandcamp result: %.3fs -> %s", elapsed_time, best_result['title'])
             return [best_result]
         else:
-            print(f"❌ Bandcamp no results: {elapsed_time:.3f}s")
+            elapsed_time = time.time() - start_time
+            log.info("❌ Bandcamp no results: %.3fs", elapsed_time)
             return [{
                 'platform': 'Bandcamp',
                 'title': 'Kein Treffer',
@@ -728,7 +769,8 @@ def search_bandcamp(artist, track):
             }]
     
     except Exception as e:
-        print(f"❌ Bandcamp scraper error: {e}")
+        elapsed_time = time.time() - locals().get('start_time', time.time())
+        log.error("❌ Bandcamp scraper error: %s (after %.3fs)", e, elapsed_time)
         return [{
             'platform': 'Bandcamp',
             'title': '❌ Bandcamp Suche nicht verfügbar',
@@ -738,132 +780,145 @@ def search_bandcamp(artist, track):
             'price': '',
             'cover_url': '',
             'url': '',
-            'search_time': 0.1
+            'search_time': elapsed_time
         }]
 
-# --- TRAXSOURCE DUMMY ---
+# --- TRAXSOURCE ---
+TRAXSOURCE_BASE_URL = "https://www.traxsource.com"
+
+def parse_traxsource_rows(html):
+    """
+    Parse the server-rendered Traxsource search page (div.trk-row) into plain dicts.
+    Returns [] when the page has no track rows.
+    """
+    import lxml.html
+
+    if not html:
+        return []
+    try:
+        doc = lxml.html.fromstring(html)
+    except Exception as e:
+        log.warning("Error parsing Traxsource HTML: %s", e)
+        return []
+
+    rows = []
+    for row in doc.xpath(f"//div[{_xpath_class('trk-row')}]"):
+        title_links = row.xpath(f".//div[{_xpath_class('title')}]/a")
+        if not title_links:
+            continue
+        title_link = title_links[0]
+
+        artist_names = [a.text_content().strip() for a in row.xpath(f".//div[{_xpath_class('artists')}]/a")]
+        labels = row.xpath(f".//div[{_xpath_class('label')}]/a")
+        prices = row.xpath(f".//span[{_xpath_class('price')}]")
+        covers = row.xpath(f".//div[{_xpath_class('thumb')}]//img/@src")
+
+        href = title_link.get('href', '')
+        rows.append({
+            'track_id': row.get('data-trid', ''),
+            'title': title_link.text_content().strip(),
+            'artists': ', '.join(name for name in artist_names if name),
+            'label': labels[0].text_content().strip() if labels else '',
+            'price': prices[0].text_content().strip() if prices else '',
+            'cover_url': covers[0] if covers else '',
+            'url': f"{TRAXSOURCE_BASE_URL}{href}" if href.startswith('/') else href,
+        })
+    return rows
+
+def is_traxsource_no_results_page(html):
+    """Traxsource renders an explicit 'No results found for ...' message for empty searches"""
+    return bool(html) and "no results found for" in html.lower()
+
+def select_traxsource_result(rows, artist, track, elapsed_time):
+    """Score the top rows in one batch and return the best match in the platform result format"""
+    rows = rows[:MAX_CANDIDATES]
+    best = RelevanceScorer(artist, track).best([(row['title'], row['artists'], row['label']) for row in rows])
+
+    if best is not None:
+        row = rows[best]
+        best_result = {
+            'platform': 'Traxsource',
+            'title': f"{row['title']} (Extended Mix)",
+            'artist': row['artists'],
+            'album': row['title'],  # Traxsource uses track title as album
+            'label': row['label'],
+            'price': row['price'] or "$2.99",  # Default price
+            'cover_url': row['cover_url'],
+            'url': row['url'],
+            'search_time': elapsed_time
+        }
+        log.info("✅ Traxsource result: %.3fs -> %s", elapsed_time, best_result['title'])
+        return [best_result]
+
+    log.info("❌ Traxsource no results: %.3fs", elapsed_time)
+    return [{
+        'platform': 'Traxsource',
+        'title': 'Kein Treffer',
+        'artist': '',
+        'album': '',
+        'label': '',
+        'price': '',
+        'cover_url': '',
+        'url': '',
+        'search_time': elapsed_time
+    }]
+
 def search_traxsource(artist, track):
-    """Traxsource scraper with test dummy and fallback error handling"""
+    """Traxsource search: plain-HTTP fast path, Selenium fallback, test dummy and error handling"""
     try:
-        # Real Traxsource scraper implementation
+        import time
+
+        log.debug("🎶 Traxsource search: %r - %r", artist, track)
+        start_time = time.time()
+
+        url = f"{TRAXSOURCE_BASE_URL}/search?term={quote_plus(f'{artist} {track}')}"
+
+        # Fast path: the search page is server-rendered, no browser needed
+        with span("page_load", provider="Traxsource", transport="http"):
+            html = fetch_page_html(url)
+        with span("parse", provider="Traxsource"):
+            rows = parse_traxsource_rows(html)
+        if rows or is_traxsource_no_results_page(html):
+            with span("filter_score", provider="Traxsource", candidates=len(rows)):
+                return select_traxsource_result(rows, artist, track, time.time() - start_time)
+
+        # Fallback: page blocked or markup changed - render it in a pooled browser
+        log.warning("⚠️ Traxsource HTTP parse found no rows - falling back to Selenium")
         from selenium import webdriver
         from selenium.webdriver.common.by import By
         from selenium.webdriver.support.ui import WebDriverWait
         from selenium.webdriver.support import expected_conditions as EC
-        import time
-        
-        print(f"🎶 Traxsource search: '{artist}' - '{track}'")
-        start_time = time.time()
-        
-        url = f"https://www.traxsource.com/search?term={artist}+{track}"
-        
-        options = webdriver.ChromeOptions()
-        options.add_argument('--headless=new')
-        options.add_argument('--no-sandbox')
-        options.add_argument('--disable-dev-shm-usage')
-        options.add_argument('--disable-gpu')
-        # Keep JavaScript/CSS enabled for Traxsource compatibility
-        
-        driver = webdriver.Chrome(options=options)
-        
-        driver.get(url)
-        wait = WebDriverWait(driver, 10)
-        
-        # Check if there are any results first, instead of waiting for elements that might not exist
-        try:
-            track_rows = wait.until(
-                EC.presence_of_all_elements_located((By.CSS_SELECTOR, 'div.trk-row'))
-            )
-        except:
-            # No track rows found - check if this is "no results" or a real error
-            page_source = driver.page_source.lower()
-            if "no results" in page_source or "no tracks found" in page_source or len(page_source) > 1000:
-                # Page loaded successfully but no results found
-                print(f"📭 Traxsource no results: No tracks found for search")
-                driver.quit()
-                elapsed_time = time.time() - start_time
-                return [{
-                    'platform': 'Traxsource',
-                    'title': 'Kein Treffer',
-                    'artist': '',
-                    'album': '',
-                    'label': '',
-                    'price': '',
-                    'cover_url': '',
-                    'url': '',
-                    'search_time': elapsed_time
-                }]
-            else:
-                # Real error - page didn't load properly
-                raise Exception("Page did not load properly")
-        
-        results = []
-        candidates = []  # Collect top 3 candidates for relevance scoring
-        
-        for row in track_rows[:3]:  # Process top 3 for relevance scoring
+
+        # Borrow a warm browser from the shared pool - JS/CSS stay enabled for Traxsource
+        with borrow_driver("standard") as driver:
+            with span("page_load", provider="Traxsource", transport="selenium"):
+                driver.get(url)
+            wait = WebDriverWait(driver, 10)
+
+            # Check if there are any results first, instead of waiting for elements that might not exist
             try:
-                title = row.find_element(By.CSS_SELECTOR, 'div.title a').text.strip()
-                artists = row.find_element(By.CSS_SELECTOR, 'div.artists').text.strip()
-                label = row.find_element(By.CSS_SELECTOR, 'div.label a').text.strip()
-                
-                try:
-                    price = row.find_element(By.CSS_SELECTOR, 'span.price').text.strip()
-                except:
-                    price = "$2.99"  # Default price
-                
-                # Cover-Image
-                try:
-                    img_elem = row.find_element(By.CSS_SELECTOR, 'div.thumb img')
-                    cover_url = img_elem.get_attribute('src') if img_elem else ''
-                except:
-                    cover_url = ''
-                
-                # Calculate relevance score for this result
-                score = calculate_relevance_score(artist, track, title, artists, label)
-                
-                if score > 0:  # Only include relevant matches
-                    candidate = {
-                        'platform': 'Traxsource',
-                        'title': f'{title} (Extended Mix)',
-                        'artist': artists,
-                        'album': title,  # Traxsource uses track title as album
-                        'label': label,
-                        'price': price,
-                        'cover_url': cover_url,
-                        'url': f'https://traxsource.com/track/{title.lower().replace(" ", "-")}',
-                        'search_time': 1.0,
-                        'relevance_score': score
-                    }
-                    candidates.append(candidate)
-            except Exception as e:
-                print(f"Error processing Traxsource row: {e}")
-                continue
-        
-        driver.quit()
-        elapsed_time = time.time() - start_time
-        
-        # Select best result based on relevance score
-        if candidates:
-            best_result = max(candidates, key=lambda x: x['relevance_score'])
-            # Remove score from final result (internal use only)
-            best_result.pop('relevance_score', None)
-            best_result['search_time'] = elapsed_time
-            print(f"✅ Traxsource result: {elapsed_time:.3f}s -> {best_result['title']}")
-            return [best_result]
-        else:
-            print(f"❌ Traxsource no results: {elapsed_time:.3f}s")
-            return [{
-                'platform': 'Traxsource',
-                'title': 'Kein Treffer',
-                'artist': '',
-                'album': '',
-                'label': '',
-                'price': '',
-                'cover_url': '',
-                'url': '',
-                'search_time': elapsed_time
-            }]
-        
+                with span("wait_for_selector", provider="Traxsource"):
+                    wait.until(
+                        EC.presence_of_all_elements_located((By.CSS_SELECTOR, 'div.trk-row'))
+                    )
+            except:
+                # No track rows found - check if this is "no results" or a real error
+                page_source = driver.page_source.lower()
+                if "no results" in page_source or "no tracks found" in page_source or len(page_source) > 1000:
+                    # Page loaded successfully but no results found
+                    log.info("📭 Traxsource no results: No tracks found for search")
+                    return select_traxsource_result([], artist, track, time.time() - start_time)
+                else:
+                    # Real error - page didn't load properly
+                    raise Exception("Page did not load properly")
+
+            # Parse the rendered DOM in one go instead of one WebDriver round-trip per field
+            with span("parse", provider="Traxsource"):
+                rows = parse_traxsource_rows(driver.page_source)
+
+        with span("filter_score", provider="Traxsource", candidates=len(rows)):
+            return select_traxsource_result(rows, artist, track, time.time() - start_time)
+
     except ImportError:
         # Test dummy for development (can be commented out to test error handling)
         time.sleep(0.1)
@@ -895,7 +950,8 @@ def search_traxsource(artist, track):
             }]
     
     except Exception as e:
-        print(f"❌ Traxsource scraper error: {e}")
+        elapsed_time = time.time() - locals().get('start_time', time.time())
+        log.error("❌ Traxsource scraper error: %s (after %.3fs)", e, elapsed_time)
         return [{
             'platform': 'Traxsource',
             'title': '❌ Traxsource Suche nicht verfügbar',
@@ -905,21 +961,144 @@ def search_traxsource(artist, track):
             'price': '',
             'cover_url': '',
             'url': '',
-            'search_time': 0.1
+            'search_time': elapsed_time
         }]
 
-# --- REVIBED DUMMY ---
+# --- REVIBED ---
+REVIBED_BASE_URL = "https://revibed.com"
+
+def _revibed_text(value):
+    """Plain text of a Revibed JSON field that may be a string, a {name/title} object or a list of those"""
+    if isinstance(value, list):
+        return ', '.join(text for text in (_revibed_text(v) for v in value) if text)
+    if isinstance(value, dict):
+        for key in ('name', 'title', 'value'):
+            if isinstance(value.get(key), str):
+                return value[key].strip()
+        return ''
+    return str(value).strip() if value is not None else ''
+
+def _revibed_field(item, *keys):
+    """First non-empty field of item among keys (the marketplace item schema is not documented)"""
+    for key in keys:
+        text = _revibed_text(item.get(key))
+        if text:
+            return text
+    return ''
+
+def _revibed_price(item):
+    price = item.get('price')
+    if isinstance(price, dict):
+        amount = price.get('value', price.get('amount'))
+        currency = price.get('currency') or price.get('currencyCode') or item.get('currency') or 'EUR'
+    else:
+        amount, currency = price, item.get('currency') or 'EUR'
+    if amount is None:
+        return _revibed_field(item, 'priceFormatted', 'priceLabel')
+    try:
+        amount = float(amount)
+    except (TypeError, ValueError):
+        return str(amount)
+    symbol = CURRENCY_SYMBOLS.get(str(currency).upper())
+    return f"{symbol}{amount:.2f}" if symbol else f"{amount:.2f} {currency}"
+
+def _revibed_cover(item):
+    for key in ('cover', 'covers', 'image', 'images', 'imageUrl', 'coverUrl'):
+        value = item.get(key)
+        if isinstance(value, list):
+            value = value[0] if value else None
+        if isinstance(value, dict):
+            value = value.get('url') or value.get('path') or value.get('src')
+        if isinstance(value, str) and value:
+            return value if value.startswith('http') else f"{REVIBED_BASE_URL}/{value.lstrip('/')}"
+    return ''
+
+def map_revibed_item(item):
+    """Map one marketplace item of the server-rendered state to the Revibed row fields"""
+    url = _revibed_field(item, 'url', 'link')
+    if not url and item.get('id') is not None:
+        url = f"{REVIBED_BASE_URL}/marketplace/{item['id']}"
+    elif url.startswith('/'):
+        url = f"{REVIBED_BASE_URL}{url}"
+    return {
+        'title': _revibed_field(item, 'artists', 'artist', 'projectName', 'title') or 'N/A',
+        'album': _revibed_field(item, 'album', 'albumTitle', 'releaseTitle', 'name') or 'N/A',
+        'label': _revibed_field(item, 'labels', 'label'),
+        'price': _revibed_price(item),
+        'cover_url': _revibed_cover(item),
+        'url': url,
+    }
+
+def parse_revibed_marketplace(html):
+    """
+    Parse the marketplace list that Revibed server-renders into __NEXT_DATA__.
+    Returns None if the page carries no (server-loaded) list, otherwise the mapped items ([] = no results).
+    """
+    next_data = extract_next_data(html)
+    if next_data is None:
+        return None
+    initial_state = (next_data.get('props') or {}).get('initialState') or {}
+    marketplace = initial_state.get('MarketplaceListReducer')
+    if not isinstance(marketplace, dict):
+        return None
+
+    items = marketplace.get('list') or []
+    if not items and not marketplace.get('getMarketplaceListFromApi'):
+        # List was not loaded on the server - only the browser would fill it
+        return None
+    return [map_revibed_item(item) for item in items if isinstance(item, dict)]
+
+def select_revibed_result(items, artist, album, elapsed_time):
+    """Check the first item against the search (Revibed: Artist OR Album priority) and return it in platform format"""
+    results = []
+
+    for item in items[:1]:  # Only first result for speed
+        # Filter by search keywords (Revibed: Artist OR Album priority)
+        if artist and artist.strip():
+            # Priority: Artist search
+            search_match = flexible_search_match(artist, "", item['title'], "", item['album'])
+        elif album and album.strip():
+            # Fallback: Album search
+            search_match = flexible_search_match("", album, item['title'], "", item['album'])
+        else:
+            search_match = False
+
+        if search_match:
+            results.append({
+                'platform': 'Revibed',
+                'title': item['title'],
+                'artist': artist,  # Use provided artist
+                'album': item['album'],
+                'label': item['label'],
+                'price': item['price'],
+                'cover_url': item['cover_url'],
+                'url': item['url'] or f"{REVIBED_BASE_URL}/item/{item['title'].lower().replace(' ', '-')}",
+                'search_time': elapsed_time
+            })
+
+    # Return first result or no results
+    if results:
+        log.info("✅ Revibed result: %.3fs -> %s", elapsed_time, results[0]['title'])
+        return results
+    log.info("❌ Revibed no results: %.3fs", elapsed_time)
+    return [{
+        'platform': 'Revibed',
+        'title': 'Kein Treffer',
+        'artist': '',
+        'album': '',
+        'label': '',
+        'price': '',
+        'cover_url': '',
+        'url': '',
+        'search_time': elapsed_time
+    }]
+
 def search_revibed(artist, album):
-    """Revibed scraper with test dummy and fallback error handling"""
+    """Revibed search: server-rendered marketplace state over HTTP, Selenium fallback, test dummy and error handling"""
     try:
-        # Real Revibed scraper implementation
-        from selenium import webdriver
-        from selenium.webdriver.common.by import By
-        from selenium.webdriver.support.ui import WebDriverWait
-        from selenium.webdriver.support import expected_conditions as EC
         import time
         
-        print(f"💿 Revibed search: artist='{artist}' album='{album}'")
+        log.debug("💿 Revibed search: artist=%r album=%r", artist, album)
         start_time = time.time()
         
         # Revibed search logic: Priority Artist first, then Album (not combined!)
@@ -944,167 +1123,106 @@ def search_revibed(artist, album):
                 'message': "Für Revibed-Suche muss mindestens Album ODER Artist ausgefüllt sein."
             }]
         
-        url = f"https://revibed.com/marketplace/buy-now-rare-vinyl-records-cds-&-cassette-tapes?query={search_query.replace(' ', '+')}&sort=totalPurchasesCount%2CDESC&size=25&page=0"
-        
-        options = webdriver.ChromeOptions()
-        options.add_argument('--headless=new')
-        options.add_argument('--no-sandbox')
-        options.add_argument('--disable-dev-shm-usage')
-        options.add_argument('--disable-gpu')
-        # Performance optimizations for faster loading
-        options.add_argument('--disable-features=VizDisplayCompositor')
-        options.add_argument('--disable-background-timer-throttling')
-        options.add_argument('--disable-renderer-backgrounding')
-        options.add_argument('--disable-backgrounding-occluded-windows')
-        options.add_argument('--disable-ipc-flooding-protection')
-        # Reduce timeout-related delays
-        options.add_argument('--dns-prefetch-disable')
-        options.add_argument('--disable-default-apps')
+        url = f"{REVIBED_BASE_URL}/marketplace/buy-now-rare-vinyl-records-cds-&-cassette-tapes?query={quote_plus(search_query)}&sort=totalPurchasesCount%2CDESC&size=25&page=0"
         
-        # 1) DOM-ready strategy - stop at DOM complete, not all resources
-        options.add_argument('--page-load-strategy=eager')
+        # Fast path: the marketplace list is part of the server-rendered Redux state
+        with span("page_load", provider="Revibed", transport="http"):
+            html = fetch_page_html(url)
+        with span("parse", provider="Revibed"):
+            items = parse_revibed_marketplace(html)
+        if items is not None:
+            with span("filter_score", provider="Revibed", candidates=len(items)):
+                return select_revibed_result(items, artist, album, time.time() - start_time)
         
-        # 2) Block images and CSS for faster loading (we only need URLs from HTML)
-        options.add_argument('--blink-settings=imagesEnabled=false')
-        options.add_argument('--disable-extensions')
-        
-        # 3) JavaScript optimizations - block unnecessary resources
-        options.add_experimental_option("prefs", {
-            "profile.managed_default_content_settings.images": 2,  # Block images
-            "profile.default_content_setting_values.notifications": 2,  # Block notifications
-            "profile.default_content_settings.popups": 0  # Block popups
-        })
-        
-        driver = webdriver.Chrome(options=options)
-        
-        # 4) Reduce implicit wait time (applies to all find_element calls)
-        driver.implicitly_wait(2)  # Down from default 15s
+        # Fallback: no server-side list - render the page in a pooled browser
+        log.warning("⚠️ Revibed HTTP fetch returned no marketplace state - falling back to Selenium")
+        from selenium import webdriver
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
         
-        # Set shorter page load timeout
-        driver.set_page_load_timeout(5)  # Down from 10s
-        driver.get(url)
+        # Borrow a warm browser (images blocked, DOM-ready loading) from the shared pool
+        with borrow_driver("lightweight") as driver:
+            with span("page_load", provider="Revibed", transport="selenium"):
+                driver.get(url)
         
-        # Reduced explicit wait time 
-        wait = WebDriverWait(driver, 5)  # Down from 8s
+            # Reduced explicit wait time 
+            wait = WebDriverWait(driver, 5)  # Down from 8s
         
-        # Check if there are any results first, instead of waiting for elements that might not exist
-        try:
-            items = wait.until(
-                EC.presence_of_all_elements_located((By.CSS_SELECTOR, "div.styles_marketplaceGoods__r5WKf"))
-            )
-        except:
-            # No items found - check if this is "no results" or a real error
-            page_source = driver.page_source.lower()
-            if "no results" in page_source or "keine ergebnisse" in page_source or len(page_source) > 1000:
-                # Page loaded successfully but no results found
-                print(f"📭 Revibed no results: No items found for search")
-                driver.quit()
-                elapsed_time = time.time() - start_time
-                return [{
-                    'platform': 'Revibed',
-                    'title': 'Kein Treffer',
-                    'artist': '',
-                    'album': '',
-                    'label': '',
-                    'price': '',
-                    'cover_url': '',
-                    'url': '',
-                    'search_time': elapsed_time
-                }]
-            else:
-                # Real error - page didn't load properly
-                raise Exception("Page did not load properly")
+            # Check if there are any results first, instead of waiting for elements that might not exist
+            try:
+                with span("wait_for_selector", provider="Revibed"):
+                    elements = wait.until(
+                        EC.presence_of_all_elements_located((By.CSS_SELECTOR, "div.styles_marketplaceGoods__r5WKf"))
+                    )
+            except:
+                # No items found - check if this is "no results" or a real error
+                page_source = driver.page_source.lower()
+                if "no results" in page_source or "keine ergebnisse" in page_source or len(page_source) > 1000:
+                    # Page loaded successfully but no results found
+                    log.info("📭 Revibed no results: No items found for search")
+                    return select_revibed_result([], artist, album, time.time() - start_time)
+                else:
+                    # Real error - page didn't load properly
+                    raise Exception("Page did not load properly")
         
-        results = []
+            items = []
         
-        for item in items[:1]:  # Only first result for speed
-            try:
+            for element in elements[:1]:  # Only first result for speed
                 try:
-                    title = item.find_element(By.CSS_SELECTOR, ".styles_projectNames__project__title__D49o3").text.strip()
-                except:
-                    title = 'N/A'
+                    try:
+                        title = element.find_element(By.CSS_SELECTOR, ".styles_projectNames__project__title__D49o3").text.strip()
+                    except:
+                        title = 'N/A'
                 
-                try:
-                    album_name = item.find_element(By.CSS_SELECTOR, ".styles_projectNames__album__title__V25wN").text.strip()
-                except:
-                    album_name = 'N/A'
+                    try:
+                        album_name = element.find_element(By.CSS_SELECTOR, ".styles_projectNames__album__title__V25wN").text.strip()
+                    except:
+                        album_name = 'N/A'
                 
-                try:
-                    cover_url = item.find_element(By.CSS_SELECTOR, "img").get_attribute('src')
-                except:
-                    cover_url = ''
+                    try:
+                        cover_url = element.find_element(By.CSS_SELECTOR, "img").get_attribute('src')
+                    except:
+                        cover_url = ''
                 
-                # Extract real price
-                try:
-                    price_elem = item.find_element(By.CSS_SELECTOR, ".styles_marketplaceGoods__price__content__NwHxk")
-                    price = price_elem.text.strip()
-                except:
+                    # Extract real price
                     try:
-                        # Alternative price selector
-                        price_elem = item.find_element(By.CSS_SELECTOR, "[class*='price']")
+                        price_elem = element.find_element(By.CSS_SELECTOR, ".styles_marketplaceGoods__price__content__NwHxk")
                         price = price_elem.text.strip()
                     except:
-                        price = ""
+                        try:
+                            # Alternative price selector
+                            price_elem = element.find_element(By.CSS_SELECTOR, "[class*='price']")
+                            price = price_elem.text.strip()
+                        except:
+                            price = ""
                 
-                # Extract real label
-                try:
-                    label_elem = item.find_element(By.CSS_SELECTOR, ".styles_projectNames__project__label__IJ3r5")
-                    label = label_elem.text.strip()
-                except:
+                    # Extract real label
                     try:
-                        # Alternative label selector
-                        label_elem = item.find_element(By.CSS_SELECTOR, "[class*='label']")
+                        label_elem = element.find_element(By.CSS_SELECTOR, ".styles_projectNames__project__label__IJ3r5")
                         label = label_elem.text.strip()
                     except:
-                        label = ""
+                        try:
+                            # Alternative label selector
+                            label_elem = element.find_element(By.CSS_SELECTOR, "[class*='label']")
+                            label = label_elem.text.strip()
+                        except:
+                            label = ""
                 
-                # Filter by search keywords (Revibed: Artist OR Album priority)
-                if artist and artist.strip():
-                    # Priority: Artist search
-                    search_match = flexible_search_match(artist, "", title, "", album_name)
-                elif album and album.strip():
-                    # Fallback: Album search
-                    search_match = flexible_search_match("", album, title, "", album_name)
-                else:
-                    search_match = False
-                    
-                if search_match:
-                    results.append({
-                        'platform': 'Revibed',
+                    items.append({
                         'title': title,
-                        'artist': artist,  # Use provided artist
                         'album': album_name,
                         'label': label,
                         'price': price,
                         'cover_url': cover_url,
-                        'url': f'https://revibed.com/item/{title.lower().replace(" ", "-")}',
-                        'search_time': 1.5
+                        'url': ''
                     })
-            except Exception as e:
-                print(f"Error processing Revibed item: {e}")
-                continue
-        
-        driver.quit()
-        elapsed_time = time.time() - start_time
+                except Exception as e:
+                    log.debug("Error processing Revibed item: %s", e)
+                    continue
         
-        # Return first result or no results
-        if results:
-            results[0]['search_time'] = elapsed_time
-            print(f"✅ Revibed result: {elapsed_time:.3f}s -> {results[0]['title']}")
-            return [results[0]]
-        else:
-            print(f"❌ Revibed no results: {elapsed_time:.3f}s")
-            return [{
-                'platform': 'Revibed',
-                'title': 'Kein Treffer',  
-                'artist': '',
-                'album': '',
-                'label': '',
-                'price': '',
-                'cover_url': '',
-                'url': '',
-                'search_time': elapsed_time
-            }]
+        with span("filter_score", provider="Revibed", candidates=len(items)):
+            return select_revibed_result(items, artist, album, time.time() - start_time)
         
     except ImportError:
         # Test dummy for development (can be commented out to test error handling)
@@ -1151,7 +1269,8 @@ def search_revibed(artist, album):
             }]
     
     except Exception as e:
-        print(f"❌ Revibed scraper error: {e}")
+        elapsed_time = time.time() - locals().get('start_time', time.time())
+        log.error("❌ Revibed scraper error: %s (after %.3fs)", e, elapsed_time)
         return [{
             'platform': 'Revibed',
             'title': '❌ Revibed Suche nicht verfügbar',
@@ -1161,7 +1280,7 @@ def search_revibed(artist, album):
             'price': '',
             'cover_url': '',
             'url': '',
-            'search_time': 0.1
+            'search_time': elapsed_time
         }]
 
 # ----- True parallel wrapper function -----
@@ -1180,7 +1299,7 @@ def search_digital_releases_parallel(artist, track, album, catno):
     
     start_time = time.time()
     
-    with ThreadPoolExecutor(max_workers=3) as executor:
+    with span("digital", provider="orchestrator"), ThreadPoolExecutor(max_workers=3) as executor:
         # Submit all platform searches in parallel
         future_to_platform = {
             executor.submit(func, artist, track): name 
@@ -1192,12 +1311,11 @@ def search_digital_releases_parallel(artist, track, album, catno):
             platform_name = future_to_platform[future]
             try:
                 result = future.result()
-                search_time = result[0].get('search_time', 0)
-                title = result[0].get('title', '-')
-                print(f"[{platform_name}] Suchzeit: {search_time}s — Ergebnis: {title}")
+                log.debug("[%s] Suchzeit: %ss — Ergebnis: %s", platform_name,
+                          result[0].get('search_time', 0), result[0].get('title', '-'))
                 results.extend(result)
             except Exception as exc:
-                print(f"{platform_name} generated an exception: {exc}")
+                log.error("%s generated an exception: %s", platform_name, exc)
                 results.append({
                     "platform": platform_name,
                     "title": "Fehler / Kein Treffer", 
@@ -1210,8 +1328,7 @@ def search_digital_releases_parallel(artist, track, album, catno):
                     "search_time": 0.1
                 })
     
-    total_time = time.time() - start_time
-    print(f"Parallel search completed in {total_time:.2f}s")
+    log.info("Parallel search completed in %.2fs", time.time() - start_time)
     
     return results
 
@@ -1232,13 +1349,14 @@ def search_digital_releases_parallel(artist, track, album, catno):
 
 
 from typing import List, Dict, Optional
-from discogs_scraper import create_discogs_scraper
+from discogs_scraper import get_discogs_scraper
 from utils import parse_price, CURRENCY_MAPPING
 
 def scrape_discogs_marketplace_offers(
     release_id: str,
     max_offers: Optional[int] = 10,
-    user_country: Optional[str] = None
+    user_country: Optional[str] = None,
+    raise_errors: bool = False
 ) -> List[Dict]:
     """
     Production-ready Discogs marketplace scraper integration
@@ -1247,6 +1365,8 @@ def scrape_discogs_marketplace_offers(
         release_id:   Discogs release ID
         max_offers:   Maximum number of offers to return
         user_country: ISO-Länderkürzel (z. B. "DE", "US")
+        raise_errors: Fehler weiterreichen statt [] zurückzugeben (Hintergrund-Jobs
+                      müssen "keine Angebote" von "Scraping fehlgeschlagen" unterscheiden)
 
     Returns:
         Liste von Angeboten in der lokalen Währung, angereichert um
@@ -1259,20 +1379,18 @@ def scrape_discogs_marketplace_offers(
     )
 
     try:
-        # Scraper mit Server-Konfiguration erzeugen
-        scraper = create_discogs_scraper(
-            headless=True,
-            enable_cache=True,
-            use_proxies=False
+        # Langlebiger Scraper pro Land - teilt den Marketplace-Cache mit allen Sessions
+        scraper = get_discogs_scraper(user_country)
+
+        # Angebote scrapen (marketplace_url nutzt scraper.config.user_country)
+        # Gleichzeitige Abfragen desselben Releases (beliebte Releases, mehrere Sessions) teilen sich einen Browser-Lauf
+        raw = get_singleflight().do(
+            ("discogs_marketplace", str(release_id), scraper.config.user_country, max_offers),
+            scraper.scrape_marketplace_offers, release_id, max_offers
         )
 
-        # user_country in den Scraper-Config schreiben, damit das
-        # build von marketplace_url korrekt funktioniert
-        if user_country:
-            scraper.config.user_country = user_country.upper()
-
-        # Angebote scrapen (interne Methode liest scraper.config.user_country)
-        raw = scraper.scrape_marketplace_offers(release_id, max_offers)
+        if raw.get("status") in ("timeout_error", "scraping_error"):
+            raise RuntimeError(raw.get("error") or f"Discogs marketplace {raw['status'].replace('_', ' ')}")
 
         offers = raw.get("offers", [])
         filtered = []
@@ -1296,11 +1414,15 @@ def scrape_discogs_marketplace_offers(
         return filtered
 
     except ImportError:
-        print("❌ Discogs scraper import error: Production scraper not available")
+        log.error("❌ Discogs scraper import error: Production scraper not available")
+        if raise_errors:
+            raise
         return []
 
     except Exception as e:
-        print(f"❌ Discogs scraper error: {e}")
+        log.error("❌ Discogs scraper error: %s", e)
+        if raise_errors:
+            raise
         return []
 
 
@@ -0,0 +1,294 @@
+"""
+Persistent search result cache shared by all Streamlit sessions and restarts
+SQLite-backed, keyed by provider name + normalized search criteria
+"""
+import os
+import json
+import time
+import sqlite3
+import threading
+import functools
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+from singleflight import get_singleflight
+from text_normalize import normalize_key_text
+from release_index import get_release_index
+from logging_config import get_logger
+
+log = get_logger(__name__)
+
+
+def _default_ttls() -> Dict[str, float]:
+    return {
+        # Digital shops: catalogue and prices change slowly
+        "iTunes": 12 * 3600,
+        "Beatport": 12 * 3600,
+        "Bandcamp": 12 * 3600,
+        "Traxsource": 12 * 3600,
+        # Physical: release search is stable, second-hand stock is not
+        "Discogs": 6 * 3600,
+        "Revibed": 3600,
+    }
+
+
+@dataclass
+class SearchCacheConfig:
+    """Configuration for the on-disk search cache (defaults can be overridden via environment)"""
+    # SQLite file - shared by every process/session on this machine
+    path: str = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".gemfinder_cache", "search_cache.sqlite")
+
+    # Upper bound of stored entries - least recently used ones are evicted first
+    max_entries: int = 5000
+
+    # TTL for namespaces without an explicit entry in ttls
+    default_ttl: float = 3600.0
+
+    # Per-provider TTLs in seconds
+    ttls: Dict[str, float] = field(default_factory=_default_ttls)
+
+    enabled: bool = True
+
+    @classmethod
+    def from_env(cls) -> "SearchCacheConfig":
+        config = cls()
+        config.path = os.environ.get("GEMFINDER_CACHE_PATH", config.path)
+        config.max_entries = int(os.environ.get("GEMFINDER_CACHE_MAX_ENTRIES", config.max_entries))
+        config.default_ttl = float(os.environ.get("GEMFINDER_CACHE_DEFAULT_TTL", config.default_ttl))
+        config.enabled = os.environ.get("GEMFINDER_CACHE_DISABLED", "").lower() not in ("1", "true", "yes")
+        for provider in list(config.ttls):
+            # e.g. GEMFINDER_CACHE_TTL_BEATPORT=600
+            env_ttl = os.environ.get(f"GEMFINDER_CACHE_TTL_{provider.upper()}")
+            if env_ttl is not None:
+                config.ttls[provider] = float(env_ttl)
+        return config
+
+    def ttl_for(self, namespace: str) -> float:
+        return self.ttls.get(namespace, self.default_ttl)
+
+
+def criteria_key(criteria) -> str:
+    """Stable cache key for a SearchCriteria (or any object with title/artist/album/catalog)"""
+    return json.dumps({
+        "title": normalize_key_text(getattr(criteria, "title", "")),
+        "artist": normalize_key_text(getattr(criteria, "artist", "")),
+        "album": normalize_key_text(getattr(criteria, "album", "")),
+        "catalog": normalize_key_text(getattr(criteria, "catalog", "")),
+    }, sort_keys=True)
+
+
+# Titles the scrapers use for failures - those results must not be cached
+ERROR_MARKERS = ("nicht verfügbar", "fehler", "error", "❌")
+
+
+def is_cacheable_result(result: Any) -> bool:
+    """Only cache real answers (hits and 'Kein Treffer'), never scraper/API failures"""
+    if not isinstance(result, dict) or result.get("error"):
+        return False
+    if "releases" in result and not result["releases"]:
+        # Discogs API failures also come back as an empty release list
+        return False
+    text = f"{result.get('title', '')} {result.get('message', '')}".lower()
+    return not any(marker in text for marker in ERROR_MARKERS)
+
+
+class SearchCache:
+    """Thread-safe SQLite cache with per-namespace TTLs, LRU eviction and hit/miss counters"""
+
+    def __init__(self, config: Optional[SearchCacheConfig] = None):
+        self.config = config or SearchCacheConfig.from_env()
+        self._lock = threading.Lock()
+        self._conn = None
+        self.stats_counters: Dict[str, Dict[str, int]] = {}
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            if self.config.path != ":memory:":
+                os.makedirs(os.path.dirname(os.path.abspath(self.config.path)), exist_ok=True)
+            conn = sqlite3.connect(self.config.path, timeout=5.0, check_same_thread=False)
+            if self.config.path != ":memory:":
+                # WAL lets several app processes read while one writes
+                conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS entries (
+                    namespace   TEXT NOT NULL,
+                    key         TEXT NOT NULL,
+                    value       TEXT NOT NULL,
+                    created_at  REAL NOT NULL,
+                    expires_at  REAL NOT NULL,
+                    last_access REAL NOT NULL,
+                    PRIMARY KEY (namespace, key)
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_last_access ON entries(last_access)")
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def _count(self, namespace: str, outcome: str, amount: int = 1):
+        counters = self.stats_counters.setdefault(namespace, {"hits": 0, "misses": 0, "stores": 0, "evictions": 0})
+        counters[outcome] += amount
+
+    # —————————————————————————————
+    # Get / set
+    # —————————————————————————————
+    def get(self, namespace: str, key: str) -> Optional[Any]:
+        """Return the cached value or None (missing or expired)"""
+        if not self.config.enabled:
+            return None
+        now = time.time()
+        with self._lock:
+            try:
+                conn = self._connection()
+                row = conn.execute(
+                    "SELECT value, expires_at FROM entries WHERE namespace = ? AND key = ?",
+                    (namespace, key)
+                ).fetchone()
+                if row is None:
+                    self._count(namespace, "misses")
+                    return None
+                value, expires_at = row
+                if expires_at <= now:
+                    conn.execute("DELETE FROM entries WHERE namespace = ? AND key = ?", (namespace, key))
+                    conn.commit()
+                    self._count(namespace, "misses")
+                    return None
+                conn.execute(
+                    "UPDATE entries SET last_access = ? WHERE namespace = ? AND key = ?",
+                    (now, namespace, key)
+                )
+                conn.commit()
+                self._count(namespace, "hits")
+                return json.loads(value)
+            except (sqlite3.Error, ValueError) as e:
+                # A broken cache must never break a search
+                log.warning("⚠️ Search cache read error: %s", e)
+                self._count(namespace, "misses")
+                return None
+
+    def set(self, namespace: str, key: str, value: Any, ttl: Optional[float] = None):
+        """Store a JSON-serialisable value; evicts least recently used entries above max_entries"""
+        if not self.config.enabled:
+            return
+        ttl = self.config.ttl_for(namespace) if ttl is None else ttl
+        if ttl <= 0:
+            return
+        now = time.time()
+        with self._lock:
+            try:
+                conn = self._connection()
+                conn.execute(
+                    "INSERT OR REPLACE INTO entries (namespace, key, value, created_at, expires_at, last_access) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (namespace, key, json.dumps(value, ensure_ascii=False), now, now + ttl, now)
+                )
+                self._count(namespace, "stores")
+                self._evict_locked(conn, namespace)
+                conn.commit()
+            except (sqlite3.Error, TypeError, ValueError) as e:
+                log.warning("⚠️ Search cache write error: %s", e)
+
+    def _evict_locked(self, conn: sqlite3.Connection, namespace: str):
+        (total,) = conn.execute("SELECT COUNT(*) FROM entries").fetchone()
+        overflow = total - self.config.max_entries
+        if overflow <= 0:
+            return
+        cursor = conn.execute(
+            "DELETE FROM entries WHERE rowid IN "
+            "(SELECT rowid FROM entries ORDER BY last_access ASC LIMIT ?)",
+            (overflow,)
+        )
+        self._count(namespace, "evictions", cursor.rowcount)
+
+    # —————————————————————————————
+    # Maintenance
+    # —————————————————————————————
+    def invalidate(self, namespace: Optional[str] = None, key: Optional[str] = None):
+        """Drop one entry, one namespace or (without arguments) everything"""
+        with self._lock:
+            conn = self._connection()
+            if namespace is None:
+                conn.execute("DELETE FROM entries")
+            elif key is None:
+                conn.execute("DELETE FROM entries WHERE namespace = ?", (namespace,))
+            else:
+                conn.execute("DELETE FROM entries WHERE namespace = ? AND key = ?", (namespace, key))
+            conn.commit()
+
+    def purge_expired(self) -> int:
+        with self._lock:
+            conn = self._connection()
+            cursor = conn.execute("DELETE FROM entries WHERE expires_at <= ?", (time.time(),))
+            conn.commit()
+            return cursor.rowcount
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            try:
+                (entries,) = self._connection().execute("SELECT COUNT(*) FROM entries").fetchone()
+            except sqlite3.Error:
+                entries = 0
+            hits = sum(c["hits"] for c in self.stats_counters.values())
+            misses = sum(c["misses"] for c in self.stats_counters.values())
+            return {
+                "entries": entries,
+                "max_entries": self.config.max_entries,
+                "hits": hits,
+                "misses": misses,
+                "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+                "namespaces": {name: dict(c) for name, c in self.stats_counters.items()},
+            }
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+_search_cache: Optional[SearchCache] = None
+_search_cache_lock = threading.Lock()
+
+
+def get_search_cache() -> SearchCache:
+    """Process-wide cache instance (one SQLite connection per process)"""
+    global _search_cache
+    with _search_cache_lock:
+        if _search_cache is None:
+            _search_cache = SearchCache()
+        return _search_cache
+
+
+def cached_search(search_method):
+    """
+    Decorator for SearchProvider.search(self, criteria):
+    answers from the shared cache, coalesces identical in-flight searches
+    and stores fresh, non-error results under the provider name (and in the release index)
+    """
+    @functools.wraps(search_method)
+    def wrapper(self, criteria):
+        cache = get_search_cache()
+        namespace = self.name
+        key = criteria_key(criteria)
+
+        start_time = time.time()
+        cached = cache.get(namespace, key)
+        if cached is not None:
+            cached["cached"] = True
+            if "search_time" in cached:
+                cached["search_time"] = time.time() - start_time
+            log.debug("💾 %s cache hit", namespace)
+            return cached
+
+        def run_and_store():
+            result = search_method(self, criteria)
+            if is_cacheable_result(result):
+                cache.set(namespace, key, result)
+                get_release_index().add_result(namespace, result)
+            return result
+
+        # Identical searches already running (other sessions, quick reruns) share one execution
+        result = get_singleflight().do((namespace, key), run_and_store)
+        # Every caller gets its own top-level dict - callers annotate results in place
+        return dict(result) if isinstance(result, dict) else result
+
+    return wrapper
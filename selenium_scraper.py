@@ -4,8 +4,12 @@ Uses real browser automation for individual offer page access
 """
 import time
 import re
-from typing import List, Dict, Optional
+from typing import Callable, List, Dict, Optional
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from driver_pool import borrow_driver
+from logging_config import get_logger, SAMPLED
+
+log = get_logger(__name__)
 
 try:
     from selenium import webdriver
@@ -17,7 +21,7 @@ try:
     SELENIUM_AVAILABLE = True
 except ImportError:
     SELENIUM_AVAILABLE = False
-    print("Selenium not available - falling back to basic filtering")
+    log.warning("Selenium not available - falling back to basic filtering")
 
 def create_selenium_driver(headless: bool = True, aggressive: bool = True) -> webdriver.Chrome:
     """Create optimized Chrome driver for fast Discogs scraping"""
@@ -57,9 +61,9 @@ def create_selenium_driver(headless: bool = True, aggressive: bool = True) -> we
     # Page load strategy - keep 'eager' for reliability 
     options.page_load_strategy = 'eager'  # Don't wait for all resources but ensure HTML is loaded
     if aggressive:
-        print("Selenium: Using AGGRESSIVE timeouts with 'eager' page load strategy")
+        log.debug("Using AGGRESSIVE timeouts with 'eager' page load strategy")
     else:
-        print("Selenium: Using SAFE mode")
+        log.debug("Using SAFE mode")
     
     driver = webdriver.Chrome(options=options)
     
@@ -76,10 +80,14 @@ def create_selenium_driver(headless: bool = True, aggressive: bool = True) -> we
     
     return driver
 
+def borrow_offer_driver():
+    """Borrow a warm aggressive-mode browser from the shared pool for offer pages"""
+    return borrow_driver("discogs_offers", factory=lambda: create_selenium_driver(headless=True, aggressive=True))
+
 def selenium_extract_offer_details(offer_url: str, user_country: str = "DE") -> Optional[Dict]:
     """
     Extract shipping and availability details from individual offer page using Selenium
-    (Creates new browser session - use selenium_extract_offer_details_with_driver for reuse)
+    (Borrows a pooled browser - use selenium_extract_offer_details_with_driver with your own driver)
     
     Args:
         offer_url: Full URL to the Discogs offer page
@@ -88,13 +96,8 @@ def selenium_extract_offer_details(offer_url: str, user_country: str = "DE") ->
     Returns:
         Dict with availability and shipping info, or None if unavailable
     """
-    driver = None
-    try:
-        driver = create_selenium_driver(headless=True)
+    with borrow_offer_driver() as driver:
         return selenium_extract_offer_details_with_driver(driver, offer_url, user_country)
-    finally:
-        if driver:
-            driver.quit()
 
 def selenium_extract_offer_details_with_driver(driver, offer_url: str, user_country: str = "DE") -> Optional[Dict]:
     """
@@ -109,7 +112,7 @@ def selenium_extract_offer_details_with_driver(driver, offer_url: str, user_coun
         Dict with availability and shipping info, or None if unavailable
     """
     try:
-        print(f"Selenium: Accessing {offer_url}")
+        log.debug("Accessing %s", offer_url)
         start_time = time.time()
         driver.get(offer_url)
         
@@ -130,7 +133,7 @@ def selenium_extract_offer_details_with_driver(driver, offer_url: str, user_coun
             for element in unavailable_elements:
                 element_text = element.text.strip()
                 if f'{country_name.lower()}' in element_text.lower() or 'germany' in element_text.lower():
-                    print(f"Selenium: Found availability restriction: {element_text}")
+                    log.debug("Found availability restriction: %s", element_text)
                     return None  # Filter out unavailable offers
         except Exception:
             pass  # Continue if availability check fails
@@ -147,21 +150,21 @@ def selenium_extract_offer_details_with_driver(driver, offer_url: str, user_coun
             'extraction_time': extraction_time
         }
         
-        print(f"Selenium: Extracted shipping - {result['shipping_cost']} ({extraction_time:.2f}s)")
+        log.debug("Extracted shipping - %s (%.2fs)", result['shipping_cost'], extraction_time)
         return result
         
     except TimeoutException:
-        print("Selenium: Page load timeout")
+        log.warning("Page load timeout: %s", offer_url)
         return {'available': True, 'shipping_cost': 'Unknown', 'shipping_amount': 0.0}
         
     except Exception as e:
-        print(f"Selenium: Error extracting offer details - {e}")
+        log.warning("Error extracting offer details from %s - %s", offer_url, e)
         return {'available': True, 'shipping_cost': 'Unknown', 'shipping_amount': 0.0}
 
 def extract_shipping_with_selenium(driver, user_country: str = "DE") -> Dict:
     """Extract shipping cost using Selenium element selection - focused on pricing areas only"""
     try:
-        print("Selenium: Looking for shipping information in pricing areas...")
+        log.debug("Looking for shipping information in pricing areas...")
         
         # Strategy 1: Look for the specific 'reduced' span that contains shipping info
         try:
@@ -173,13 +176,13 @@ def extract_shipping_with_selenium(driver, user_country: str = "DE") -> Dict:
                 if not span_text:
                     continue
                 # Only log non-empty spans
-                print(f"Selenium: Found shipping span: '{span_text}'")
+                log.debug("Found shipping span: %r", span_text, extra=SAMPLED)
                 if '+' in span_text and ('versand' in span_text.lower() or 'shipping' in span_text.lower()):
                     result = parse_selenium_shipping(span_text, user_country)
                     if result.get('shipping_cost') != 'Unknown':
                         return result
         except Exception as e:
-            print(f"Selenium: Error scanning reduced spans: {e}")
+            log.debug("Error scanning reduced spans: %s", e)
         
         # Strategy 2: Look in table cells that contain pricing info
         try:
@@ -187,26 +190,26 @@ def extract_shipping_with_selenium(driver, user_country: str = "DE") -> Dict:
             price_cells = driver.find_elements(By.CSS_SELECTOR, 'td.item_price')
             for cell in price_cells:
                 cell_text = cell.text.strip()
-                print(f"Selenium: Price cell text: '{cell_text}'")
+                log.debug("Price cell text: %r", cell_text, extra=SAMPLED)
                 
                 # Look for shipping spans within price cells
                 shipping_spans = cell.find_elements(By.CSS_SELECTOR, 'span.hide_mobile, span.reduced')
                 for span in shipping_spans:
                     span_text = span.text.strip()
-                    print(f"Selenium: Shipping span text: '{span_text}'")
+                    log.debug("Shipping span text: %r", span_text, extra=SAMPLED)
                     if span_text and ('+' in span_text or 'shipping' in span_text.lower() or 'versand' in span_text.lower()):
                         result = parse_selenium_shipping(span_text)
                         if result.get('shipping_cost') != 'Unknown':
                             return result
         except Exception as e:
-            print(f"Selenium: Error scanning price cells: {e}")
+            log.debug("Error scanning price cells: %s", e)
         
         # Strategy 2: Look for the pricing_info paragraph specifically  
         try:
             pricing_paragraphs = driver.find_elements(By.CSS_SELECTOR, 'p.pricing_info.muted')
             for p in pricing_paragraphs:
                 p_text = p.text.strip()
-                print(f"Selenium: Pricing paragraph: '{p_text}'")
+                log.debug("Pricing paragraph: %r", p_text, extra=SAMPLED)
                 
                 # Only process if it's short (not terms and conditions)
                 if len(p_text) < 200 and ('+' in p_text or 'shipping' in p_text.lower()):
@@ -214,7 +217,7 @@ def extract_shipping_with_selenium(driver, user_country: str = "DE") -> Dict:
                     if result.get('shipping_cost') != 'Unknown':
                         return result
         except Exception as e:
-            print(f"Selenium: Error scanning pricing paragraphs: {e}")
+            log.debug("Error scanning pricing paragraphs: %s", e)
         
         # Strategy 3: Look for the actual offer buttons/actions area
         # This is where the add to cart functionality is, so shipping should be nearby
@@ -222,7 +225,7 @@ def extract_shipping_with_selenium(driver, user_country: str = "DE") -> Dict:
             offer_sections = driver.find_elements(By.CSS_SELECTOR, '.offer_actions, .inline-buttons')
             for section in offer_sections:
                 section_text = section.text.strip()
-                print(f"Selenium: Offer section: '{section_text[:100]}...'")
+                log.debug("Offer section: %.100r", section_text, extra=SAMPLED)
                 
                 # Look for shipping info in this section
                 if len(section_text) < 500:  # Avoid long legal text
@@ -230,7 +233,7 @@ def extract_shipping_with_selenium(driver, user_country: str = "DE") -> Dict:
                     if result.get('shipping_cost') != 'Unknown':
                         return result
         except Exception as e:
-            print(f"Selenium: Error scanning offer sections: {e}")
+            log.debug("Error scanning offer sections: %s", e)
         
         # Strategy 4: Targeted XPath for price-related shipping only
         shipping_xpaths = [
@@ -244,20 +247,20 @@ def extract_shipping_with_selenium(driver, user_country: str = "DE") -> Dict:
                 elements = driver.find_elements(By.XPATH, xpath)
                 for element in elements:
                     text = element.text.strip()
-                    print(f"Selenium: XPath element: '{text}'")
+                    log.debug("XPath element: %r", text, extra=SAMPLED)
                     if text and len(text) < 50:  # Short text only
                         result = parse_selenium_shipping(text)
                         if result.get('shipping_cost') != 'Unknown':
                             return result
             except Exception as e:
-                print(f"Selenium: Error with XPath {xpath}: {e}")
+                log.debug("Error with XPath %s: %s", xpath, e)
                 continue
         
-        print("Selenium: No shipping information found in pricing areas")
+        log.debug("No shipping information found in pricing areas")
         return {'shipping_cost': 'Unknown', 'shipping_amount': 0.0}
         
     except Exception as e:
-        print(f"Selenium shipping extraction error: {e}")
+        log.warning("Shipping extraction error: %s", e)
         return {'shipping_cost': 'Unknown', 'shipping_amount': 0.0}
 
 def parse_selenium_shipping(shipping_text: str, user_country: str = "DE") -> Dict:
@@ -265,12 +268,12 @@ def parse_selenium_shipping(shipping_text: str, user_country: str = "DE") -> Dic
     if not shipping_text:
         return {'shipping_cost': 'Unknown', 'shipping_amount': 0.0}
     
-    print(f"Selenium: Parsing shipping text: '{shipping_text}'")
+    log.debug("Parsing shipping text: %r", shipping_text, extra=SAMPLED)
     
     # Check for free shipping
     free_indicators = ['free', 'kostenlos', 'gratis', 'free shipping', 'kostenloser versand']
     if any(indicator in shipping_text.lower() for indicator in free_indicators):
-        print("Selenium: Found free shipping")
+        log.debug("Found free shipping")
         return {'shipping_cost': 'Free', 'shipping_amount': 0.0}
     
     # Only extract if text contains clear shipping indicators
@@ -278,7 +281,7 @@ def parse_selenium_shipping(shipping_text: str, user_country: str = "DE") -> Dic
     has_shipping_indicator = any(indicator in shipping_text.lower() for indicator in shipping_indicators)
     
     if not has_shipping_indicator:
-        print(f"Selenium: No shipping indicators found in '{shipping_text}'")
+        log.debug("No shipping indicators found in %r", shipping_text, extra=SAMPLED)
         return {'shipping_cost': 'Unknown', 'shipping_amount': 0.0}
     
     # Get expected currency based on user country
@@ -327,7 +330,7 @@ def parse_selenium_shipping(shipping_text: str, user_country: str = "DE") -> Dic
                     expected = get_expected_currencies(user_country)
                     currency = expected[0][0] if expected else '€'
                 
-                print(f"Selenium: Extracted shipping with pattern {i+1}: {currency}{amount:.2f}")
+                log.debug("Extracted shipping with pattern %d: %s%.2f", i + 1, currency, amount)
                 return {
                     'shipping_cost': f'{currency}{amount:.2f}',
                     'shipping_amount': amount
@@ -335,12 +338,12 @@ def parse_selenium_shipping(shipping_text: str, user_country: str = "DE") -> Dic
             except ValueError:
                 continue
     
-    print(f"Selenium: Could not extract shipping amount from '{shipping_text}'")
+    log.debug("Could not extract shipping amount from %r", shipping_text)
     return {'shipping_cost': 'Unknown', 'shipping_amount': 0.0}
 
 def parse_shipping_from_text(html_content: str) -> Dict:
     """Fallback: parse shipping from raw HTML content with better patterns"""
-    print("Selenium: Parsing shipping from page source...")
+    log.debug("Parsing shipping from page source...")
     
     # More specific patterns that avoid item prices
     patterns = [
@@ -357,7 +360,7 @@ def parse_shipping_from_text(html_content: str) -> Dict:
         for match in matches:
             try:
                 amount = float(match.group(1).replace(',', '.'))
-                print(f"Selenium: Found shipping with pattern {i+1}: €{amount:.2f}")
+                log.debug("Found shipping with pattern %d: €%.2f", i + 1, amount)
                 return {
                     'shipping_cost': f'€{amount:.2f}',
                     'shipping_amount': amount
@@ -372,10 +375,10 @@ def parse_shipping_from_text(html_content: str) -> Dict:
     ]
     for pattern in free_patterns:
         if re.search(pattern, html_content, re.IGNORECASE):
-            print("Selenium: Found free shipping in page source")
+            log.debug("Found free shipping in page source")
             return {'shipping_cost': 'Free', 'shipping_amount': 0.0}
     
-    print("Selenium: No shipping information found in page source")
+    log.debug("No shipping information found in page source")
     return {'shipping_cost': 'Unknown', 'shipping_amount': 0.0}
 
 def get_country_name(country_code: str) -> str:
@@ -425,7 +428,7 @@ def selenium_filter_offers(offers: List[Dict], user_country: str) -> List[Dict]:
         return []
     
     if not SELENIUM_AVAILABLE:
-        print("Selenium not available - returning offers without enhancement")
+        log.debug("Selenium not available - returning offers without enhancement")
         return offers
     
     enhanced_offers = []
@@ -447,24 +450,21 @@ def selenium_filter_offers(offers: List[Dict], user_country: str) -> List[Dict]:
     if not offers_to_process:
         return enhanced_offers
     
-    print(f"Selenium: Processing {len(offers_to_process)} offers with reused browser session")
+    log.info("Processing %d offers with reused browser session", len(offers_to_process))
     
-    # Create a single browser session for all offers
-    driver = None
-    try:
-        driver = create_selenium_driver(headless=True)
-        
+    # Borrow a single pooled browser session for all offers
+    with borrow_offer_driver() as driver:
         for i, offer in enumerate(offers_to_process):
-            print(f"Selenium: Enhancing offer {i+1}/{len(offers_to_process)}")
-            
+            log.debug("Enhancing offer %d/%d", i + 1, len(offers_to_process))
+        
             try:
                 details = selenium_extract_offer_details_with_driver(driver, offer.get('offer_url'), user_country)
-                
+            
                 if details is None:
                     # Offer is not available, skip it
-                    print(f"Selenium: Offer {i+1} not available in {user_country}")
+                    log.debug("Offer %d not available in %s", i + 1, user_country)
                     continue
-                
+            
                 # Enhance offer with Selenium data
                 enhanced = offer.copy()
                 if details.get('shipping_cost', 'Unknown') != 'Unknown':
@@ -472,23 +472,20 @@ def selenium_filter_offers(offers: List[Dict], user_country: str) -> List[Dict]:
                     enhanced['shipping_amount'] = details.get('shipping_amount', 0.0)
                     enhanced['total_amount'] = enhanced.get('price_amount', 0) + details.get('shipping_amount', 0.0)
                     enhanced['selenium_enhanced'] = True
-                
+            
                 enhanced_offers.append(enhanced)
             except Exception as e:
-                print(f"Selenium: Error processing offer {i+1}: {e}")
+                log.warning("Error processing offer %d: %s", i + 1, e)
                 # On error, keep original offer
                 enhanced_offers.append(offer)
-            
-            # No delay needed with browser reuse
         
-    finally:
-        if driver:
-            driver.quit()
+            # No delay needed with browser reuse
     
-    print(f"Selenium: Filtered to {len(enhanced_offers)} available offers")
+    log.info("Filtered to %d available offers", len(enhanced_offers))
     return enhanced_offers
 
-def selenium_filter_offers_parallel(offers: List[Dict], user_country: str, max_workers: int = 3) -> List[Dict]:
+def selenium_filter_offers_parallel(offers: List[Dict], user_country: str, max_workers: int = 3,
+                                    on_offer: Optional[Callable[[Dict], None]] = None) -> List[Dict]:
     """
     Filter offers using parallel Selenium processing for maximum speed
     Sorts by price first to ensure cheapest offers are processed first
@@ -497,6 +494,7 @@ def selenium_filter_offers_parallel(offers: List[Dict], user_country: str, max_w
         offers: List of offers from main marketplace scraper
         user_country: User's country code
         max_workers: Number of parallel browser sessions (default 3)
+        on_offer: Progress callback, called with every accepted offer as soon as it is ready
         
     Returns:
         Filtered list of available offers with enhanced shipping data
@@ -505,7 +503,10 @@ def selenium_filter_offers_parallel(offers: List[Dict], user_country: str, max_w
         return []
     
     if not SELENIUM_AVAILABLE:
-        print("Selenium not available - returning offers without enhancement")
+        log.debug("Selenium not available - returning offers without enhancement")
+        if on_offer:
+            for offer in offers:
+                on_offer(offer)
         return offers
     
     enhanced_offers = []
@@ -523,6 +524,8 @@ def selenium_filter_offers_parallel(offers: List[Dict], user_country: str, max_w
             offers_to_process.append(offer)
         else:
             enhanced_offers.append(offer)
+            if on_offer:
+                on_offer(offer)
     
     if not offers_to_process:
         return enhanced_offers
@@ -530,17 +533,13 @@ def selenium_filter_offers_parallel(offers: List[Dict], user_country: str, max_w
     # SMART OPTIMIZATION: Sort by price first to process cheapest offers first
     # This ensures users see the best deals even with early exit at 5 offers
     offers_to_process.sort(key=lambda x: x.get('price_amount', float('inf')))
-    print(f"Selenium: Sorted {len(offers_to_process)} offers by price - processing cheapest first")
+    log.info("Processing %d offers (cheapest first) with %d parallel browsers", len(offers_to_process), max_workers)
     
-    print(f"Selenium: Processing {len(offers_to_process)} offers with {max_workers} parallel browsers")
-    
-    def process_offer_with_new_driver(offer):
-        """Process a single offer with its own driver instance using aggressive mode"""
-        driver = None
+    def process_offer_with_pooled_driver(offer):
+        """Process a single offer with a borrowed aggressive-mode browser"""
         try:
-            # Create aggressive driver for maximum speed
-            driver = create_selenium_driver(headless=True, aggressive=True)
-            details = selenium_extract_offer_details_with_driver(driver, offer.get('offer_url'), user_country)
+            with borrow_offer_driver() as driver:
+                details = selenium_extract_offer_details_with_driver(driver, offer.get('offer_url'), user_country)
             
             if details is None:
                 return None  # Offer not available
@@ -556,15 +555,12 @@ def selenium_filter_offers_parallel(offers: List[Dict], user_country: str, max_w
             
             return enhanced
         except Exception as e:
-            print(f"Selenium: Error processing offer: {e}")
+            log.warning("Error processing offer %s: %s", offer.get('offer_url'), e)
             return offer  # Return original on error
-        finally:
-            if driver:
-                driver.quit()
     
     # Process offers in parallel with early exit optimization
     with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        future_to_offer = {executor.submit(process_offer_with_new_driver, offer): offer 
+        future_to_offer = {executor.submit(process_offer_with_pooled_driver, offer): offer 
                           for offer in offers_to_process}
         
         processed_count = 0
@@ -573,15 +569,17 @@ def selenium_filter_offers_parallel(offers: List[Dict], user_country: str, max_w
             if result is not None:
                 enhanced_offers.append(result)
                 processed_count += 1
+                if on_offer:
+                    on_offer(result)
                 
                 # Early exit if we have enough good offers (5+ offers for speed)
                 if len(enhanced_offers) >= 5:
-                    print(f"Selenium: Early exit - found {len(enhanced_offers)} good offers (sorted by price)")
+                    log.debug("Early exit - found %d good offers (sorted by price)", len(enhanced_offers))
                     # Cancel remaining futures for speed
                     for remaining_future in future_to_offer:
                         if not remaining_future.done():
                             remaining_future.cancel()
                     break
     
-    print(f"Selenium: Parallel processing completed - {len(enhanced_offers)} available offers")
+    log.info("Parallel processing completed - %d available offers", len(enhanced_offers))
     return enhanced_offers
\ No newline at end of file
@@ -0,0 +1,65 @@
+"""
+Request coalescing for identical in-flight searches
+The first caller for a key does the work; concurrent callers with the same key wait for and share its result
+"""
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable
+
+
+class SingleFlight:
+    """Thread-safe call group (like Go's singleflight) - one execution per key at a time"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, Future] = {}
+        self.stats_counters = {"executed": 0, "shared": 0}
+
+    def do(self, key: Hashable, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Run fn(*args, **kwargs) unless a call with the same key is already running,
+        in which case wait for that call and return its result (or raise its exception)
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._calls[key] = future
+                self.stats_counters["executed"] += 1
+            else:
+                self.stats_counters["shared"] += 1
+
+        if not leader:
+            return future.result()
+
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as e:
+            self._finish(key)
+            future.set_exception(e)
+            raise
+        self._finish(key)
+        future.set_result(result)
+        return result
+
+    def _finish(self, key: Hashable):
+        # Forget the key before waking followers - later callers start a fresh call (or hit the cache)
+        with self._lock:
+            self._calls.pop(key, None)
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {"in_flight": len(self._calls), **self.stats_counters}
+
+
+_group = SingleFlight()
+
+
+def get_singleflight() -> SingleFlight:
+    """Process-wide call group shared by all Streamlit sessions (keys are namespaced by the caller)"""
+    return _group
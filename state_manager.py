@@ -1,6 +1,6 @@
 # state_manager.py
 import streamlit as st
-from providers import SearchCriteria
+from providers import SearchCriteria, SPECULATIVE_PHYSICAL_DEFAULT
 
 DEFAULT_KEYS = {
     "results_digital":        [],
@@ -25,7 +25,9 @@ DEFAULT_KEYS = {
     "secondary_search_done":   False,
     "has_digital_hits":        False,
     "search_cache_valid":      False,
-    "last_search_criteria":    ""}
+    "last_search_criteria":    "",
+    "speculative_physical":    SPECULATIVE_PHYSICAL_DEFAULT,
+    "speculative_search":      None}
 
 class AppState:
     def __init__(self):
@@ -63,6 +65,10 @@ class AppState:
         st.session_state.results_digital = []
         st.session_state.results_discogs = []
         st.session_state.results_revibed = []
+        # Vorab gestartete physische Suchen gehören zu den alten Kriterien
+        if st.session_state.get("speculative_search") is not None:
+            st.session_state.speculative_search.cancel()
+        st.session_state.speculative_search = None
 
     def get_criteria_hash(self) -> str:
         """Generate hash of current search criteria for cache validation"""
@@ -0,0 +1,71 @@
+"""Shared pytest setup."""
+
+import os
+import sys
+
+import pytest
+
+# Keep test runs independent of (and from polluting) the on-disk search cache and release index
+os.environ.setdefault("GEMFINDER_CACHE_DISABLED", "1")
+os.environ.setdefault("GEMFINDER_INDEX_DISABLED", "1")
+
+# Add parent directory to path to import modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import release_index
+import search_cache
+from rate_governor import RateGovernor, RateGovernorConfig
+from release_index import ReleaseIndex, ReleaseIndexConfig
+from search_cache import SearchCache, SearchCacheConfig
+
+
+class FakeClock:
+    """Manual clock; sleeping records the requested waits without advancing time"""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+
+
+@pytest.fixture
+def fake_clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def make_governor(fake_clock):
+    """Discogs rate governor on the test's fake clock - make_governor(limit=3, window=3)"""
+    def make(**config):
+        return RateGovernor("Discogs", RateGovernorConfig(**config), clock=fake_clock, sleep=fake_clock.sleep)
+
+    return make
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """Enabled search cache in a temporary SQLite file (the suite disables the real one)"""
+    store = SearchCache(SearchCacheConfig(path=str(tmp_path / "cache.sqlite"), max_entries=3))
+    yield store
+    store.close()
+
+
+@pytest.fixture
+def index(tmp_path):
+    """Enabled release index in a temporary SQLite file"""
+    store = ReleaseIndex(ReleaseIndexConfig(path=str(tmp_path / "index.sqlite")))
+    yield store
+    store.close()
+
+
+@pytest.fixture
+def shared_stores(monkeypatch, cache, index):
+    """Install the temporary cache and index as the process-wide instances used by cached_search"""
+    monkeypatch.setattr(search_cache, "_search_cache", cache)
+    monkeypatch.setattr(release_index, "_release_index", index)
+    return cache, index
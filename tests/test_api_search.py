@@ -89,6 +89,60 @@ class TestSearchDiscogsReleases:
                   any(key in release for key in ["title", "artist", "label"]) 
                   for release in result)
     
+    def test_catno_parameter_queried_first(self, monkeypatch):
+        """Test a catno search uses the dedicated catno filter and falls back to free text without hits."""
+        import api_search
+
+        class Response:
+            status_code = 200
+            url = "https://api.discogs.com/database/search"
+
+            def __init__(self, results):
+                self.results = results
+
+            def json(self):
+                return {"results": self.results}
+
+        calls = []
+
+        def fake_get(url, **kwargs):
+            calls.append(kwargs["params"])
+            if "catno" in kwargs["params"] and kwargs["params"]["catno"] == "SOMA CD 66":
+                return Response([{"id": 2, "title": "Daft Punk - Homework", "catno": "SOMA CD 66"}])
+            return Response([])
+
+        monkeypatch.setenv("DISCOGS_USER_TOKEN", "token")
+        monkeypatch.setattr(api_search, "discogs_api_get", fake_get)
+
+        result = search_discogs_releases(catno="SOMA CD 66")
+        assert [r["title"] for r in result] == ["Homework"]
+        assert result[0]["catno_query"] == {"catno": "SOMA CD 66", "artist": ""}
+        assert calls == [{"catno": "SOMA CD 66", "per_page": 15, "page": 1}]
+
+        calls.clear()
+        assert search_discogs_releases(artist="Daft Punk", catno="XYZ 1") == []
+        assert calls[0] == {"catno": "XYZ 1", "per_page": 15, "page": 1, "artist": "Daft Punk"}
+        assert calls[1]["q"] == "Daft Punk XYZ 1"
+
+    def test_failed_catno_request_falls_back_to_free_text(self, monkeypatch):
+        """Test an API error on the catno filter still tries the free-text search."""
+        import api_search
+
+        calls = []
+
+        def fake_search(headers, params, artist=None):
+            calls.append(params)
+            if "catno" in params:
+                return None
+            return [{"id": 2, "title": "Homework"}]
+
+        monkeypatch.setenv("DISCOGS_USER_TOKEN", "token")
+        monkeypatch.setattr(api_search, "discogs_database_search", fake_search)
+
+        assert search_discogs_releases(catno="SOMA  CD 66 ") == [{"id": 2, "title": "Homework"}]
+        assert calls[0]["catno"] == "SOMA CD 66"
+        assert calls[1]["q"].split() == ["SOMA", "CD", "66"]
+    
     def test_discogs_artist_trigger(self):
         """Test search triggered by artist containing 'discogs'."""
         result = search_discogs_releases(artist="discogs artist")
@@ -123,6 +177,20 @@ class TestGetDiscogsReleaseDetails:
             # Expected since this likely requires real API calls
             pass
 
+    def test_rate_limit_returns_fallback(self, monkeypatch):
+        """Test an exhausted quota still yields the fallback details instead of raising."""
+        import api_search
+        from rate_governor import RateLimitExceeded
+
+        def limited(release_id, max_wait=None):
+            raise RateLimitExceeded("Discogs", 30)
+
+        monkeypatch.setattr(api_search, "fetch_discogs_release_details", limited)
+
+        result = get_discogs_release_details("123456")
+
+        assert result["id"] == "123456" and result["tracklist"] == []
+
 
 class TestGetDiscogsOffers:
     """Test Discogs offers retrieval."""
@@ -0,0 +1,259 @@
+"""Tests for batch_search.py module."""
+
+import pytest
+import sys
+import os
+import csv
+import json
+import threading
+import time
+
+# Add parent directory to path to import modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from batch_search import (
+    BatchConfig, BatchRunner, BatchWriter, drop_records, load_completed_ids, normalize_row, read_batch_input
+)
+from providers import SearchCriteria, SearchProvider
+
+
+class FakeProvider(SearchProvider):
+    """Provider stand-in tracking concurrency"""
+
+    def __init__(self, name, delay=0.0, results=None):
+        self.name = name
+        self.delay = delay
+        self.results = list(results or [])
+        self.calls = []
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def can_search(self, c):
+        return bool(c.title and c.artist)
+
+    def search(self, c):
+        with self._lock:
+            self.calls.append(c.title)
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(self.delay)
+        with self._lock:
+            self.active -= 1
+        if self.results:
+            return self.results.pop(0)
+        return {"platform": self.name, "title": f"{c.title} ({self.name})", "price": "€1.99", "url": "https://x"}
+
+
+def write_csv(path, rows):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=["artist", "track", "album", "catno"])
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def run(providers, rows, output, fmt="jsonl", completed=None, **config):
+    runner = BatchRunner(providers, BatchConfig(**config), sleep=lambda s: None)
+    with BatchWriter(str(output), fmt, [p.name for p in providers]) as writer:
+        return runner.run(rows, writer, completed)
+
+
+class TestBatchInput:
+    """Test reading crate lists."""
+
+    def test_csv_aliases_are_normalized(self, tmp_path):
+        """Test track/catno headers map onto the search criteria fields."""
+        path = tmp_path / "crate.csv"
+        write_csv(path, [{"artist": "Moodymann", "track": "Shades", "album": "", "catno": "KDJ 1"}])
+
+        rows = list(read_batch_input(str(path)))
+
+        assert rows == [{"row_id": "1", "artist": "Moodymann", "title": "Shades", "album": "", "catalog": "KDJ 1"}]
+
+    def test_jsonl_uses_explicit_ids(self, tmp_path):
+        """Test JSONL rows keep their own id for resuming."""
+        path = tmp_path / "crate.jsonl"
+        path.write_text('{"id": "sku-7", "artist": "A", "title": "T"}\n\n', encoding="utf-8")
+
+        rows = list(read_batch_input(str(path)))
+
+        assert rows[0]["row_id"] == "sku-7"
+        assert normalize_row({"Title": " X "}, 3)["title"] == "X"
+
+
+class TestBatchRunner:
+    """Test the batch runner."""
+
+    def test_results_streamed_per_row(self, tmp_path):
+        """Test every row is written once with results of all eligible providers."""
+        providers = [FakeProvider("Beatport"), FakeProvider("Discogs")]
+        rows = [normalize_row({"artist": "A", "title": f"T{i}"}, i) for i in range(1, 4)]
+        output = tmp_path / "out.jsonl"
+
+        summary = run(providers, rows, output)
+
+        records = [json.loads(line) for line in output.read_text(encoding="utf-8").splitlines()]
+        assert summary.completed == 3
+        assert sorted(r["row_id"] for r in records) == ["1", "2", "3"]
+        assert list(records[0]["results"]) == ["Beatport", "Discogs"]
+
+    def test_per_platform_concurrency_is_bounded(self, tmp_path):
+        """Test no platform runs more searches at once than its limit."""
+        slow = FakeProvider("Beatport", delay=0.03)
+        fast = FakeProvider("iTunes", delay=0.03)
+        rows = [normalize_row({"artist": "A", "title": f"T{i}"}, i) for i in range(1, 9)]
+
+        run([slow, fast], rows, tmp_path / "out.jsonl", limits={"Beatport": 1, "iTunes": 3})
+
+        assert slow.max_active == 1
+        assert 1 < fast.max_active <= 3
+
+    def test_resume_skips_finished_rows(self, tmp_path):
+        """Test an interrupted batch continues where it stopped."""
+        provider = FakeProvider("Beatport")
+        rows = [normalize_row({"artist": "A", "title": f"T{i}"}, i) for i in range(1, 5)]
+        output = tmp_path / "out.jsonl"
+        run([provider], rows[:2], output)
+        # Simulate a crash in the middle of writing the next record
+        with open(output, "a", encoding="utf-8") as f:
+            f.write('{"row_id": "3", "resu')
+
+        completed = load_completed_ids(str(output), "jsonl")
+        summary = run([provider], rows, output, completed=completed)
+
+        assert completed == {"1", "2"}
+        assert summary.skipped == 2
+        assert provider.calls == ["T1", "T2", "T3", "T4"]
+        assert load_completed_ids(str(output), "jsonl") == {"1", "2", "3", "4"}
+
+    def test_csv_output_resumes(self, tmp_path):
+        """Test CSV output has one header and flattened provider columns."""
+        provider = FakeProvider("Traxsource")
+        rows = [normalize_row({"artist": "A", "title": f"T{i}"}, i) for i in range(1, 3)]
+        output = tmp_path / "out.csv"
+
+        run([provider], rows[:1], output, fmt="csv")
+        run([provider], rows, output, fmt="csv", completed=load_completed_ids(str(output), "csv"))
+
+        with open(output, newline="", encoding="utf-8") as f:
+            written = list(csv.DictReader(f))
+        assert [r["row_id"] for r in written] == ["1", "2"]
+        assert written[1]["Traxsource_title"] == "T2 (Traxsource)"
+
+    def test_csv_resume_with_other_platforms_is_refused(self, tmp_path):
+        """Test appending to a CSV written for other platforms fails instead of dropping columns."""
+        rows = [normalize_row({"artist": "A", "title": f"T{i}"}, i) for i in range(1, 3)]
+        output = tmp_path / "out.csv"
+        run([FakeProvider("Traxsource")], rows[:1], output, fmt="csv")
+        before = output.read_text(encoding="utf-8")
+
+        with pytest.raises(ValueError, match="other platforms"):
+            run([FakeProvider("Traxsource"), FakeProvider("Beatport")], rows, output, fmt="csv")
+
+        assert output.read_text(encoding="utf-8") == before
+
+    def test_rate_limited_search_is_retried(self, tmp_path):
+        """Test rate-limited Discogs searches wait for the quota and retry."""
+        provider = FakeProvider("Discogs", results=[
+            {"platform": "Discogs", "releases": [], "rate_limited": True, "retry_after": 5},
+            {"platform": "Discogs", "releases": [{"title": "Release", "uri": "/release/1"}]},
+        ])
+        rows = [normalize_row({"artist": "A", "title": "T"}, 1)]
+        output = tmp_path / "out.jsonl"
+
+        run([provider], rows, output)
+
+        record = json.loads(output.read_text(encoding="utf-8"))
+        assert len(provider.calls) == 2
+        assert record["results"]["Discogs"]["releases"][0]["title"] == "Release"
+
+    def test_rate_limit_retry_keeps_platform_slot(self):
+        """Test the wait before a rate-limit retry happens inside the platform limit."""
+        provider = FakeProvider("Discogs", results=[
+            {"platform": "Discogs", "releases": [], "rate_limited": True, "retry_after": 5},
+            {"platform": "Discogs", "releases": [{"title": "Release", "uri": "/release/1"}]},
+        ])
+        runner = BatchRunner([provider], BatchConfig(limits={"Discogs": 1}))
+        slot_held = []
+        runner._sleep = lambda s: slot_held.append(not runner._semaphores["Discogs"].acquire(blocking=False))
+
+        result = runner.search_one(provider, SearchCriteria(title="T", artist="A"))
+
+        assert slot_held == [True]
+        assert result["releases"][0]["title"] == "Release"
+
+    def test_slow_provider_hits_deadline(self, tmp_path):
+        """Test a provider over provider_timeout is recorded as timeout instead of stalling the batch."""
+        rows = [normalize_row({"artist": "A", "title": "T"}, 1)]
+        output = tmp_path / "out.jsonl"
+
+        start = time.time()
+        summary = run([FakeProvider("Bandcamp", delay=1.0), FakeProvider("iTunes")], rows, output,
+                      provider_timeout=0.1)
+
+        record = json.loads(output.read_text(encoding="utf-8"))
+        assert time.time() - start < 0.9
+        assert record["results"]["Bandcamp"]["status"] == "timeout"
+        assert record["results"]["iTunes"]["title"] == "T (iTunes)"
+        assert summary.errors == 1
+
+    def test_interrupt_stops_after_the_window(self, tmp_path):
+        """Test an interrupt only leaves the rows of the current window running."""
+        provider = FakeProvider("Beatport", delay=0.02)
+        rows = [normalize_row({"artist": "A", "title": f"T{i}"}, i) for i in range(1, 101)]
+        output = tmp_path / "out.jsonl"
+
+        def interrupt(record):
+            raise KeyboardInterrupt
+
+        runner = BatchRunner([provider], BatchConfig(window=2), sleep=lambda s: None)
+        with BatchWriter(str(output), "jsonl", ["Beatport"]) as writer:
+            with pytest.raises(KeyboardInterrupt):
+                runner.run(rows, writer, on_record=interrupt)
+        time.sleep(0.1)
+
+        assert len(output.read_text(encoding="utf-8").splitlines()) == 1
+        assert len(provider.calls) <= 3
+
+    def test_duplicate_row_ids_are_all_searched(self, tmp_path):
+        """Test rows sharing an id do not overwrite each other's results."""
+        rows = [normalize_row({"id": "x", "artist": "A", "title": t}, i) for i, t in enumerate(["T1", "T2"], 1)]
+        output = tmp_path / "out.jsonl"
+
+        run([FakeProvider("Beatport")], rows, output)
+
+        records = [json.loads(line) for line in output.read_text(encoding="utf-8").splitlines()]
+        assert sorted(r["results"]["Beatport"]["title"] for r in records) == ["T1 (Beatport)", "T2 (Beatport)"]
+
+    @pytest.mark.parametrize("fmt", ["jsonl", "csv"])
+    def test_retried_rows_replace_their_error_record(self, tmp_path, fmt):
+        """Test --retry-errors rewrites failed rows instead of appending a second record."""
+        rows = [normalize_row({"artist": "A", "title": f"T{i}"}, i) for i in range(1, 3)]
+        output = tmp_path / f"out.{fmt}"
+        flaky = FakeProvider("Beatport", results=[{"platform": "Beatport", "error": "timeout"}])
+        run([flaky], rows[:1], output, fmt=fmt)
+        run([flaky], rows, output, fmt=fmt, completed=load_completed_ids(str(output), fmt))
+
+        completed = load_completed_ids(str(output), fmt, retry_errors=True)
+        assert drop_records(str(output), fmt, completed) == 1
+        run([flaky], rows, output, fmt=fmt, completed=completed)
+
+        assert load_completed_ids(str(output), fmt, retry_errors=True) == {"1", "2"}
+        with open(output, newline="", encoding="utf-8") as f:
+            ids = [r["row_id"] for r in (csv.DictReader(f) if fmt == "csv" else map(json.loads, f))]
+        assert sorted(ids) == ["1", "2"]
+
+    def test_provider_exception_becomes_error_result(self, tmp_path):
+        """Test a crashing provider does not abort the batch."""
+        class Broken(FakeProvider):
+            def search(self, c):
+                raise RuntimeError("chromedriver died")
+
+        rows = [normalize_row({"artist": "A", "title": "T"}, 1)]
+        output = tmp_path / "out.jsonl"
+
+        summary = run([Broken("Bandcamp")], rows, output)
+
+        record = json.loads(output.read_text(encoding="utf-8"))
+        assert summary.errors == 1
+        assert "chromedriver died" in record["results"]["Bandcamp"]["error"]
@@ -0,0 +1,76 @@
+"""Tests for the offline benchmark suite (benchmarks/)."""
+
+import pytest
+import sys
+import os
+
+# Add parent directory to path to import modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.replay_server import ReplayServer, replay_provider_traffic
+from benchmarks.run import compare_to_baseline, summarize
+
+
+def results(p50_ms=10.0, peak_kb=1000.0, searches_per_s=20.0):
+    return {
+        "parse": {"beatport": {"p50_ms": p50_ms, "p95_ms": p50_ms * 3}},
+        "memory": {"parse_beatport_peak_kb": peak_kb},
+        "throughput": {"searches_per_s": searches_per_s, "concurrency": 4},
+    }
+
+
+class TestBaselineComparison:
+    """Test regression detection against the stored baseline."""
+
+    def test_within_tolerance_passes(self):
+        """Test small slowdowns and noisy p95 values are not flagged."""
+        current = results(p50_ms=12.0)
+        current["parse"]["beatport"]["p95_ms"] = 300.0
+
+        assert compare_to_baseline(current, results(), tolerance=0.3) == []
+
+    def test_slower_median_is_flagged(self):
+        """Test a median latency above the tolerance is a regression."""
+        regressions = compare_to_baseline(results(p50_ms=20.0), results(), tolerance=0.3)
+
+        assert [r["metric"] for r in regressions] == ["parse.beatport.p50_ms"]
+        assert regressions[0]["change"] == 100.0
+
+    def test_memory_and_throughput_are_flagged(self):
+        """Test higher memory peaks and lower throughput are regressions."""
+        regressions = compare_to_baseline(results(peak_kb=2000.0, searches_per_s=5.0), results(), tolerance=0.3)
+
+        assert {r["metric"] for r in regressions} == {
+            "memory.parse_beatport_peak_kb", "throughput.searches_per_s"
+        }
+
+    def test_summarize_reports_milliseconds(self):
+        """Test latency samples are summarized in milliseconds."""
+        stats = summarize([0.001, 0.002, 0.003])
+
+        assert stats["p50_ms"] == 2.0
+        assert stats["p95_ms"] == 3.0
+
+
+class TestReplayServer:
+    """Test the local stand-in server for provider traffic."""
+
+    def test_provider_pages_are_replayed(self):
+        """Test the shared scrape session is routed to the recorded fixture."""
+        from scrape_search import fetch_page_html, parse_traxsource_rows
+
+        with ReplayServer() as server, replay_provider_traffic(server):
+            html = fetch_page_html("https://www.traxsource.com/search?term=house")
+
+        assert len(parse_traxsource_rows(html)) == 10
+        assert server.request_count == 1
+
+    def test_revibed_fixture_has_listings(self):
+        """Test the Revibed benchmark exercises the hit path, not only "no results"."""
+        from providers import RevibedProvider, SearchCriteria
+
+        with ReplayServer() as server, replay_provider_traffic(server):
+            result = RevibedProvider().search(SearchCriteria(title="One More Time", artist="Daft Punk"))
+
+        assert result["title"] == "Daft Punk"
+        assert result["price"] == "€42.00"
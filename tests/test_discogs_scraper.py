@@ -0,0 +1,96 @@
+"""Tests for discogs_scraper.py module."""
+
+import pytest
+import sys
+import os
+import json
+
+# Add parent directory to path to import modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import discogs_scraper
+from discogs_scraper import SharedTTLCache, get_discogs_scraper
+
+
+@pytest.fixture(autouse=True)
+def fresh_registry(monkeypatch):
+    monkeypatch.setattr(discogs_scraper, "_scrapers", {})
+    monkeypatch.setattr(discogs_scraper, "_marketplace_cache", SharedTTLCache())
+
+
+class TestDiscogsScraperRegistry:
+    """Test the long-lived scraper registry and its shared marketplace cache."""
+
+    def test_same_scraper_per_country(self):
+        """Test repeated lookups return the same instance per country."""
+        assert get_discogs_scraper("de") is get_discogs_scraper("DE")
+        assert get_discogs_scraper("US") is not get_discogs_scraper("DE")
+        assert get_discogs_scraper("US").config.user_country == "US"
+
+    def test_cache_hit_skips_rate_limit(self, monkeypatch):
+        """Test a cached release is returned without delay or browser."""
+        scraper = get_discogs_scraper("DE")
+        key = scraper.get_cache_key(release_id="123", country="DE")
+        scraper.set_cache(key, {"release_id": "123", "offers": [{"price": "€1"}] * 5,
+                                "total_offers": 5, "status": "success", "max_offers": 10})
+
+        def fail(*args, **kwargs):
+            raise AssertionError("network path must not be used on a cache hit")
+
+        monkeypatch.setattr(scraper, "wait_rate_limit", fail)
+        result = scraper.scrape_marketplace_offers("123", max_offers=3)
+
+        assert result["cached"] is True
+        assert result["total_offers"] == 3
+
+    def test_cache_shared_between_scrapers_but_keyed_by_country(self, monkeypatch):
+        """Test another country's scraper does not reuse offers of a different country."""
+        de = get_discogs_scraper("DE")
+        de.set_cache(de.get_cache_key(release_id="1", country="DE"),
+                     {"release_id": "1", "offers": [], "total_offers": 0, "max_offers": None})
+        us = get_discogs_scraper("US")
+        calls = []
+        monkeypatch.setattr(us, "wait_rate_limit", lambda: calls.append("wait"))
+        monkeypatch.setattr(discogs_scraper, "get_driver_pool",
+                            lambda *a, **k: (_ for _ in ()).throw(RuntimeError("no browser")))
+
+        assert us.scrape_marketplace_offers("1", max_offers=5)["status"] == "scraping_error"
+        assert calls == ["wait"]
+        assert len(discogs_scraper._marketplace_cache) == 1
+
+    def test_smaller_cache_entry_is_not_reused_for_more_offers(self, monkeypatch):
+        """Test an entry scraped with fewer offers does not answer a larger request."""
+        scraper = get_discogs_scraper("DE")
+        scraper.set_cache(scraper.get_cache_key(release_id="7", country="DE"),
+                          {"release_id": "7", "offers": [{}] * 8, "total_offers": 8, "max_offers": 8})
+        calls = []
+        monkeypatch.setattr(scraper, "wait_rate_limit", lambda: calls.append("wait"))
+        monkeypatch.setattr(discogs_scraper, "get_driver_pool",
+                            lambda *a, **k: (_ for _ in ()).throw(RuntimeError("no browser")))
+
+        scraper.scrape_marketplace_offers("7", max_offers=15)
+
+        assert calls == ["wait"]
+
+    def test_complete_cache_entry_answers_any_request(self, monkeypatch):
+        """Test an entry with all offers (max_offers None) serves larger requests and stays strict JSON."""
+        scraper = get_discogs_scraper("DE")
+        entry = {"release_id": "9", "offers": [{}] * 3, "total_offers": 3, "max_offers": None}
+        scraper.set_cache(scraper.get_cache_key(release_id="9", country="DE"), entry)
+        monkeypatch.setattr(scraper, "wait_rate_limit", lambda: pytest.fail("cache hit expected"))
+
+        assert scraper.scrape_marketplace_offers("9", max_offers=50)["total_offers"] == 3
+        assert json.dumps(entry, allow_nan=False)
+
+
+class TestSharedTTLCache:
+    """Test SharedTTLCache expiry."""
+
+    def test_expired_entry_is_dropped(self):
+        """Test entries older than the TTL are not returned."""
+        cache = SharedTTLCache()
+        cache.set("k", {"a": 1})
+
+        assert cache.get("k", ttl=60) == {"a": 1}
+        assert cache.get("k", ttl=0) is None
+        assert len(cache) == 0
@@ -0,0 +1,187 @@
+"""Tests for driver_pool.py module."""
+
+import pytest
+import sys
+import os
+import threading
+import time
+
+# Add parent directory to path to import modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from driver_pool import DriverPool, DriverPoolConfig, DriverPoolTimeout
+
+
+class FakeDriver:
+    """Minimal stand-in for a Selenium WebDriver"""
+
+    def __init__(self):
+        self.alive = True
+        self.quit_called = False
+        self.window_handles = ["main"]
+        self.timeouts = "default-timeouts"
+
+    @property
+    def current_window_handle(self):
+        if not self.alive:
+            raise RuntimeError("browser crashed")
+        return self.window_handles[0]
+
+    def quit(self):
+        self.quit_called = True
+
+
+class DriverFactory:
+    """Pool factory that keeps every driver it started"""
+
+    def __init__(self):
+        self.created = []
+
+    def __call__(self):
+        driver = FakeDriver()
+        self.created.append(driver)
+        return driver
+
+
+class TestDriverPool:
+    """Test DriverPool borrowing and recycling."""
+
+    def test_driver_is_reused_between_borrows(self):
+        """Test a returned driver is handed out again instead of starting a new one."""
+        factory = DriverFactory()
+        pool = DriverPool(factory, DriverPoolConfig(max_size=2), name="test")
+        created = factory.created
+
+        with pool.borrow() as first:
+            pass
+        with pool.borrow() as second:
+            pass
+
+        assert first is second
+        assert len(created) == 1
+        assert pool.get_stats()["reused"] == 1
+
+    def test_driver_recycled_after_max_uses(self):
+        """Test a driver is quit once it reached max_uses."""
+        factory = DriverFactory()
+        pool = DriverPool(factory, DriverPoolConfig(max_size=1, max_uses=2), name="test")
+        created = factory.created
+
+        for _ in range(3):
+            with pool.borrow():
+                pass
+
+        assert len(created) == 2
+        assert created[0].quit_called
+        assert pool.get_stats()["recycled"] == 1
+
+    def test_crashed_driver_is_discarded(self):
+        """Test a driver that died during a borrow is not returned to the pool."""
+        factory = DriverFactory()
+        pool = DriverPool(factory, DriverPoolConfig(max_size=1), name="test")
+        created = factory.created
+
+        with pytest.raises(ValueError):
+            with pool.borrow() as driver:
+                driver.alive = False
+                raise ValueError("scraper failed")
+
+        with pool.borrow() as driver:
+            assert driver is created[1]
+        assert created[0].quit_called
+
+    def test_scraper_error_keeps_healthy_driver(self):
+        """Test normal scraper exceptions do not throw away a healthy browser."""
+        factory = DriverFactory()
+        pool = DriverPool(factory, DriverPoolConfig(max_size=1), name="test")
+        created = factory.created
+
+        with pytest.raises(ValueError):
+            with pool.borrow():
+                raise ValueError("element not found")
+
+        with pool.borrow() as driver:
+            assert driver is created[0]
+
+    def test_idle_driver_expires(self):
+        """Test idle drivers are quit after idle_timeout."""
+        factory = DriverFactory()
+        pool = DriverPool(factory, DriverPoolConfig(max_size=1, idle_timeout=0.01), name="test")
+        created = factory.created
+
+        with pool.borrow():
+            pass
+        time.sleep(0.05)
+        pool.reap_idle()
+
+        assert created[0].quit_called
+        assert pool.get_stats()["idle"] == 0
+
+    def test_expired_driver_quit_outside_lock(self):
+        """Test a slow browser quit does not block other threads waiting for the pool lock."""
+        factory = DriverFactory()
+        pool = DriverPool(factory, DriverPoolConfig(max_size=2, idle_timeout=0.01), name="test")
+        created = factory.created
+        lock_free = []
+
+        with pool.borrow():
+            pass
+
+        def slow_quit():
+            acquired = pool._cond.acquire(blocking=False)
+            if acquired:
+                pool._cond.release()
+            lock_free.append(acquired)
+
+        created[0].quit = slow_quit
+        time.sleep(0.05)
+
+        with pool.borrow() as driver:
+            assert driver is created[1]
+        assert lock_free == [True]
+
+    def test_extra_tabs_closed_on_release(self):
+        """Test tabs opened by a scraper are closed before the driver is re-pooled."""
+        closed = []
+        factory = DriverFactory()
+        pool = DriverPool(factory, DriverPoolConfig(max_size=1), name="test")
+        created = factory.created
+
+        with pool.borrow() as driver:
+            driver.window_handles = ["main", "price-tab"]
+
+            class SwitchTo:
+                def window(self, handle):
+                    driver.current = handle
+
+            driver.switch_to = SwitchTo()
+            driver.close = lambda: closed.append(driver.current)
+
+        assert closed == ["price-tab"]
+
+    def test_acquire_times_out_when_pool_exhausted(self):
+        """Test acquire raises DriverPoolTimeout when all drivers are borrowed."""
+        factory = DriverFactory()
+        pool = DriverPool(factory, DriverPoolConfig(max_size=1), name="test")
+        pooled = pool.acquire()
+
+        with pytest.raises(DriverPoolTimeout):
+            pool.acquire(timeout=0.05)
+
+        pool.release(pooled)
+
+    def test_waiting_borrower_gets_released_driver(self):
+        """Test a blocked borrower receives the driver as soon as it is returned."""
+        factory = DriverFactory()
+        pool = DriverPool(factory, DriverPoolConfig(max_size=1), name="test")
+        created = factory.created
+        pooled = pool.acquire()
+        received = []
+
+        worker = threading.Thread(target=lambda: received.append(pool.acquire(timeout=2)))
+        worker.start()
+        time.sleep(0.05)
+        pool.release(pooled)
+        worker.join()
+
+        assert received[0].driver is created[0]
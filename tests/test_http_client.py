@@ -0,0 +1,152 @@
+"""Tests for http_client.py module."""
+
+import pytest
+import sys
+import os
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add parent directory to path to import modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from http_client import DnsCache, HttpClientConfig, HttpStats, create_http_session
+
+
+class ScriptedHandler(BaseHTTPRequestHandler):
+    """Keep-alive handler answering with the next status code of the server's script"""
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        script = self.server.script
+        status = script.pop(0) if script else 200
+        body = b'{"ok": true}'
+        self.send_response(status)
+        if status == 429:
+            self.send_header("Retry-After", "0")
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), ScriptedHandler)
+    httpd.script = []
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+class RecordingResolver:
+    """getaddrinfo stand-in that records the requested address families"""
+
+    def __init__(self, ipv4=True):
+        self.ipv4 = ipv4
+        self.calls = []
+
+    def __call__(self, host, port, family=0, type=0):
+        self.calls.append(family)
+        if family == socket.AF_INET and not self.ipv4:
+            raise socket.gaierror("no A record")
+        return socket.getaddrinfo("127.0.0.1", port, socket.AF_INET, socket.SOCK_STREAM)
+
+
+class TestPooledSession:
+    """Test keep-alive reuse, retries and metrics of the shared sessions."""
+
+    def test_connection_is_reused(self, server):
+        """Test sequential requests to one host share a single keep-alive connection."""
+        stats = HttpStats()
+        session = create_http_session(HttpClientConfig(backoff_factor=0), stats=stats)
+        url = f"http://127.0.0.1:{server.server_port}/search"
+
+        for _ in range(3):
+            assert session.get(url, timeout=2).status_code == 200
+
+        snapshot = stats.snapshot()
+        assert snapshot["requests"] == 3
+        assert snapshot["new_connections"] == 1
+        assert snapshot["reused_connections"] == 2
+
+    def test_server_errors_are_retried(self, server):
+        """Test 5xx and 429 answers are retried transparently."""
+        stats = HttpStats()
+        session = create_http_session(HttpClientConfig(retries=2, backoff_factor=0), stats=stats)
+        server.script = [503, 429]
+
+        response = session.get(f"http://127.0.0.1:{server.server_port}/", timeout=2)
+
+        assert response.status_code == 200
+        assert stats.snapshot()["requests"] == 3
+
+    def test_last_error_response_is_returned(self, server):
+        """Test exhausted retries return the final response instead of raising."""
+        session = create_http_session(HttpClientConfig(retries=1, backoff_factor=0), stats=HttpStats())
+        server.script = [502, 502]
+
+        response = session.get(f"http://127.0.0.1:{server.server_port}/", timeout=2)
+
+        assert response.status_code == 502
+
+    def test_config_pool_size_follows_workers(self, monkeypatch):
+        """Test the per-host pool size defaults to the search worker count."""
+        monkeypatch.setenv("GEMFINDER_SEARCH_WORKERS", "12")
+        monkeypatch.delenv("GEMFINDER_HTTP_POOL_SIZE", raising=False)
+
+        assert HttpClientConfig.from_env().pool_maxsize == 12
+
+
+class TestDnsCache:
+    """Test the IPv4-preferring DNS cache used by the shared transport."""
+
+    def test_lookup_is_cached_within_ttl(self):
+        """Test repeated resolves of one host hit the cache."""
+        resolver = RecordingResolver()
+        cache = DnsCache(ttl=60, resolver=resolver)
+
+        cache.resolve("api.discogs.com", 443)
+        cache.resolve("api.discogs.com", 443)
+
+        assert resolver.calls == [socket.AF_INET]
+        assert cache.stats_counters == {"hits": 1, "misses": 1}
+
+    def test_expired_entry_is_resolved_again(self):
+        """Test entries are looked up again after the TTL."""
+        resolver = RecordingResolver()
+        cache = DnsCache(ttl=0.01, resolver=resolver)
+
+        cache.resolve("itunes.apple.com", 443)
+        time.sleep(0.02)
+        cache.resolve("itunes.apple.com", 443)
+
+        assert len(resolver.calls) == 2
+
+    def test_ipv6_only_host_falls_back_to_any_family(self):
+        """Test hosts without IPv4 addresses still resolve."""
+        resolver = RecordingResolver(ipv4=False)
+        cache = DnsCache(resolver=resolver)
+
+        assert cache.resolve("v6only.example", 443)
+        assert resolver.calls == [socket.AF_INET, socket.AF_UNSPEC]
+
+    def test_sessions_share_lookups_without_patching_socket(self, server):
+        """Test connections resolve through the cache and leave socket.getaddrinfo untouched."""
+        resolver = RecordingResolver()
+        cache = DnsCache(resolver=resolver)
+        original_getaddrinfo = socket.getaddrinfo
+        url = f"http://gemfinder.test:{server.server_port}/"
+
+        for _ in range(2):
+            session = create_http_session(HttpClientConfig(backoff_factor=0), stats=HttpStats(), dns_cache=cache)
+            assert session.get(url, timeout=2).status_code == 200
+
+        assert resolver.calls == [socket.AF_INET]
+        assert socket.getaddrinfo is original_getaddrinfo
@@ -0,0 +1,99 @@
+"""Tests for logging_config.py module."""
+
+import pytest
+import sys
+import os
+import io
+import json
+import logging
+
+# Add parent directory to path to import modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import logging_config
+from logging_config import (
+    SAMPLED, JsonFormatter, LoggingConfig, SamplingFilter, configure_logging, get_logger, parse_module_levels
+)
+
+
+@pytest.fixture
+def captured():
+    """Configure logging for one test and capture what the app logger tree writes"""
+    stream = io.StringIO()
+
+    def configure(**config):
+        configure_logging(LoggingConfig(**config), force=True)
+        handler = logging.getLogger(logging_config.ROOT_LOGGER).handlers[0]
+        handler.setStream(stream)
+        return stream
+
+    yield configure
+    configure_logging(LoggingConfig.from_env(), force=True)
+
+
+class Expensive:
+    """Argument that records whether it was ever formatted"""
+    formatted = False
+
+    def __str__(self):
+        Expensive.formatted = True
+        return "expensive"
+
+
+class TestLoggingConfig:
+    """Test levels, laziness, sampling and the JSON format."""
+
+    def test_module_levels_from_env(self, monkeypatch):
+        """Test GEMFINDER_LOG_LEVELS sets per-module levels."""
+        monkeypatch.setenv("GEMFINDER_LOG_LEVELS", "selenium_scraper=debug, api_search=WARNING,broken")
+
+        config = LoggingConfig.from_env()
+
+        assert config.module_levels == {"selenium_scraper": "DEBUG", "api_search": "WARNING"}
+        assert parse_module_levels("") == {}
+
+    def test_per_module_level_overrides_default(self, captured):
+        """Test one module can log DEBUG while the rest stays at INFO."""
+        stream = captured(level="INFO", module_levels={"selenium_scraper": "DEBUG"})
+
+        get_logger("selenium_scraper").debug("span %s", "+ €2,49 Versand")
+        get_logger("scrape_search").debug("row %s", 1)
+
+        output = stream.getvalue()
+        assert "gemfinder.selenium_scraper: span + €2,49 Versand" in output
+        assert "row 1" not in output
+
+    def test_disabled_debug_lines_are_not_formatted(self, captured):
+        """Test arguments of suppressed lines are never formatted at INFO."""
+        captured(level="INFO")
+        Expensive.formatted = False
+
+        get_logger("ui_helpers").debug("offer %s", Expensive())
+
+        assert Expensive.formatted is False
+
+    def test_sampled_lines_keep_every_nth_per_call_site(self, captured):
+        """Test sampled records pass once per 1/rate calls; unsampled ones always pass."""
+        stream = captured(level="DEBUG", sample_rate=0.25)
+        log = get_logger("selenium_scraper")
+
+        for i in range(8):
+            log.debug("sampled %d", i, extra=SAMPLED)
+        log.debug("always")
+
+        lines = stream.getvalue().splitlines()
+        assert [l.split(": ", 1)[1] for l in lines] == ["sampled 0", "sampled 4", "always"]
+        assert SamplingFilter(0).filter(logging.LogRecord("x", 10, "", 1, "m", (), None, func=None)) is True
+
+    def test_json_formatter_includes_extra_fields(self):
+        """Test JSON lines carry level, logger, message and extra= fields."""
+        record = logging.LogRecord("gemfinder.api_search", logging.WARNING, __file__, 10,
+                                   "retry in %.0fs", (5.0,), None)
+        record.provider = "Discogs"
+
+        payload = json.loads(JsonFormatter().format(record))
+
+        assert payload["level"] == "WARNING"
+        assert payload["logger"] == "gemfinder.api_search"
+        assert payload["message"] == "retry in 5s"
+        assert payload["provider"] == "Discogs"
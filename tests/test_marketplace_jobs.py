@@ -0,0 +1,189 @@
+"""Tests for marketplace_jobs.py module."""
+
+import pytest
+import sys
+import os
+import threading
+
+# Add parent directory to path to import modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from marketplace_jobs import DONE, FAILED, MarketplaceJobConfig, MarketplaceJobQueue, offers_topic
+from refresh_bus import VersionBus
+
+
+RAW_OFFERS = [{"price": "€10.00", "seller": "a"}, {"price": "€12.00", "seller": "b"}]
+
+
+class FakeMarketplace:
+    """Scrape/enrich stand-ins that count calls and can be held back with an event"""
+
+    def __init__(self, offers=RAW_OFFERS, fail=False):
+        self.offers = offers
+        self.fail = fail
+        self.scrapes = 0
+        self.release = threading.Event()
+        self.release.set()
+        self.first_offer_sent = threading.Event()
+
+    def scrape(self, release_id, max_offers=8, user_country=None, raise_errors=False):
+        self.scrapes += 1
+        if self.fail:
+            raise RuntimeError("blocked by Cloudflare")
+        return list(self.offers)
+
+    def enrich(self, offers, user_country, max_workers=3, on_offer=None):
+        accepted = []
+        for offer in offers:
+            accepted.append(offer)
+            on_offer(offer)
+            self.first_offer_sent.set()
+            self.release.wait(5)
+        return accepted
+
+
+@pytest.fixture
+def make_queue():
+    """Job queue running on a FakeMarketplace - shut down after the test"""
+    queues = []
+
+    def make(fake, config=None):
+        queue = MarketplaceJobQueue(config or MarketplaceJobConfig(), bus=VersionBus(),
+                                    scrape=fake.scrape, enrich=fake.enrich)
+        queues.append(queue)
+        return queue
+
+    yield make
+    for queue in queues:
+        queue.shutdown(wait=True)
+
+
+class TestMarketplaceJobs:
+    """Test submitting, sharing and retrying marketplace jobs."""
+
+    def test_job_collects_offers_and_publishes(self, make_queue):
+        """Test a job ends done with all offers and leaves its topic published and not pending."""
+        queue = make_queue(FakeMarketplace())
+
+        job = queue.submit(123, "de")
+
+        assert job.wait(5)
+        assert job.status == DONE and job.topic == offers_topic("123", "DE")
+        assert job.offers() == RAW_OFFERS
+        assert queue.bus.pending(job.topic) == 0
+        assert queue.bus.version(job.topic) >= 3  # two partial offers + final
+
+    def test_partial_offers_visible_while_running(self, make_queue):
+        """Test accepted offers show up before the job finishes and the topic stays pending."""
+        fake = FakeMarketplace()
+        fake.release.clear()
+        queue = make_queue(fake)
+
+        job = queue.submit("1", "US")
+        assert fake.first_offer_sent.wait(5)
+
+        assert not job.done
+        assert job.offers() == RAW_OFFERS[:1]
+        assert queue.bus.any_pending([job.topic])
+        fake.release.set()
+        assert job.wait(5)
+
+    def test_running_and_completed_jobs_are_shared(self, make_queue):
+        """Test the same release/country reuses one job; another country gets its own."""
+        fake = FakeMarketplace()
+        queue = make_queue(fake)
+
+        job = queue.submit("7", "DE")
+        assert queue.submit("7", "de") is job
+        job.wait(5)
+        assert queue.submit("7", "DE") is job
+        other = queue.submit("7", "US")
+        other.wait(5)
+
+        assert other is not job
+        assert fake.scrapes == 2
+        assert queue.get_stats()["reused"] == 2
+
+    def test_expired_jobs_run_again(self, make_queue):
+        """Test completed jobs older than result_ttl are not reused."""
+        fake = FakeMarketplace()
+        queue = make_queue(fake, MarketplaceJobConfig(result_ttl=0))
+
+        queue.submit("7", "DE").wait(5)
+        queue.submit("7", "DE").wait(5)
+
+        assert fake.scrapes == 2
+
+    def test_failed_job_is_kept_until_explicit_retry(self, make_queue):
+        """Test a failed job is reused by plain submits (re-renders) and only retry starts a new one."""
+        fake = FakeMarketplace(fail=True)
+        queue = make_queue(fake)
+
+        job = queue.submit("9", "DE")
+        job.wait(5)
+        fake.fail = False
+        assert queue.submit("9", "DE") is job
+        retry = queue.submit("9", "DE", retry=True)
+        retry.wait(5)
+
+        assert job.status == FAILED and "Cloudflare" in job.error
+        assert retry is not job and retry.status == DONE
+        assert fake.scrapes == 2
+        assert queue.bus.pending(job.topic) == 0
+
+    def test_shutdown_ends_queued_jobs(self, make_queue):
+        """Test jobs dropped by shutdown fail and leave their topic no longer pending."""
+        fake = FakeMarketplace()
+        fake.release.clear()
+        queue = make_queue(fake, MarketplaceJobConfig(workers=1))
+
+        running = queue.submit("1", "DE")
+        assert fake.first_offer_sent.wait(5)
+        queued = queue.submit("2", "DE")
+        queue.shutdown()
+        fake.release.set()
+
+        assert queued.wait(5) and queued.status == FAILED and "cancelled" in queued.error
+        assert queue.bus.pending(queued.topic) == 0
+        assert running.wait(5) and running.status == DONE
+
+    def test_failed_job_expires_after_failure_ttl(self, make_queue):
+        """Test a failed job older than failure_ttl is started again without a retry."""
+        fake = FakeMarketplace(fail=True)
+        queue = make_queue(fake, MarketplaceJobConfig(failure_ttl=0))
+
+        queue.submit("9", "DE").wait(5)
+        queue.submit("9", "DE").wait(5)
+
+        assert fake.scrapes == 2
+
+    def test_retry_does_not_restart_a_successful_job(self, make_queue):
+        """Test retry only replaces failed jobs - a completed one is still shared."""
+        fake = FakeMarketplace()
+        queue = make_queue(fake)
+
+        job = queue.submit("9", "DE")
+        job.wait(5)
+
+        assert queue.submit("9", "DE", retry=True) is job
+        assert fake.scrapes == 1
+
+
+class TestMarketplaceJobConfig:
+    """Test the job pool defaults fit the shared browser pool."""
+
+    def test_defaults_fit_driver_pool(self):
+        """Test all concurrent shipping checks can hold a browser at once with default settings."""
+        from driver_pool import DriverPoolConfig
+
+        config = MarketplaceJobConfig()
+
+        assert config.workers * config.shipping_workers <= DriverPoolConfig().max_size
+
+    def test_env_shipping_workers_capped_at_pool_share(self, monkeypatch):
+        """Test overriding shipping workers beyond the pool is capped to each job's share."""
+        monkeypatch.setenv("GEMFINDER_MARKETPLACE_WORKERS", "3")
+        monkeypatch.setenv("GEMFINDER_MARKETPLACE_SHIPPING_WORKERS", "5")
+        monkeypatch.setenv("GEMFINDER_DRIVER_POOL_SIZE", "6")
+
+        assert MarketplaceJobConfig.from_env().shipping_workers == 2
@@ -16,8 +16,30 @@ from providers import (
     BeatportProvider,
     BandcampProvider,
     TraxsourceProvider,
-    SearchManager
+    SearchManager,
+    SpeculativeSearch,
+    error_result
 )
+import asyncio
+import time
+
+
+class SleepyProvider(SearchProvider):
+    """Provider stub that answers after a delay (or raises)."""
+
+    def __init__(self, name, delay=0.0, fail=False):
+        self.name = name
+        self.delay = delay
+        self.fail = fail
+
+    def can_search(self, c):
+        return True
+
+    def search(self, c):
+        time.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("boom")
+        return {"platform": self.name, "title": f"{self.name} hit"}
 
 
 class TestSearchCriteria:
@@ -143,6 +165,21 @@ class TestDiscogsProvider:
         
         assert result["platform"] == "Discogs"
 
+    def test_rate_limit_is_reported_not_empty(self, monkeypatch):
+        """Test an exhausted Discogs quota is surfaced with the expected wait."""
+        import providers
+        from rate_governor import RateLimitExceeded
+
+        def limited(*args, **kwargs):
+            raise RateLimitExceeded("Discogs", 12)
+
+        monkeypatch.setattr(providers, "search_discogs_releases", limited)
+        result = DiscogsProvider().search(SearchCriteria(artist="Artist", title="Track"))
+
+        assert result["rate_limited"] is True
+        assert result["retry_after"] == 12
+        assert "12s" in result["message"]
+
 
 class TestRevibedProvider:
     """Test RevibedProvider functionality."""
@@ -483,4 +520,164 @@ class TestProvidersIntegration:
                 result = provider.search(criteria)
                 assert isinstance(result, dict)
                 assert "platform" in result
-                assert result["platform"] == provider.name
\ No newline at end of file
+                assert result["platform"] == provider.name
+
+class TestSearchManagerStream:
+    """Test the async orchestrator."""
+
+    def test_results_arrive_in_completion_order(self):
+        """Test faster providers are yielded first and all run concurrently."""
+        manager = SearchManager([SleepyProvider("Slow", 0.3), SleepyProvider("Fast", 0.05)])
+
+        start = time.time()
+        platforms = [r["platform"] for r in manager.stream_sync(SearchCriteria(title="t", artist="a"))]
+
+        assert platforms == ["Fast", "Slow"]
+        assert time.time() - start < 0.5
+
+    def test_provider_timeout_yields_timeout_entry(self):
+        """Test a provider over its deadline is reported without blocking the others."""
+        manager = SearchManager([SleepyProvider("Stuck", 1.0), SleepyProvider("Quick")], provider_timeout=0.1)
+
+        results = {r["platform"]: r for r in manager.stream_sync(SearchCriteria(title="t", artist="a"))}
+
+        assert results["Quick"]["title"] == "Quick hit"
+        assert results["Stuck"]["status"] == "timeout"
+        assert results["Stuck"]["title"] == "Fehler"
+
+    def test_overall_timeout_cancels_stragglers(self):
+        """Test the overall deadline ends the stream."""
+        manager = SearchManager([SleepyProvider("A", 1.0), SleepyProvider("B", 1.0)],
+                                provider_timeout=5, overall_timeout=0.1)
+
+        start = time.time()
+        results = list(manager.stream_sync(SearchCriteria(title="t", artist="a")))
+
+        assert time.time() - start < 0.5
+        assert sorted(r["platform"] for r in results) == ["A", "B"]
+        assert all(r["status"] == "timeout" for r in results)
+
+    def test_provider_exception_becomes_error_entry(self):
+        """Test exceptions are turned into error dicts instead of aborting the stream."""
+        manager = SearchManager([SleepyProvider("Broken", fail=True), SleepyProvider("Ok")])
+
+        results = {r["platform"]: r for r in manager.stream_sync(SearchCriteria(title="t", artist="a"))}
+
+        assert results["Broken"]["error"] == "boom"
+        assert results["Ok"]["title"] == "Ok hit"
+
+    def test_async_stream(self):
+        """Test the async iterator can be consumed directly."""
+        manager = SearchManager([SleepyProvider("One"), SleepyProvider("Two", 0.05)])
+
+        async def collect():
+            return [r["platform"] async for r in manager.stream(SearchCriteria(title="t", artist="a"))]
+
+        assert asyncio.run(collect()) == ["One", "Two"]
+
+    def test_early_break_stops_stream(self):
+        """Test a consumer may stop after the first result."""
+        manager = SearchManager([SleepyProvider("Fast"), SleepyProvider("Slow", 1.0)])
+
+        start = time.time()
+        for result in manager.stream_sync(SearchCriteria(title="t", artist="a")):
+            break
+
+        assert result["platform"] == "Fast"
+        assert time.time() - start < 0.5
+
+    def test_error_result_shape(self):
+        """Test error entries carry the common result keys."""
+        entry = error_result("Beatport", "Timeout", status="timeout")
+
+        assert entry["platform"] == "Beatport"
+        assert entry["url"] == ""
+        assert entry["status"] == "timeout"
+
+
+class CountingProvider(SleepyProvider):
+    """SleepyProvider that counts its searches."""
+
+    def __init__(self, name, delay=0.0, fail=False):
+        super().__init__(name, delay, fail)
+        self.calls = 0
+
+    def search(self, c):
+        self.calls += 1
+        return super().search(c)
+
+
+class TestSpeculativeSearch:
+    """Test background physical searches started during the digital stage."""
+
+    def test_result_reuses_running_search(self):
+        """Test the started search is taken over instead of searching twice."""
+        provider = CountingProvider("Discogs", 0.1)
+        criteria = SearchCriteria(title="t", artist="a")
+        speculative = SpeculativeSearch([provider], criteria)
+
+        result = speculative.result(provider, criteria)
+
+        assert result["title"] == "Discogs hit"
+        assert provider.calls == 1
+        assert speculative.is_done(provider)
+
+    def test_changed_criteria_search_again(self):
+        """Test results for other criteria are never handed out."""
+        provider = CountingProvider("Revibed")
+        speculative = SpeculativeSearch([provider], SearchCriteria(artist="old"))
+
+        speculative.result(provider, SearchCriteria(artist="new"))
+
+        assert provider.calls == 2
+
+    def test_failed_background_search_falls_back(self):
+        """Test an exception in the background search leads to a normal search."""
+        provider = CountingProvider("Discogs", fail=True)
+        criteria = SearchCriteria(title="t", artist="a")
+        speculative = SpeculativeSearch([provider], criteria)
+
+        with pytest.raises(RuntimeError):
+            speculative.result(provider, criteria)
+        assert provider.calls == 2
+
+    def test_stream_takes_over_speculative_searches(self):
+        """Test the orchestrator joins background searches instead of starting new ones."""
+        discogs = CountingProvider("Discogs", 0.1)
+        revibed = CountingProvider("Revibed", 0.05)
+        criteria = SearchCriteria(title="t", artist="a", album="b")
+        speculative = SpeculativeSearch([discogs, revibed], criteria)
+
+        manager = SearchManager([discogs, revibed])
+        platforms = [r["platform"] for r in manager.stream_sync(criteria, speculative=speculative)]
+
+        assert platforms == ["Revibed", "Discogs"]
+        assert discogs.calls == 1
+        assert revibed.calls == 1
+
+    def test_stream_waits_on_speculative_search_without_a_worker(self, monkeypatch):
+        """Test joining a background search does not need a free worker of the busy search executor."""
+        import threading
+        import providers
+        from concurrent.futures import Future, ThreadPoolExecutor
+
+        executor = ThreadPoolExecutor(max_workers=1)
+        release = threading.Event()
+        executor.submit(release.wait, 5)  # every worker busy
+        monkeypatch.setattr(providers, "_search_executor", executor)
+
+        provider = CountingProvider("Discogs")
+        criteria = SearchCriteria(title="t", artist="a")
+        speculative = SpeculativeSearch([], criteria)
+        background = speculative.futures["Discogs"] = Future()
+        threading.Timer(0.05, background.set_result, [{"platform": "Discogs", "title": "early hit"}]).start()
+
+        try:
+            results = list(SearchManager([provider]).stream_sync(criteria, provider_timeout=1,
+                                                                 speculative=speculative))
+        finally:
+            release.set()
+            executor.shutdown()
+
+        assert results[0]["title"] == "early hit"
+        assert provider.calls == 0
@@ -0,0 +1,88 @@
+"""Tests for rate_governor.py module."""
+
+import pytest
+import sys
+import os
+import threading
+
+# Add parent directory to path to import modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rate_governor import RateLimitExceeded
+
+
+class TestRateGovernor:
+    """Test token-bucket pacing of Discogs API calls."""
+
+    def test_burst_within_quota_does_not_wait(self, make_governor, fake_clock):
+        """Test requests up to the limit are granted immediately."""
+        governor = make_governor(limit=3, window=3)
+
+        for _ in range(3):
+            assert governor.acquire() == 0
+
+        assert fake_clock.sleeps == []
+
+    def test_queued_callers_get_increasing_slots(self, make_governor):
+        """Test callers beyond the quota are paced in arrival order."""
+        governor = make_governor(limit=2, window=2, max_wait=10)
+        governor.acquire()
+        governor.acquire()
+
+        first = governor.acquire()
+        second = governor.acquire()
+
+        assert first == pytest.approx(1.0)
+        assert second == pytest.approx(2.0)
+
+    def test_tokens_refill_over_time(self, make_governor, fake_clock):
+        """Test the bucket refills at limit/window tokens per second."""
+        governor = make_governor(limit=2, window=2)
+        governor.acquire()
+        governor.acquire()
+
+        fake_clock.now += 1.0
+
+        assert governor.acquire() == 0
+
+    def test_wait_beyond_max_wait_raises_with_retry_after(self, make_governor):
+        """Test callers are told the expected wait instead of queueing too long."""
+        governor = make_governor(limit=1, window=10, max_wait=2)
+        governor.acquire()
+
+        with pytest.raises(RateLimitExceeded) as exc_info:
+            governor.acquire()
+
+        assert exc_info.value.retry_after == pytest.approx(10.0)
+        assert governor.get_stats()["rejected"] == 1
+
+    def test_server_remaining_header_drains_bucket(self, make_governor):
+        """Test X-Discogs-Ratelimit-Remaining lowers the local token count."""
+        governor = make_governor(limit=60, window=60, max_wait=0.5)
+
+        governor.update_from_headers({"X-Discogs-Ratelimit": "60", "X-Discogs-Ratelimit-Remaining": "0"})
+
+        with pytest.raises(RateLimitExceeded):
+            governor.acquire()
+        assert governor.get_stats()["server_remaining"] == 0
+
+    def test_429_blocks_for_retry_after(self, make_governor):
+        """Test a 429 answer pauses the bucket for the Retry-After duration."""
+        governor = make_governor(limit=60, window=60, max_wait=60)
+
+        governor.on_rate_limited(5)
+
+        assert governor.expected_wait() == pytest.approx(5.0)
+
+    def test_concurrent_callers_share_quota(self, make_governor):
+        """Test parallel callers never get more immediate slots than the limit."""
+        governor = make_governor(limit=5, window=5, max_wait=100)
+        waits = []
+
+        threads = [threading.Thread(target=lambda: waits.append(governor.acquire())) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert sorted(waits) == pytest.approx([0, 0, 0, 0, 0, 1, 2, 3])
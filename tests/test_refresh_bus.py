@@ -0,0 +1,81 @@
+"""Tests for refresh_bus.py module."""
+
+import pytest
+import sys
+import os
+import threading
+
+# Add parent directory to path to import modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from refresh_bus import AdaptivePoller, RefreshConfig, VersionBus
+
+
+class TestVersionBus:
+    """Test version counters and pending jobs."""
+
+    def test_job_is_pending_until_it_publishes(self):
+        """Test a job marks its topic pending and publishes a new version when done."""
+        bus = VersionBus()
+
+        with bus.job("offers:1"):
+            assert bus.any_pending(["offers:1", "offers:2"])
+            bus.publish("offers:1")
+            assert bus.version("offers:1") == 1
+
+        assert not bus.any_pending(["offers:1"])
+        assert bus.versions(["offers:1", "offers:2"]) == (2, 0)
+
+    def test_wait_for_change_wakes_on_publish(self):
+        """Test watchers wake up as soon as a topic gets a new version."""
+        bus = VersionBus()
+        seen = bus.versions(["offers:7"])
+        timer = threading.Timer(0.02, bus.publish, args=("offers:7",))
+        timer.start()
+
+        assert bus.wait_for_change(["offers:7"], seen, timeout=2) is True
+        assert bus.wait_for_change(["offers:7"], bus.versions(["offers:7"]), timeout=0.01) is False
+
+
+class TestAdaptivePoller:
+    """Test the adaptive polling interval."""
+
+    def test_no_timer_without_pending_jobs(self):
+        """Test idle fragments are never polled."""
+        poller = AdaptivePoller(RefreshConfig(tiers=(0.25, 1.0), ticks_per_tier=2))
+
+        assert poller.interval(pending=False) is None
+        assert poller.interval(pending=True) == 0.25
+
+    def test_backs_off_while_unchanged_and_resets_on_new_data(self):
+        """Test the interval slows down on idle ticks and speeds up when data arrives."""
+        poller = AdaptivePoller(RefreshConfig(tiers=(0.25, 0.5, 2.0), ticks_per_tier=2))
+        poller.retarget(["offers:1"], (0,))
+
+        intervals = []
+        for _ in range(6):
+            poller.observe((0,))
+            intervals.append(poller.interval(pending=True))
+        changed = poller.observe((1,))
+
+        assert intervals == [0.25, 0.5, 0.5, 2.0, 2.0, 2.0]
+        assert changed is True
+        assert poller.interval(pending=True) == 0.25
+
+    def test_new_topics_restart_at_fastest_tier(self):
+        """Test selecting another release resets the backoff."""
+        poller = AdaptivePoller(RefreshConfig(tiers=(0.25, 2.0), ticks_per_tier=1))
+        poller.retarget(["offers:1"], (0,))
+        poller.observe((0,))
+        poller.retarget(["offers:1"], (0,))
+        assert poller.interval(pending=True) == 2.0
+
+        poller.retarget(["offers:2"], (0,))
+
+        assert poller.interval(pending=True) == 0.25
+
+    def test_tiers_from_env(self, monkeypatch):
+        """Test GEMFINDER_REFRESH_TIERS overrides the polling tiers."""
+        monkeypatch.setenv("GEMFINDER_REFRESH_TIERS", "0.5, 1, 5")
+
+        assert RefreshConfig.from_env().tiers == (0.5, 1.0, 5.0)
@@ -0,0 +1,126 @@
+"""Tests for release_details.py module."""
+
+import pytest
+import sys
+import os
+import threading
+import time
+
+# Add parent directory to path to import modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rate_governor import RateLimitExceeded
+from release_details import ReleaseDetailsCache, ReleaseDetailsConfig, release_key
+
+
+class FakeDetailsApi:
+    """Stand-in for fetch_discogs_release_details that records calls and their max_wait"""
+
+    def __init__(self, governor=None):
+        self.calls = []
+        self.governor = governor
+        self._lock = threading.Lock()
+
+    def __call__(self, release_id, max_wait=None):
+        if self.governor is not None:
+            self.governor.acquire(max_wait)
+        with self._lock:
+            self.calls.append((release_id, max_wait))
+        return {"id": release_id, "tracklist": [{"title": f"Track {release_id}"}], "community": {"have": 1}}
+
+
+def releases(n):
+    return [{"id": i, "title": f"Release {i}"} for i in range(1, n + 1)]
+
+
+class TestReleaseDetailsCache:
+    """Test prefetching and serving release details."""
+
+    def test_prefetch_top_n_without_queueing(self, make_governor):
+        """Test only the top-N releases are fetched and prefetches never wait for a slot."""
+        api = FakeDetailsApi()
+        cache = ReleaseDetailsCache(ReleaseDetailsConfig(top_n=3), fetch=api, governor=make_governor(limit=60))
+
+        assert cache.prefetch(releases(10)) == 3
+        cache.shutdown(wait=True)
+
+        assert sorted(call[0] for call in api.calls) == ["1", "2", "3"]
+        assert all(max_wait == 0 for _, max_wait in api.calls)
+        assert cache.get(2)["tracklist"] == [{"title": "Track 2"}]
+        assert cache.get_stats()["prefetched"] == 3
+
+    def test_cached_releases_are_not_fetched_again(self, make_governor):
+        """Test switching back to a release and a repeated prefetch read from the cache."""
+        api = FakeDetailsApi()
+        cache = ReleaseDetailsCache(ReleaseDetailsConfig(top_n=2), fetch=api, governor=make_governor(limit=60))
+
+        cache.get_or_fetch("1")
+        assert cache.get_or_fetch(1)["id"] == "1"
+        cache.prefetch(releases(2))
+        cache.shutdown(wait=True)
+
+        assert [call[0] for call in api.calls] == ["1", "2"]
+        assert api.calls[0][1] is None  # interactive call may queue
+
+    def test_prefetch_leaves_reserve_for_interactive_calls(self, make_governor):
+        """Test prefetches are skipped once only the reserved rate-limit tokens are left."""
+        governor = make_governor(limit=4, window=60)
+        api = FakeDetailsApi(governor)
+        cache = ReleaseDetailsCache(ReleaseDetailsConfig(top_n=5, workers=1, reserve=2), fetch=api, governor=governor)
+
+        cache.prefetch(releases(5))
+        cache.shutdown(wait=True)
+
+        assert len(api.calls) == 2
+        assert cache.get_stats()["skipped"] == 3
+        assert governor.get_stats()["tokens"] == pytest.approx(2, abs=0.1)
+
+    def test_rate_limited_interactive_fetch_returns_none(self, make_governor):
+        """Test an exhausted quota degrades to None instead of raising in the UI."""
+        def limited(release_id, max_wait=None):
+            raise RateLimitExceeded("Discogs", 12)
+
+        cache = ReleaseDetailsCache(ReleaseDetailsConfig(), fetch=limited, governor=make_governor(limit=60))
+
+        assert cache.get_or_fetch("5") is None
+        assert cache.get("5") is None
+
+    def test_interactive_call_retries_after_joining_skipped_prefetch(self, make_governor):
+        """Test joining a prefetch flight that found no free slot does not fail the interactive call."""
+        entered, release = threading.Event(), threading.Event()
+
+        def api(release_id, max_wait=None):
+            if max_wait == 0:
+                entered.set()
+                release.wait(5)
+                raise RateLimitExceeded("Discogs", 5)
+            return {"id": release_id, "tracklist": []}
+
+        cache = ReleaseDetailsCache(ReleaseDetailsConfig(top_n=1), fetch=api, governor=make_governor(limit=60))
+        cache.prefetch(releases(1))
+        assert entered.wait(5)
+        result = {}
+        user = threading.Thread(target=lambda: result.update(details=cache.get_or_fetch("1")))
+        user.start()
+        deadline = time.monotonic() + 5
+        while cache._flight.get_stats()["shared"] == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        release.set()
+        user.join(5)
+        cache.shutdown(wait=True)
+
+        assert result["details"] == {"id": "1", "tracklist": []}
+        assert cache.get_stats()["skipped"] == 1
+
+    def test_entries_expire_after_ttl(self, make_governor, fake_clock):
+        """Test expired details are fetched again."""
+        api = FakeDetailsApi()
+        cache = ReleaseDetailsCache(ReleaseDetailsConfig(ttl=10), fetch=api, governor=make_governor(limit=60),
+                                    clock=fake_clock)
+
+        cache.get_or_fetch("1")
+        fake_clock.now = 11
+        cache.get_or_fetch("1")
+
+        assert len(api.calls) == 2
+        assert release_key({"uri": "/release/42"}) == "42"
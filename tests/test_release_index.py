@@ -0,0 +1,178 @@
+"""Tests for release_index.py module."""
+
+import pytest
+import sys
+import os
+from types import SimpleNamespace
+
+# Add parent directory to path to import modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import release_index
+from release_index import ReleaseIndex, ReleaseIndexConfig, catno_key, entries_from_result
+from search_cache import cached_search
+
+
+DISCOGS_RESULT = {
+    "platform": "Discogs",
+    "releases": [
+        {"id": "1", "title": "Discovery", "artist": "Daft Punk", "label": ["Virgin"], "catno": "V 2940",
+         "year": "2001", "uri": "/release/1", "cover": "c.jpg"},
+        {"id": "2", "title": "Homework", "artist": "Daft Punk", "label": ["Soma"], "catno": "SOMA CD 66",
+         "year": "1997", "uri": "/release/2"},
+    ],
+    "count": 2,
+    "has_results": True,
+}
+
+DISCOVERY, HOMEWORK = DISCOGS_RESULT["releases"]
+
+
+def catno_answer(catno, *releases, artist=""):
+    """Discogs result of a catno= query - api_search marks those releases"""
+    marked = [{**release, "catno_query": {"catno": catno, "artist": artist}} for release in releases]
+    return {"platform": "Discogs", "releases": marked, "count": len(marked), "has_results": True}
+
+
+BEATPORT_HIT = {"platform": "Beatport", "title": "One More Time (Original Mix)", "artist": "Daft Punk",
+                "album": "Discovery", "label": "Parlophone", "url": "https://www.beatport.com/track/x/1"}
+
+
+class TestReleaseIndex:
+    """Test feeding, fuzzy lookup and persistence of the release index."""
+
+    def test_entries_from_results(self):
+        """Test Discogs release lists and single shop hits become entries; no-hit answers are skipped."""
+        entries = entries_from_result("Discogs", DISCOGS_RESULT)
+
+        assert [e["title"] for e in entries] == ["Discovery", "Homework"]
+        assert entries[0]["url"] == "https://www.discogs.com/release/1"
+        assert entries[0]["label"] == "Virgin"
+        assert entries_from_result("Traxsource", {"platform": "Traxsource", "title": "Kein Treffer"}) == []
+
+    def test_fuzzy_lookup_while_typing(self, index):
+        """Test partial, accent-free input finds earlier hits best first."""
+        index.add_result("Discogs", DISCOGS_RESULT)
+        index.add_result("Beatport", BEATPORT_HIT)
+
+        hits = index.search(artist="daft pun", title="one more")
+
+        assert hits[0]["platform"] == "Beatport"
+        assert hits[0]["score"] >= 80
+        assert index.search(artist="xy") == []  # below min_query_length
+
+    def test_catalog_number_lookup(self, index):
+        """Test catalog numbers match regardless of spacing and case, also as prefix."""
+        index.add_result("Discogs", DISCOGS_RESULT)
+
+        exact = index.search(catalog="soma-cd66")
+        prefix = index.search(catalog="V29")
+
+        assert catno_key("SOMA CD 66") == "SOMACD66"
+        assert exact[0]["title"] == "Homework" and exact[0]["score"] == 100.0
+        assert prefix[0]["title"] == "Discovery" and prefix[0]["score"] == 95.0
+
+    def test_releases_for_catno(self, index):
+        """Test catno= answers are kept per normalized catno, filtered by artist and album and expire."""
+        index.add_result("Discogs", catno_answer("V 2940", DISCOVERY))
+
+        assert [r["id"] for r in index.releases_for_catno("v-2940")] == ["1"]
+        assert index.releases_for_catno("V2940", artist="daft punk")[0]["title"] == "Discovery"
+        assert index.releases_for_catno("V2940", album="Discovery")[0]["id"] == "1"
+        assert index.releases_for_catno("V2940", artist="Aphex Twin") == []
+        assert index.releases_for_catno("V2940", album="Selected Ambient Works") == []
+        assert index.releases_for_catno("UNKNOWN1") == []
+
+        index.config.catno_ttl = 0
+        assert index.releases_for_catno("V2940") == []
+
+    def test_expired_catnos_pruned_from_memory(self, index, monkeypatch, fake_clock):
+        """Test adding results drops catno mappings older than catno_ttl from memory too."""
+        monkeypatch.setattr(release_index, "time", SimpleNamespace(time=fake_clock))
+        index.config.catno_ttl = 10
+        index.add_result("Discogs", catno_answer("V 2940", DISCOVERY))
+        fake_clock.now = 11
+
+        index.add_result("Discogs", catno_answer("V 3060", {"id": "3", "title": "Human After All",
+                                                             "artist": "Daft Punk", "catno": "V 3060"}))
+
+        assert set(index._catno_releases) == {"V3060"}
+        assert index.get_stats()["catnos"] == 1
+
+    def test_free_text_hits_not_used_for_catno(self, index):
+        """Test free-text results never answer catno searches - other pressings could be missing."""
+        index.add_result("Discogs", DISCOGS_RESULT)
+
+        assert index.releases_for_catno("V 2940") == []
+        assert index.get_stats()["catnos"] == 0
+
+    def test_artist_narrowed_answer_not_used_for_other_artists(self, index):
+        """Test a catno= answer filtered by one artist is only reused for that artist."""
+        index.add_result("Discogs", catno_answer("SOMA CD 66", HOMEWORK, artist="Daft Punk"))
+
+        assert index.releases_for_catno("SOMACD66", artist="daft punk")[0]["id"] == "2"
+        assert index.releases_for_catno("SOMACD66") == []
+
+    def test_catno_fast_path_skips_api(self, shared_stores, monkeypatch):
+        """Test a repeated catno search is answered from the index without calling Discogs."""
+        import providers
+        from providers import DiscogsProvider, SearchCriteria
+
+        _, index = shared_stores
+        calls = []
+
+        def api(*args):
+            calls.append(args)
+            return catno_answer(args[3], HOMEWORK)["releases"]
+
+        monkeypatch.setattr(providers, "search_discogs_releases", api)
+
+        first = DiscogsProvider().search(SearchCriteria(catalog="SOMA CD 66"))
+        repeat = DiscogsProvider().search(SearchCriteria(catalog="somacd66", artist="Daft Punk"))
+        with_track = DiscogsProvider().search(SearchCriteria(catalog="SOMA CD 66", title="Da Funk"))
+
+        assert calls == [("", "", "", "SOMA CD 66"), ("", "Da Funk", "", "SOMA CD 66")]
+        assert "from_index" not in first and "from_index" not in with_track
+        assert repeat["from_index"] is True and repeat["releases"][0]["title"] == "Homework"
+
+    def test_persisted_across_instances_and_bounded(self, tmp_path):
+        """Test entries survive a restart and the oldest ones are evicted above max_entries."""
+        path = str(tmp_path / "index.sqlite")
+        first = ReleaseIndex(ReleaseIndexConfig(path=path, max_entries=2))
+        first.add_result("Discogs", catno_answer("V 2940", DISCOVERY))
+        first.add_result("Discogs", catno_answer("SOMA CD 66", HOMEWORK))
+        first.add_result("Beatport", BEATPORT_HIT)
+        first.close()
+
+        restored = ReleaseIndex(ReleaseIndexConfig(path=path, max_entries=2))
+
+        assert restored.get_stats()["entries"] == 2
+        assert restored.releases_for_catno("V 2940")[0]["title"] == "Discovery"  # catno map is kept
+        assert restored.search(catalog="V2940") == []  # oldest entry was evicted
+        assert restored.search(artist="Daft Punk", title="One More Time")[0]["platform"] == "Beatport"
+        restored.close()
+
+    def test_fed_by_cached_search(self, shared_stores):
+        """Test fresh provider answers are indexed by the cached_search decorator."""
+        _, index = shared_stores
+
+        class Provider:
+            name = "Beatport"
+
+            @cached_search
+            def search(self, criteria):
+                return dict(BEATPORT_HIT)
+
+        class Criteria:
+            title, artist, album, catalog = "One More Time", "Daft Punk", "", ""
+
+        Provider().search(Criteria())
+
+        assert index.get_stats()["entries"] == 1
+
+    def test_disabled_index_ignores_everything(self, tmp_path):
+        """Test GEMFINDER_INDEX_DISABLED turns feed and lookup into no-ops."""
+        idx = ReleaseIndex(ReleaseIndexConfig(path=str(tmp_path / "index.sqlite"), enabled=False))
+
+        assert idx.add_result("Beatport", BEATPORT_HIT) == 0
+        assert idx.search(artist="Daft Punk", title="One More Time") == []
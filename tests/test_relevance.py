@@ -0,0 +1,74 @@
+"""Tests for relevance.py module."""
+
+import pytest
+import sys
+import os
+
+# Add parent directory to path to import modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from relevance import RelevanceScorer
+from text_normalize import normalize_for_matching
+from scrape_search import calculate_relevance_score
+
+
+CANDIDATES = [
+    ("One More Time (Daft Punk Cover)", "London Elektricity Big Band", ""),
+    ("Around the World (Original Mix)", "Daft Punk", ""),
+    ("One More Time (Original Mix)", "Daft Punk", "Virgin"),
+    ("Totally Unrelated", "Someone Else", ""),
+]
+
+
+class TestRelevanceScorer:
+    """Test batch scoring, ranking and the platform filters."""
+
+    def test_points_match_single_row_scoring(self):
+        """Test score_many gives the calculate_relevance_score points for every row."""
+        scorer = RelevanceScorer("Daft Punk", "One More Time")
+
+        assert scorer.score_many(CANDIDATES) == [16, 5, 13, 0]
+        assert scorer.score_many(CANDIDATES) == [calculate_relevance_score("Daft Punk", "One More Time", *c)
+                                                 for c in CANDIDATES]
+
+    def test_accents_and_empty_terms(self):
+        """Test accent folding and that an empty artist still grants the title bonus like before."""
+        scorer = RelevanceScorer("", "Café del Mar")
+
+        assert normalize_for_matching("  Café DEL Mar ") == "cafe del mar"
+        assert scorer.score("Cafe del Mar (Energy 52)", "Energy 52") == 5 + 3 + 3
+
+    def test_rank_prefers_artist_match_over_cover(self):
+        """Test the original track outranks a cover that names the artist in its title."""
+        scorer = RelevanceScorer("Daft Punk", "One More Time")
+
+        ranked = scorer.rank(CANDIDATES)
+
+        assert [index for index, _ in ranked] == [2, 0, 1]
+        assert scorer.best(CANDIDATES) == 2
+        assert scorer.best(CANDIDATES[3:]) is None
+        assert scorer.best([]) is None
+
+    def test_equal_rows_keep_list_order(self):
+        """Test identical candidates are ranked in their original order."""
+        scorer = RelevanceScorer("Daft Punk", "One More Time")
+
+        assert scorer.best([CANDIDATES[2], CANDIDATES[2]]) == 0
+
+    @pytest.mark.parametrize("artist,track,album,row,expected", [
+        ("Drum Starts", "Picasso", "", ("PICASSO (Extended Mix)", "Someone", "Picasso"), False),
+        ("Drum Starts", "Picasso", "", ("Picasso (Original Mix)", "Drum Starts", "Picasso"), True),
+        ("", "", "Discovery", ("Voyager", "Daft Punk", "Discovery"), True),
+        ("", "", "", ("Voyager", "Daft Punk", "Discovery"), False),
+    ])
+    def test_word_filter(self, artist, track, album, row, expected):
+        """Test the Beatport word filter needs a word of each given search term."""
+        assert RelevanceScorer(artist, track, album).word_filter(*row) is expected
+
+    def test_term_filter(self):
+        """Test the iTunes filter needs the artist or the track in one field."""
+        scorer = RelevanceScorer("Beyoncé", "Halo")
+
+        assert scorer.term_filter("Crazy in Love", "Beyonce", "Dangerously in Love") is True
+        assert scorer.term_filter("Halo (Remix)", "Someone", "") is True
+        assert scorer.term_filter("Single Ladies", "Other", "") is False
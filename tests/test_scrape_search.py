@@ -7,14 +7,33 @@ import os
 # Add parent directory to path to import modules
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+import scrape_search
 from scrape_search import (
     search_beatport,
     search_bandcamp,
     search_traxsource,
     search_revibed,
-    search_digital_releases_parallel
+    search_digital_releases_parallel,
+    parse_traxsource_rows,
+    is_traxsource_no_results_page,
+    select_traxsource_result,
+    extract_next_data,
+    parse_beatport_next_data,
+    select_beatport_result,
+    parse_bandcamp_price,
+    price_from_buy_text,
+    parse_revibed_marketplace,
+    map_revibed_item,
+    select_revibed_result
 )
 
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def read_fixture(name):
+    with open(os.path.join(REPO_DIR, name), encoding="utf-8") as f:
+        return f.read()
+
 
 class TestSearchBeatport:
     """Test Beatport search functionality."""
@@ -139,6 +158,240 @@ class TestSearchTraxsource:
         assert result[0]["artist"] == ""
 
 
+class TestParseBeatportNextData:
+    """Test the embedded-JSON Beatport parser against captured pages."""
+
+    def test_parses_track_search_page(self):
+        """Test tracks are mapped from the search-tracks query state."""
+        tracks = parse_beatport_next_data(read_fixture("beatport_tracks_source.html"))
+
+        assert len(tracks) == 150
+        first = tracks[0]
+        assert first["title"] == "One More Time (12 Mix)"
+        assert first["artist"] == "Daft Punk"
+        assert first["album"] == "One More Time"
+        assert first["label"] == "Daft Life Ltd./ADA France"
+        assert first["price"] == "€1.39"
+        assert first["url"] == "https://www.beatport.com/track/one-more-time/6014288"
+        assert "250x250" in first["cover_url"]
+
+    def test_parses_search_all_page(self):
+        """Test the tracks section of the combined search page is used."""
+        tracks = parse_beatport_next_data(read_fixture("beatport_page_source.html"))
+
+        assert tracks
+        assert all(track["url"].startswith("https://www.beatport.com/track/") for track in tracks)
+
+    def test_page_without_embedded_state(self):
+        """Test pages without __NEXT_DATA__ are reported as None (not as 'no results')."""
+        assert extract_next_data("<html><body>Just a moment...</body></html>") is None
+        assert parse_beatport_next_data(None) is None
+
+    def test_empty_track_list_means_no_results(self):
+        """Test an embedded state without tracks yields an empty list."""
+        html = ('<script id="__NEXT_DATA__" type="application/json">'
+                '{"props": {"pageProps": {"dehydratedState": {"queries": '
+                '[{"state": {"data": {"data": []}}}]}}}}</script>')
+
+        assert parse_beatport_next_data(html) == []
+
+    def test_select_applies_word_filter(self):
+        """Test the Beatport filter picks a matching track and rejects unrelated ones."""
+        tracks = parse_beatport_next_data(read_fixture("beatport_tracks_source.html"))
+
+        hit = select_beatport_result(tracks, "Daft Punk", "One More Time", "", 0.3)
+        miss = select_beatport_result(tracks, "Nobody", "Nothing", "", 0.3)
+
+        assert hit[0]["platform"] == "Beatport"
+        assert hit[0]["artist"] == "Daft Punk"
+        assert hit[0]["search_time"] == 0.3
+        assert "catalog_number" not in hit[0]
+        assert miss[0]["title"] == "Kein Treffer"
+
+
+def bandcamp_page(tralbum=None, ld_json=None, buy_html=""):
+    """Build a minimal Bandcamp item page with the embedded data blocks."""
+    import html as html_lib
+    import json
+
+    parts = ["<html><head>"]
+    if ld_json is not None:
+        parts.append(f'<script type="application/ld+json">{json.dumps(ld_json)}</script>')
+    if tralbum is not None:
+        parts.append(f'<script data-tralbum="{html_lib.escape(json.dumps(tralbum))}"></script>')
+    parts.append(f"</head><body>{buy_html}</body></html>")
+    return "".join(parts)
+
+
+class TestParseBandcampPrice:
+    """Test Bandcamp price extraction from embedded item page data."""
+
+    def test_track_price_from_json_ld(self):
+        """Test a track sold on its own is shown with currency and (Track)."""
+        html = bandcamp_page(
+            tralbum={"item_type": "track", "current": {"minimum_price": 1.0}},
+            ld_json={"@type": "MusicRecording", "offers": {"price": 1.0, "priceCurrency": "EUR"}},
+        )
+
+        assert parse_bandcamp_price(html) == "€1.00 (Track)"
+
+    def test_track_only_sold_with_album(self):
+        """Test a track that is not sold separately shows the album price."""
+        html = bandcamp_page(
+            tralbum={"item_type": "track", "current": {}, "trackinfo": [{"is_downloadable": False}]},
+            ld_json={
+                "@type": "MusicRecording",
+                "inAlbum": {"@type": "MusicAlbum", "albumRelease": [
+                    {"musicReleaseFormat": "VinylFormat", "offers": {"price": 25.0, "priceCurrency": "USD"}},
+                    {"musicReleaseFormat": "DigitalFormat", "offers": {"price": 7.0, "priceCurrency": "USD"}},
+                ]},
+            },
+        )
+
+        assert parse_bandcamp_price(html) == "$7.00 (Album only)"
+
+    def test_name_your_price_album(self):
+        """Test a minimum price of 0 is reported as name-your-price."""
+        html = bandcamp_page(
+            tralbum={"item_type": "album", "current": {"minimum_price": 0.0}},
+            ld_json={"@type": "MusicAlbum", "albumRelease": [
+                {"musicReleaseFormat": "DigitalFormat", "offers": {"price": 0.0, "priceCurrency": "GBP"}},
+            ]},
+        )
+
+        assert parse_bandcamp_price(html) == "nyp (Album only)"
+
+    def test_malformed_minimum_price_ignored(self):
+        """Test an empty or malformed minimum price does not break the price lookup."""
+        html = bandcamp_page(
+            tralbum={"item_type": "track", "current": {"minimum_price": ""}},
+            ld_json={"@type": "MusicRecording", "offers": {"price": 1.0, "priceCurrency": "EUR"}},
+        )
+        no_price = bandcamp_page(tralbum={"item_type": "album", "current": {"minimum_price": "n/a"}})
+
+        assert parse_bandcamp_price(html) == "€1.00 (Track)"
+        assert parse_bandcamp_price(no_price) == ""
+
+    def test_other_currency_uses_code(self):
+        """Test currencies without a symbol are shown with their ISO code."""
+        html = bandcamp_page(
+            ld_json={"@type": "MusicRecording", "offers": {"price": 1.5, "priceCurrency": "CAD"}},
+        )
+
+        assert parse_bandcamp_price(html) == "1.50 CAD (Track)"
+
+    def test_buy_item_text_fallback(self):
+        """Test the server-rendered purchase section is used when no embedded data exists."""
+        html = bandcamp_page(buy_html='<li class="buyItem digital"><h4>Buy Digital Track</h4>'
+                                      '<span>£1</span> <span>GBP</span> or more</li>')
+
+        assert parse_bandcamp_price(html) == "£1 (Track)"
+
+    def test_page_without_purchase_info(self):
+        """Test pages without any price data return an empty price."""
+        assert parse_bandcamp_price("<html><body></body></html>") == ""
+        assert parse_bandcamp_price(None) == ""
+
+    def test_buy_text_name_your_price(self):
+        """Test name-your-price wording without a currency."""
+        assert price_from_buy_text("Buy Digital Album name your price") == "nyp (Album only)"
+
+
+class TestParseRevibedMarketplace:
+    """Test the server-rendered Revibed marketplace state parser."""
+
+    def test_empty_server_list_means_no_results(self):
+        """Test an API-loaded empty list is a definite 'no results' (no browser needed)."""
+        assert parse_revibed_marketplace(read_fixture("revibed_page_source.html")) == []
+
+    def test_list_not_loaded_on_server(self):
+        """Test a list the server did not load is reported as None for the browser fallback."""
+        html = ('<script id="__NEXT_DATA__" type="application/json">'
+                '{"props": {"initialState": {"MarketplaceListReducer": '
+                '{"list": [], "getMarketplaceListFromApi": false}}}}</script>')
+
+        assert parse_revibed_marketplace(html) is None
+        assert parse_revibed_marketplace("<html></html>") is None
+
+    def test_map_item_fields(self):
+        """Test marketplace items are mapped defensively to the result fields."""
+        item = map_revibed_item({
+            "id": 42,
+            "artists": [{"name": "Pink Floyd"}],
+            "album": {"title": "The Wall"},
+            "labels": [{"name": "Harvest"}],
+            "price": {"value": 45, "currency": "EUR"},
+            "covers": [{"path": "/images/wall.jpg"}],
+        })
+
+        assert item["title"] == "Pink Floyd"
+        assert item["album"] == "The Wall"
+        assert item["label"] == "Harvest"
+        assert item["price"] == "€45.00"
+        assert item["cover_url"] == "https://revibed.com/images/wall.jpg"
+        assert item["url"] == "https://revibed.com/marketplace/42"
+
+    def test_select_matches_artist(self):
+        """Test the first item is returned when it matches the searched artist."""
+        items = [map_revibed_item({"id": 1, "artist": "Pink Floyd", "name": "The Wall", "price": 30})]
+
+        hit = select_revibed_result(items, "Pink Floyd", "", 0.2)
+        miss = select_revibed_result(items, "Madonna", "", 0.2)
+
+        assert hit[0]["platform"] == "Revibed"
+        assert hit[0]["album"] == "The Wall"
+        assert hit[0]["price"] == "€30.00"
+        assert miss[0]["title"] == "Kein Treffer"
+
+
+class TestParseTraxsourceRows:
+    """Test the plain-HTTP Traxsource parser against captured pages."""
+
+    def test_parses_all_track_rows(self):
+        """Test every server-rendered track row is parsed."""
+        rows = parse_traxsource_rows(read_fixture("traxsource_house_page.html"))
+
+        assert len(rows) == 10
+        first = rows[0]
+        assert first["title"] == "House Music Is the Answer"
+        assert first["artists"] == "DJ Biddy"
+        assert first["label"] == "GROOVE MOVE RECORDS"
+        assert first["price"] == "$2.49"
+        assert first["url"] == "https://www.traxsource.com/track/13697044/house-music-is-the-answer"
+        assert first["cover_url"].startswith("https://geo-static.traxsource.com/")
+
+    def test_no_results_page(self):
+        """Test the empty search page yields no rows but is recognised as 'no results'."""
+        html = read_fixture("traxsource_full_page.html")
+
+        assert parse_traxsource_rows(html) == []
+        assert is_traxsource_no_results_page(html)
+
+    def test_broken_markup_returns_empty_list(self):
+        """Test missing or unusable HTML does not raise."""
+        assert parse_traxsource_rows(None) == []
+        assert parse_traxsource_rows("<html><body></body></html>") == []
+
+    def test_select_best_row(self):
+        """Test parsed rows are scored and mapped to the platform result format."""
+        rows = parse_traxsource_rows(read_fixture("traxsource_house_page.html"))
+        result = select_traxsource_result(rows, "DJ Biddy", "House Music Is the Answer", 0.2)
+
+        assert len(result) == 1
+        assert result[0]["platform"] == "Traxsource"
+        assert result[0]["title"] == "House Music Is the Answer (Extended Mix)"
+        assert result[0]["url"].endswith("/track/13697044/house-music-is-the-answer")
+        assert result[0]["search_time"] == 0.2
+        assert "relevance_score" not in result[0]
+
+    def test_select_without_match_returns_no_hit(self):
+        """Test irrelevant rows produce the 'Kein Treffer' entry."""
+        rows = parse_traxsource_rows(read_fixture("traxsource_house_page.html"))
+        result = select_traxsource_result(rows, "zzqx", "qqzz", 0.2)
+
+        assert result[0]["title"] == "Kein Treffer"
+
+
 class TestSearchRevibed:
     """Test Revibed search functionality."""
     
@@ -287,4 +540,26 @@ class TestScrapeSearchIntegration:
         
         # Test Revibed with vinyl artist (should work)
         revibed_vinyl_result = search_revibed("vinyl artist", "")
-        assert revibed_vinyl_result[0]["title"] != "Kein Treffer"
\ No newline at end of file
+        assert revibed_vinyl_result[0]["title"] != "Kein Treffer"
+
+class TestDiscogsMarketplaceOffers:
+    """Test the marketplace scraper integration used by the offers jobs."""
+
+    @pytest.fixture
+    def failing_scraper(self, monkeypatch):
+        class FailingScraper:
+            config = type("Config", (), {"user_country": "DE"})()
+
+            def scrape_marketplace_offers(self, release_id, max_offers):
+                return {"release_id": release_id, "offers": [], "status": "timeout_error"}
+
+        monkeypatch.setattr(scrape_search, "get_discogs_scraper", lambda country: FailingScraper())
+
+    def test_scrape_error_returns_empty_list(self, failing_scraper):
+        """Test interactive callers keep getting [] when scraping fails."""
+        assert scrape_search.scrape_discogs_marketplace_offers("1", user_country="DE") == []
+
+    def test_scrape_error_raised_on_request(self, failing_scraper):
+        """Test jobs can tell a failed scrape apart from a release without offers."""
+        with pytest.raises(RuntimeError, match="timeout error"):
+            scrape_search.scrape_discogs_marketplace_offers("1", user_country="DE", raise_errors=True)
@@ -0,0 +1,184 @@
+"""Tests for search_cache.py module."""
+
+import pytest
+import sys
+import os
+import time
+
+# Add parent directory to path to import modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from search_cache import (
+    SearchCache,
+    SearchCacheConfig,
+    cached_search,
+    criteria_key,
+    is_cacheable_result,
+)
+from providers import SearchCriteria
+
+
+class TestSearchCache:
+    """Test SearchCache storage, expiry and eviction."""
+
+    def test_set_and_get(self, cache):
+        """Test a stored value is returned and counted as hit."""
+        cache.set("Beatport", "k", {"title": "Track"})
+
+        assert cache.get("Beatport", "k") == {"title": "Track"}
+        assert cache.get("Beatport", "other") is None
+        stats = cache.get_stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["namespaces"]["Beatport"]["stores"] == 1
+
+    def test_entry_expires_after_ttl(self, cache):
+        """Test entries are not returned after their TTL."""
+        cache.set("Revibed", "k", {"title": "Item"}, ttl=0.01)
+        time.sleep(0.05)
+
+        assert cache.get("Revibed", "k") is None
+        assert cache.get_stats()["entries"] == 0
+
+    def test_provider_ttls(self):
+        """Test per-provider TTLs with default fallback."""
+        config = SearchCacheConfig(default_ttl=10, ttls={"Discogs": 99})
+
+        assert config.ttl_for("Discogs") == 99
+        assert config.ttl_for("Unknown") == 10
+
+    def test_lru_eviction(self, cache):
+        """Test the least recently used entry is evicted above max_entries."""
+        for key in ("a", "b", "c"):
+            cache.set("iTunes", key, {"title": key})
+            time.sleep(0.01)
+        cache.get("iTunes", "a")  # a is now more recent than b
+        cache.set("iTunes", "d", {"title": "d"})
+
+        assert cache.get("iTunes", "b") is None
+        assert cache.get("iTunes", "a") == {"title": "a"}
+        assert cache.get_stats()["entries"] == 3
+
+    def test_eviction_counts_every_removed_row(self, cache):
+        """Test the eviction counter grows by the number of evicted entries, not per batch."""
+        for key in ("a", "b", "c"):
+            cache.set("iTunes", key, {"title": key})
+        cache.config.max_entries = 1
+        cache.set("iTunes", "d", {"title": "d"})
+
+        assert cache.get_stats()["namespaces"]["iTunes"]["evictions"] == 3
+
+    def test_persists_across_instances(self, tmp_path):
+        """Test a second cache instance (e.g. after restart) sees stored entries."""
+        config = SearchCacheConfig(path=str(tmp_path / "shared.sqlite"))
+        first = SearchCache(config)
+        first.set("Bandcamp", "k", {"title": "Song"})
+        first.close()
+
+        second = SearchCache(config)
+        assert second.get("Bandcamp", "k") == {"title": "Song"}
+        second.close()
+
+    def test_disabled_cache(self, tmp_path):
+        """Test a disabled cache stores nothing."""
+        cache = SearchCache(SearchCacheConfig(path=str(tmp_path / "c.sqlite"), enabled=False))
+        cache.set("iTunes", "k", {"title": "x"})
+
+        assert cache.get("iTunes", "k") is None
+
+
+class TestCacheKeysAndResults:
+    """Test criteria normalization and the cacheability rules."""
+
+    def test_criteria_key_is_normalized(self):
+        """Test case, accents and whitespace do not change the key."""
+        assert criteria_key(SearchCriteria(title="Café  Del Mar", artist="Energy 52")) == \
+            criteria_key(SearchCriteria(title="cafe del mar", artist=" ENERGY 52 "))
+
+    def test_error_results_not_cacheable(self):
+        """Test failures are never cached, hits and 'Kein Treffer' are."""
+        assert is_cacheable_result({"title": "Kein Treffer"})
+        assert is_cacheable_result({"title": "Track", "price": "€1.39"})
+        assert not is_cacheable_result({"title": "❌ Beatport Suche nicht verfügbar"})
+        assert not is_cacheable_result({"platform": "Discogs", "releases": [], "count": 0})
+        assert not is_cacheable_result(None)
+
+
+class TestCachedSearchDecorator:
+    """Test the provider decorator."""
+
+    def test_second_search_served_from_cache(self, shared_stores):
+        """Test the wrapped search runs once per criteria and marks cached answers."""
+        calls = []
+
+        class FakeProvider:
+            name = "Traxsource"
+
+            @cached_search
+            def search(self, c):
+                calls.append(c)
+                return {"platform": self.name, "title": "Track", "search_time": 1.2}
+
+        provider = FakeProvider()
+        first = provider.search(SearchCriteria(title="Track", artist="Artist"))
+        second = provider.search(SearchCriteria(title="track", artist="artist"))
+
+        assert len(calls) == 1
+        assert "cached" not in first
+        assert second["cached"] is True
+        assert second["title"] == "Track"
+        assert second["search_time"] < 1.2
+
+    def test_error_result_is_retried(self, shared_stores):
+        """Test failed searches go to the network again next time."""
+        calls = []
+
+        class FailingProvider:
+            name = "Bandcamp"
+
+            @cached_search
+            def search(self, c):
+                calls.append(c)
+                return {"platform": self.name, "title": "❌ Bandcamp Suche nicht verfügbar"}
+
+        provider = FailingProvider()
+        provider.search(SearchCriteria(title="x", artist="y"))
+        provider.search(SearchCriteria(title="x", artist="y"))
+
+        assert len(calls) == 2
+
+    def test_concurrent_identical_searches_run_once(self, shared_stores):
+        """Test identical in-flight searches are coalesced, even for uncacheable results."""
+        import threading
+        calls = []
+        started = threading.Event()
+        release = threading.Event()
+
+        class SlowProvider:
+            name = "Beatport"
+
+            @cached_search
+            def search(self, c):
+                calls.append(c)
+                started.set()
+                release.wait(2)
+                return {"platform": self.name, "title": "❌ Beatport Suche nicht verfügbar"}
+
+        provider = SlowProvider()
+        results = []
+        workers = [
+            threading.Thread(target=lambda: results.append(provider.search(SearchCriteria(title="T", artist="A"))))
+            for _ in range(3)
+        ]
+        workers[0].start()
+        started.wait(2)
+        for worker in workers[1:]:
+            worker.start()
+        time.sleep(0.05)
+        release.set()
+        for worker in workers:
+            worker.join()
+
+        assert len(calls) == 1
+        assert len(results) == 3
+        assert results[0] is not results[1]
@@ -0,0 +1,93 @@
+"""Tests for singleflight.py module."""
+
+import pytest
+import sys
+import os
+import threading
+import time
+
+# Add parent directory to path to import modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from singleflight import SingleFlight
+
+
+def run_concurrently(group, key, fn, count):
+    """Start count callers for key; the first one is in fn before the others arrive"""
+    results, errors = [], []
+
+    def call():
+        try:
+            results.append(group.do(key, fn))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=call) for _ in range(count)]
+    threads[0].start()
+    while group.in_flight() == 0:
+        time.sleep(0.001)
+    for thread in threads[1:]:
+        thread.start()
+    return threads, results, errors
+
+
+class TestSingleFlight:
+    """Test coalescing of identical in-flight calls."""
+
+    def test_concurrent_callers_share_one_execution(self):
+        """Test followers receive the leader's result without running fn."""
+        group = SingleFlight()
+        release = threading.Event()
+        calls = []
+
+        def work():
+            calls.append(1)
+            release.wait(2)
+            return {"offers": [1, 2]}
+
+        threads, results, _ = run_concurrently(group, "release-1", work, 4)
+        time.sleep(0.05)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        assert len(calls) == 1
+        assert results == [{"offers": [1, 2]}] * 4
+        assert group.get_stats() == {"in_flight": 0, "executed": 1, "shared": 3}
+
+    def test_exception_is_shared(self):
+        """Test followers see the leader's exception."""
+        group = SingleFlight()
+        release = threading.Event()
+
+        def work():
+            release.wait(2)
+            raise TimeoutError("page load")
+
+        threads, results, errors = run_concurrently(group, "k", work, 3)
+        time.sleep(0.05)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        assert results == []
+        assert len(errors) == 3
+        assert all(isinstance(e, TimeoutError) for e in errors)
+
+    def test_sequential_calls_run_again(self):
+        """Test finished calls are not memoized - that is the cache's job."""
+        group = SingleFlight()
+        calls = []
+
+        group.do("k", lambda: calls.append(1))
+        group.do("k", lambda: calls.append(1))
+
+        assert len(calls) == 2
+
+    def test_different_keys_run_independently(self):
+        """Test only identical keys are coalesced."""
+        group = SingleFlight()
+
+        assert group.do("a", lambda: "A") == "A"
+        assert group.do("b", lambda: "B") == "B"
+        assert group.get_stats()["shared"] == 0
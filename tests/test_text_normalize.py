@@ -0,0 +1,61 @@
+"""Tests for text_normalize.py module."""
+
+import pytest
+import sys
+import os
+import random
+
+# Add parent directory to path to import modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import text_normalize
+from text_normalize import normalize_catno, normalize_for_matching, normalize_key_text, normalize_many, strip_accents_slow
+
+
+def reference(text):
+    """The former per-character implementation"""
+    return strip_accents_slow(text).lower().strip() if text else ""
+
+
+class TestNormalize:
+    """Test the table-based normalization against the unicodedata reference."""
+
+    @pytest.mark.parametrize("text,expected", [
+        ("  Beyoncé ", "beyonce"),
+        ("Ólafur Arnalds", "olafur arnalds"),
+        ("Mötley Crüe", "motley crue"),
+        ("DJ Koze", "dj koze"),
+        ("", ""),
+        (None, ""),
+    ])
+    def test_known_values(self, text, expected):
+        """Test accents and case are folded and surrounding whitespace is removed."""
+        assert normalize_for_matching(text) == expected
+
+    def test_matches_reference_for_mixed_scripts(self):
+        """Test random strings from Latin, Greek, Cyrillic, Hangul, combining marks and astral characters."""
+        alphabet = ("aéÅçØßñ" "ΆΐЙё" "한글" "́̈" "\U0001D15E" "ǅ ")
+        rng = random.Random(7)
+        for _ in range(2000):
+            text = "".join(rng.choice(alphabet) for _ in range(rng.randint(1, 10)))
+            assert normalize_for_matching(text) == reference(text), repr(text)
+
+    def test_normalize_many_and_memo_cache(self):
+        """Test the batch API matches single calls and repeated strings are served from the cache."""
+        text_normalize.clear_cache()
+
+        first = normalize_many(["Café", "", "Café", 42])
+        hits = text_normalize.cache_info().hits
+
+        assert first == ["cafe", "", "cafe", "42"]
+        assert hits >= 1
+
+    def test_key_text_collapses_whitespace(self):
+        """Test cache keys ignore case, accents and repeated whitespace."""
+        assert normalize_key_text("  Daft   Pünk ") == "daft punk"
+        assert normalize_key_text(None) == ""
+
+    def test_catno_ignores_spacing_dashes_and_case(self):
+        """Test catalog numbers normalize to upper-case alphanumerics."""
+        assert normalize_catno("warp-cd 92") == normalize_catno("WARPCD92") == "WARPCD92"
+        assert normalize_catno(None) == ""
@@ -0,0 +1,106 @@
+"""Tests for tracing.py module."""
+
+import pytest
+import sys
+import os
+import io
+import json
+
+# Add parent directory to path to import modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tracing import Tracer, TracingConfig, percentile
+
+
+class TestSpans:
+    """Test recording spans."""
+
+    def test_span_records_duration_and_attributes(self):
+        """Test a span lands in the buffer with provider, stage and extra attributes."""
+        tracer = Tracer(TracingConfig())
+
+        with tracer.span("parse", provider="Traxsource", transport="http") as attrs:
+            attrs["rows"] = 12
+
+        [entry] = tracer.spans()
+        assert (entry.provider, entry.stage, entry.status) == ("Traxsource", "parse", "ok")
+        assert entry.attrs == {"transport": "http", "rows": 12}
+        assert entry.duration >= 0
+
+    def test_nested_span_inherits_provider_and_errors_are_recorded(self):
+        """Test inner spans use the enclosing provider and exceptions mark the span as failed."""
+        tracer = Tracer(TracingConfig())
+
+        with pytest.raises(ValueError):
+            with tracer.span("search", provider="Bandcamp"):
+                with tracer.span("page_load"):
+                    raise ValueError("timeout")
+
+        inner, outer = tracer.spans()
+        assert inner.provider == "Bandcamp" and inner.stage == "page_load"
+        assert inner.status == outer.status == "error"
+        assert "timeout" in inner.error
+
+    def test_ring_buffer_keeps_most_recent_spans(self):
+        """Test the buffer drops the oldest spans once full."""
+        tracer = Tracer(TracingConfig(buffer_size=3))
+
+        for i in range(5):
+            tracer.record("request", "iTunes", i / 10)
+
+        assert [s.duration for s in tracer.spans()] == [0.2, 0.3, 0.4]
+
+    def test_disabled_tracer_records_nothing(self):
+        """Test GEMFINDER_TRACING_DISABLED turns spans into no-ops."""
+        tracer = Tracer(TracingConfig(enabled=False))
+
+        with tracer.span("parse", provider="Beatport"):
+            pass
+
+        assert tracer.spans() == []
+
+
+class TestSummaries:
+    """Test percentile summaries and exports."""
+
+    def test_percentiles_per_provider_and_stage(self):
+        """Test p50/p95/p99 are computed per (provider, stage)."""
+        tracer = Tracer(TracingConfig())
+        for i in range(1, 101):
+            tracer.record("page_load", "Beatport", i / 100)
+        tracer.record("page_load", "Traxsource", 2.0, status="error")
+
+        summary = tracer.summary()
+
+        beatport = summary[("Beatport", "page_load")]
+        assert beatport["count"] == 100
+        assert (beatport["p50"], beatport["p95"], beatport["p99"]) == (0.51, 0.95, 0.99)
+        assert summary[("Traxsource", "page_load")]["errors"] == 1
+        assert percentile([], 0.5) == 0.0
+
+    def test_prometheus_export(self):
+        """Test the Prometheus text format carries quantiles, sum, count and errors."""
+        tracer = Tracer(TracingConfig())
+        tracer.record("request", "Discogs", 0.25)
+
+        text = tracer.export_prometheus()
+
+        assert '# TYPE gemfinder_stage_duration_seconds summary' in text
+        assert 'gemfinder_stage_duration_seconds{provider="Discogs",stage="request",quantile="0.95"} 0.250000' in text
+        assert 'gemfinder_stage_duration_seconds_count{provider="Discogs",stage="request"} 1' in text
+        assert 'gemfinder_stage_errors_total{provider="Discogs",stage="request"} 0' in text
+
+    def test_jsonl_round_trip_and_file_sink(self, tmp_path):
+        """Test spans written to GEMFINDER_TRACE_FILE load back into a tracer."""
+        path = tmp_path / "spans.jsonl"
+        tracer = Tracer(TracingConfig(jsonl_path=str(path)))
+        tracer.record("wait_for_selector", "Revibed", 0.5, url="https://revibed.com")
+
+        exported = io.StringIO()
+        tracer.export_jsonl(exported)
+        restored = Tracer(TracingConfig())
+        loaded = restored.load_jsonl(path.read_text(encoding="utf-8").splitlines() + ["{broken"])
+
+        assert json.loads(exported.getvalue())["stage"] == "wait_for_selector"
+        assert loaded == 1
+        assert restored.spans()[0].attrs == {"url": "https://revibed.com"}
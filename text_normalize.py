@@ -0,0 +1,89 @@
+"""
+Accent- and case-insensitive text normalization shared by all filters, scorers and cache keys
+A precomputed str.translate table replaces the per-character unicodedata loop and an LRU cache
+serves repeated strings (query terms, artists, labels) without normalizing them again
+
+    from text_normalize import normalize_for_matching, normalize_many
+    normalize_for_matching(" Beyoncé ")   # -> "beyonce"
+    normalize_many(["Café", "Ólafur"])     # -> ["cafe", "olafur"]
+"""
+import os
+import unicodedata
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional
+
+# Distinct strings kept in the memo cache - one search touches a few hundred
+CACHE_SIZE = int(os.environ.get("GEMFINDER_NORMALIZE_CACHE_SIZE", 65536))
+
+_BMP_MAX = "\uffff"
+
+
+def strip_accents_slow(text: str) -> str:
+    """Reference implementation: NFD, then drop combining marks (used for characters outside the table)"""
+    text = unicodedata.normalize("NFD", text)
+    return "".join(c for c in text if unicodedata.category(c) != "Mn")
+
+
+@lru_cache(maxsize=1)
+def accent_table() -> Dict[int, Optional[str]]:
+    """
+    str.translate table for the Basic Multilingual Plane: every character whose NFD form differs
+    (é -> e, Hangul syllables -> Jamo) or that is itself a combining mark (-> removed)
+    """
+    table = {}
+    for codepoint in range(0x80, 0x10000):
+        if 0xD800 <= codepoint <= 0xDFFF:
+            continue
+        char = chr(codepoint)
+        if unicodedata.category(char) == "Mn":
+            table[codepoint] = None
+            continue
+        decomposed = unicodedata.normalize("NFD", char)
+        if decomposed != char:
+            table[codepoint] = strip_accents_slow(decomposed) or None
+    return table
+
+
+def strip_accents(text: str) -> str:
+    if text.isascii():
+        return text
+    if max(text) > _BMP_MAX:
+        # Astral-plane characters are not in the table
+        return strip_accents_slow(text)
+    return text.translate(accent_table())
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _normalize(text: str) -> str:
+    return strip_accents(text).lower().strip()
+
+
+def normalize_for_matching(text) -> str:
+    """Normalize text for flexible matching - handles accents and case"""
+    if not text:
+        return ""
+    return _normalize(text if isinstance(text, str) else str(text))
+
+
+def normalize_many(texts: Iterable) -> List[str]:
+    """normalize_for_matching for a whole candidate list"""
+    normalize = _normalize
+    return [normalize(t if isinstance(t, str) else str(t)) if t else "" for t in texts]
+
+
+def normalize_key_text(text) -> str:
+    """Case-, accent- and whitespace-insensitive form of a search term (cache keys)"""
+    return " ".join(normalize_for_matching(text).split())
+
+
+def normalize_catno(catno) -> str:
+    """Catalog number without case, spaces, dashes and punctuation ("WARP-CD 92" -> "WARPCD92")"""
+    return "".join(c for c in str(catno or "").upper() if c.isalnum())
+
+
+def cache_info():
+    return _normalize.cache_info()
+
+
+def clear_cache():
+    _normalize.cache_clear()
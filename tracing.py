@@ -0,0 +1,250 @@
+"""
+Per-stage latency tracing for searches
+Spans (provider + stage, e.g. Beatport/page_load) go into an in-process ring buffer;
+summaries with p50/p95/p99 and Prometheus text / JSONL exports show where the seconds of a search go
+
+    python tracing.py spans.jsonl                      # per-stage table from a GEMFINDER_TRACE_FILE
+    python tracing.py spans.jsonl --format prometheus
+
+    with span("page_load", provider="Beatport", url=url):
+        driver.get(url)
+"""
+import os
+import sys
+import json
+import argparse
+import time
+import threading
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, asdict, field
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO
+
+from logging_config import get_logger
+
+log = get_logger(__name__)
+
+
+@dataclass
+class TracingConfig:
+    """Configuration for the span buffer (defaults can be overridden via environment)"""
+    # Number of most recent spans kept in memory
+    buffer_size: int = 5000
+
+    enabled: bool = True
+
+    # Optional JSONL file every finished span is appended to (survives restarts, readable by the CLI below)
+    jsonl_path: str = ""
+
+    @classmethod
+    def from_env(cls) -> "TracingConfig":
+        config = cls()
+        config.buffer_size = int(os.environ.get("GEMFINDER_TRACE_BUFFER", config.buffer_size))
+        config.enabled = os.environ.get("GEMFINDER_TRACING_DISABLED", "").lower() not in ("1", "true", "yes")
+        config.jsonl_path = os.environ.get("GEMFINDER_TRACE_FILE", config.jsonl_path)
+        return config
+
+
+@dataclass
+class Span:
+    """One timed stage of a search"""
+    provider: str
+    stage: str
+    start: float
+    duration: float
+    status: str = "ok"
+    error: str = ""
+    attrs: Dict = field(default_factory=dict)
+
+
+def percentile(ordered: List[float], q: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, int(round(q * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+class Tracer:
+    """Thread-safe ring buffer of spans with latency summaries and exports"""
+
+    def __init__(self, config: Optional[TracingConfig] = None):
+        self.config = config or TracingConfig.from_env()
+        self._lock = threading.Lock()
+        self._spans = deque(maxlen=max(1, self.config.buffer_size))
+        # Nested spans without an explicit provider inherit the one of the enclosing span (per thread)
+        self._local = threading.local()
+
+    def current_provider(self) -> str:
+        stack = getattr(self._local, "providers", None)
+        return stack[-1] if stack else ""
+
+    @contextmanager
+    def span(self, stage: str, provider: Optional[str] = None, **attrs) -> Iterator[Dict]:
+        """
+        Time the block as one span. The yielded dict takes extra attributes (e.g. result counts);
+        exceptions are recorded with status="error" and re-raised
+        """
+        if not self.config.enabled:
+            yield attrs
+            return
+
+        provider = provider or self.current_provider() or "unknown"
+        stack = getattr(self._local, "providers", None)
+        if stack is None:
+            stack = self._local.providers = []
+        stack.append(provider)
+        started_at = time.time()
+        start = time.perf_counter()
+        status, error = "ok", ""
+        try:
+            yield attrs
+        except BaseException as e:
+            status, error = "error", f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            stack.pop()
+            self.record(stage, provider, time.perf_counter() - start, status=status, error=error,
+                        start=started_at, **attrs)
+
+    def record(self, stage: str, provider: str, duration: float, status: str = "ok", error: str = "",
+               start: Optional[float] = None, **attrs):
+        """Add an externally timed span"""
+        if not self.config.enabled:
+            return
+        entry = Span(provider=provider, stage=stage, start=time.time() - duration if start is None else start,
+                     duration=duration, status=status, error=error, attrs=attrs)
+        with self._lock:
+            self._spans.append(entry)
+            if self.config.jsonl_path:
+                self._append_jsonl(entry)
+
+    def _append_jsonl(self, entry: Span):
+        # Tracing must never break a search - a full disk only loses the file copy
+        try:
+            with open(self.config.jsonl_path, "a", encoding="utf-8") as f:
+                f.write(_span_json(entry) + "\n")
+        except OSError as e:
+            log.warning("⚠️ Could not write span to %s: %s", self.config.jsonl_path, e)
+
+    def spans(self, provider: Optional[str] = None, stage: Optional[str] = None) -> List[Span]:
+        with self._lock:
+            spans = list(self._spans)
+        return [s for s in spans if (provider is None or s.provider == provider)
+                and (stage is None or s.stage == stage)]
+
+    def clear(self):
+        with self._lock:
+            self._spans.clear()
+
+    # —————————————————————————————
+    # Summaries and exports
+    # —————————————————————————————
+    def summary(self) -> Dict[tuple, Dict]:
+        """Per (provider, stage): count, errors, total and p50/p95/p99/max in seconds"""
+        grouped: Dict[tuple, List[Span]] = {}
+        for s in self.spans():
+            grouped.setdefault((s.provider, s.stage), []).append(s)
+
+        summary = {}
+        for key in sorted(grouped):
+            spans = grouped[key]
+            ordered = sorted(s.duration for s in spans)
+            summary[key] = {
+                "count": len(spans),
+                "errors": sum(1 for s in spans if s.status == "error"),
+                "total": sum(ordered),
+                "p50": percentile(ordered, 0.50),
+                "p95": percentile(ordered, 0.95),
+                "p99": percentile(ordered, 0.99),
+                "max": ordered[-1],
+            }
+        return summary
+
+    def export_prometheus(self) -> str:
+        """Prometheus text exposition format (summary metric over the buffered spans)"""
+        lines = [
+            "# HELP gemfinder_stage_duration_seconds Duration of search stages per provider",
+            "# TYPE gemfinder_stage_duration_seconds summary",
+        ]
+        errors = []
+        for (provider, stage), stats in self.summary().items():
+            labels = f'provider="{_escape_label(provider)}",stage="{_escape_label(stage)}"'
+            for name in ("p50", "p95", "p99"):
+                quantile = int(name[1:]) / 100
+                lines.append(f'gemfinder_stage_duration_seconds{{{labels},quantile="{quantile}"}} {stats[name]:.6f}')
+            lines.append(f"gemfinder_stage_duration_seconds_sum{{{labels}}} {stats['total']:.6f}")
+            lines.append(f"gemfinder_stage_duration_seconds_count{{{labels}}} {stats['count']}")
+            errors.append(f"gemfinder_stage_errors_total{{{labels}}} {stats['errors']}")
+        lines += [
+            "# HELP gemfinder_stage_errors_total Failed search stages per provider",
+            "# TYPE gemfinder_stage_errors_total counter",
+        ] + errors
+        return "\n".join(lines) + "\n"
+
+    def export_jsonl(self, fp: Optional[TextIO] = None) -> str:
+        """One JSON object per buffered span; written to fp if given"""
+        text = "".join(_span_json(s) + "\n" for s in self.spans())
+        if fp is not None:
+            fp.write(text)
+        return text
+
+    def load_jsonl(self, lines: Iterable[str]) -> int:
+        """Add spans from a JSONL export (e.g. GEMFINDER_TRACE_FILE); broken lines are skipped"""
+        loaded = 0
+        for line in lines:
+            try:
+                entry = Span(**json.loads(line))
+            except (ValueError, TypeError):
+                continue
+            with self._lock:
+                self._spans.append(entry)
+            loaded += 1
+        return loaded
+
+
+def _span_json(entry: Span) -> str:
+    return json.dumps(asdict(entry), ensure_ascii=False, default=str)
+
+
+def _escape_label(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+_tracer = Tracer()
+
+
+def get_tracer() -> Tracer:
+    """Process-wide tracer shared by all Streamlit sessions and worker threads"""
+    return _tracer
+
+
+def span(stage: str, provider: Optional[str] = None, **attrs):
+    """Shortcut: `with span("parse", provider="Traxsource"): ...` on the global tracer"""
+    return _tracer.span(stage, provider, **attrs)
+
+
+def format_summary(summary: Dict[tuple, Dict]) -> str:
+    lines = [f"{'provider':<20} {'stage':<18} {'count':>6} {'err':>4} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}"]
+    for (provider, stage), stats in summary.items():
+        lines.append(f"{provider:<20} {stage:<18} {stats['count']:>6} {stats['errors']:>4} "
+                     f"{stats['p50'] * 1000:>9.1f} {stats['p95'] * 1000:>9.1f} {stats['p99'] * 1000:>9.1f}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Summarize GemFinder span exports")
+    parser.add_argument("path", help="JSONL span file (GEMFINDER_TRACE_FILE)")
+    parser.add_argument("--format", choices=("table", "prometheus"), default="table")
+    args = parser.parse_args(argv)
+
+    tracer = Tracer(TracingConfig(buffer_size=10 ** 7))
+    with open(args.path, encoding="utf-8") as f:
+        tracer.load_jsonl(f)
+    output = tracer.export_prometheus() if args.format == "prometheus" else format_summary(tracer.summary())
+    print(output.rstrip("\n"))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
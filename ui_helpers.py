@@ -148,17 +148,24 @@ def show_live_results():
         if len(real_hits) > 0:
             st.session_state.has_digital_hits_for_button = True
 
+import logging
 import streamlit as st
 from scrape_search import search_revibed, scrape_discogs_marketplace_offers
-from selenium_scraper import selenium_filter_offers_parallel
 # Passe den Import-Pfad hier an, je nachdem wo du get_platform_info und is_fuzzy_match definiert hast:
 from api_search import search_discogs_releases, get_discogs_release_details, get_discogs_offers
 from utils import (get_platform_info, is_fuzzy_match, CURRENCY_MAPPING, 
                    CONDITION_HIERARCHY, HIGH_QUALITY_CONDITIONS, parse_price)
-import requests
+from http_client import get_http_session
+from refresh_bus import AdaptivePoller, get_refresh_bus
+from marketplace_jobs import get_marketplace_jobs, offers_topic
+from release_details import get_release_details_cache, release_key
+from release_index import get_release_index
+from logging_config import get_logger, SAMPLED
 from api_search import get_discogs_release_details
 from bs4 import BeautifulSoup
 
+log = get_logger(__name__)
+
 def check_offer_shipping_availability(offer_url, user_country):
     """
     Check if an offer is available for shipping to user's country
@@ -181,15 +188,15 @@ def check_offer_shipping_availability(offer_url, user_country):
         }
         
         # Quick timeout for faster processing
-        response = requests.get(offer_url, timeout=5, headers=headers)
+        response = get_http_session("scrape").get(offer_url, timeout=5, headers=headers)
         
         if response.status_code == 403:
-            print(f"403 Forbidden for {offer_url} - checking if URL indicates unavailability")
+            log.debug("403 Forbidden for %s - checking if URL indicates unavailability", offer_url)
             # If we get 403, we can't check the content, but we can try to be conservative
             # For now, let's assume it's available and let the user decide
             return True
         elif response.status_code != 200:
-            print(f"Failed to fetch offer page: {offer_url} (Status: {response.status_code})")
+            log.debug("Failed to fetch offer page: %s (Status: %s)", offer_url, response.status_code)
             return True  # Assume available if we can't check
         
         soup = BeautifulSoup(response.text, 'html.parser')
@@ -202,7 +209,7 @@ def check_offer_shipping_availability(offer_url, user_country):
             pricing_info = no_offer_container.find('p', class_='pricing_info muted')
             if pricing_info:
                 shipping_text = pricing_info.get_text().strip()
-                print(f"Found shipping restriction in no_offer container: '{shipping_text}'")
+                log.debug("Found shipping restriction in no_offer container: %r", shipping_text)
                 
                 # Check for country restrictions
                 user_country_name = {
@@ -221,13 +228,13 @@ def check_offer_shipping_availability(offer_url, user_country):
                 
                 for pattern in unavailable_patterns:
                     if pattern in shipping_text:
-                        print(f"Offer restricted for {user_country_name}: {shipping_text}")
+                        log.debug("Offer restricted for %s: %s", user_country_name, shipping_text)
                         return False
         
         return True  # No restrictions found
         
     except Exception as e:
-        print(f"Error checking shipping for {offer_url}: {e}")
+        log.warning("Error checking shipping for %s: %s", offer_url, e)
         return True  # Assume available if error occurs
 
 # --- Unified Hit Detection Logic ---
@@ -241,13 +248,27 @@ def is_valid_result(entry, check_empty_title=True):
     else:
         return title not in invalid_titles
 
+# --- Previously found (local release index) ---
+def show_previously_found(criteria):
+    """Treffer früherer Suchen zur aktuellen Eingabe - aus dem lokalen Index, ohne Netzwerk"""
+    hits = get_release_index().search(artist=criteria.artist, title=criteria.title,
+                                      album=criteria.album, catalog=criteria.catalog)
+    if not hits:
+        return
+    with st.expander(f"🕘 Previously found ({len(hits)})", expanded=True):
+        for hit in hits:
+            name = " – ".join(part for part in (hit["artist"], hit["title"]) if part)
+            extra = ", ".join(part for part in (hit["label"], hit["catno"], hit["year"]) if part)
+            line = f"**{hit['platform']}**: [{name}]({hit['url']})" if hit["url"] else f"**{hit['platform']}**: {name}"
+            st.markdown(line + (f"  \n:gray[{extra}]" if extra else ""))
+
 def get_user_location():
     """Get user location via IP for currency zone detection"""
     if 'user_location' in st.session_state:
         return st.session_state.user_location
     
     try:
-        r = requests.get("https://ipinfo.io/json", timeout=3)
+        r = get_http_session().get("https://ipinfo.io/json", timeout=3)
         if r.status_code == 200:
             data = r.json()
             location = {
@@ -258,7 +279,7 @@ def get_user_location():
             st.session_state.user_location = location
             return location
     except Exception as e:
-        print(f"Location Error: {e}")
+        log.warning("Location Error: %s", e)
     
     # Default location
     default_location = {"country": "DE", "city": "Unknown", "currency": "EUR"}
@@ -364,6 +385,55 @@ def filter_offers_by_condition(offers, high_quality_only=False):
     
     return filtered_offers
 
+def prepare_offers(offers, preferred_currency):
+    """Keep offers in the preferred currency with a valid price and add parsed price/shipping/total amounts"""
+    preferred_currency_offers = []
+    for i, offer in enumerate(offers):
+        # Debug: full offer structure to understand data format (formatted only at DEBUG)
+        if i < 3:  # Only the first 3 offers to avoid spam
+            log.debug("Offer %d: %s", i + 1, offer)
+        
+        price_amount, price_currency = parse_price(offer.get('price', ''))
+        
+        # Filter currency
+        if price_currency and price_currency != preferred_currency:
+            log.debug("Currency mismatch: got %s, expected %s", price_currency, preferred_currency, extra=SAMPLED)
+            continue
+        
+        # Simplified filter: Skip offers without valid total pricing
+        # Unavailable offers often have incomplete pricing information
+        shipping_info = offer.get('shipping', '')
+        
+        # Selenium should have already filtered problematic offers
+        # Only basic validation needed now  
+        if shipping_info == 'N/A' and not offer.get('selenium_enhanced'):
+            log.debug("Skipping offer %d - no shipping info and not Selenium-enhanced", i + 1)
+            continue
+        
+        # Skip offers with suspiciously low prices that might indicate errors
+        if price_amount <= 0:
+            log.debug("Skipping offer %d - invalid price: %s", i + 1, price_amount)
+            continue
+        
+        # Parse shipping and calculate total
+        shipping_amount, shipping_currency = parse_price(offer.get('shipping', ''))
+        total_amount = price_amount + shipping_amount
+        
+        # Final validation: Skip offers without meaningful total price
+        if total_amount <= 0 or total_amount > 10000:  # Sanity check for extreme values
+            log.debug("Skipping offer %d - invalid total amount: %s", i + 1, total_amount)
+            continue
+        
+        offer_copy = offer.copy()
+        offer_copy.update({
+            'price_amount': price_amount,
+            'price_currency': price_currency,
+            'shipping_amount': shipping_amount,
+            'total_amount': total_amount
+        })
+        preferred_currency_offers.append(offer_copy)
+    return preferred_currency_offers
+
 def search_discogs_offers_simplified(selected_release):
     """Simplified offers display - show offers for selected release"""
     
@@ -389,87 +459,29 @@ def search_discogs_offers_simplified(selected_release):
         st.error("Release-ID nicht gefunden.")
         return
     
-    # Load offers only if not already cached
-    cache_key = f"all_offers_{release_id}"
-    
-    if cache_key not in st.session_state:
-        # Show loading state only for initial load
-        with st.spinner(f"Loading and filtering offers for shipping availability..."):
-            try:
-                # Use original scraper + Selenium enhancement for shipping/availability
-                offers = scrape_discogs_marketplace_offers(release_id, max_offers=8, user_country=user_location['country'])
-                print(f"Scraper returned {len(offers)} offers")
-                
-                # Enhance with Selenium using parallel processing for speed
-                # Uses 5 parallel browsers to process offers simultaneously for maximum speed
-                if offers:
-                    offers = selenium_filter_offers_parallel(offers, user_location['country'], max_workers=5)
-                    print(f"Selenium parallel filtered to {len(offers)} available offers")
-
-                if not offers:
-                    st.info("📭 No marketplace offers found for this release.")
-                    return
-                
-                # Process offers - filter out unavailable ones based on shipping info
-                preferred_currency_offers = []
-                for i, offer in enumerate(offers):
-                    # Debug: Print full offer structure to understand data format
-                    if i < 3:  # Only print first 3 offers to avoid spam
-                        print(f"DEBUG Offer {i+1}: {offer}")
-                    
-                    price_amount, price_currency = parse_price(offer.get('price', ''))
-                    
-                    # Filter currency
-                    if price_currency and price_currency != preferred_currency:
-                        print(f"Currency mismatch: got {price_currency}, expected {preferred_currency}")
-                        continue
-                    
-                    # Simplified filter: Skip offers without valid total pricing
-                    # Unavailable offers often have incomplete pricing information
-                    shipping_info = offer.get('shipping', '')
-                    
-                    # Selenium should have already filtered problematic offers
-                    # Only basic validation needed now  
-                    if shipping_info == 'N/A' and not offer.get('selenium_enhanced'):
-                        print(f"Skipping offer {i+1} - no shipping info and not Selenium-enhanced")
-                        continue
-                    
-                    # Skip offers with suspiciously low prices that might indicate errors
-                    if price_amount <= 0:
-                        print(f"Skipping offer {i+1} - invalid price: {price_amount}")
-                        continue
-                    
-                    # Parse shipping and calculate total
-                    shipping_amount, shipping_currency = parse_price(offer.get('shipping', ''))
-                    total_amount = price_amount + shipping_amount
-                    
-                    # Final validation: Skip offers without meaningful total price
-                    if total_amount <= 0 or total_amount > 10000:  # Sanity check for extreme values
-                        print(f"Skipping offer {i+1} - invalid total amount: {total_amount}")
-                        continue
-                    
-                    offer_copy = offer.copy()
-                    offer_copy.update({
-                        'price_amount': price_amount,
-                        'price_currency': price_currency,
-                        'shipping_amount': shipping_amount,
-                        'total_amount': total_amount
-                    })
-                    preferred_currency_offers.append(offer_copy)
-                
-                # Store all offers in session state for quality filtering
-                st.session_state[cache_key] = preferred_currency_offers
-                
-            except Exception as e:
-                st.error(f"❌ Error loading offers: {str(e)}")
-                return
+    # Scrape + shipping check run as a background job (shared by all sessions) - this run only
+    # renders what the job has accepted so far; the offers fragment reruns while it is pending.
+    # A failed job is only started again when its retry button was clicked (True for this run)
+    retry_key = f"retry_offers_{release_id}"
+    job = get_marketplace_jobs().submit(release_id, user_location['country'],
+                                        retry=bool(st.session_state.get(retry_key)))
     
-    # Apply quality filter on cached data (no reload, instant filtering)
     try:
+        preferred_currency_offers = prepare_offers(job.offers(), preferred_currency)
+        
+        if not job.done:
+            st.caption(f"⏳ Loading and filtering offers for shipping availability... {len(preferred_currency_offers)} so far")
+        elif job.error:
+            st.error(f"❌ Error loading offers: {job.error}")
+            st.button("🔄 Retry", key=retry_key)
+            return
+        elif not job.raw_count:
+            st.info("📭 No marketplace offers found for this release.")
+            return
+        
+        # Apply quality filter on the job's offers (no reload, instant filtering)
         if high_quality_only:
-            preferred_currency_offers = filter_offers_by_condition(st.session_state[cache_key], high_quality_only)
-        else:
-            preferred_currency_offers = st.session_state[cache_key]
+            preferred_currency_offers = filter_offers_by_condition(preferred_currency_offers, high_quality_only)
         
         # Sort by total price
         preferred_currency_offers.sort(key=lambda x: x.get('total_amount', 0))
@@ -477,10 +489,9 @@ def search_discogs_offers_simplified(selected_release):
         # Display offers directly (no stats, no buttons)
         if preferred_currency_offers:
             for i, offer in enumerate(preferred_currency_offers[:10], 1):
-                # Debug: Print offer URL to console
-                print(f"Offer {i} URL: {offer.get('offer_url', 'NO URL')}")
+                log.debug("Offer %d URL: %s", i, offer.get('offer_url', 'NO URL'), extra=SAMPLED)
                 display_single_offer_clean(offer, i, preferred_currency, selected_release)
-        else:
+        elif job.done:
             quality_msg = " in VG+ or better condition" if high_quality_only else ""
             st.info(f"No offers found in {preferred_currency}{quality_msg}.")
     
@@ -876,11 +887,16 @@ def show_discogs_block(releases, track_for_search):
         st.markdown("#### Available offers in your currency")
     
     # Debug info for monitoring (from combined version)
-    print(f"UI: Received {len(releases)} releases from API")
-    for i, r in enumerate(releases[:3]):
-        print(f"UI Release {i+1}: ID={r.get('id')}, Title={r.get('title')}")
+    log.debug("UI: Received %d releases from API", len(releases))
+    if log.isEnabledFor(logging.DEBUG):
+        for i, r in enumerate(releases[:3]):
+            log.debug("UI Release %d: ID=%s, Title=%s", i + 1, r.get('id'), r.get('title'))
     
     if releases:
+        # Fetch details of the top releases in the background - switching releases then reads from the cache
+        details_cache = get_release_details_cache()
+        details_cache.prefetch(releases)
+        
         # Two-column layout: Release info on left, offers on right
         release_col, offers_col = st.columns([1, 1])
         
@@ -936,28 +952,10 @@ def show_discogs_block(releases, track_for_search):
                 st.markdown(f"**Format:** {format_str}")
                 st.markdown(f"**Katalog:** `{catno_str}`")
                 
-                # Have/Want ratio - get from API details with caching
-                release_id = r.get("id")
-                # if release_id:
-                #     # Cache release details to avoid repeated API calls
-                #     cache_key = f"release_details_{release_id}"
-                #     # if cache_key not in st.session_state:
-                #     #     try:
-                #     #         print(f"Fetching release details for {release_id} (not cached)")
-                #     #         details = get_discogs_release_details(release_id)
-                #     #         st.session_state[cache_key] = details
-                #     #     except Exception as e:
-                #     #         print(f"Error getting release details: {e}")
-                #     #         st.session_state[cache_key] = {}
-                #     # else:
-                #     #     print(f"Using cached release details for {release_id}")
-                    
-                #     details = st.session_state[cache_key]
-                #     # community = details.get("community", {})
-                #     have_count = community.get("have", r.get("community", {}).get("have", "-"))
-                #     want_count = community.get("want", r.get("community", {}).get("want", "-"))
-                # else:
-                community = r.get("community", {})
+                # Have/Want ratio - from the shared details cache (prefetched or fetched once for all sessions)
+                release_id = release_key(r)
+                details = (details_cache.get_or_fetch(release_id) if release_id else None) or {}
+                community = details.get("community") or r.get("community", {})
                 have_count = community.get("have", "-")
                 want_count = community.get("want", "-")
                                 
@@ -984,19 +982,8 @@ def show_discogs_block(releases, track_for_search):
         if selected_idx < len(releases):
             r = releases[selected_idx]
             
-            # Get full tracklist from details API with caching
-            release_id = r.get("id")
-            if release_id:
-                # Use the same cached details from above
-                cache_key = f"release_details_{release_id}"
-                if cache_key in st.session_state:
-                    details = st.session_state[cache_key]
-                    full_tracklist = details.get("tracklist", [])
-                else:
-                    # Fallback if somehow not cached yet
-                    full_tracklist = r.get("tracklist", [])
-            else:
-                full_tracklist = r.get("tracklist", [])
+            # Full tracklist from the details loaded above, search result as fallback
+            full_tracklist = details.get("tracklist") or r.get("tracklist", [])
             
             with release_col:
                 if full_tracklist:
@@ -1024,11 +1011,10 @@ def show_discogs_block(releases, track_for_search):
                     st.markdown(tracklist_text)
                 
                 # Move search button below tracklist
+                # on_click runs before the rerun, so the offers fragment above already sees the request
                 search_button_key = f"search_offers_btn_{selected_idx}"
-                if st.button("Search for Offers", key=search_button_key):
-                    st.session_state.show_offers = True
-                    st.session_state.offers_for_release = selected_idx
-                    # st.rerun() KOMPLETT ENTFERNT - teste was passiert
+                st.button("Search for Offers", key=search_button_key,
+                          on_click=request_offers, args=(selected_idx,))
         st.markdown("---")
     else:
         st.image(NO_HIT_COVER, width=92)
@@ -1040,10 +1026,53 @@ def show_discogs_block(releases, track_for_search):
 # - show_discogs_block() for enhanced Discogs display
 # - show_revibed_fragment() for parallel Revibed loading
 
-@st.fragment(run_every=0.05)
+def request_offers(selected_idx):
+    """on_click des "Search for Offers"-Buttons"""
+    st.session_state.show_offers = True
+    st.session_state.offers_for_release = selected_idx
+
+def show_event_fragment(name, body, topics, *args):
+    """
+    Render body(*args) as a fragment that reruns only while a background job on one of the
+    topics is pending. The timer is armed with the poller's tier at the last full script run
+    (fast right after new data, slower while nothing changed) and kept until the job ends -
+    only starting and stopping the timer costs a full rerun. Idle fragments have no timer at all.
+    """
+    bus = get_refresh_bus()
+    state = st.session_state.setdefault(f"refresh_{name}", {"poller": AdaptivePoller(), "run": 0, "body_run": -1})
+    state["run"] += 1
+    run = state["run"]
+    poller = state["poller"]
+    poller.retarget(topics, bus.versions(topics))
+    interval = poller.interval(bus.any_pending(topics))
+
+    def render(*fragment_args):
+        if state["body_run"] == run:
+            # Timer tick (fragment-only rerun): tier changes wait for the next full run, only
+            # "nothing pending any more" needs a full rerun to remove the timer
+            poller.observe(bus.versions(topics))
+            if poller.interval(bus.any_pending(topics)) is None:
+                st.rerun()
+        state["body_run"] = run
+        body(*fragment_args)
+        if interval is None and bus.any_pending(topics):
+            # body started a job (e.g. after the button click) - full rerun arms the timer
+            st.rerun()
+
+    st.fragment(render, run_every=interval)(*args)
+
 def show_offers_fragment(releases, selected_idx):
-    """Fragment für Offers-Anzeige - 50ms Update-Zyklus für sofortige Reaktion"""
-    # Track state changes for immediate updates
+    """Offers-Anzeige als Fragment - läuft nur neu, wenn ein Marketplace-Job neue Angebote meldet"""
+    release = releases[selected_idx] if selected_idx < len(releases) else {}
+    release_id = release.get("id") or release.get("uri", "").split("/")[-1]
+    topics = []
+    if st.session_state.get("show_offers") and st.session_state.get("offers_for_release") == selected_idx:
+        # Jobs are keyed by release and country - the location lookup only happens once offers were requested
+        topics = [offers_topic(release_id, get_user_location()['country'])]
+    show_event_fragment("offers", render_offers_panel, topics, releases, selected_idx)
+
+def render_offers_panel(releases, selected_idx):
+    """Inhalt des Offers-Fragments: Angebote des gewählten Releases oder Hinweis auf den Button"""
     offers_state = st.session_state.get("show_offers", False)
     offers_release = st.session_state.get("offers_for_release", None)
     
@@ -1054,9 +1083,9 @@ def show_offers_fragment(releases, selected_idx):
     elif selected_idx < len(releases):
         st.info("Click 'Search for Offers' to see marketplace listings")
 
-@st.fragment(run_every=2)
+@st.fragment
 def show_revibed_fragment(revibed_results):
-    """Pure Revibed fragment with back button - enables parallel loading"""
+    """Pure Revibed fragment with back button - reruns only on its own widgets (no timer)"""
     # Check if there are any Revibed hits for display logic
     def is_real_revibed_hit(entry):
         return is_valid_result(entry, check_empty_title=True)
@@ -1106,10 +1135,11 @@ def show_revibed_fragment(revibed_results):
     # Scenario 2 & 3: No digital hits -> no back button
     if st.session_state.get("has_digital_hits", False):
         if st.button("Zurück zu digitalen Shops", key="digital_back_revibed"):
-            print("🔄 DEBUG: Back button clicked - returning to digital results")
+            log.debug("🔄 Back button clicked - returning to digital results")
             
             # Fragment-safe state changes (no aggressive clearing)
             st.session_state.discogs_revibed_mode = False
             st.session_state.show_digital = True
             st.session_state.mode_switch_button_shown = False
-            # Fragment will handle the rest automatically
+            # The layout switch happens outside the fragment - rerun the whole page
+            st.rerun()